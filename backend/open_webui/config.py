@@ -34,6 +34,7 @@ from open_webui.env import (
 )
 from open_webui.internal.db import Base, get_db
 from open_webui.utils.redis import get_redis_connection
+from open_webui.utils.serialization import json_dumps, json_loads
 
 
 class EndpointFilter(logging.Filter):
@@ -255,7 +256,7 @@ class AppConfig:
 
             if self._redis:
                 redis_key = f"{self._redis_key_prefix}:config:{key}"
-                self._redis.set(redis_key, json.dumps(self._state[key].value))
+                self._redis.set(redis_key, json_dumps(self._state[key].value))
 
     def __getattr__(self, key):
         if key not in self._state:
@@ -268,7 +269,7 @@ class AppConfig:
 
             if redis_value is not None:
                 try:
-                    decoded_value = json.loads(redis_value)
+                    decoded_value = json_loads(redis_value)
 
                     # Update the in-memory value if different
                     if self._state[key].value != decoded_value:
@@ -2047,6 +2048,31 @@ else:
     except Exception:
         PGVECTOR_POOL_RECYCLE = 3600
 
+# Rows sent per COPY when bulk writing chunks
+try:
+    PGVECTOR_BULK_BATCH_SIZE = max(
+        1, int(os.environ.get("PGVECTOR_BULK_BATCH_SIZE", "5000"))
+    )
+except Exception:
+    PGVECTOR_BULK_BATCH_SIZE = 5000
+
+# ANN index on document_chunk.vector: "hnsw", "ivfflat" or "none"
+PGVECTOR_INDEX_METHOD = os.environ.get("PGVECTOR_INDEX_METHOD", "ivfflat").lower()
+PGVECTOR_HNSW_M = int(os.environ.get("PGVECTOR_HNSW_M", "16"))
+PGVECTOR_HNSW_EF_CONSTRUCTION = int(
+    os.environ.get("PGVECTOR_HNSW_EF_CONSTRUCTION", "64")
+)
+# Lower bound, each search uses at least its result limit
+PGVECTOR_HNSW_EF_SEARCH = int(os.environ.get("PGVECTOR_HNSW_EF_SEARCH", "40"))
+PGVECTOR_IVFFLAT_LISTS = int(os.environ.get("PGVECTOR_IVFFLAT_LISTS", "100"))
+PGVECTOR_IVFFLAT_PROBES = int(os.environ.get("PGVECTOR_IVFFLAT_PROBES", "1"))
+
+# Collections with at least this many chunks get their own partial ANN index, smaller
+# ones are searched exactly and no table-wide ANN index is kept. 0 disables
+PGVECTOR_PARTIAL_INDEX_MIN_ROWS = int(
+    os.environ.get("PGVECTOR_PARTIAL_INDEX_MIN_ROWS", "0")
+)
+
 # Pinecone
 PINECONE_API_KEY = os.environ.get("PINECONE_API_KEY", None)
 PINECONE_ENVIRONMENT = os.environ.get("PINECONE_ENVIRONMENT", None)
@@ -343,6 +343,55 @@ DATABASE_ENABLE_SQLITE_WAL = (
     os.environ.get("DATABASE_ENABLE_SQLITE_WAL", "False").lower() == "true"
 )
 
+# Tuned pragmas, a single writer connection with a pool of read connections and
+# periodic WAL checkpoints for single node SQLite deployments (implies WAL)
+ENABLE_SQLITE_PERFORMANCE_PROFILE = (
+    os.environ.get("ENABLE_SQLITE_PERFORMANCE_PROFILE", "False").lower() == "true"
+)
+
+try:
+    DATABASE_SQLITE_READ_POOL_SIZE = max(
+        1, int(os.environ.get("DATABASE_SQLITE_READ_POOL_SIZE", "8"))
+    )
+except ValueError:
+    DATABASE_SQLITE_READ_POOL_SIZE = 8
+
+try:
+    DATABASE_SQLITE_BUSY_TIMEOUT = max(
+        0, int(os.environ.get("DATABASE_SQLITE_BUSY_TIMEOUT", "10000"))
+    )
+except ValueError:
+    DATABASE_SQLITE_BUSY_TIMEOUT = 10000
+
+# Page cache per connection in KiB
+try:
+    DATABASE_SQLITE_CACHE_SIZE = max(
+        0, int(os.environ.get("DATABASE_SQLITE_CACHE_SIZE", "65536"))
+    )
+except ValueError:
+    DATABASE_SQLITE_CACHE_SIZE = 65536
+
+try:
+    DATABASE_SQLITE_MMAP_SIZE = max(
+        0, int(os.environ.get("DATABASE_SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    )
+except ValueError:
+    DATABASE_SQLITE_MMAP_SIZE = 256 * 1024 * 1024
+
+# Seconds between wal_checkpoint(TRUNCATE) runs, 0 leaves it to SQLite
+try:
+    DATABASE_SQLITE_CHECKPOINT_INTERVAL = max(
+        0, int(os.environ.get("DATABASE_SQLITE_CHECKPOINT_INTERVAL", "300"))
+    )
+except ValueError:
+    DATABASE_SQLITE_CHECKPOINT_INTERVAL = 300
+
+# Serve the async data access methods of the models with an asyncpg / aiosqlite
+# engine. Without it (or the driver) they run the sync methods in a thread.
+ENABLE_ASYNC_DATABASE = (
+    os.environ.get("ENABLE_ASYNC_DATABASE", "True").lower() == "true"
+)
+
 DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL = os.environ.get(
     "DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL", None
 )
@@ -354,6 +403,60 @@ if DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL is not None:
     except Exception:
         DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL = 0.0
 
+# Seconds an authenticated user is served from the in-memory cache, 0 disables it
+try:
+    USER_CACHE_TTL = max(0.0, float(os.environ.get("USER_CACHE_TTL", "5")))
+except ValueError:
+    USER_CACHE_TTL = 5.0
+
+try:
+    USER_CACHE_SIZE = max(0, int(os.environ.get("USER_CACHE_SIZE", "1000")))
+except ValueError:
+    USER_CACHE_SIZE = 1000
+
+# Seconds between batched writes of the users' last active timestamps
+try:
+    USER_LAST_ACTIVE_FLUSH_INTERVAL = max(
+        1.0, float(os.environ.get("USER_LAST_ACTIVE_FLUSH_INTERVAL", "10"))
+    )
+except ValueError:
+    USER_LAST_ACTIVE_FLUSH_INTERVAL = 10.0
+
+# Chats fetched per round trip by the streaming exports and inserted per
+# transaction by the bulk import
+try:
+    CHAT_STREAM_BATCH_SIZE = max(
+        1, int(os.environ.get("CHAT_STREAM_BATCH_SIZE", "100"))
+    )
+except ValueError:
+    CHAT_STREAM_BATCH_SIZE = 100
+
+# Seconds between event loop lag samples, 0 disables the monitor
+try:
+    EVENT_LOOP_LAG_SAMPLE_INTERVAL = max(
+        0.0, float(os.environ.get("EVENT_LOOP_LAG_SAMPLE_INTERVAL", "1"))
+    )
+except ValueError:
+    EVENT_LOOP_LAG_SAMPLE_INTERVAL = 1.0
+
+# Debugging aid: log the stack of any callback blocking the event loop for longer
+# than this many milliseconds, 0 disables it
+try:
+    EVENT_LOOP_BLOCKING_THRESHOLD_MS = max(
+        0, int(os.environ.get("EVENT_LOOP_BLOCKING_THRESHOLD_MS", "0"))
+    )
+except ValueError:
+    EVENT_LOOP_BLOCKING_THRESHOLD_MS = 0
+
+# Threads running blocking calls offloaded from async routes (embeddings, vector
+# DB calls). Calls beyond this wait for a free thread.
+try:
+    BLOCKING_EXECUTOR_WORKERS = max(
+        1, int(os.environ.get("BLOCKING_EXECUTOR_WORKERS", "16"))
+    )
+except ValueError:
+    BLOCKING_EXECUTOR_WORKERS = 16
+
 RESET_CONFIG_ON_START = (
     os.environ.get("RESET_CONFIG_ON_START", "False").lower() == "true"
 )
@@ -558,6 +661,10 @@ else:
     except Exception:
         CHAT_RESPONSE_MAX_TOOL_CALL_RETRIES = 10
 
+ENABLE_CHAT_STREAM_PASSTHROUGH = (
+    os.environ.get("ENABLE_CHAT_STREAM_PASSTHROUGH", "True").lower() == "true"
+)
+
 
 ####################################
 # WEBSOCKET SUPPORT
@@ -679,6 +786,157 @@ else:
     except Exception:
         SENTENCE_TRANSFORMERS_CROSS_ENCODER_MODEL_KWARGS = None
 
+
+# Coalesce concurrent local (SentenceTransformer) embedding requests into micro-batches
+ENABLE_SENTENCE_TRANSFORMERS_BATCHING = (
+    os.environ.get("ENABLE_SENTENCE_TRANSFORMERS_BATCHING", "True").lower() == "true"
+)
+
+try:
+    SENTENCE_TRANSFORMERS_BATCH_SIZE = int(
+        os.environ.get("SENTENCE_TRANSFORMERS_BATCH_SIZE", "32")
+    )
+except ValueError:
+    SENTENCE_TRANSFORMERS_BATCH_SIZE = 32
+
+try:
+    SENTENCE_TRANSFORMERS_BATCH_WAIT_MS = float(
+        os.environ.get("SENTENCE_TRANSFORMERS_BATCH_WAIT_MS", "5")
+    )
+except ValueError:
+    SENTENCE_TRANSFORMERS_BATCH_WAIT_MS = 5.0
+
+try:
+    SENTENCE_TRANSFORMERS_NUM_THREADS = (
+        int(os.environ.get("SENTENCE_TRANSFORMERS_NUM_THREADS", "")) or None
+    )
+except ValueError:
+    SENTENCE_TRANSFORMERS_NUM_THREADS = None
+
+# Number of (query, chunk) reranking scores kept in memory, 0 disables the cache
+try:
+    RAG_RERANKING_CACHE_SIZE = int(os.environ.get("RAG_RERANKING_CACHE_SIZE", "4096"))
+except ValueError:
+    RAG_RERANKING_CACHE_SIZE = 4096
+
+# Number of chunks embedded and written to the vector DB at a time while ingesting
+try:
+    RAG_INGEST_BATCH_SIZE = max(1, int(os.environ.get("RAG_INGEST_BATCH_SIZE", "256")))
+except ValueError:
+    RAG_INGEST_BATCH_SIZE = 256
+
+# Files processed in parallel when reindexing knowledge bases
+try:
+    KNOWLEDGE_REINDEX_CONCURRENCY = max(
+        1, int(os.environ.get("KNOWLEDGE_REINDEX_CONCURRENCY", "4"))
+    )
+except ValueError:
+    KNOWLEDGE_REINDEX_CONCURRENCY = 4
+
+# Seconds between removals of deleted files from the knowledge bases' file ids,
+# 0 disables the background run
+try:
+    KNOWLEDGE_FILE_RECONCILE_INTERVAL = max(
+        0, int(os.environ.get("KNOWLEDGE_FILE_RECONCILE_INTERVAL", "3600"))
+    )
+except ValueError:
+    KNOWLEDGE_FILE_RECONCILE_INTERVAL = 3600
+
+# Seconds between vector DB garbage collection runs, 0 disables the background run
+try:
+    VECTOR_DB_GC_INTERVAL = max(
+        0, int(os.environ.get("VECTOR_DB_GC_INTERVAL", "86400"))
+    )
+except ValueError:
+    VECTOR_DB_GC_INTERVAL = 86400
+
+# Seconds a web search collection is kept before the garbage collector removes it,
+# 0 keeps them
+try:
+    WEB_SEARCH_COLLECTION_TTL = max(
+        0, int(os.environ.get("WEB_SEARCH_COLLECTION_TTL", "604800"))
+    )
+except ValueError:
+    WEB_SEARCH_COLLECTION_TTL = 604800
+
+# Seconds a knowledge-like collection must stay without its knowledge base before
+# the garbage collector removes it
+try:
+    VECTOR_DB_GC_ORPHAN_GRACE_PERIOD = max(
+        0, int(os.environ.get("VECTOR_DB_GC_ORPHAN_GRACE_PERIOD", "86400"))
+    )
+except ValueError:
+    VECTOR_DB_GC_ORPHAN_GRACE_PERIOD = 86400
+
+####################################
+# EXTRACTION CACHE
+####################################
+
+ENABLE_EXTRACTION_CACHE = (
+    os.environ.get("ENABLE_EXTRACTION_CACHE", "True").lower() == "true"
+)
+
+EXTRACTION_CACHE_DIR = os.environ.get(
+    "EXTRACTION_CACHE_DIR", str(DATA_DIR / "cache" / "extraction")
+)
+
+try:
+    EXTRACTION_CACHE_MAX_SIZE_MB = int(
+        os.environ.get("EXTRACTION_CACHE_MAX_SIZE_MB", "1024")
+    )
+except ValueError:
+    EXTRACTION_CACHE_MAX_SIZE_MB = 1024
+
+# Seconds after which an extraction result is removed from the cache, 0 keeps
+# results until they are evicted or their file is deleted
+try:
+    EXTRACTION_CACHE_TTL = max(
+        0, int(os.environ.get("EXTRACTION_CACHE_TTL", "604800"))
+    )
+except ValueError:
+    EXTRACTION_CACHE_TTL = 604800
+
+####################################
+# DOCUMENT LOADERS
+####################################
+
+# Maximum number of documents sent to each external extraction engine at once
+try:
+    DOCUMENT_LOADER_MAX_CONCURRENCY = int(
+        os.environ.get("DOCUMENT_LOADER_MAX_CONCURRENCY", "4")
+    )
+except ValueError:
+    DOCUMENT_LOADER_MAX_CONCURRENCY = 4
+
+try:
+    DOCUMENT_LOADER_POOL_SIZE = int(os.environ.get("DOCUMENT_LOADER_POOL_SIZE", "32"))
+except ValueError:
+    DOCUMENT_LOADER_POOL_SIZE = 32
+
+# Extract large PDFs page-parallel in a process pool with the default engine
+ENABLE_PARALLEL_PDF_EXTRACTION = (
+    os.environ.get("ENABLE_PARALLEL_PDF_EXTRACTION", "True").lower() == "true"
+)
+
+try:
+    PDF_EXTRACTION_WORKERS = int(
+        os.environ.get("PDF_EXTRACTION_WORKERS", str(min(4, os.cpu_count() or 1)))
+    )
+except ValueError:
+    PDF_EXTRACTION_WORKERS = min(4, os.cpu_count() or 1)
+
+try:
+    PDF_EXTRACTION_PAGES_PER_SHARD = int(
+        os.environ.get("PDF_EXTRACTION_PAGES_PER_SHARD", "25")
+    )
+except ValueError:
+    PDF_EXTRACTION_PAGES_PER_SHARD = 25
+
+try:
+    PDF_EXTRACTION_MIN_PAGES = int(os.environ.get("PDF_EXTRACTION_MIN_PAGES", "50"))
+except ValueError:
+    PDF_EXTRACTION_MIN_PAGES = 50
+
 ####################################
 # OFFLINE_MODE
 ####################################
@@ -790,6 +1048,20 @@ OTEL_LOGS_OTLP_SPAN_EXPORTER = os.environ.get(
     "OTEL_LOGS_OTLP_SPAN_EXPORTER", OTEL_OTLP_SPAN_EXPORTER
 ).lower()  # grpc or http
 
+# Serve the metrics in the Prometheus text format at /metrics, with or without
+# an OTLP collector (ENABLE_OTEL)
+ENABLE_PROMETHEUS_METRICS = (
+    os.environ.get("ENABLE_PROMETHEUS_METRICS", "False").lower() == "true"
+)
+# Bearer token required to scrape /metrics. Without one, /metrics refuses every
+# request unless PROMETHEUS_METRICS_ALLOW_UNAUTHENTICATED is set, e.g. when only
+# a scraper on a private network can reach it
+PROMETHEUS_METRICS_API_KEY = os.environ.get("PROMETHEUS_METRICS_API_KEY", "")
+PROMETHEUS_METRICS_ALLOW_UNAUTHENTICATED = (
+    os.environ.get("PROMETHEUS_METRICS_ALLOW_UNAUTHENTICATED", "False").lower()
+    == "true"
+)
+
 ####################################
 # TOOLS/FUNCTIONS PIP OPTIONS
 ####################################
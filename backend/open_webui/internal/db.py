@@ -1,10 +1,12 @@
+import asyncio
 import os
-import json
 import logging
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 from typing import Any, Optional
+from urllib.parse import urlencode
 
 from open_webui.internal.wrappers import register_connection
+from open_webui.utils.serialization import json_dumps, json_loads
 from open_webui.env import (
     OPEN_WEBUI_DIR,
     DATABASE_URL,
@@ -15,12 +17,21 @@ from open_webui.env import (
     DATABASE_POOL_SIZE,
     DATABASE_POOL_TIMEOUT,
     DATABASE_ENABLE_SQLITE_WAL,
+    DATABASE_SQLITE_BUSY_TIMEOUT,
+    DATABASE_SQLITE_CACHE_SIZE,
+    DATABASE_SQLITE_CHECKPOINT_INTERVAL,
+    DATABASE_SQLITE_MMAP_SIZE,
+    DATABASE_SQLITE_READ_POOL_SIZE,
+    ENABLE_ASYNC_DATABASE,
+    ENABLE_SQLITE_PERFORMANCE_PROFILE,
 )
 from peewee_migrate import Router
-from sqlalchemy import Dialect, create_engine, MetaData, event, types
+from sqlalchemy import Dialect, Select, create_engine, MetaData, event, text, types
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import scoped_session, sessionmaker
-from sqlalchemy.pool import QueuePool, NullPool
+from sqlalchemy.orm import Session as OrmSession, scoped_session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool, NullPool
 from sqlalchemy.sql.type_api import _T
 from typing_extensions import Self
 
@@ -33,21 +44,21 @@ class JSONField(types.TypeDecorator):
     cache_ok = True
 
     def process_bind_param(self, value: Optional[_T], dialect: Dialect) -> Any:
-        return json.dumps(value)
+        return json_dumps(value)
 
     def process_result_value(self, value: Optional[_T], dialect: Dialect) -> Any:
         if value is not None:
-            return json.loads(value)
+            return json_loads(value)
 
     def copy(self, **kw: Any) -> Self:
         return JSONField(self.impl.length)
 
     def db_value(self, value):
-        return json.dumps(value)
+        return json_dumps(value)
 
     def python_value(self, value):
         if value is not None:
-            return json.loads(value)
+            return json_loads(value)
 
 
 # Workaround to handle the peewee migration
@@ -81,6 +92,18 @@ handle_peewee_migration(DATABASE_URL)
 
 
 SQLALCHEMY_DATABASE_URL = DATABASE_URL
+# Separate pool of read only connections, used by the SQLite performance profile
+read_engine = None
+
+
+def sqlite_lower(value):
+    return value.lower() if isinstance(value, str) else value
+
+
+def register_sqlite_functions(dbapi_connection) -> None:
+    # Unicode-aware lower(), used to search filenames case-insensitively
+    dbapi_connection.create_function("py_lower", 1, sqlite_lower, deterministic=True)
+
 
 # Handle SQLCipher URLs
 if SQLALCHEMY_DATABASE_URL.startswith("sqlite+sqlcipher://"):
@@ -101,30 +124,80 @@ if SQLALCHEMY_DATABASE_URL.startswith("sqlite+sqlcipher://"):
 
         conn = sqlcipher3.connect(db_path, check_same_thread=False)
         conn.execute(f"PRAGMA key = '{database_password}'")
+        register_sqlite_functions(conn)
         return conn
 
     engine = create_engine(
         "sqlite://",  # Dummy URL since we're using creator
         creator=create_sqlcipher_connection,
         echo=False,
+        json_serializer=json_dumps,
+        json_deserializer=json_loads,
     )
 
     log.info("Connected to encrypted SQLite database using SQLCipher")
 
 elif "sqlite" in SQLALCHEMY_DATABASE_URL:
-    engine = create_engine(
-        SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-    )
+    if ENABLE_SQLITE_PERFORMANCE_PROFILE:
+        # SQLite allows one writer at a time, so writes share a single
+        # connection and wait for it instead of failing with "database is locked"
+        engine = create_engine(
+            SQLALCHEMY_DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            poolclass=QueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=DATABASE_POOL_TIMEOUT,
+            json_serializer=json_dumps,
+            json_deserializer=json_loads,
+        )
+        read_engine = create_engine(
+            SQLALCHEMY_DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            poolclass=QueuePool,
+            pool_size=DATABASE_SQLITE_READ_POOL_SIZE,
+            max_overflow=DATABASE_SQLITE_READ_POOL_SIZE,
+            pool_timeout=DATABASE_POOL_TIMEOUT,
+            json_serializer=json_dumps,
+            json_deserializer=json_loads,
+        )
+    else:
+        engine = create_engine(
+            SQLALCHEMY_DATABASE_URL,
+            connect_args={"check_same_thread": False},
+            json_serializer=json_dumps,
+            json_deserializer=json_loads,
+        )
 
     def on_connect(dbapi_connection, connection_record):
+        register_sqlite_functions(dbapi_connection)
         cursor = dbapi_connection.cursor()
-        if DATABASE_ENABLE_SQLITE_WAL:
+        if DATABASE_ENABLE_SQLITE_WAL or ENABLE_SQLITE_PERFORMANCE_PROFILE:
             cursor.execute("PRAGMA journal_mode=WAL")
         else:
             cursor.execute("PRAGMA journal_mode=DELETE")
+
+        if ENABLE_SQLITE_PERFORMANCE_PROFILE:
+            # NORMAL is durable in WAL mode except for the last transactions
+            # before a power loss
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute(f"PRAGMA busy_timeout={DATABASE_SQLITE_BUSY_TIMEOUT}")
+            cursor.execute(f"PRAGMA cache_size=-{DATABASE_SQLITE_CACHE_SIZE}")
+            cursor.execute(f"PRAGMA mmap_size={DATABASE_SQLITE_MMAP_SIZE}")
+            cursor.execute("PRAGMA temp_store=MEMORY")
         cursor.close()
 
     event.listen(engine, "connect", on_connect)
+
+    if ENABLE_SQLITE_PERFORMANCE_PROFILE:
+
+        def on_read_connect(dbapi_connection, connection_record):
+            on_connect(dbapi_connection, connection_record)
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA query_only=ON")
+            cursor.close()
+
+        event.listen(read_engine, "connect", on_read_connect)
 else:
     if isinstance(DATABASE_POOL_SIZE, int):
         if DATABASE_POOL_SIZE > 0:
@@ -136,23 +209,89 @@ else:
                 pool_recycle=DATABASE_POOL_RECYCLE,
                 pool_pre_ping=True,
                 poolclass=QueuePool,
+                json_serializer=json_dumps,
+                json_deserializer=json_loads,
             )
         else:
             engine = create_engine(
-                SQLALCHEMY_DATABASE_URL, pool_pre_ping=True, poolclass=NullPool
+                SQLALCHEMY_DATABASE_URL,
+                pool_pre_ping=True,
+                poolclass=NullPool,
+                json_serializer=json_dumps,
+                json_deserializer=json_loads,
             )
     else:
-        engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_pre_ping=True)
+        engine = create_engine(
+            SQLALCHEMY_DATABASE_URL,
+            pool_pre_ping=True,
+            json_serializer=json_dumps,
+            json_deserializer=json_loads,
+        )
+
+
+class ReadWriteSession(OrmSession):
+    """
+    Sends SELECTs to the read engine and everything else (flushes, DML, raw
+    SQL) to the write engine. Once a transaction has written, its reads go to
+    the write engine too, so they see the uncommitted changes.
+    """
+
+    _writing = False
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if self._writing or self._flushing or not isinstance(clause, Select):
+            self._writing = True
+            return engine
+        return read_engine
+
+
+@event.listens_for(ReadWriteSession, "after_transaction_end")
+def _reset_writing(session, transaction):
+    if transaction.parent is None:
+        session._writing = False
 
 
 SessionLocal = sessionmaker(
-    autocommit=False, autoflush=False, bind=engine, expire_on_commit=False
+    class_=ReadWriteSession if read_engine is not None else OrmSession,
+    autocommit=False,
+    autoflush=False,
+    bind=engine,
+    expire_on_commit=False,
 )
 metadata_obj = MetaData(schema=DATABASE_SCHEMA)
 Base = declarative_base(metadata=metadata_obj)
 Session = scoped_session(SessionLocal)
 
 
+def is_sqlite_performance_profile() -> bool:
+    return read_engine is not None
+
+
+def checkpoint_sqlite_wal() -> None:
+    with engine.connect() as connection:
+        busy, log_pages, checkpointed = connection.execute(
+            text("PRAGMA wal_checkpoint(TRUNCATE)")
+        ).one()
+    log.debug(
+        f"SQLite WAL checkpoint: {checkpointed} of {log_pages} pages"
+        f"{' (busy)' if busy else ''}"
+    )
+
+
+def optimize_sqlite() -> None:
+    with engine.connect() as connection:
+        connection.execute(text("PRAGMA optimize"))
+
+
+async def periodic_sqlite_checkpoint():
+    while True:
+        await asyncio.sleep(DATABASE_SQLITE_CHECKPOINT_INTERVAL)
+        try:
+            await asyncio.to_thread(checkpoint_sqlite_wal)
+        except Exception as e:
+            log.warning(f"SQLite WAL checkpoint failed: {e}")
+
+
 def get_session():
     db = SessionLocal()
     try:
@@ -162,3 +301,141 @@ def get_session():
 
 
 get_db = contextmanager(get_session)
+
+
+####################
+# Async engine
+####################
+
+
+# URL query parameters that asyncpg (or SQLAlchemy's asyncpg dialect) takes as
+# connect() keyword arguments, the others are libpq connection parameters
+ASYNCPG_URL_PARAMETERS = {
+    "host",
+    "port",
+    "ssl",
+    "direct_tls",
+    "passfile",
+    "timeout",
+    "command_timeout",
+    "statement_cache_size",
+    "max_cached_statement_lifetime",
+    "max_cacheable_statement_size",
+    "prepared_statement_cache_size",
+    "target_session_attrs",
+    "krbsrvname",
+    "gsslib",
+}
+
+
+def get_async_database_url(database_url: str) -> Optional[str]:
+    """
+    Returns the asyncpg / aiosqlite URL of the database, or None for databases
+    without an async driver (e.g. SQLCipher). The libpq parameters of a
+    PostgreSQL URL are left out, see get_async_database_connect_args.
+    """
+    url = make_url(database_url)
+    if url.drivername in ("sqlite", "sqlite+pysqlite"):
+        return url.set(drivername="sqlite+aiosqlite").render_as_string(
+            hide_password=False
+        )
+    if url.drivername in ("postgresql", "postgresql+psycopg2"):
+        return url.set(
+            drivername="postgresql+asyncpg",
+            query={
+                key: value
+                for key, value in url.query.items()
+                if key in ASYNCPG_URL_PARAMETERS
+            },
+        ).render_as_string(hide_password=False)
+    return None
+
+
+def get_async_database_connect_args(database_url: str) -> dict:
+    """
+    Returns the asyncpg connect() arguments for the libpq parameters of a
+    PostgreSQL URL (sslmode, sslrootcert, options, application_name, ...).
+
+    asyncpg rejects those as keyword arguments, but parses them like libpq from
+    a DSN, which is merged with the keyword arguments SQLAlchemy passes.
+    """
+    url = make_url(database_url)
+    if url.drivername not in ("postgresql", "postgresql+psycopg2"):
+        return {}
+
+    query = {
+        key: value
+        for key, value in url.query.items()
+        if key not in ASYNCPG_URL_PARAMETERS
+    }
+    if not query:
+        return {}
+    return {"dsn": f"postgresql://?{urlencode(query, doseq=True)}"}
+
+
+async_engine = None
+ASYNC_DATABASE_URL = (
+    get_async_database_url(SQLALCHEMY_DATABASE_URL) if ENABLE_ASYNC_DATABASE else None
+)
+ASYNC_DATABASE_CONNECT_ARGS = get_async_database_connect_args(SQLALCHEMY_DATABASE_URL)
+
+if ASYNC_DATABASE_URL:
+    try:
+        if ASYNC_DATABASE_URL.startswith("sqlite"):
+            async_engine = create_async_engine(
+                ASYNC_DATABASE_URL,
+                json_serializer=json_dumps,
+                json_deserializer=json_loads,
+            )
+            event.listen(async_engine.sync_engine, "connect", on_connect)
+        elif isinstance(DATABASE_POOL_SIZE, int):
+            if DATABASE_POOL_SIZE > 0:
+                async_engine = create_async_engine(
+                    ASYNC_DATABASE_URL,
+                    pool_size=DATABASE_POOL_SIZE,
+                    max_overflow=DATABASE_POOL_MAX_OVERFLOW,
+                    pool_timeout=DATABASE_POOL_TIMEOUT,
+                    pool_recycle=DATABASE_POOL_RECYCLE,
+                    pool_pre_ping=True,
+                    poolclass=AsyncAdaptedQueuePool,
+                    connect_args=ASYNC_DATABASE_CONNECT_ARGS,
+                    json_serializer=json_dumps,
+                    json_deserializer=json_loads,
+                )
+            else:
+                async_engine = create_async_engine(
+                    ASYNC_DATABASE_URL,
+                    pool_pre_ping=True,
+                    poolclass=NullPool,
+                    connect_args=ASYNC_DATABASE_CONNECT_ARGS,
+                    json_serializer=json_dumps,
+                    json_deserializer=json_loads,
+                )
+        else:
+            async_engine = create_async_engine(
+                ASYNC_DATABASE_URL,
+                pool_pre_ping=True,
+                connect_args=ASYNC_DATABASE_CONNECT_ARGS,
+                json_serializer=json_dumps,
+                json_deserializer=json_loads,
+            )
+    except ImportError as e:
+        log.warning(f"Async database driver not available, using threads: {e}")
+
+AsyncSessionLocal = (
+    async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None
+    else None
+)
+
+
+def has_async_db() -> bool:
+    return AsyncSessionLocal is not None
+
+
+async def get_async_session():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+get_async_db = asynccontextmanager(get_async_session)
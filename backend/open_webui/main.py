@@ -11,8 +11,8 @@ import random
 from uuid import uuid4
 
 
-from contextlib import asynccontextmanager
-from urllib.parse import urlencode, parse_qs, urlparse
+from contextlib import asynccontextmanager, suppress
+from urllib.parse import urlencode
 from pydantic import BaseModel
 from sqlalchemy import text
 
@@ -45,10 +45,9 @@ from fastapi.staticfiles import StaticFiles
 from starlette_compress import CompressMiddleware
 
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.responses import Response, StreamingResponse
-from starlette.datastructures import Headers
+from starlette.datastructures import Headers, MutableHeaders
 
 
 from open_webui.utils import logger
@@ -95,8 +94,24 @@ from open_webui.routers.retrieval import (
     get_ef,
     get_rf,
 )
-
-from open_webui.internal.db import Session, engine
+from open_webui.retrieval.loaders.cache import (
+    EXTRACTION_CACHE,
+    periodic_extraction_cache_expiry,
+)
+from open_webui.retrieval.loaders.pdf import shutdown_pdf_executor
+from open_webui.retrieval.loaders.pool import LOADER_CLIENT_POOL
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.gc import periodic_vector_db_gc
+from open_webui.utils.knowledge_reindex import periodic_knowledge_file_reconcile
+
+from open_webui.internal.db import (
+    Session,
+    async_engine,
+    engine,
+    is_sqlite_performance_profile,
+    optimize_sqlite,
+    periodic_sqlite_checkpoint,
+)
 
 from open_webui.models.functions import Functions
 from open_webui.models.models import Models
@@ -468,8 +483,15 @@ from open_webui.env import (
     RESET_CONFIG_ON_START,
     ENABLE_VERSION_UPDATE_CHECK,
     ENABLE_OTEL,
+    ENABLE_PROMETHEUS_METRICS,
     EXTERNAL_PWA_MANIFEST_URL,
     AIOHTTP_CLIENT_SESSION_SSL,
+    VECTOR_DB_GC_INTERVAL,
+    DATABASE_SQLITE_CHECKPOINT_INTERVAL,
+    KNOWLEDGE_FILE_RECONCILE_INTERVAL,
+    EXTRACTION_CACHE_TTL,
+    EVENT_LOOP_LAG_SAMPLE_INTERVAL,
+    EVENT_LOOP_BLOCKING_THRESHOLD_MS,
 )
 
 
@@ -493,11 +515,19 @@ from open_webui.utils.auth import (
     decode_token,
     get_admin_user,
     get_verified_user,
+    periodic_user_last_active_flush,
 )
 from open_webui.utils.plugin import install_tool_and_function_dependencies
 from open_webui.utils.oauth import OAuthManager
-from open_webui.utils.security_headers import SecurityHeadersMiddleware
+from open_webui.utils.asgi import RequestPipelineMiddleware
+from open_webui.utils.event_loop import monitor_event_loop, shutdown_blocking_executor
+from open_webui.utils.telemetry.instruments import (
+    get_llm_attributes,
+    observe_token_stream,
+)
+from open_webui.utils.security_headers import set_security_headers
 from open_webui.utils.redis import get_redis_connection
+from open_webui.utils.serialization import ORJSONResponse
 
 from open_webui.tasks import (
     redis_task_command_listener,
@@ -588,8 +618,33 @@ async def lifespan(app: FastAPI):
         limiter = anyio.to_thread.current_default_thread_limiter()
         limiter.total_tokens = THREAD_POOL_SIZE
 
+    if EVENT_LOOP_LAG_SAMPLE_INTERVAL > 0 or EVENT_LOOP_BLOCKING_THRESHOLD_MS > 0:
+        app.state.event_loop_monitor = asyncio.create_task(monitor_event_loop())
+
     asyncio.create_task(periodic_usage_pool_cleanup())
 
+    app.state.user_last_active_flush = asyncio.create_task(
+        periodic_user_last_active_flush()
+    )
+
+    if is_sqlite_performance_profile() and DATABASE_SQLITE_CHECKPOINT_INTERVAL > 0:
+        app.state.sqlite_checkpoint = asyncio.create_task(periodic_sqlite_checkpoint())
+
+    if VECTOR_DB_GC_INTERVAL > 0:
+        app.state.vector_db_gc = asyncio.create_task(
+            periodic_vector_db_gc(VECTOR_DB_CLIENT, app.state.redis)
+        )
+
+    if KNOWLEDGE_FILE_RECONCILE_INTERVAL > 0:
+        app.state.knowledge_file_reconcile = asyncio.create_task(
+            periodic_knowledge_file_reconcile(app.state.redis)
+        )
+
+    if EXTRACTION_CACHE is not None and EXTRACTION_CACHE_TTL > 0:
+        app.state.extraction_cache_expiry = asyncio.create_task(
+            periodic_extraction_cache_expiry()
+        )
+
     if app.state.config.ENABLE_BASE_MODELS_CACHE:
         await get_all_models(
             Request(
@@ -616,6 +671,38 @@ async def lifespan(app: FastAPI):
     if hasattr(app.state, "redis_task_command_listener"):
         app.state.redis_task_command_listener.cancel()
 
+    if hasattr(app.state, "vector_db_gc"):
+        app.state.vector_db_gc.cancel()
+
+    if hasattr(app.state, "knowledge_file_reconcile"):
+        app.state.knowledge_file_reconcile.cancel()
+
+    if hasattr(app.state, "extraction_cache_expiry"):
+        app.state.extraction_cache_expiry.cancel()
+
+    app.state.user_last_active_flush.cancel()
+    with suppress(asyncio.CancelledError):
+        await app.state.user_last_active_flush
+
+    if hasattr(app.state, "event_loop_monitor"):
+        app.state.event_loop_monitor.cancel()
+
+    await asyncio.to_thread(LOADER_CLIENT_POOL.close)
+    shutdown_pdf_executor()
+    shutdown_blocking_executor()
+
+    if hasattr(app.state, "sqlite_checkpoint"):
+        app.state.sqlite_checkpoint.cancel()
+
+    if is_sqlite_performance_profile():
+        try:
+            await asyncio.to_thread(optimize_sqlite)
+        except Exception as e:
+            log.warning(f"SQLite optimize failed: {e}")
+
+    if async_engine is not None:
+        await async_engine.dispose()
+
 
 app = FastAPI(
     title="Open WebUI",
@@ -623,6 +710,7 @@ app = FastAPI(
     openapi_url="/openapi.json" if ENV == "dev" else None,
     redoc_url=None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 oauth_manager = OAuthManager(app)
@@ -647,7 +735,7 @@ app.state.LICENSE_METADATA = None
 #
 ########################################
 
-if ENABLE_OTEL:
+if ENABLE_OTEL or ENABLE_PROMETHEUS_METRICS:
     from open_webui.utils.telemetry.setup import setup as setup_opentelemetry
 
     setup_opentelemetry(app=app, db_engine=engine)
@@ -1178,58 +1266,7 @@ app.state.config.AUTOCOMPLETE_GENERATION_INPUT_MAX_LENGTH = (
 app.state.MODELS = {}
 
 
-class RedirectMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        # Check if the request is a GET request
-        if request.method == "GET":
-            path = request.url.path
-            query_params = dict(parse_qs(urlparse(str(request.url)).query))
-
-            # Check for the specific watch path and the presence of 'v' parameter
-            if path.endswith("/watch") and "v" in query_params:
-                # Extract the first 'v' parameter
-                video_id = query_params["v"][0]
-                encoded_video_id = urlencode({"youtube": video_id})
-                redirect_url = f"/?{encoded_video_id}"
-                return RedirectResponse(url=redirect_url)
-
-        # Proceed with the normal flow of other requests
-        response = await call_next(request)
-        return response
-
-
-# Add the middleware to the app
-if ENABLE_COMPRESSION_MIDDLEWARE:
-    app.add_middleware(CompressMiddleware)
-
-app.add_middleware(RedirectMiddleware)
-app.add_middleware(SecurityHeadersMiddleware)
-
-
-@app.middleware("http")
-async def commit_session_after_request(request: Request, call_next):
-    response = await call_next(request)
-    # log.debug("Commit session after request")
-    Session.commit()
-    return response
-
-
-@app.middleware("http")
-async def check_url(request: Request, call_next):
-    start_time = int(time.time())
-    request.state.token = get_http_authorization_cred(
-        request.headers.get("Authorization")
-    )
-
-    request.state.enable_api_key = app.state.config.ENABLE_API_KEY
-    response = await call_next(request)
-    process_time = int(time.time()) - start_time
-    response.headers["X-Process-Time"] = str(process_time)
-    return response
-
-
-@app.middleware("http")
-async def inspect_websocket(request: Request, call_next):
+def reject_invalid_websocket_upgrade(request: Request):
     if (
         "/ws/socket.io" in request.url.path
         and request.query_params.get("transport") == "websocket"
@@ -1243,7 +1280,48 @@ async def inspect_websocket(request: Request, call_next):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={"detail": "Invalid WebSocket upgrade request"},
             )
-    return await call_next(request)
+
+
+def redirect_youtube_watch(request: Request):
+    # Redirect YouTube watch links (e.g. shared to /watch?v=...) to the chat
+    if request.method == "GET" and request.url.path.endswith("/watch"):
+        video_id = request.query_params.get("v")
+        if video_id:
+            return RedirectResponse(url=f"/?{urlencode({'youtube': video_id})}")
+
+
+def set_request_state(request: Request):
+    request.state.token = get_http_authorization_cred(
+        request.headers.get("Authorization")
+    )
+    request.state.enable_api_key = app.state.config.ENABLE_API_KEY
+
+
+SECURITY_HEADERS = set_security_headers()
+
+
+def add_security_headers(request: Request, headers: MutableHeaders):
+    headers.update(SECURITY_HEADERS)
+
+
+def commit_session_after_request(request: Request):
+    Session.commit()
+
+
+# Add the middleware to the app
+if ENABLE_COMPRESSION_MIDDLEWARE:
+    app.add_middleware(CompressMiddleware)
+
+app.add_middleware(
+    RequestPipelineMiddleware,
+    request_hooks=[
+        reject_invalid_websocket_upgrade,
+        set_request_state,
+        redirect_youtube_watch,
+    ],
+    response_hooks=[add_security_headers],
+    finish_hooks=[commit_session_after_request],
+)
 
 
 app.add_middleware(
@@ -1531,7 +1609,9 @@ async def chat_completion(
 
         if metadata.get("chat_id") and (user and user.role != "admin"):
             if metadata["chat_id"] != "local":
-                chat = Chats.get_chat_by_id_and_user_id(metadata["chat_id"], user.id)
+                chat = await Chats.get_chat_by_id_and_user_id_async(
+                    metadata["chat_id"], user.id
+                )
                 if chat is None:
                     raise HTTPException(
                         status_code=status.HTTP_404_NOT_FOUND,
@@ -1554,10 +1634,16 @@ async def chat_completion(
                 request, form_data, user, metadata, model
             )
 
+            start = time.perf_counter()
             response = await chat_completion_handler(request, form_data, user)
+            if isinstance(response, StreamingResponse):
+                response.body_iterator = observe_token_stream(
+                    response.body_iterator, get_llm_attributes(model_id, model), start
+                )
+
             if metadata.get("chat_id") and metadata.get("message_id"):
                 try:
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    await Chats.upsert_message_to_chat_by_id_and_message_id_async(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
@@ -1584,7 +1670,7 @@ async def chat_completion(
             if metadata.get("chat_id") and metadata.get("message_id"):
                 # Update the chat message with the error
                 try:
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    await Chats.upsert_message_to_chat_by_id_and_message_id_async(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
@@ -1685,7 +1771,7 @@ async def list_tasks_endpoint(request: Request, user=Depends(get_verified_user))
 async def list_tasks_by_chat_id_endpoint(
     request: Request, chat_id: str, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id(chat_id)
+    chat = await Chats.get_chat_by_id_async(chat_id)
     if chat is None or chat.user_id != user.id:
         return {"task_ids": []}
 
@@ -1726,7 +1812,7 @@ async def get_app_config(request: Request):
                 detail="Invalid token",
             )
         if data is not None and "id" in data:
-            user = Users.get_user_by_id(data["id"])
+            user = await Users.get_user_by_id_async(data["id"])
 
     user_count = Users.get_num_users()
     onboarding = False
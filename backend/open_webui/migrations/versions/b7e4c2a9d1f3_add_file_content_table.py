@@ -0,0 +1,101 @@
+"""Add file_content table
+
+Revision ID: b7e4c2a9d1f3
+Revises: merge_oauth_pii_001
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.sql import table, select, update
+
+from open_webui.migrations.util import get_existing_tables
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e4c2a9d1f3"
+down_revision: Union[str, None] = "merge_oauth_pii_001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 100
+
+file_table = table(
+    "file",
+    sa.Column("id", sa.String()),
+    sa.Column("data", sa.JSON()),
+)
+
+file_content_table = table(
+    "file_content",
+    sa.Column("id", sa.String()),
+    sa.Column("content", sa.Text()),
+    sa.Column("page_content", sa.JSON()),
+)
+
+
+def upgrade() -> None:
+    if "file_content" not in get_existing_tables():
+        op.create_table(
+            "file_content",
+            sa.Column("id", sa.String(), nullable=False),
+            sa.Column("content", sa.Text(), nullable=True),
+            sa.Column("page_content", sa.JSON(), nullable=True),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    # Move the extracted text out of file.data, a batch of files at a time
+    connection = op.get_bind()
+    ids = connection.execute(select(file_table.c.id)).scalars().all()
+    for start in range(0, len(ids), BATCH_SIZE):
+        rows = connection.execute(
+            select(file_table.c.id, file_table.c.data).where(
+                file_table.c.id.in_(ids[start : start + BATCH_SIZE])
+            )
+        ).all()
+        for row in rows:
+            data = row.data if isinstance(row.data, dict) else None
+            if not data or ("content" not in data and "page_content" not in data):
+                continue
+
+            content = data.pop("content", None)
+            if isinstance(content, str):
+                content = content.replace("\x00", "")
+            connection.execute(
+                file_content_table.insert().values(
+                    id=row.id,
+                    content=content,
+                    page_content=data.pop("page_content", None),
+                )
+            )
+            connection.execute(
+                update(file_table).where(file_table.c.id == row.id).values(data=data)
+            )
+
+
+def downgrade() -> None:
+    connection = op.get_bind()
+    rows = connection.execute(
+        select(
+            file_content_table.c.id,
+            file_content_table.c.content,
+            file_content_table.c.page_content,
+        )
+    )
+    for row in rows.all():
+        data = connection.execute(
+            select(file_table.c.data).where(file_table.c.id == row.id)
+        ).scalar()
+        if not isinstance(data, dict):
+            data = {}
+        if row.content is not None:
+            data["content"] = row.content
+        if row.page_content is not None:
+            data["page_content"] = row.page_content
+        connection.execute(
+            update(file_table).where(file_table.c.id == row.id).values(data=data)
+        )
+
+    op.drop_table("file_content")
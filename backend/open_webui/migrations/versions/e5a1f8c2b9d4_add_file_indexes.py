@@ -0,0 +1,40 @@
+"""Add file listing and filename search indexes
+
+Revision ID: e5a1f8c2b9d4
+Revises: b7e4c2a9d1f3
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "e5a1f8c2b9d4"
+down_revision = "b7e4c2a9d1f3"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset pagination of GET /files/ (ORDER BY created_at DESC, id DESC)
+    op.create_index("file_created_at_idx", "file", ["created_at"])
+    op.create_index("file_user_id_created_at_idx", "file", ["user_id", "created_at"])
+
+    # Filename search (lower(filename) LIKE 'prefix%'). Postgres only uses a
+    # btree index for LIKE with text_pattern_ops unless the collation is "C".
+    lower_filename = "lower(filename)"
+    if op.get_bind().dialect.name == "postgresql":
+        lower_filename += " text_pattern_ops"
+    op.create_index("file_lower_filename_idx", "file", [sa.text(lower_filename)])
+    op.create_index(
+        "file_user_id_lower_filename_idx",
+        "file",
+        ["user_id", sa.text(lower_filename)],
+    )
+
+
+def downgrade():
+    op.drop_index("file_user_id_lower_filename_idx", table_name="file")
+    op.drop_index("file_lower_filename_idx", table_name="file")
+    op.drop_index("file_user_id_created_at_idx", table_name="file")
+    op.drop_index("file_created_at_idx", table_name="file")
@@ -1,10 +1,11 @@
+import asyncio
 import logging
 import json
 import time
 import uuid
-from typing import Optional
+from typing import Iterator, Optional
 
-from open_webui.internal.db import Base, get_db
+from open_webui.internal.db import Base, get_async_db, get_db, has_async_db
 from open_webui.models.tags import TagModel, Tag, Tags
 from open_webui.models.folders import Folders
 from open_webui.env import SRC_LOG_LEVELS
@@ -122,6 +123,61 @@ class ChatTitleIdResponse(BaseModel):
     created_at: int
 
 
+def upsert_message_to_chat(chat: dict, message_id: str, message: dict) -> dict:
+    # Sanitize message content for null characters before upserting
+    if isinstance(message.get("content"), str):
+        message["content"] = message["content"].replace("\x00", "")
+
+    history = chat.get("history", {})
+
+    if message_id in history.get("messages", {}):
+        history["messages"][message_id] = {
+            **history["messages"][message_id],
+            **message,
+        }
+    else:
+        history["messages"][message_id] = message
+
+    history["currentId"] = message_id
+
+    chat["history"] = history
+    return chat
+
+
+def add_message_status_to_chat(chat: dict, message_id: str, status: dict) -> dict:
+    history = chat.get("history", {})
+
+    if message_id in history.get("messages", {}):
+        status_history = history["messages"][message_id].get("statusHistory", [])
+        status_history.append(status)
+        history["messages"][message_id]["statusHistory"] = status_history
+
+    chat["history"] = history
+    return chat
+
+
+def new_imported_chat(user_id: str, form_data: ChatImportForm) -> ChatModel:
+    return ChatModel(
+        **{
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "title": (
+                form_data.chat["title"] if "title" in form_data.chat else "New Chat"
+            ),
+            "chat": form_data.chat,
+            "meta": form_data.meta,
+            "pinned": form_data.pinned,
+            "folder_id": form_data.folder_id,
+            "created_at": (
+                form_data.created_at if form_data.created_at else int(time.time())
+            ),
+            "updated_at": (
+                form_data.updated_at if form_data.updated_at else int(time.time())
+            ),
+        }
+    )
+
+
 class ChatTable:
     def insert_new_chat(self, user_id: str, form_data: ChatForm) -> Optional[ChatModel]:
         with get_db() as db:
@@ -152,32 +208,7 @@ class ChatTable:
         self, user_id: str, form_data: ChatImportForm
     ) -> Optional[ChatModel]:
         with get_db() as db:
-            id = str(uuid.uuid4())
-            chat = ChatModel(
-                **{
-                    "id": id,
-                    "user_id": user_id,
-                    "title": (
-                        form_data.chat["title"]
-                        if "title" in form_data.chat
-                        else "New Chat"
-                    ),
-                    "chat": form_data.chat,
-                    "meta": form_data.meta,
-                    "pinned": form_data.pinned,
-                    "folder_id": form_data.folder_id,
-                    "created_at": (
-                        form_data.created_at
-                        if form_data.created_at
-                        else int(time.time())
-                    ),
-                    "updated_at": (
-                        form_data.updated_at
-                        if form_data.updated_at
-                        else int(time.time())
-                    ),
-                }
-            )
+            chat = new_imported_chat(user_id, form_data)
 
             result = Chat(**chat.model_dump())
             db.add(result)
@@ -185,6 +216,21 @@ class ChatTable:
             db.refresh(result)
             return ChatModel.model_validate(result) if result else None
 
+    def import_chats(
+        self, user_id: str, forms: list[ChatImportForm]
+    ) -> list[ChatModel]:
+        """
+        Inserts the chats with a single statement and transaction.
+        """
+        chats = [new_imported_chat(user_id, form_data) for form_data in forms]
+        if chats:
+            with get_db() as db:
+                db.execute(
+                    Chat.__table__.insert(), [chat.model_dump() for chat in chats]
+                )
+                db.commit()
+        return chats
+
     def update_chat_by_id(self, id: str, chat: dict) -> Optional[ChatModel]:
         try:
             with get_db() as db:
@@ -199,6 +245,22 @@ class ChatTable:
         except Exception:
             return None
 
+    async def update_chat_by_id_async(self, id: str, chat: dict) -> Optional[ChatModel]:
+        if not has_async_db():
+            return await asyncio.to_thread(self.update_chat_by_id, id, chat)
+        try:
+            async with get_async_db() as db:
+                chat_item = await db.get(Chat, id)
+                chat_item.chat = chat
+                chat_item.title = chat["title"] if "title" in chat else "New Chat"
+                chat_item.updated_at = int(time.time())
+                await db.commit()
+                await db.refresh(chat_item)
+
+                return ChatModel.model_validate(chat_item)
+        except Exception:
+            return None
+
     def update_chat_title_by_id(self, id: str, title: str) -> Optional[ChatModel]:
         chat = self.get_chat_by_id(id)
         if chat is None:
@@ -243,6 +305,13 @@ class ChatTable:
 
         return chat.chat.get("history", {}).get("messages", {}) or {}
 
+    async def get_messages_by_chat_id_async(self, id: str) -> Optional[dict]:
+        chat = await self.get_chat_by_id_async(id)
+        if chat is None:
+            return None
+
+        return chat.chat.get("history", {}).get("messages", {}) or {}
+
     def get_message_by_id_and_message_id(
         self, id: str, message_id: str
     ) -> Optional[dict]:
@@ -252,6 +321,15 @@ class ChatTable:
 
         return chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
 
+    async def get_message_by_id_and_message_id_async(
+        self, id: str, message_id: str
+    ) -> Optional[dict]:
+        chat = await self.get_chat_by_id_async(id)
+        if chat is None:
+            return None
+
+        return chat.chat.get("history", {}).get("messages", {}).get(message_id, {})
+
     def upsert_message_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, message: dict
     ) -> Optional[ChatModel]:
@@ -259,25 +337,20 @@ class ChatTable:
         if chat is None:
             return None
 
-        # Sanitize message content for null characters before upserting
-        if isinstance(message.get("content"), str):
-            message["content"] = message["content"].replace("\x00", "")
-
-        chat = chat.chat
-        history = chat.get("history", {})
-
-        if message_id in history.get("messages", {}):
-            history["messages"][message_id] = {
-                **history["messages"][message_id],
-                **message,
-            }
-        else:
-            history["messages"][message_id] = message
+        return self.update_chat_by_id(
+            id, upsert_message_to_chat(chat.chat, message_id, message)
+        )
 
-        history["currentId"] = message_id
+    async def upsert_message_to_chat_by_id_and_message_id_async(
+        self, id: str, message_id: str, message: dict
+    ) -> Optional[ChatModel]:
+        chat = await self.get_chat_by_id_async(id)
+        if chat is None:
+            return None
 
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+        return await self.update_chat_by_id_async(
+            id, upsert_message_to_chat(chat.chat, message_id, message)
+        )
 
     def add_message_status_to_chat_by_id_and_message_id(
         self, id: str, message_id: str, status: dict
@@ -286,16 +359,20 @@ class ChatTable:
         if chat is None:
             return None
 
-        chat = chat.chat
-        history = chat.get("history", {})
+        return self.update_chat_by_id(
+            id, add_message_status_to_chat(chat.chat, message_id, status)
+        )
 
-        if message_id in history.get("messages", {}):
-            status_history = history["messages"][message_id].get("statusHistory", [])
-            status_history.append(status)
-            history["messages"][message_id]["statusHistory"] = status_history
+    async def add_message_status_to_chat_by_id_and_message_id_async(
+        self, id: str, message_id: str, status: dict
+    ) -> Optional[ChatModel]:
+        chat = await self.get_chat_by_id_async(id)
+        if chat is None:
+            return None
 
-        chat["history"] = history
-        return self.update_chat_by_id(id, chat)
+        return await self.update_chat_by_id_async(
+            id, add_message_status_to_chat(chat.chat, message_id, status)
+        )
 
     def insert_shared_chat_by_chat_id(self, chat_id: str) -> Optional[ChatModel]:
         with get_db() as db:
@@ -547,6 +624,16 @@ class ChatTable:
         except Exception:
             return None
 
+    async def get_chat_by_id_async(self, id: str) -> Optional[ChatModel]:
+        if not has_async_db():
+            return await asyncio.to_thread(self.get_chat_by_id, id)
+        try:
+            async with get_async_db() as db:
+                chat = await db.get(Chat, id)
+                return ChatModel.model_validate(chat)
+        except Exception:
+            return None
+
     def get_chat_by_share_id(self, id: str) -> Optional[ChatModel]:
         try:
             with get_db() as db:
@@ -569,6 +656,20 @@ class ChatTable:
         except Exception:
             return None
 
+    async def get_chat_by_id_and_user_id_async(
+        self, id: str, user_id: str
+    ) -> Optional[ChatModel]:
+        if not has_async_db():
+            return await asyncio.to_thread(self.get_chat_by_id_and_user_id, id, user_id)
+        try:
+            async with get_async_db() as db:
+                chat = await db.scalar(
+                    select(Chat).filter_by(id=id, user_id=user_id).limit(1)
+                )
+                return ChatModel.model_validate(chat)
+        except Exception:
+            return None
+
     def get_chats(self, skip: int = 0, limit: int = 50) -> list[ChatModel]:
         with get_db() as db:
             all_chats = (
@@ -578,6 +679,24 @@ class ChatTable:
             )
             return [ChatModel.model_validate(chat) for chat in all_chats]
 
+    def iter_chats(
+        self, user_id: Optional[str] = None, batch_size: int = 100
+    ) -> Iterator[ChatModel]:
+        """
+        Yields the chats (of a user) newest first, fetching batch_size rows at a
+        time through a server-side cursor instead of loading them all.
+        """
+        with get_db() as db:
+            query = select(Chat)
+            if user_id is not None:
+                query = query.where(Chat.user_id == user_id)
+            query = query.order_by(Chat.updated_at.desc()).execution_options(
+                yield_per=batch_size
+            )
+
+            for chat in db.scalars(query):
+                yield ChatModel.model_validate(chat)
+
     def get_chats_by_user_id(self, user_id: str) -> list[ChatModel]:
         with get_db() as db:
             all_chats = (
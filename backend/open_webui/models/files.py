@@ -1,11 +1,27 @@
+import asyncio
+import base64
+import json
 import logging
 import time
+from fnmatch import fnmatch
 from typing import Optional
 
-from open_webui.internal.db import Base, JSONField, get_db
+from open_webui.internal.db import Base, JSONField, get_async_db, get_db, has_async_db
 from open_webui.env import SRC_LOG_LEVELS
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, JSON
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    Index,
+    String,
+    Text,
+    JSON,
+    delete,
+    func,
+    select,
+    tuple_,
+    update,
+)
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -32,6 +48,78 @@ class File(Base):
     created_at = Column(BigInteger)
     updated_at = Column(BigInteger)
 
+    __table_args__ = (
+        # ORDER BY created_at DESC, id DESC (keyset pagination)
+        Index("file_created_at_idx", "created_at"),
+        Index("file_user_id_created_at_idx", "user_id", "created_at"),
+        # WHERE lower(filename) LIKE ...
+        Index("file_lower_filename_idx", func.lower(filename)),
+        Index("file_user_id_lower_filename_idx", "user_id", func.lower(filename)),
+    )
+
+
+# Extracted text of a file. It is read through FileModel.data like before, but
+# kept out of file.data so that status, PII and extraction updates of file.data
+# don't rewrite (and list queries don't load) megabytes of text.
+class FileContent(Base):
+    __tablename__ = "file_content"
+    id = Column(String, primary_key=True)
+
+    content = Column(Text, nullable=True)
+    page_content = Column(JSON, nullable=True)
+
+
+FILE_CONTENT_KEYS = ("content", "page_content")
+
+
+def split_file_content(data: Optional[dict]) -> tuple[dict, dict]:
+    """
+    Splits file data into the keys stored in file.data and the ones stored in
+    the file_content table.
+    """
+    data = dict(data or {})
+    content = {key: data.pop(key) for key in FILE_CONTENT_KEYS if key in data}
+    if isinstance(content.get("content"), str):
+        # Postgres text columns cannot store NUL characters
+        content["content"] = content["content"].replace("\x00", "")
+    return data, content
+
+
+def encode_cursor(values: list) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str, types: tuple[type, ...]) -> list:
+    """
+    Decodes a cursor whose values have the given types, in order. Raises
+    ValueError for cursors not created by encode_cursor for the same query.
+    """
+    values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    if not (
+        isinstance(values, list)
+        and len(values) == len(types)
+        and all(type(value) is value_type for value, value_type in zip(values, types))
+    ):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return values
+
+
+def filename_pattern_to_like(pattern: str) -> Optional[str]:
+    """
+    Translates a fnmatch pattern to a LIKE pattern escaped with a backslash, or
+    returns None if it has character sets ([...]), which LIKE cannot express.
+    """
+    if "[" in pattern:
+        return None
+    return "".join(
+        (
+            "%"
+            if char == "*"
+            else "_" if char == "?" else f"\\{char}" if char in "%_\\" else char
+        )
+        for char in pattern
+    )
+
 
 class FileModel(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -98,11 +186,58 @@ class FileForm(BaseModel):
 
 
 class FilesTable:
+    def _to_file_model(
+        self, file: File, file_content: Optional[FileContent] = None
+    ) -> FileModel:
+        model = FileModel.model_validate(file)
+        if file_content is not None:
+            model.data = {
+                **(model.data or {}),
+                **{
+                    key: getattr(file_content, key)
+                    for key in FILE_CONTENT_KEYS
+                    if getattr(file_content, key) is not None
+                },
+            }
+        return model
+
+    def _get_files(self, query, include_content: bool) -> list[FileModel]:
+        with get_db() as db:
+            if not include_content:
+                return [self._to_file_model(file) for file in db.scalars(query)]
+
+            query = query.add_columns(FileContent).outerjoin(
+                FileContent, FileContent.id == File.id
+            )
+            return [
+                self._to_file_model(file, file_content)
+                for file, file_content in db.execute(query)
+            ]
+
+    def _get_file_contents(self, db, ids: list[str]) -> dict[str, FileContent]:
+        contents = {}
+        for start in range(0, len(ids), 500):
+            for file_content in db.scalars(
+                select(FileContent).where(FileContent.id.in_(ids[start : start + 500]))
+            ):
+                contents[file_content.id] = file_content
+        return contents
+
+    def _set_file_content(self, db, id: str, content: dict):
+        # Update without loading the previous content, insert if there is none
+        result = db.execute(
+            update(FileContent).where(FileContent.id == id).values(**content)
+        )
+        if result.rowcount == 0:
+            db.add(FileContent(id=id, **content))
+
     def insert_new_file(self, user_id: str, form_data: FileForm) -> Optional[FileModel]:
         with get_db() as db:
+            data, content = split_file_content(form_data.data)
             file = FileModel(
                 **{
                     **form_data.model_dump(),
+                    "data": data,
                     "user_id": user_id,
                     "created_at": int(time.time()),
                     "updated_at": int(time.time()),
@@ -112,24 +247,61 @@ class FilesTable:
             try:
                 result = File(**file.model_dump())
                 db.add(result)
+                if content:
+                    db.add(FileContent(id=file.id, **content))
                 db.commit()
                 db.refresh(result)
                 if result:
-                    return FileModel.model_validate(result)
+                    file = FileModel.model_validate(result)
+                    file.data = {**(file.data or {}), **content}
+                    return file
                 else:
                     return None
             except Exception as e:
                 log.exception(f"Error inserting a new file: {e}")
                 return None
 
-    def get_file_by_id(self, id: str) -> Optional[FileModel]:
+    def get_file_by_id(
+        self, id: str, include_content: bool = True
+    ) -> Optional[FileModel]:
         with get_db() as db:
             try:
                 file = db.get(File, id)
-                return FileModel.model_validate(file)
+                file_content = db.get(FileContent, id) if include_content else None
+                return self._to_file_model(file, file_content)
             except Exception:
                 return None
 
+    async def get_file_by_id_async(
+        self, id: str, include_content: bool = True
+    ) -> Optional[FileModel]:
+        if not has_async_db():
+            return await asyncio.to_thread(self.get_file_by_id, id, include_content)
+        try:
+            async with get_async_db() as db:
+                file = await db.get(File, id)
+                file_content = (
+                    await db.get(FileContent, id) if include_content else None
+                )
+                return self._to_file_model(file, file_content)
+        except Exception:
+            return None
+
+    def get_file_content_by_id(self, id: str) -> Optional[str]:
+        """
+        Returns the extracted text of a file, without loading its page content.
+        """
+        with get_db() as db:
+            return db.scalar(select(FileContent.content).where(FileContent.id == id))
+
+    async def get_file_content_by_id_async(self, id: str) -> Optional[str]:
+        if not has_async_db():
+            return await asyncio.to_thread(self.get_file_content_by_id, id)
+        async with get_async_db() as db:
+            return await db.scalar(
+                select(FileContent.content).where(FileContent.id == id)
+            )
+
     def get_file_metadata_by_id(self, id: str) -> Optional[FileMetadataResponse]:
         with get_db() as db:
             try:
@@ -143,12 +315,127 @@ class FilesTable:
             except Exception:
                 return None
 
-    def get_files(self) -> list[FileModel]:
+    def get_files(self, include_content: bool = True) -> list[FileModel]:
+        return self._get_files(select(File), include_content)
+
+    def get_files_page(
+        self,
+        user_id: Optional[str] = None,
+        include_content: bool = True,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[FileModel], Optional[str]]:
+        """
+        Lists the files (of a user) newest first. With a limit, also returns the
+        cursor of the next page, None on the last one.
+        """
+        query = select(File).order_by(File.created_at.desc(), File.id.desc())
+        if user_id is not None:
+            query = query.where(File.user_id == user_id)
+        if cursor:
+            created_at, id = decode_cursor(cursor, (int, str))
+            query = query.where(
+                tuple_(File.created_at, File.id) < tuple_(created_at, id)
+            )
+        if limit:
+            query = query.limit(limit)
+
+        files = self._get_files(query, include_content)
+        next_cursor = (
+            encode_cursor([files[-1].created_at, files[-1].id])
+            if limit and len(files) == limit
+            else None
+        )
+        return files, next_cursor
+
+    def search_files_by_filename(
+        self,
+        pattern: str,
+        user_id: Optional[str] = None,
+        include_content: bool = True,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> tuple[list[FileModel], Optional[str]]:
+        """
+        Finds the files (of a user) whose lowercase filename matches the
+        lowercase fnmatch pattern, ordered by filename. The pattern is evaluated
+        with LIKE, or with fnmatch on the rows sharing its literal prefix if it
+        has character sets. With a limit, also returns the next page's cursor.
+        """
+        pattern = pattern.lower()
+        like = filename_pattern_to_like(pattern)
+        prefix = next(
+            (pattern[:i] for i, char in enumerate(pattern) if char in "*?["), pattern
+        )
+
+        with get_db() as db:
+            is_sqlite = db.get_bind().dialect.name == "sqlite"
+            if is_sqlite:
+                # SQLite's lower() only folds ASCII letters, py_lower is str.lower
+                key = func.py_lower(File.filename)
+            else:
+                key = func.lower(File.filename)
+
+            query = select(File, key).order_by(key, File.id)
+            if user_id is not None:
+                query = query.where(File.user_id == user_id)
+            if like is not None:
+                query = query.where(key.like(like, escape="\\"))
+                if limit:
+                    query = query.limit(limit)
+            elif prefix:
+                query = query.where(
+                    key.like(f"{filename_pattern_to_like(prefix)}%", escape="\\")
+                )
+            if cursor:
+                query = query.where(
+                    tuple_(key, File.id) > tuple_(*decode_cursor(cursor, (str, str)))
+                )
+
+            if (
+                is_sqlite
+                and prefix
+                and prefix.isascii()
+                and not set(prefix) & {"i", "k"}
+            ):
+                # SQLite cannot use the lower(filename) index for LIKE, but can
+                # for the equivalent (binary collation) range of the prefix.
+                # Only non-ASCII letters are lowered differently by lower(), and
+                # of those only İ and the Kelvin sign lower to ASCII (i and k).
+                lower = func.lower(File.filename)
+                query = query.where(lower >= prefix)
+                query = query.where(lower < prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+            matches = []
+            for file, filename in db.execute(query.execution_options(yield_per=500)):
+                if like is None and not fnmatch(filename, pattern):
+                    continue
+                matches.append((file, filename))
+                if limit and len(matches) == limit:
+                    break
+
+            contents = (
+                self._get_file_contents(db, [file.id for file, _ in matches])
+                if include_content
+                else {}
+            )
+
+        files = [
+            self._to_file_model(file, contents.get(file.id)) for file, _ in matches
+        ]
+        next_cursor = (
+            encode_cursor([matches[-1][1], matches[-1][0].id])
+            if limit and len(matches) == limit
+            else None
+        )
+        return files, next_cursor
+
+    def get_file_ids(self) -> list[str]:
         with get_db() as db:
-            return [FileModel.model_validate(file) for file in db.query(File).all()]
+            return [id for (id,) in db.query(File.id).all()]
 
     def check_access_by_user_id(self, id, user_id, permission="write") -> bool:
-        file = self.get_file_by_id(id)
+        file = self.get_file_by_id(id, include_content=False)
         if not file:
             return False
         if file.user_id == user_id:
@@ -156,37 +443,40 @@ class FilesTable:
         # Implement additional access control logic here as needed
         return False
 
-    def get_files_by_ids(self, ids: list[str]) -> list[FileModel]:
-        with get_db() as db:
-            return [
-                FileModel.model_validate(file)
-                for file in db.query(File)
-                .filter(File.id.in_(ids))
-                .order_by(File.updated_at.desc())
-                .all()
-            ]
+    def get_files_by_ids(
+        self, ids: list[str], include_content: bool = True
+    ) -> list[FileModel]:
+        return self._get_files(
+            select(File).where(File.id.in_(ids)).order_by(File.updated_at.desc()),
+            include_content,
+        )
 
     def get_file_metadatas_by_ids(self, ids: list[str]) -> list[FileMetadataResponse]:
+        ids = list(dict.fromkeys(ids))
+        files = []
         with get_db() as db:
-            return [
-                FileMetadataResponse(
-                    id=file.id,
-                    meta=file.meta,
-                    created_at=file.created_at,
-                    updated_at=file.updated_at,
+            # Only the metadata columns, in chunks to stay below the bind
+            # parameter limits when listing all knowledge bases at once
+            for start in range(0, len(ids), 500):
+                files.extend(
+                    FileMetadataResponse(
+                        id=id, meta=meta, created_at=created_at, updated_at=updated_at
+                    )
+                    for id, meta, created_at, updated_at in db.execute(
+                        select(
+                            File.id, File.meta, File.created_at, File.updated_at
+                        ).where(File.id.in_(ids[start : start + 500]))
+                    )
                 )
-                for file in db.query(File)
-                .filter(File.id.in_(ids))
-                .order_by(File.updated_at.desc())
-                .all()
-            ]
+        files.sort(key=lambda file: file.updated_at, reverse=True)
+        return files
 
-    def get_files_by_user_id(self, user_id: str) -> list[FileModel]:
-        with get_db() as db:
-            return [
-                FileModel.model_validate(file)
-                for file in db.query(File).filter_by(user_id=user_id).all()
-            ]
+    def get_files_by_user_id(
+        self, user_id: str, include_content: bool = True
+    ) -> list[FileModel]:
+        return self._get_files(
+            select(File).where(File.user_id == user_id), include_content
+        )
 
     def update_file_hash_by_id(self, id: str, hash: str) -> Optional[FileModel]:
         with get_db() as db:
@@ -200,12 +490,26 @@ class FilesTable:
                 return None
 
     def update_file_data_by_id(self, id: str, data: dict) -> Optional[FileModel]:
+        """
+        Merges data into the file data. The returned file only includes the
+        content if it was part of the update.
+        """
         with get_db() as db:
             try:
+                data, content = split_file_content(data)
                 file = db.query(File).filter_by(id=id).first()
-                file.data = {**(file.data if file.data else {}), **data}
+                if file is None:
+                    return None
+
+                if data:
+                    file.data = {**(file.data if file.data else {}), **data}
+                if content:
+                    self._set_file_content(db, id, content)
                 db.commit()
-                return FileModel.model_validate(file)
+
+                file = FileModel.model_validate(file)
+                file.data = {**(file.data or {}), **content}
+                return file
             except Exception as e:
                 log.exception(f"Error updating file data: {e}")
                 return None
@@ -224,6 +528,7 @@ class FilesTable:
         with get_db() as db:
             try:
                 db.query(File).filter_by(id=id).delete()
+                db.execute(delete(FileContent).where(FileContent.id == id))
                 db.commit()
 
                 return True
@@ -234,6 +539,7 @@ class FilesTable:
         with get_db() as db:
             try:
                 db.query(File).delete()
+                db.execute(delete(FileContent))
                 db.commit()
 
                 return True
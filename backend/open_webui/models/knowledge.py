@@ -7,13 +7,13 @@ import uuid
 from open_webui.internal.db import Base, get_db
 from open_webui.env import SRC_LOG_LEVELS
 
-from open_webui.models.files import FileMetadataResponse
+from open_webui.models.files import File, FileMetadataResponse
 from open_webui.models.groups import Groups
 from open_webui.models.users import Users, UserResponse
 
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Boolean, Column, String, Text, JSON, select
 
 from open_webui.utils.access_control import has_access
 
@@ -157,6 +157,10 @@ class KnowledgeTable:
                 )
             return knowledge_bases
 
+    def get_knowledge_ids(self) -> list[str]:
+        with get_db() as db:
+            return [id for (id,) in db.query(Knowledge.id).all()]
+
     def check_access_by_user_id(self, id, user_id, permission="write") -> bool:
         knowledge = self.get_knowledge_by_id(id)
         if not knowledge:
@@ -224,6 +228,49 @@ class KnowledgeTable:
             log.exception(e)
             return None
 
+    def remove_missing_file_ids(self) -> int:
+        """
+        Removes the ids of deleted files from the knowledge bases' file_ids and
+        returns the number of knowledge bases updated.
+        """
+        with get_db() as db:
+            knowledge_file_ids = {
+                id: data["file_ids"]
+                for id, data in db.execute(select(Knowledge.id, Knowledge.data))
+                if data and data.get("file_ids")
+            }
+            # Read after the knowledge bases: a file is created before it is added
+            file_ids = {id for (id,) in db.execute(select(File.id))}
+
+        updated = 0
+        for id, ids in knowledge_file_ids.items():
+            if set(ids) <= file_ids:
+                continue
+            with get_db() as db:
+                # Re-read under lock so files added meanwhile are kept
+                knowledge = (
+                    db.query(Knowledge).filter_by(id=id).with_for_update().first()
+                )
+                if not knowledge or not knowledge.data:
+                    continue
+                ids = knowledge.data.get("file_ids", [])
+                existing = {
+                    file_id
+                    for (file_id,) in db.execute(
+                        select(File.id).where(File.id.in_(ids))
+                    )
+                }
+                if len(existing) == len(set(ids)):
+                    continue
+                knowledge.data = {
+                    **knowledge.data,
+                    "file_ids": [file_id for file_id in ids if file_id in existing],
+                }
+                knowledge.updated_at = int(time.time())
+                db.commit()
+                updated += 1
+        return updated
+
     def delete_knowledge_by_id(self, id: str) -> bool:
         try:
             with get_db() as db:
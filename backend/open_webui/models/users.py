@@ -1,10 +1,23 @@
+import asyncio
+import threading
 import time
+from collections import OrderedDict
 from typing import Optional
 
-from open_webui.internal.db import Base, JSONField, get_db
+from open_webui.internal.db import (
+    Base,
+    JSONField,
+    get_async_db,
+    get_db,
+    has_async_db,
+)
 
 
-from open_webui.env import DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL
+from open_webui.env import (
+    DATABASE_USER_ACTIVE_STATUS_UPDATE_INTERVAL,
+    USER_CACHE_SIZE,
+    USER_CACHE_TTL,
+)
 from open_webui.models.chats import Chats
 from open_webui.models.groups import Groups
 from open_webui.utils.misc import throttle
@@ -12,7 +25,7 @@ from open_webui.utils.misc import throttle
 
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text, Date
-from sqlalchemy import or_
+from sqlalchemy import bindparam, or_, update
 
 import datetime
 
@@ -140,7 +153,101 @@ class UserUpdateForm(BaseModel):
     password: Optional[str] = None
 
 
+####################
+# Caches
+####################
+
+
+class UserCache:
+    """
+    LRU cache of recently authenticated users, looked up by id or API key.
+    Entries expire after `ttl` seconds and are dropped whenever the user is
+    changed through UsersTable, so the TTL only bounds how long changes made by
+    other workers can go unnoticed.
+    """
+
+    def __init__(self, ttl: float = USER_CACHE_TTL, size: int = USER_CACHE_SIZE):
+        self.ttl = ttl
+        self.size = size
+        self._users: OrderedDict[str, tuple[float, UserModel]] = OrderedDict()
+        self._api_keys: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, id: str) -> Optional[UserModel]:
+        with self._lock:
+            entry = self._users.get(id)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._pop(id)
+                return None
+            self._users.move_to_end(id)
+            return entry[1]
+
+    def get_by_api_key(self, api_key: str) -> Optional[UserModel]:
+        id = self._api_keys.get(api_key)
+        user = self.get(id) if id is not None else None
+        if user is None or user.api_key != api_key:
+            with self._lock:
+                self._api_keys.pop(api_key, None)
+            return None
+        return user
+
+    def set(self, user: UserModel) -> None:
+        if not self.ttl or not self.size:
+            return
+        with self._lock:
+            self._pop(user.id)
+            self._users[user.id] = (time.monotonic() + self.ttl, user)
+            if user.api_key:
+                self._api_keys[user.api_key] = user.id
+            while len(self._users) > self.size:
+                self._pop(next(iter(self._users)))
+
+    def invalidate(self, id: str) -> None:
+        with self._lock:
+            self._pop(id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._users.clear()
+            self._api_keys.clear()
+
+    def _pop(self, id: str) -> None:
+        entry = self._users.pop(id, None)
+        if entry is not None and entry[1].api_key:
+            self._api_keys.pop(entry[1].api_key, None)
+
+
+class LastActiveBuffer:
+    """
+    Collects the users' last active timestamps in memory, so they are written
+    in one batch per flush instead of one UPDATE per request.
+    """
+
+    def __init__(self):
+        self._timestamps: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def touch(self, id: str) -> None:
+        with self._lock:
+            self._timestamps[id] = int(time.time())
+
+    def restore(self, id: str, timestamp: int) -> None:
+        with self._lock:
+            self._timestamps.setdefault(id, timestamp)
+
+    def drain(self) -> dict[str, int]:
+        with self._lock:
+            timestamps, self._timestamps = self._timestamps, {}
+        return timestamps
+
+
 class UsersTable:
+    def __init__(self):
+        self.cache = UserCache()
+        self.last_active = LastActiveBuffer()
+
     def insert_new_user(
         self,
         id: str,
@@ -181,6 +288,16 @@ class UsersTable:
         except Exception:
             return None
 
+    async def get_user_by_id_async(self, id: str) -> Optional[UserModel]:
+        if not has_async_db():
+            return await asyncio.to_thread(self.get_user_by_id, id)
+        try:
+            async with get_async_db() as db:
+                user = await db.get(User, id)
+                return UserModel.model_validate(user)
+        except Exception:
+            return None
+
     def get_user_by_api_key(self, api_key: str) -> Optional[UserModel]:
         try:
             with get_db() as db:
@@ -189,6 +306,30 @@ class UsersTable:
         except Exception:
             return None
 
+    def get_cached_user_by_id(self, id: str) -> Optional[UserModel]:
+        user = self.cache.get(id)
+        if user is None:
+            user = self.get_user_by_id(id)
+            if user is not None:
+                self.cache.set(user)
+        return user
+
+    async def get_cached_user_by_id_async(self, id: str) -> Optional[UserModel]:
+        user = self.cache.get(id)
+        if user is None:
+            user = await self.get_user_by_id_async(id)
+            if user is not None:
+                self.cache.set(user)
+        return user
+
+    def get_cached_user_by_api_key(self, api_key: str) -> Optional[UserModel]:
+        user = self.cache.get_by_api_key(api_key)
+        if user is None:
+            user = self.get_user_by_api_key(api_key)
+            if user is not None:
+                self.cache.set(user)
+        return user
+
     def get_user_by_email(self, email: str) -> Optional[UserModel]:
         try:
             with get_db() as db:
@@ -317,6 +458,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"role": role})
                 db.commit()
+                self.cache.invalidate(id)
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
         except Exception:
@@ -331,6 +473,7 @@ class UsersTable:
                     {"profile_image_url": profile_image_url}
                 )
                 db.commit()
+                self.cache.invalidate(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -351,6 +494,34 @@ class UsersTable:
         except Exception:
             return None
 
+    def touch_user_last_active_by_id(self, id: str) -> None:
+        # Written by flush_user_last_active
+        self.last_active.touch(id)
+
+    def flush_user_last_active(self) -> int:
+        timestamps = self.last_active.drain()
+        if not timestamps:
+            return 0
+
+        try:
+            with get_db() as db:
+                db.connection().execute(
+                    update(User.__table__)
+                    .where(User.__table__.c.id == bindparam("user_id"))
+                    .values(last_active_at=bindparam("last_active_at")),
+                    [
+                        {"user_id": id, "last_active_at": last_active_at}
+                        for id, last_active_at in timestamps.items()
+                    ],
+                )
+                db.commit()
+        except Exception:
+            # Keep the timestamps for the next flush unless newer ones arrived
+            for id, last_active_at in timestamps.items():
+                self.last_active.restore(id, last_active_at)
+            raise
+        return len(timestamps)
+
     def update_user_oauth_sub_by_id(
         self, id: str, oauth_sub: str
     ) -> Optional[UserModel]:
@@ -358,6 +529,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update({"oauth_sub": oauth_sub})
                 db.commit()
+                self.cache.invalidate(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -369,6 +541,7 @@ class UsersTable:
             with get_db() as db:
                 db.query(User).filter_by(id=id).update(updated)
                 db.commit()
+                self.cache.invalidate(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -389,6 +562,7 @@ class UsersTable:
 
                 db.query(User).filter_by(id=id).update({"settings": user_settings})
                 db.commit()
+                self.cache.invalidate(id)
 
                 user = db.query(User).filter_by(id=id).first()
                 return UserModel.model_validate(user)
@@ -407,6 +581,7 @@ class UsersTable:
                     # Delete User
                     db.query(User).filter_by(id=id).delete()
                     db.commit()
+                self.cache.invalidate(id)
 
                 return True
             else:
@@ -419,6 +594,7 @@ class UsersTable:
             with get_db() as db:
                 result = db.query(User).filter_by(id=id).update({"api_key": api_key})
                 db.commit()
+                self.cache.invalidate(id)
                 return True if result == 1 else False
         except Exception:
             return False
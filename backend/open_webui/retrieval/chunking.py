@@ -0,0 +1,268 @@
+import json
+import logging
+import re
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple, Optional
+
+from langchain_core.documents import Document
+
+from open_webui.constants import ERROR_MESSAGES
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+MARKDOWN_HEADERS = [
+    ("#", "Header 1"),
+    ("##", "Header 2"),
+    ("###", "Header 3"),
+    ("####", "Header 4"),
+    ("#####", "Header 5"),
+    ("######", "Header 6"),
+]
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+")
+
+
+class Chunk(NamedTuple):
+    text: str
+    # Offset of the chunk in the source document (all pages of a file, in order)
+    start_index: int
+    # Metadata of the page the chunk was cut from, shared by all of its chunks
+    metadata: dict
+    # PII entities of the chunk with chunk-local occurrences
+    pii: dict
+    headings: Optional[list[str]] = None
+
+    def get_metadata(self) -> dict:
+        metadata = {
+            **self.metadata,
+            "start_index": self.start_index,
+            "pii": self.pii,
+            "pii_positions_normalized": True,
+        }
+        if self.headings is not None:
+            metadata["headings"] = self.headings
+        return metadata
+
+
+@lru_cache(maxsize=16)
+def get_text_splitter(
+    text_splitter: str,
+    chunk_size: int,
+    chunk_overlap: int,
+    encoding_name: Optional[str] = None,
+):
+    """
+    Returns a shared splitter for the given settings. Splitters are stateless,
+    so the token splitter's tiktoken encoder is loaded once per encoding.
+    """
+    from langchain_text_splitters import (
+        RecursiveCharacterTextSplitter,
+        TokenTextSplitter,
+    )
+
+    if text_splitter in ["", "character", "markdown_header"]:
+        return RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size, chunk_overlap=chunk_overlap
+        )
+    elif text_splitter == "token":
+        log.info(f"Using token text splitter: {encoding_name}")
+        return TokenTextSplitter(
+            encoding_name=str(encoding_name),
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+        )
+    raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+
+
+@lru_cache(maxsize=1)
+def get_markdown_splitter():
+    from langchain_text_splitters import MarkdownHeaderTextSplitter
+
+    return MarkdownHeaderTextSplitter(
+        headers_to_split_on=MARKDOWN_HEADERS,
+        strip_headers=False,  # Keep headers in content for context
+    )
+
+
+def split_pages(text: str, page_size: int = 5000) -> list[str]:
+    """
+    Splits text into pages of at most page_size characters at sentence
+    boundaries (a single longer sentence gets a page of its own). Pages are
+    slices of text, so they concatenate back to it exactly.
+    """
+    if len(text) <= page_size:
+        return [text]
+
+    pages = []
+    start = end = 0
+    boundaries = [match.end() for match in SENTENCE_BOUNDARY.finditer(text)]
+    for boundary in boundaries + [len(text)]:
+        if boundary - start > page_size and end > start:
+            pages.append(text[start:end])
+            start = end
+        end = boundary
+    if start < len(text):
+        pages.append(text[start:])
+    return pages
+
+
+def _entities_to_dict(entities: list) -> dict:
+    # Convert list of entities to dict keyed by label/text
+    converted = {}
+    for entity in entities:
+        if not isinstance(entity, dict):
+            continue
+        key = entity.get("text") or entity.get("label") or entity.get("raw_text")
+        if key:
+            converted[key] = entity
+    return converted
+
+
+def parse_pii(pii) -> dict:
+    """
+    Normalizes PII metadata, which may arrive as a dict, a list of entities or
+    a JSON string of either, to a dict keyed by entity text.
+    """
+    try:
+        if isinstance(pii, str):
+            try:
+                pii = json.loads(pii)
+            except Exception:
+                # If parsing fails, drop PII to avoid breaking ingestion
+                return {}
+        if isinstance(pii, dict):
+            return pii
+        if isinstance(pii, list):
+            return _entities_to_dict(pii)
+    except Exception:
+        # Never let PII normalization break ingestion
+        pass
+    return {}
+
+
+def get_chunk_pii(pii: dict, start: int, end: int) -> dict:
+    """
+    Keeps the occurrences within [start, end) of the page, shifted to be
+    relative to the chunk. Entities without such occurrences are dropped.
+    """
+    chunk_pii = {}
+    for entity, data in pii.items():
+        if not isinstance(data, dict):
+            continue
+        occurrences = []
+        for occurrence in data.get("occurrences", []):
+            s = occurrence.get("start_idx")
+            e = occurrence.get("end_idx")
+            if isinstance(s, int) and isinstance(e, int) and start <= s and e <= end:
+                occurrences.append({"start_idx": s - start, "end_idx": e - start})
+        if occurrences:
+            chunk_pii[entity] = {**data, "occurrences": occurrences}
+    return chunk_pii
+
+
+def _locate(text: str, chunks: list[str], chunk_overlap: int) -> Iterator[tuple]:
+    # Same lookup as langchain's add_start_index, without building Documents
+    index = 0
+    previous_chunk_len = 0
+    for chunk in chunks:
+        offset = index + previous_chunk_len - chunk_overlap
+        found = text.find(chunk, max(0, offset))
+        # Token chunks may not decode to an exact substring
+        index = found if found != -1 else min(max(0, offset), len(text))
+        previous_chunk_len = len(chunk)
+        yield index, chunk
+
+
+def _split_page(
+    text: str, text_splitter: str, splitter, chunk_overlap: int
+) -> Iterator[tuple]:
+    if text_splitter != "markdown_header":
+        yield from (
+            (start, chunk, None)
+            for start, chunk in _locate(text, splitter.split_text(text), chunk_overlap)
+        )
+        return
+
+    # Sections are re-joined line by line, so chunks are located by their
+    # first line, which the header splitter only strips
+    cursor = 0
+    for section in get_markdown_splitter().split_text(text):
+        headings = [
+            section.metadata[key]
+            for _, key in MARKDOWN_HEADERS
+            if key in section.metadata
+        ]
+        for chunk in splitter.split_text(section.page_content):
+            found = text.find(chunk.strip().split("\n", 1)[0].strip(), cursor)
+            if found != -1:
+                cursor = found
+            yield cursor, chunk, headings
+
+
+def iter_chunks(
+    docs: Iterable[Document],
+    text_splitter: Optional[str] = "character",
+    chunk_size: int = 1000,
+    chunk_overlap: int = 100,
+    encoding_name: Optional[str] = None,
+    split: bool = True,
+) -> Iterator[Chunk]:
+    """
+    Lazily turns the pages of one or more documents into chunks.
+
+    Chunks reference their page's metadata instead of copying it and carry the
+    offset into their source document: consecutive pages with the same file_id
+    (or source) are treated as one text, as process_file stores them. With
+    split=False every page is a single chunk.
+    """
+    splitter = (
+        get_text_splitter(text_splitter or "", chunk_size, chunk_overlap, encoding_name)
+        if split
+        else None
+    )
+
+    def generate():
+        source = None
+        offset = 0
+        for doc in docs:
+            metadata = doc.metadata
+            doc_source = metadata.get("file_id") or metadata.get("source")
+            if doc_source != source:
+                source, offset = doc_source, 0
+
+            # Pages re-read from a collection keep the position they had
+            base = metadata.get("start_index", offset)
+            if not isinstance(base, int):
+                base = offset
+
+            # PII occurrences are relative to the page content
+            pii = parse_pii(metadata.get("pii"))
+            text = doc.page_content
+
+            if splitter is None:
+                pieces = [(0, text, None)]
+            else:
+                pieces = _split_page(text, text_splitter, splitter, chunk_overlap)
+
+            for start, chunk, headings in pieces:
+                yield Chunk(
+                    text=chunk,
+                    start_index=base + start,
+                    metadata=metadata,
+                    pii=get_chunk_pii(pii, start, start + len(chunk)),
+                    headings=headings,
+                )
+
+            offset = base + len(text)
+
+    return generate()
+
+
+def batched(iterable: Iterable, n: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, n)):
+        yield batch
@@ -0,0 +1,262 @@
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from langchain_core.documents import Document
+
+from open_webui.env import (
+    ENABLE_EXTRACTION_CACHE,
+    EXTRACTION_CACHE_DIR,
+    EXTRACTION_CACHE_MAX_SIZE_MB,
+    EXTRACTION_CACHE_TTL,
+    SRC_LOG_LEVELS,
+)
+from open_webui.utils.redis import run_periodically
+from open_webui.utils.serialization import json_dumps, json_dumps_bytes, json_loads
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+# Bump when the stored format or the loader post-processing changes
+CACHE_VERSION = 2
+
+
+def get_file_hash(file_path: str, chunk_size: int = 1024 * 1024) -> str:
+    sha256 = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class ExtractionCache:
+    """
+    Content-addressed store for document loader results.
+
+    Entries are keyed by the file's SHA-256 together with the extraction engine
+    and its parameters, and stored as gzip-compressed JSON below `cache_dir`.
+    Once the total size exceeds `max_size` bytes the least recently used entries
+    are evicted. Entries older than `ttl` seconds (if set) are expired, and
+    delete_file() removes the entries of a deleted file.
+
+    An entry's mtime is the time it was stored, its atime the time it was last
+    used.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int, ttl: int = 0):
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._size = None
+        self._lock = threading.Lock()
+
+    def get_key(self, file_path: str, engine: str, params: dict[str, Any]) -> str:
+        """
+        Key of the file's extraction result, params being the settings that
+        change the result of the engine.
+        """
+        file_hash = get_file_hash(file_path)
+        params = {key: value for key, value in params.items() if value is not None}
+        fingerprint = json_dumps(
+            [CACHE_VERSION, file_hash, engine, params],
+            default=str,
+            sort_keys=True,
+        )
+        # Prefixed with the file's hash, so its entries can be found to delete
+        return f"{file_hash}-{hashlib.sha256(fingerprint.encode()).hexdigest()}"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json.gz"
+
+    def _is_expired(self, stat: os.stat_result) -> bool:
+        return bool(self.ttl) and stat.st_mtime < time.time() - self.ttl
+
+    def get(self, key: str) -> Optional[list[Document]]:
+        path = self._path(key)
+        try:
+            stat = path.stat()
+            if self._is_expired(stat):
+                path.unlink(missing_ok=True)
+                raise FileNotFoundError(path)
+
+            data = json_loads(gzip.decompress(path.read_bytes()))
+            # Mark as recently used for eviction, keeping the time it was stored
+            os.utime(path, (time.time(), stat.st_mtime))
+        except FileNotFoundError:
+            data = None
+        except Exception as e:
+            log.warning(f"Discarding unreadable extraction cache entry {key}: {e}")
+            path.unlink(missing_ok=True)
+            data = None
+
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if data is None:
+            return None
+
+        log.debug(f"ExtractionCache: hit {key} ({self.hit_rate:.0%} hit rate)")
+        return [
+            Document(page_content=doc["page_content"], metadata=doc["metadata"])
+            for doc in data
+        ]
+
+    def set(self, key: str, docs: list[Document]):
+        path = self._path(key)
+        data = gzip.compress(
+            json_dumps_bytes(
+                [
+                    {"page_content": doc.page_content, "metadata": doc.metadata}
+                    for doc in docs
+                ],
+                default=str,
+            ),
+            compresslevel=6,
+        )
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write atomically so concurrent readers never see a partial entry
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            log.warning(f"Failed to store extraction cache entry {key}: {e}")
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data)
+
+            if self._size > self.max_size:
+                self._evict()
+
+    def delete_file(self, file_path: str) -> int:
+        """
+        Removes the extraction results of the file's content, returning the
+        number of entries removed.
+        """
+        file_hash = get_file_hash(file_path)
+        removed = 0
+        for path in self.cache_dir.glob(f"{file_hash[:2]}/{file_hash}-*.json.gz"):
+            path.unlink(missing_ok=True)
+            removed += 1
+
+        if removed:
+            with self._lock:
+                self._size = None
+        return removed
+
+    def expire(self) -> int:
+        """Removes the entries older than the TTL, returning their number."""
+        if not self.ttl:
+            return 0
+
+        removed = 0
+        for _, path, stat in self._entries():
+            if self._is_expired(stat):
+                path.unlink(missing_ok=True)
+                removed += 1
+
+        if removed:
+            with self._lock:
+                self._size = None
+        return removed
+
+    def clear(self):
+        """Removes all entries."""
+        with self._lock:
+            for path in self.cache_dir.glob("*/*.json.gz"):
+                path.unlink(missing_ok=True)
+            self._size = 0
+
+    def _entries(self) -> list[tuple[float, Path, os.stat_result]]:
+        """The entries with their stat, least recently used first."""
+        entries = []
+        for path in self.cache_dir.glob("*/*.json.gz"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((max(stat.st_atime, stat.st_mtime), path, stat))
+        return sorted(entries)
+
+    def _scan_size(self) -> int:
+        return sum(stat.st_size for _, _, stat in self._entries())
+
+    def _evict(self):
+        # Other workers share the directory, so re-scan instead of trusting the
+        # running total. Evict down to 90% to avoid evicting on every store.
+        entries = self._entries()
+        size = sum(stat.st_size for _, _, stat in entries)
+        target = self.max_size * 0.9
+
+        for _, path, stat in entries:
+            if size <= target:
+                break
+            path.unlink(missing_ok=True)
+            size -= stat.st_size
+            self.evictions += 1
+
+        self._size = size
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+            "size": self._size,
+            "max_size": self.max_size,
+        }
+
+
+EXTRACTION_CACHE = (
+    ExtractionCache(
+        EXTRACTION_CACHE_DIR,
+        EXTRACTION_CACHE_MAX_SIZE_MB * 1024 * 1024,
+        ttl=EXTRACTION_CACHE_TTL,
+    )
+    if ENABLE_EXTRACTION_CACHE and EXTRACTION_CACHE_MAX_SIZE_MB > 0
+    else None
+)
+
+
+async def periodic_extraction_cache_expiry():
+    """
+    Expires the extraction cache entries older than EXTRACTION_CACHE_TTL. The
+    cache directory may be local to the node, so every worker sweeps it.
+    """
+
+    async def expire():
+        removed = await asyncio.to_thread(EXTRACTION_CACHE.expire)
+        if removed:
+            log.info(f"Expired {removed} extraction cache entries")
+
+    interval = min(EXTRACTION_CACHE_TTL, 3600)
+    await run_periodically(
+        "extraction_cache_expiry", expire, interval, initial_delay=interval
+    )
@@ -1,5 +1,5 @@
+import asyncio
 import os
-import time
 import requests
 import logging
 import json
@@ -7,10 +7,16 @@ from typing import List, Optional
 from langchain_core.documents import Document
 from fastapi import HTTPException, status
 
+import aiohttp
+
+from open_webui.retrieval.loaders.pool import PooledLoader, read_file, to_form_value
+
 log = logging.getLogger(__name__)
 
 
-class DatalabMarkerLoader:
+class DatalabMarkerLoader(PooledLoader):
+    engine = "datalab_marker"
+
     def __init__(
         self,
         file_path: str,
@@ -84,7 +90,7 @@ class DatalabMarkerLoader:
                 status.HTTP_502_BAD_GATEWAY, detail=f"Invalid JSON: {e}"
             )
 
-    def load(self) -> List[Document]:
+    async def _aload(self, session) -> List[Document]:
         filename = os.path.basename(self.file_path)
         mime_type = self._get_mime_type(filename)
         headers = {"X-Api-Key": self.api_key}
@@ -108,21 +114,25 @@ class DatalabMarkerLoader:
         )
 
         try:
-            with open(self.file_path, "rb") as f:
-                files = {"file": (filename, f, mime_type)}
-                response = requests.post(
-                    f"{self.api_base_url}",
-                    data=form_data,
-                    files=files,
-                    headers=headers,
-                )
+            data = await asyncio.to_thread(read_file, self.file_path)
+
+            form = aiohttp.FormData()
+            for key, value in form_data.items():
+                value = to_form_value(value)
+                if value is not None:
+                    form.add_field(key, value)
+            form.add_field("file", data, filename=filename, content_type=mime_type)
+
+            async with session.post(
+                f"{self.api_base_url}", data=form, headers=headers
+            ) as response:
                 response.raise_for_status()
-                result = response.json()
+                result = await response.json(content_type=None)
         except FileNotFoundError:
             raise HTTPException(
                 status.HTTP_404_NOT_FOUND, detail=f"File not found: {self.file_path}"
             )
-        except requests.HTTPError as e:
+        except aiohttp.ClientResponseError as e:
             raise HTTPException(
                 status.HTTP_400_BAD_REQUEST,
                 detail=f"Datalab Marker request failed: {e}",
@@ -145,15 +155,16 @@ class DatalabMarkerLoader:
 
         # Check if this is a direct response (self-hosted) or polling response (DataLab)
         if check_url:
-            # DataLab polling pattern
+            # DataLab polling pattern, waiting without blocking a thread
             for _ in range(300):  # Up to 10 minutes
-                time.sleep(2)
+                await asyncio.sleep(2)
+                raw_body = ""
                 try:
-                    poll_response = requests.get(check_url, headers=headers)
-                    poll_response.raise_for_status()
-                    poll_result = poll_response.json()
-                except (requests.HTTPError, ValueError) as e:
-                    raw_body = poll_response.text
+                    async with session.get(check_url, headers=headers) as poll_response:
+                        raw_body = await poll_response.text()
+                        poll_response.raise_for_status()
+                        poll_result = json.loads(raw_body)
+                except (aiohttp.ClientResponseError, ValueError) as e:
                     log.error(f"Polling error: {e}, response body: {raw_body}")
                     raise HTTPException(
                         status.HTTP_502_BAD_GATEWAY, detail=f"Polling failed: {e}"
@@ -1,4 +1,5 @@
-import requests
+import asyncio
+import json
 import logging, os
 from typing import Iterator, List, Union
 from urllib.parse import quote
@@ -6,12 +7,15 @@ from urllib.parse import quote
 from langchain_core.document_loaders import BaseLoader
 from langchain_core.documents import Document
 from open_webui.env import SRC_LOG_LEVELS
+from open_webui.retrieval.loaders.pool import PooledLoader, read_file
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["RAG"])
 
 
-class ExternalDocumentLoader(BaseLoader):
+class ExternalDocumentLoader(PooledLoader, BaseLoader):
+    engine = "external"
+
     def __init__(
         self,
         file_path,
@@ -26,9 +30,8 @@ class ExternalDocumentLoader(BaseLoader):
         self.file_path = file_path
         self.mime_type = mime_type
 
-    def load(self) -> List[Document]:
-        with open(self.file_path, "rb") as f:
-            data = f.read()
+    async def _aload(self, session) -> List[Document]:
+        data = await asyncio.to_thread(read_file, self.file_path)
 
         headers = {}
         if self.mime_type is not None:
@@ -47,14 +50,19 @@ class ExternalDocumentLoader(BaseLoader):
             url = url[:-1]
 
         try:
-            response = requests.put(f"{url}/process", data=data, headers=headers)
+            async with session.put(
+                f"{url}/process", data=data, headers=headers
+            ) as response:
+                ok = response.ok
+                status_code = response.status
+                response_text = await response.text()
         except Exception as e:
             log.error(f"Error connecting to endpoint: {e}")
             raise Exception(f"Error connecting to endpoint: {e}")
 
-        if response.ok:
+        if ok:
 
-            response_data = response.json()
+            response_data = json.loads(response_text)
             if response_data:
                 if isinstance(response_data, dict):
                     return [
@@ -79,6 +87,4 @@ class ExternalDocumentLoader(BaseLoader):
             else:
                 raise Exception("Error loading document: No content returned")
         else:
-            raise Exception(
-                f"Error loading document: {response.status_code} {response.text}"
-            )
+            raise Exception(f"Error loading document: {status_code} {response_text}")
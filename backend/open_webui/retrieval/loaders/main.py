@@ -1,35 +1,32 @@
-import requests
+import asyncio
 import logging
+import os
 import ftfy
 import sys
 import json
+from typing import Optional
+
+import aiohttp
 
-from azure.identity import DefaultAzureCredential
-from langchain_community.document_loaders import (
-    AzureAIDocumentIntelligenceLoader,
-    BSHTMLLoader,
-    CSVLoader,
-    Docx2txtLoader,
-    OutlookMessageLoader,
-    PyPDFLoader,
-    TextLoader,
-    UnstructuredEPubLoader,
-    UnstructuredExcelLoader,
-    UnstructuredODTLoader,
-    UnstructuredPowerPointLoader,
-    UnstructuredRSTLoader,
-    UnstructuredXMLLoader,
-    YoutubeLoader,
-)
 from langchain_core.documents import Document
 
+from open_webui.retrieval.loaders.cache import EXTRACTION_CACHE
 from open_webui.retrieval.loaders.external_document import ExternalDocumentLoader
 
 from open_webui.retrieval.loaders.mistral import MistralLoader
+from open_webui.retrieval.loaders.pdf import ParallelPDFLoader
+from open_webui.retrieval.loaders.pool import PooledLoader, read_file, to_form_value
 from open_webui.retrieval.loaders.datalab_marker import DatalabMarkerLoader
 
 
-from open_webui.env import SRC_LOG_LEVELS, GLOBAL_LOG_LEVEL
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    GLOBAL_LOG_LEVEL,
+    ENABLE_PARALLEL_PDF_EXTRACTION,
+    PDF_EXTRACTION_MIN_PAGES,
+    PDF_EXTRACTION_PAGES_PER_SHARD,
+    PDF_EXTRACTION_WORKERS,
+)
 
 logging.basicConfig(stream=sys.stdout, level=GLOBAL_LOG_LEVEL)
 log = logging.getLogger(__name__)
@@ -89,7 +86,9 @@ known_source_ext = [
 ]
 
 
-class TikaLoader:
+class TikaLoader(PooledLoader):
+    engine = "tika"
+
     def __init__(self, url, file_path, mime_type=None, extract_images=None):
         self.url = url
         self.file_path = file_path
@@ -97,9 +96,8 @@ class TikaLoader:
 
         self.extract_images = extract_images
 
-    def load(self) -> list[Document]:
-        with open(self.file_path, "rb") as f:
-            data = f.read()
+    async def _aload(self, session) -> list[Document]:
+        data = await asyncio.to_thread(read_file, self.file_path)
 
         if self.mime_type is not None:
             headers = {"Content-Type": self.mime_type}
@@ -114,23 +112,26 @@ class TikaLoader:
             endpoint += "/"
         endpoint += "tika/text"
 
-        r = requests.put(endpoint, data=data, headers=headers)
+        async with session.put(endpoint, data=data, headers=headers) as r:
+            if r.ok:
+                raw_metadata = await r.json(content_type=None)
+                text = raw_metadata.get(
+                    "X-TIKA:content", "<No text content found>"
+                ).strip()
 
-        if r.ok:
-            raw_metadata = r.json()
-            text = raw_metadata.get("X-TIKA:content", "<No text content found>").strip()
+                if "Content-Type" in raw_metadata:
+                    headers["Content-Type"] = raw_metadata["Content-Type"]
 
-            if "Content-Type" in raw_metadata:
-                headers["Content-Type"] = raw_metadata["Content-Type"]
+                log.debug("Tika extracted text length: %d", len(text))
 
-            log.debug("Tika extracted text length: %d", len(text))
+                return [Document(page_content=text, metadata=headers)]
+            else:
+                raise Exception(f"Error calling Tika: {r.reason}")
 
-            return [Document(page_content=text, metadata=headers)]
-        else:
-            raise Exception(f"Error calling Tika: {r.reason}")
 
+class DoclingLoader(PooledLoader):
+    engine = "docling"
 
-class DoclingLoader:
     def __init__(self, url, file_path=None, mime_type=None, params=None):
         self.url = url.rstrip("/")
         self.file_path = file_path
@@ -138,100 +139,136 @@ class DoclingLoader:
 
         self.params = params or {}
 
-    def load(self) -> list[Document]:
-        with open(self.file_path, "rb") as f:
-            files = {
-                "files": (
-                    self.file_path,
-                    f,
-                    self.mime_type or "application/octet-stream",
-                )
-            }
-
-            params = {
-                "image_export_mode": "placeholder",
-                "table_mode": "fast",
-                # Ask Docling to include explicit page break placeholders in markdown output
-                "md_page_break_placeholder": None,
-            }
-
-            if self.params:
-                if self.params.get("md_page_break_placeholder"):
-                    params["md_page_break_placeholder"] = self.params.get(
-                        "md_page_break_placeholder"
-                    )
+    async def _aload(self, session) -> list[Document]:
+        data = await asyncio.to_thread(read_file, self.file_path)
 
-                if self.params.get("do_picture_description"):
-                    params["do_picture_description"] = self.params.get(
-                        "do_picture_description"
-                    )
+        params = {
+            "image_export_mode": "placeholder",
+            "table_mode": "fast",
+            # Ask Docling to include explicit page break placeholders in markdown output
+            "md_page_break_placeholder": None,
+        }
 
-                    picture_description_mode = self.params.get(
-                        "picture_description_mode", ""
-                    ).lower()
-
-                    if picture_description_mode == "local" and self.params.get(
-                        "picture_description_local", {}
-                    ):
-                        params["picture_description_local"] = json.dumps(
-                            self.params.get("picture_description_local", {})
-                        )
+        if self.params:
+            if self.params.get("md_page_break_placeholder"):
+                params["md_page_break_placeholder"] = self.params.get(
+                    "md_page_break_placeholder"
+                )
 
-                    elif picture_description_mode == "api" and self.params.get(
-                        "picture_description_api", {}
-                    ):
-                        params["picture_description_api"] = json.dumps(
-                            self.params.get("picture_description_api", {})
-                        )
+            if self.params.get("do_picture_description"):
+                params["do_picture_description"] = self.params.get(
+                    "do_picture_description"
+                )
 
-                params["do_ocr"] = self.params.get("do_ocr")
+                picture_description_mode = self.params.get(
+                    "picture_description_mode", ""
+                ).lower()
 
-                params["force_ocr"] = self.params.get("force_ocr")
+                if picture_description_mode == "local" and self.params.get(
+                    "picture_description_local", {}
+                ):
+                    params["picture_description_local"] = json.dumps(
+                        self.params.get("picture_description_local", {})
+                    )
 
-                if (
-                    self.params.get("do_ocr")
-                    and self.params.get("ocr_engine")
-                    and self.params.get("ocr_lang")
+                elif picture_description_mode == "api" and self.params.get(
+                    "picture_description_api", {}
                 ):
-                    params["ocr_engine"] = self.params.get("ocr_engine")
-                    params["ocr_lang"] = [
-                        lang.strip()
-                        for lang in self.params.get("ocr_lang").split(",")
-                        if lang.strip()
-                    ]
+                    params["picture_description_api"] = json.dumps(
+                        self.params.get("picture_description_api", {})
+                    )
 
-                if self.params.get("pdf_backend"):
-                    params["pdf_backend"] = self.params.get("pdf_backend")
+            params["do_ocr"] = self.params.get("do_ocr")
 
-                if self.params.get("table_mode"):
-                    params["table_mode"] = self.params.get("table_mode")
+            params["force_ocr"] = self.params.get("force_ocr")
 
-                if self.params.get("pipeline"):
-                    params["pipeline"] = self.params.get("pipeline")
+            if (
+                self.params.get("do_ocr")
+                and self.params.get("ocr_engine")
+                and self.params.get("ocr_lang")
+            ):
+                params["ocr_engine"] = self.params.get("ocr_engine")
+                params["ocr_lang"] = [
+                    lang.strip()
+                    for lang in self.params.get("ocr_lang").split(",")
+                    if lang.strip()
+                ]
 
-            endpoint = f"{self.url}/v1/convert/file"
-            r = requests.post(endpoint, files=files, data=params)
+            if self.params.get("pdf_backend"):
+                params["pdf_backend"] = self.params.get("pdf_backend")
+
+            if self.params.get("table_mode"):
+                params["table_mode"] = self.params.get("table_mode")
+
+            if self.params.get("pipeline"):
+                params["pipeline"] = self.params.get("pipeline")
+
+        form = aiohttp.FormData()
+        for key, value in params.items():
+            for item in value if isinstance(value, list) else [value]:
+                item = to_form_value(item)
+                if item is not None:
+                    form.add_field(key, item)
+        form.add_field(
+            "files",
+            data,
+            filename=os.path.basename(self.file_path),
+            content_type=self.mime_type or "application/octet-stream",
+        )
 
-        if r.ok:
-            result = r.json()
-            document_data = result.get("document", {})
-            text = document_data.get("md_content", "<No text content found>")
+        endpoint = f"{self.url}/v1/convert/file"
+        async with session.post(endpoint, data=form) as r:
+            if r.ok:
+                result = await r.json(content_type=None)
+                document_data = result.get("document", {})
+                text = document_data.get("md_content", "<No text content found>")
 
-            metadata = {"Content-Type": self.mime_type} if self.mime_type else {}
+                metadata = {"Content-Type": self.mime_type} if self.mime_type else {}
 
-            log.debug("Docling extracted text length: %d", len(text))
+                log.debug("Docling extracted text length: %d", len(text))
 
-            return [Document(page_content=text, metadata=metadata)]
-        else:
-            error_msg = f"Error calling Docling API: {r.reason}"
-            if r.text:
-                try:
-                    error_data = r.json()
-                    if "detail" in error_data:
-                        error_msg += f" - {error_data['detail']}"
-                except Exception:
-                    error_msg += f" - {r.text}"
-            raise Exception(f"Error calling Docling: {error_msg}")
+                return [Document(page_content=text, metadata=metadata)]
+            else:
+                error_msg = f"Error calling Docling API: {r.reason}"
+                text = await r.text()
+                if text:
+                    try:
+                        error_data = json.loads(text)
+                        if "detail" in error_data:
+                            error_msg += f" - {error_data['detail']}"
+                    except Exception:
+                        error_msg += f" - {text}"
+                raise Exception(f"Error calling Docling: {error_msg}")
+
+
+# Loader settings that change the extraction result of each engine. Whether its
+# credentials are set is part of it too (the local loaders are used otherwise),
+# but not their values, so that rotating a key keeps the cached results.
+ENGINE_CACHE_SETTINGS = {
+    "external": ["EXTERNAL_DOCUMENT_LOADER_URL"],
+    "tika": ["TIKA_SERVER_URL"],
+    "datalab_marker": [
+        "DATALAB_MARKER_API_BASE_URL",
+        "DATALAB_MARKER_ADDITIONAL_CONFIG",
+        "DATALAB_MARKER_FORCE_OCR",
+        "DATALAB_MARKER_PAGINATE",
+        "DATALAB_MARKER_STRIP_EXISTING_OCR",
+        "DATALAB_MARKER_DISABLE_IMAGE_EXTRACTION",
+        "DATALAB_MARKER_FORMAT_LINES",
+        "DATALAB_MARKER_USE_LLM",
+        "DATALAB_MARKER_OUTPUT_FORMAT",
+    ],
+    "docling": ["DOCLING_SERVER_URL", "DOCLING_PARAMS"],
+    "document_intelligence": ["DOCUMENT_INTELLIGENCE_ENDPOINT"],
+}
+ENGINE_CACHE_CREDENTIALS = {
+    "external": ["EXTERNAL_DOCUMENT_LOADER_API_KEY", "MISTRAL_OCR_API_KEY"],
+    "datalab_marker": ["DATALAB_MARKER_API_KEY"],
+    "document_intelligence": ["DOCUMENT_INTELLIGENCE_KEY"],
+    "mistral_ocr": ["MISTRAL_OCR_API_KEY"],
+}
+# Settings asking an engine to extract the file again instead of reusing a result
+ENGINE_SKIP_CACHE = {"datalab_marker": "DATALAB_MARKER_SKIP_CACHE"}
 
 
 class Loader:
@@ -242,16 +279,86 @@ class Loader:
     def load(
         self, filename: str, file_content_type: str, file_path: str
     ) -> list[Document]:
+        cache_key, docs = self._get_cached(filename, file_content_type, file_path)
+        if docs is not None:
+            return docs
+
         loader = self._get_loader(filename, file_content_type, file_path)
         docs = loader.load()
 
-        return [
+        return self._finalize(cache_key, docs)
+
+    async def aload(
+        self, filename: str, file_content_type: str, file_path: str
+    ) -> list[Document]:
+        """
+        Async counterpart of load(): external engines are awaited on the shared
+        loader pool, local loaders run in a worker thread.
+        """
+        cache_key, docs = await asyncio.to_thread(
+            self._get_cached, filename, file_content_type, file_path
+        )
+        if docs is not None:
+            return docs
+
+        loader = self._get_loader(filename, file_content_type, file_path)
+        if isinstance(loader, PooledLoader):
+            docs = await loader.aload()
+        else:
+            docs = await asyncio.to_thread(loader.load)
+
+        return await asyncio.to_thread(self._finalize, cache_key, docs)
+
+    def _get_cached(
+        self, filename: str, file_content_type: str, file_path: str
+    ) -> tuple[Optional[str], Optional[list[Document]]]:
+        if EXTRACTION_CACHE is None or self.kwargs.get(
+            ENGINE_SKIP_CACHE.get(self.engine, "")
+        ):
+            return None, None
+
+        try:
+            cache_key = EXTRACTION_CACHE.get_key(
+                file_path,
+                self.engine,
+                self._get_cache_params(filename, file_content_type),
+            )
+            docs = EXTRACTION_CACHE.get(cache_key)
+            if docs is not None:
+                log.info(f"Loaded extraction result for {filename} from cache")
+            return cache_key, docs
+        except Exception as e:
+            log.warning(f"Extraction cache lookup failed for {filename}: {e}")
+            return None, None
+
+    def _get_cache_params(self, filename: str, file_content_type: str) -> dict:
+        params = {
+            "file_ext": filename.split(".")[-1].lower(),
+            "file_content_type": file_content_type,
+            # Used by the local loaders every engine falls back to, and by Tika
+            "PDF_EXTRACT_IMAGES": self.kwargs.get("PDF_EXTRACT_IMAGES"),
+        }
+        for key in ENGINE_CACHE_SETTINGS.get(self.engine, []):
+            params[key] = self.kwargs.get(key)
+        for key in ENGINE_CACHE_CREDENTIALS.get(self.engine, []):
+            params[key] = bool(self.kwargs.get(key))
+        return params
+
+    def _finalize(
+        self, cache_key: Optional[str], docs: list[Document]
+    ) -> list[Document]:
+        docs = [
             Document(
                 page_content=ftfy.fix_text(doc.page_content), metadata=doc.metadata
             )
             for doc in docs
         ]
 
+        if cache_key is not None:
+            EXTRACTION_CACHE.set(cache_key, docs)
+
+        return docs
+
     def _is_text_file(self, file_ext: str, file_content_type: str) -> bool:
         return file_ext in known_source_ext or (
             file_content_type
@@ -261,6 +368,23 @@ class Loader:
         )
 
     def _get_loader(self, filename: str, file_content_type: str, file_path: str):
+        # langchain_community loaders are imported on first use to keep startup light
+        from langchain_community.document_loaders import (
+            AzureAIDocumentIntelligenceLoader,
+            BSHTMLLoader,
+            CSVLoader,
+            Docx2txtLoader,
+            OutlookMessageLoader,
+            PyPDFLoader,
+            TextLoader,
+            UnstructuredEPubLoader,
+            UnstructuredExcelLoader,
+            UnstructuredODTLoader,
+            UnstructuredPowerPointLoader,
+            UnstructuredRSTLoader,
+            UnstructuredXMLLoader,
+        )
+
         file_ext = filename.split(".")[-1].lower()
 
         if (
@@ -374,6 +498,8 @@ class Loader:
                     api_key=self.kwargs.get("DOCUMENT_INTELLIGENCE_KEY"),
                 )
             else:
+                from azure.identity import DefaultAzureCredential
+
                 loader = AzureAIDocumentIntelligenceLoader(
                     file_path=file_path,
                     api_endpoint=self.kwargs.get("DOCUMENT_INTELLIGENCE_ENDPOINT"),
@@ -398,7 +524,15 @@ class Loader:
                 api_key=self.kwargs.get("MISTRAL_OCR_API_KEY"), file_path=file_path
             )
         else:
-            if file_ext == "pdf":
+            if file_ext == "pdf" and ENABLE_PARALLEL_PDF_EXTRACTION:
+                loader = ParallelPDFLoader(
+                    file_path,
+                    extract_images=self.kwargs.get("PDF_EXTRACT_IMAGES"),
+                    max_workers=PDF_EXTRACTION_WORKERS,
+                    pages_per_shard=PDF_EXTRACTION_PAGES_PER_SHARD,
+                    min_pages=PDF_EXTRACTION_MIN_PAGES,
+                )
+            elif file_ext == "pdf":
                 loader = PyPDFLoader(
                     file_path, extract_images=self.kwargs.get("PDF_EXTRACT_IMAGES")
                 )
@@ -0,0 +1,234 @@
+import logging
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Iterator, Optional
+
+from langchain_core.document_loaders import BaseLoader
+from langchain_core.documents import Document
+
+log = logging.getLogger(__name__)
+
+_executor = None
+_executor_workers = None
+_executor_lock = threading.Lock()
+
+
+def get_pdf_executor(max_workers: int) -> ProcessPoolExecutor:
+    """Process pool shared by all PDF extractions, created on first use"""
+    global _executor, _executor_workers
+    with _executor_lock:
+        if _executor is None or _executor_workers != max_workers:
+            if _executor is not None:
+                _executor.shutdown(wait=False, cancel_futures=True)
+            # Forking a multi-threaded server process is unsafe, spawn fresh workers
+            _executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            _executor_workers = max_workers
+        return _executor
+
+
+def shutdown_pdf_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+# The helpers below reproduce PyPDFParser's private page and metadata handling
+# (langchain_community 0.3), so that the output matches PyPDFLoader's without
+# importing private names.
+PARAGRAPH_DELIMITERS = ["\n\n\n", "\n\n"]
+
+
+def merge_text_and_extras(extras: list[str], text: str) -> str:
+    """
+    Inserts extras (the text of images) before the last paragraph break of the
+    text, skipping one in the page footer, or appends them.
+    """
+
+    def merge(text: str, skip_footer: bool) -> Optional[str]:
+        if not extras:
+            return text
+        for delimiter in PARAGRAPH_DELIMITERS:
+            position = text.rfind(delimiter)
+            if position == -1:
+                continue
+            previous = merge(text[:position], False) if skip_footer else None
+            if previous:
+                return previous + text[position:]
+            joined = "\n\n".join(extra for extra in extras if extra)
+            return (
+                text[:position]
+                + (delimiter + joined if joined else "")
+                + text[position:]
+            )
+        return None
+
+    merged = merge(text, True)
+    if not merged:
+        joined = "\n\n".join(extra for extra in extras if extra)
+        merged = text + (PARAGRAPH_DELIMITERS[-1] + joined if joined else "")
+    return merged
+
+
+def purge_metadata(metadata: dict[str, Any]) -> dict[str, Any]:
+    """Normalizes PDF document info keys and values like PyPDFParser"""
+    purged = {}
+    for key, value in metadata.items():
+        if type(value) not in [str, int]:
+            value = str(value)
+        key = key.removeprefix("/").lower()
+        if key in ["creationdate", "moddate"]:
+            try:
+                purged[key] = datetime.strptime(
+                    value.replace("'", ""), "D:%Y%m%d%H%M%S%z"
+                ).isoformat("T")
+            except ValueError:
+                purged[key] = value
+        elif key in ["page_count", "file_path"]:
+            purged["total_pages" if key == "page_count" else "source"] = value
+            purged[key] = value
+        elif isinstance(value, str):
+            purged[key] = value.strip()
+        else:
+            purged[key] = value
+    return purged
+
+
+# Reader of the last document handled by this worker process. Opening a PDF
+# resolves the whole page tree, which would otherwise be repeated for every shard.
+_worker_reader = (None, None)
+
+
+def _get_reader(file_path: str):
+    global _worker_reader
+    import pypdf
+
+    stat = os.stat(file_path)
+    key = (file_path, stat.st_mtime_ns, stat.st_size)
+    if _worker_reader[0] != key:
+        _worker_reader = (key, pypdf.PdfReader(file_path))
+    return _worker_reader[1]
+
+
+def extract_pdf_pages(
+    file_path: str, start: int, end: int, extract_images: bool = False
+) -> list[str]:
+    """
+    Extracts the text of pages [start, end) the same way PyPDFLoader does.
+    Runs in a worker process.
+    """
+    from langchain_community.document_loaders import PyPDFLoader
+
+    parser = PyPDFLoader(file_path, extract_images=extract_images).parser
+    reader = _get_reader(file_path)
+
+    texts = []
+    for page_number in range(start, end):
+        page = reader.pages[page_number]
+        text = page.extract_text(
+            extraction_mode=parser.extraction_mode, **parser.extraction_kwargs
+        )
+        images = parser.extract_images_from_page(page)
+        texts.append(merge_text_and_extras([images], text).strip())
+    return texts
+
+
+class ParallelPDFLoader(BaseLoader):
+    """
+    Drop-in replacement for PyPDFLoader that extracts large PDFs in parallel.
+
+    Documents with at least `min_pages` pages are split into shards of
+    `pages_per_shard` pages which are extracted in a process pool, with at most
+    two shards per worker in flight. Pages are returned in page order. Smaller
+    documents are extracted in-process by PyPDFLoader.
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        extract_images: bool = False,
+        max_workers: Optional[int] = None,
+        pages_per_shard: int = 25,
+        min_pages: int = 50,
+    ):
+        self.file_path = file_path
+        self.extract_images = bool(extract_images)
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.pages_per_shard = max(1, pages_per_shard)
+        self.min_pages = min_pages
+
+    def lazy_load(self) -> Iterator[Document]:
+        import pypdf
+        from langchain_community.document_loaders import PyPDFLoader
+
+        reader = pypdf.PdfReader(self.file_path)
+        total_pages = len(reader.pages)
+
+        if self.max_workers <= 1 or total_pages < self.min_pages:
+            yield from PyPDFLoader(
+                self.file_path, extract_images=self.extract_images
+            ).lazy_load()
+            return
+
+        doc_metadata = purge_metadata(
+            {"producer": "PyPDF", "creator": "PyPDF", "creationdate": ""}
+            | dict(reader.metadata or {})
+            | {"source": self.file_path, "total_pages": total_pages}
+        )
+        page_labels = reader.page_labels
+
+        shards = iter(
+            (start, min(start + self.pages_per_shard, total_pages))
+            for start in range(0, total_pages, self.pages_per_shard)
+        )
+        executor = get_pdf_executor(self.max_workers)
+        log.info(
+            f"Extracting {total_pages} pages of {self.file_path} with {self.max_workers} workers"
+        )
+
+        pending = deque()
+
+        def submit_next():
+            shard = next(shards, None)
+            if shard is not None:
+                pending.append(
+                    (
+                        shard[0],
+                        executor.submit(
+                            extract_pdf_pages,
+                            self.file_path,
+                            *shard,
+                            self.extract_images,
+                        ),
+                    )
+                )
+
+        try:
+            for _ in range(self.max_workers * 2):
+                submit_next()
+
+            while pending:
+                start, future = pending.popleft()
+                texts = future.result()
+                submit_next()
+
+                for page_number, text in enumerate(texts, start):
+                    yield Document(
+                        page_content=text,
+                        metadata=doc_metadata
+                        | {
+                            "page": page_number,
+                            "page_label": page_labels[page_number],
+                        },
+                    )
+        finally:
+            for _, future in pending:
+                future.cancel()
@@ -0,0 +1,138 @@
+import abc
+import asyncio
+import logging
+import threading
+from typing import Any, Coroutine, Optional
+
+import aiohttp
+from langchain_core.documents import Document
+
+from open_webui.env import (
+    DOCUMENT_LOADER_MAX_CONCURRENCY,
+    DOCUMENT_LOADER_POOL_SIZE,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+class LoaderClientPool:
+    """
+    Runs the HTTP calls of the external extraction engines (Tika, Docling,
+    Datalab Marker, external loader) on a single background event loop.
+
+    All loaders share one aiohttp session, so connections to the extraction
+    services are reused, and each engine gets its own semaphore that bounds how
+    many documents are sent to it at once, no matter how many request threads
+    or event loops are extracting documents.
+    """
+
+    def __init__(self, max_concurrency: int, pool_size: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self.pool_size = pool_size
+
+        self._loop = None
+        self._thread = None
+        self._session = None
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=loop.run_forever, name="document-loaders", daemon=True
+                )
+                self._thread.start()
+                self._loop = loop
+        return self._loop
+
+    def get_session(self) -> aiohttp.ClientSession:
+        # Only called from coroutines running on the pool's loop
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.pool_size, keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=None, sock_connect=30),
+                trust_env=True,
+            )
+        return self._session
+
+    def get_semaphore(self, engine: str) -> asyncio.Semaphore:
+        if engine not in self._semaphores:
+            self._semaphores[engine] = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphores[engine]
+
+    def submit(self, coro: Coroutine) -> "asyncio.Future[Any]":
+        return asyncio.run_coroutine_threadsafe(coro, self._get_loop())
+
+    def run(self, coro: Coroutine) -> Any:
+        """Blocks the calling thread until coro has finished on the pool's loop"""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("Cannot block the document loader loop on itself")
+        return self.submit(coro).result()
+
+    async def run_async(self, coro: Coroutine) -> Any:
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def close(self):
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+
+        async def shutdown():
+            if self._session is not None:
+                await self._session.close()
+                self._session = None
+            self._semaphores = {}
+
+        asyncio.run_coroutine_threadsafe(shutdown(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+
+LOADER_CLIENT_POOL = LoaderClientPool(
+    DOCUMENT_LOADER_MAX_CONCURRENCY, DOCUMENT_LOADER_POOL_SIZE
+)
+
+
+class PooledLoader(abc.ABC):
+    """
+    Base for loaders talking to an extraction service through LOADER_CLIENT_POOL.
+
+    Subclasses implement `_aload(session)`. `load()` blocks the calling thread
+    while the request runs on the pool's loop, `aload()` can be awaited from any
+    event loop.
+    """
+
+    engine: str = ""
+
+    @abc.abstractmethod
+    async def _aload(self, session: aiohttp.ClientSession) -> list[Document]:
+        pass
+
+    async def _run(self) -> list[Document]:
+        async with LOADER_CLIENT_POOL.get_semaphore(self.engine):
+            return await self._aload(LOADER_CLIENT_POOL.get_session())
+
+    def load(self) -> list[Document]:
+        return LOADER_CLIENT_POOL.run(self._run())
+
+    async def aload(self) -> list[Document]:
+        return await LOADER_CLIENT_POOL.run_async(self._run())
+
+
+def read_file(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read()
+
+
+def to_form_value(value: Any) -> Optional[str]:
+    # Matches how requests encodes non-string multipart values
+    if value is None:
+        return None
+    return value if isinstance(value, (str, bytes)) else str(value)
@@ -0,0 +1,161 @@
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Optional, Union
+
+import numpy as np
+
+from open_webui.env import SRC_LOG_LEVELS
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+class EmbeddingBatcher:
+    """
+    Serves a local SentenceTransformer model from a single worker thread.
+
+    Concurrent encode() calls are queued and coalesced into micro-batches: the
+    worker collects requests until `max_batch_size` sentences are pending or
+    `max_wait_ms` has passed since the first one, runs one forward pass per prompt
+    and resolves each caller's future with its slice of the embeddings.
+    """
+
+    def __init__(
+        self,
+        model,
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        num_threads: Optional[int] = None,
+    ):
+        self.model = model
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.num_threads = num_threads
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._closed = False
+
+    def __getattr__(self, name):
+        # Expose the wrapped model's attributes (e.g. max_seq_length)
+        if name == "model":
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+    def submit(self, sentences: list[str], prompt: Optional[str] = None) -> Future:
+        future = Future()
+        if not sentences:
+            future.set_result(np.empty((0,), dtype=np.float32))
+            return future
+
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("EmbeddingBatcher is closed")
+
+            if self._worker is None:
+                self._worker = threading.Thread(
+                    target=self._run, name="embedding-batcher", daemon=True
+                )
+                self._worker.start()
+
+            # Under the lock, so no request is queued after close()'s sentinel
+            self._queue.put((list(sentences), prompt, future))
+        return future
+
+    def encode(
+        self, sentences: Union[str, list[str]], prompt: Optional[str] = None, **kwargs
+    ):
+        """
+        SentenceTransformer.encode compatible entry point.
+        """
+        if kwargs:
+            # Custom encode options bypass the batching
+            return self.model.encode(
+                sentences, **({"prompt": prompt} if prompt else {}), **kwargs
+            )
+
+        if isinstance(sentences, str):
+            return self.submit([sentences], prompt).result()[0]
+        return self.submit(sentences, prompt).result()
+
+    def close(self):
+        """Stops the worker once the queued requests are done, blocking until then"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            worker = self._worker
+            if worker is not None:
+                self._queue.put(None)
+
+        if worker is not None:
+            worker.join()
+
+    def _run(self):
+        if self.num_threads:
+            try:
+                import torch
+
+                torch.set_num_threads(self.num_threads)
+            except ImportError:
+                pass
+
+        stopped = False
+        while not stopped:
+            request = self._queue.get()
+            if request is None:
+                break
+
+            batch = [request]
+            size = len(request[0])
+            deadline = time.monotonic() + self.max_wait
+
+            while size < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+
+                try:
+                    request = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+                if request is None:
+                    stopped = True
+                    break
+
+                batch.append(request)
+                size += len(request[0])
+
+            self._process(batch)
+
+    def _process(self, batch: list[tuple[list[str], Optional[str], Future]]):
+        groups = {}
+        for request in batch:
+            groups.setdefault(request[1], []).append(request)
+
+        for prompt, requests in groups.items():
+            sentences = [sentence for request in requests for sentence in request[0]]
+            log.debug(
+                f"EmbeddingBatcher: encoding {len(sentences)} sentences from {len(requests)} requests"
+            )
+
+            try:
+                embeddings = self.model.encode(
+                    sentences,
+                    batch_size=self.max_batch_size,
+                    **({"prompt": prompt} if prompt else {}),
+                )
+            except Exception as e:
+                for _, _, future in requests:
+                    future.set_exception(e)
+                continue
+
+            offset = 0
+            for texts, _, future in requests:
+                future.set_result(embeddings[offset : offset + len(texts)])
+                offset += len(texts)
@@ -4,13 +4,17 @@ from typing import Optional, Union
 
 import requests
 import hashlib
+import heapq
+import itertools
+import operator
+import threading
+from collections import OrderedDict
 from concurrent.futures import ThreadPoolExecutor
 import time
 
+import numpy as np
+
 from urllib.parse import quote
-from huggingface_hub import snapshot_download
-from langchain.retrievers import ContextualCompressionRetriever, EnsembleRetriever
-from langchain_community.retrievers import BM25Retriever
 from langchain_core.documents import Document
 
 from open_webui.config import VECTOR_DB
@@ -22,14 +26,17 @@ from open_webui.models.knowledge import Knowledges
 from open_webui.models.notes import Notes
 
 from open_webui.retrieval.vector.main import GetResult
+from open_webui.retrieval.models.base_reranker import BaseReranker
 from open_webui.utils.access_control import has_access
 from open_webui.utils.pii import apply_pii_masking_to_content
+from open_webui.utils.telemetry.instruments import rag_stage
 
 
 from open_webui.env import (
     SRC_LOG_LEVELS,
     OFFLINE_MODE,
     ENABLE_FORWARD_USER_INFO_HEADERS,
+    RAG_RERANKING_CACHE_SIZE,
 )
 from open_webui.config import (
     RAG_EMBEDDING_QUERY_PREFIX,
@@ -51,6 +58,7 @@ class VectorSearchRetriever(BaseRetriever):
     collection_name: Any
     embedding_function: Any
     top_k: int
+    query_embedding: Optional[list[float]] = None
 
     def _get_relevant_documents(
         self,
@@ -58,11 +66,16 @@ class VectorSearchRetriever(BaseRetriever):
         *,
         run_manager: CallbackManagerForRetrieverRun,
     ) -> list[Document]:
-        result = VECTOR_DB_CLIENT.search(
-            collection_name=self.collection_name,
-            vectors=[self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)],
-            limit=self.top_k,
-        )
+        query_embedding = self.query_embedding
+        if query_embedding is None:
+            query_embedding = self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
+
+        with rag_stage("vector_search"):
+            result = VECTOR_DB_CLIENT.search(
+                collection_name=self.collection_name,
+                vectors=[query_embedding],
+                limit=self.top_k,
+            )
 
         ids = result.ids[0]
         metadatas = result.metadatas[0]
@@ -72,6 +85,7 @@ class VectorSearchRetriever(BaseRetriever):
         for idx in range(len(ids)):
             results.append(
                 Document(
+                    id=str(ids[idx]),
                     metadata=metadatas[idx],
                     page_content=documents[idx],
                 )
@@ -84,11 +98,12 @@ def query_doc(
 ):
     try:
         log.debug(f"query_doc:doc {collection_name}")
-        result = VECTOR_DB_CLIENT.search(
-            collection_name=collection_name,
-            vectors=[query_embedding],
-            limit=k,
-        )
+        with rag_stage("vector_search"):
+            result = VECTOR_DB_CLIENT.search(
+                collection_name=collection_name,
+                vectors=[query_embedding],
+                limit=k,
+            )
 
         if result:
             log.debug(f"query_doc:result {result.ids} {result.metadatas}")
@@ -113,6 +128,222 @@ def get_doc(collection_name: str, user: UserModel = None):
         raise e
 
 
+def get_hybrid_search_candidates(
+    collection_name: str,
+    collection_result: GetResult,
+    query: str,
+    embedding_function,
+    k: int,
+    hybrid_bm25_weight: float,
+    query_embedding: Optional[list[float]] = None,
+) -> list[Document]:
+    """
+    Runs the BM25 / vector ensemble retrieval for a single collection and query,
+    returning the unscored candidates for the reranking stage. Candidates carry
+    their chunk id, so their stored vectors can be looked up for scoring.
+    """
+    if not collection_result.documents[0]:
+        log.warning(f"get_hybrid_search_candidates:no_docs {collection_name}")
+        return []
+
+    log.debug(f"get_hybrid_search_candidates:doc {collection_name}")
+
+    from langchain.retrievers import EnsembleRetriever
+    from langchain_community.retrievers import BM25Retriever
+
+    # Building the index is most of the BM25 cost, its query runs in the ensemble
+    with rag_stage("bm25"):
+        bm25_retriever = BM25Retriever.from_texts(
+            texts=collection_result.documents[0],
+            metadatas=collection_result.metadatas[0],
+            ids=[str(id) for id in collection_result.ids[0]],
+        )
+    bm25_retriever.k = k
+
+    vector_search_retriever = VectorSearchRetriever(
+        collection_name=collection_name,
+        embedding_function=embedding_function,
+        top_k=k,
+        query_embedding=query_embedding,
+    )
+
+    if hybrid_bm25_weight <= 0:
+        ensemble_retriever = EnsembleRetriever(
+            retrievers=[vector_search_retriever], weights=[1.0]
+        )
+    elif hybrid_bm25_weight >= 1:
+        ensemble_retriever = EnsembleRetriever(
+            retrievers=[bm25_retriever], weights=[1.0]
+        )
+    else:
+        ensemble_retriever = EnsembleRetriever(
+            retrievers=[bm25_retriever, vector_search_retriever],
+            weights=[hybrid_bm25_weight, 1.0 - hybrid_bm25_weight],
+        )
+
+    return ensemble_retriever.invoke(query)
+
+
+def get_embedding_matrix(
+    texts: list[str],
+    known: dict[str, list[float]],
+    embed,
+    dimension: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Stacks the embeddings of `texts`, taking them from `known` where possible and
+    embedding the others in a single call. Known vectors of another dimension are
+    embedded again, unless they only carry zero padding (as stored by pgvector).
+    """
+    rows = [None] * len(texts)
+    missing = []
+    for i, text in enumerate(texts):
+        vector = known.get(text)
+        if vector is not None:
+            vector = np.asarray(vector, dtype=np.float32)
+            if dimension is not None and vector.shape[0] != dimension:
+                if vector.shape[0] > dimension and not vector[dimension:].any():
+                    vector = vector[:dimension]
+                else:
+                    vector = None
+        if vector is None:
+            missing.append(i)
+        rows[i] = vector
+
+    if missing:
+        embeddings = embed([texts[i] for i in missing])
+        for i, embedding in zip(missing, embeddings):
+            rows[i] = np.asarray(embedding, dtype=np.float32)
+
+    return np.vstack(rows)
+
+
+@rag_stage("rerank")
+def rerank_documents(
+    query_documents: dict[str, list[Document]],
+    embedding_function,
+    reranking_function,
+    top_n: int,
+    r: float,
+    query_embeddings: Optional[dict[str, list[float]]] = None,
+    document_vectors: Optional[dict[str, list[float]]] = None,
+) -> dict[str, list[Document]]:
+    """
+    Scores the candidates of all queries in one batch and keeps the `top_n` best
+    documents per query whose score reaches `r`.
+
+    Candidates are deduplicated by content per query, so a chunk found in several
+    collections (or by both retrievers) is only scored once. Without a reranking
+    function the cosine similarity of the embeddings is used instead. Query
+    embeddings and stored chunk vectors (keyed by document id) are used when
+    given, only the rest is embedded.
+    """
+    candidates = {}
+    for query, documents in query_documents.items():
+        unique = {}
+        for doc in documents:
+            unique.setdefault(doc.page_content, doc)
+        if unique:
+            candidates[query] = list(unique.values())
+
+    if not candidates:
+        return {query: [] for query in query_documents}
+
+    pairs = [
+        (query, doc.page_content)
+        for query, documents in candidates.items()
+        for doc in documents
+    ]
+
+    if reranking_function is not None:
+        scores = reranking_function(pairs)
+    else:
+        queries = list(candidates.keys())
+        query_embeddings = get_embedding_matrix(
+            queries,
+            query_embeddings or {},
+            lambda texts: embedding_function(texts, RAG_EMBEDDING_QUERY_PREFIX),
+        )
+
+        # Any stored vector of a chunk will do, whichever document carries it
+        stored = {}
+        for documents in candidates.values():
+            for doc in documents:
+                vector = (document_vectors or {}).get(doc.id) if doc.id else None
+                if vector is not None:
+                    stored.setdefault(doc.page_content, vector)
+
+        contents = list({content: None for _, content in pairs})
+        document_embeddings = get_embedding_matrix(
+            contents,
+            stored,
+            lambda texts: embedding_function(texts, RAG_EMBEDDING_CONTENT_PREFIX),
+            dimension=query_embeddings.shape[1],
+        )
+
+        query_embeddings /= np.maximum(
+            np.linalg.norm(query_embeddings, axis=1, keepdims=True), 1e-12
+        )
+        document_embeddings /= np.maximum(
+            np.linalg.norm(document_embeddings, axis=1, keepdims=True), 1e-12
+        )
+        similarities = query_embeddings @ document_embeddings.T
+
+        query_index = {query: i for i, query in enumerate(queries)}
+        content_index = {content: i for i, content in enumerate(contents)}
+        scores = [
+            similarities[query_index[query], content_index[content]]
+            for query, content in pairs
+        ]
+
+    if scores is None:
+        log.warning(
+            "No valid scores found, check your reranking function. Returning original documents."
+        )
+        return {query: list(documents) for query, documents in query_documents.items()}
+
+    scores = iter(scores.tolist() if not isinstance(scores, list) else scores)
+
+    results = {query: [] for query in query_documents}
+    for query, documents in candidates.items():
+        docs_with_scores = [(float(next(scores)), doc) for doc in documents]
+        if r:
+            docs_with_scores = [(s, d) for s, d in docs_with_scores if s >= r]
+
+        results[query] = [
+            Document(
+                page_content=doc.page_content, metadata={**doc.metadata, "score": s}
+            )
+            for s, doc in heapq.nlargest(
+                top_n, docs_with_scores, key=operator.itemgetter(0)
+            )
+        ]
+
+    return results
+
+
+def get_stored_vectors(
+    collection_documents: dict[str, list[Document]],
+) -> dict[str, list[float]]:
+    """
+    Fetches the vectors stored for the documents (by id) in one call per
+    collection. Backends that can't return vectors contribute nothing, and the
+    reranking stage embeds those documents instead.
+    """
+    vectors = {}
+    for collection_name, documents in collection_documents.items():
+        ids = list({doc.id: None for doc in documents if doc.id})
+        if not ids:
+            continue
+        try:
+            vectors.update(
+                VECTOR_DB_CLIENT.get_vectors(collection_name=collection_name, ids=ids)
+            )
+        except Exception as e:
+            log.warning(f"Failed to fetch stored vectors from {collection_name}: {e}")
+    return vectors
+
+
 def query_doc_with_hybrid_search(
     collection_name: str,
     collection_result: GetResult,
@@ -131,61 +362,40 @@ def query_doc_with_hybrid_search(
 
         log.debug(f"query_doc_with_hybrid_search:doc {collection_name}")
 
-        bm25_retriever = BM25Retriever.from_texts(
-            texts=collection_result.documents[0],
-            metadatas=collection_result.metadatas[0],
-        )
-        bm25_retriever.k = k
+        # Embed the query once for both the vector search and the scoring
+        query_embedding = None
+        if hybrid_bm25_weight < 1 or reranking_function is None:
+            query_embedding = embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
 
-        vector_search_retriever = VectorSearchRetriever(
+        candidates = get_hybrid_search_candidates(
             collection_name=collection_name,
+            collection_result=collection_result,
+            query=query,
             embedding_function=embedding_function,
-            top_k=k,
+            k=k,
+            hybrid_bm25_weight=hybrid_bm25_weight,
+            query_embedding=query_embedding,
         )
 
-        if hybrid_bm25_weight <= 0:
-            ensemble_retriever = EnsembleRetriever(
-                retrievers=[vector_search_retriever], weights=[1.0]
-            )
-        elif hybrid_bm25_weight >= 1:
-            ensemble_retriever = EnsembleRetriever(
-                retrievers=[bm25_retriever], weights=[1.0]
-            )
-        else:
-            ensemble_retriever = EnsembleRetriever(
-                retrievers=[bm25_retriever, vector_search_retriever],
-                weights=[hybrid_bm25_weight, 1.0 - hybrid_bm25_weight],
-            )
-
-        compressor = RerankCompressor(
+        # retrieve only min(k, k_reranker) items
+        result = rerank_documents(
+            {query: candidates},
             embedding_function=embedding_function,
-            top_n=k_reranker,
             reranking_function=reranking_function,
-            r_score=r,
-        )
-
-        compression_retriever = ContextualCompressionRetriever(
-            base_compressor=compressor, base_retriever=ensemble_retriever
-        )
-
-        result = compression_retriever.invoke(query)
-
-        distances = [d.metadata.get("score") for d in result]
-        documents = [d.page_content for d in result]
-        metadatas = [d.metadata for d in result]
-
-        # retrieve only min(k, k_reranker) items, sort and cut by distance if k < k_reranker
-        if k < k_reranker:
-            sorted_items = sorted(
-                zip(distances, metadatas, documents), key=lambda x: x[0], reverse=True
-            )
-            sorted_items = sorted_items[:k]
-            distances, documents, metadatas = map(list, zip(*sorted_items))
+            top_n=min(k, k_reranker),
+            r=r,
+            query_embeddings={query: query_embedding},
+            document_vectors=(
+                get_stored_vectors({collection_name: candidates})
+                if reranking_function is None
+                else None
+            ),
+        )[query]
 
         result = {
-            "distances": [distances],
-            "documents": [documents],
-            "metadatas": [metadatas],
+            "distances": [[d.metadata.get("score") for d in result]],
+            "documents": [[d.page_content for d in result]],
+            "metadatas": [[d.metadata for d in result]],
         }
 
         log.info(
@@ -198,64 +408,82 @@ def query_doc_with_hybrid_search(
         raise e
 
 
-def merge_get_results(get_results: list[dict]) -> dict:
-    # Initialize lists to store combined data
-    combined_documents = []
-    combined_metadatas = []
-    combined_ids = []
-
-    for data in get_results:
-        combined_documents.extend(data["documents"][0])
-        combined_metadatas.extend(data["metadatas"][0])
-        combined_ids.extend(data["ids"][0])
-
-    # Create the output dictionary
-    result = {
-        "documents": [combined_documents],
-        "metadatas": [combined_metadatas],
-        "ids": [combined_ids],
+def get_result_column(result: Union[dict, GetResult], key: str) -> list:
+    """
+    Returns the first row of a column of a GetResult / SearchResult, or of its
+    dict form, without copying it.
+    """
+    if isinstance(result, dict):
+        column = result.get(key)
+    else:
+        column = getattr(result, key, None)
+    return column[0] if column else []
+
+
+def get_chunk_key(document: str, metadata) -> Union[tuple, str]:
+    """
+    Identifies a chunk for deduplication. Chunk ids differ between collections
+    holding the same file, so chunks are keyed by their position in the file,
+    falling back to the text itself (its hash is cached by the string).
+    """
+    if isinstance(metadata, dict):
+        file_id = metadata.get("file_id")
+        start_index = metadata.get("start_index")
+        if file_id is not None and start_index is not None:
+            return (file_id, start_index, len(document))
+    return document
+
+
+def merge_get_results(get_results: list[Union[dict, GetResult]]) -> dict:
+    # Concatenate the columns without copying the rows
+    return {
+        key: [
+            list(
+                itertools.chain.from_iterable(
+                    get_result_column(data, key) for data in get_results
+                )
+            )
+        ]
+        for key in ("documents", "metadatas", "ids")
     }
 
-    return result
-
-
-def merge_and_sort_query_results(query_results: list[dict], k: int) -> dict:
-    # Initialize lists to store combined data
-    combined = dict()  # To store documents with unique document hashes
-
-    for data in query_results:
-        distances = data["distances"][0]
-        documents = data["documents"][0]
-        metadatas = data["metadatas"][0]
 
-        for distance, document, metadata in zip(distances, documents, metadatas):
-            if isinstance(document, str):
-                doc_hash = hashlib.sha256(
-                    document.encode()
-                ).hexdigest()  # Compute a hash for uniqueness
-
-                if doc_hash not in combined.keys():
-                    combined[doc_hash] = (distance, document, metadata)
-                    continue  # if doc is new, no further comparison is needed
+def merge_and_sort_query_results(
+    query_results: list[Union[dict, GetResult]], k: int
+) -> dict:
+    """
+    Merges search results into the `k` best distinct chunks. Only the position
+    of the best hit per chunk is kept, and the rows are read from the result
+    columns once the top k are selected.
+    """
+    columns = [
+        (
+            get_result_column(data, "distances"),
+            get_result_column(data, "documents"),
+            get_result_column(data, "metadatas"),
+        )
+        for data in query_results
+    ]
 
-                # if doc is alredy in, but new distance is better, update
-                if distance > combined[doc_hash][0]:
-                    combined[doc_hash] = (distance, document, metadata)
+    best = {}  # chunk key -> (distance, result index, row index)
+    for result_index, (distances, documents, metadatas) in enumerate(columns):
+        for row_index, (distance, document, metadata) in enumerate(
+            zip(distances, documents, metadatas)
+        ):
+            if not isinstance(document, str):
+                continue
 
-    combined = list(combined.values())
-    # Sort the list based on distances
-    combined.sort(key=lambda x: x[0], reverse=True)
+            key = get_chunk_key(document, metadata)
+            current = best.get(key)
+            if current is None or distance > current[0]:
+                best[key] = (distance, result_index, row_index)
 
-    # Slice to keep only the top k elements
-    sorted_distances, sorted_documents, sorted_metadatas = (
-        zip(*combined[:k]) if combined else ([], [], [])
-    )
+    top = heapq.nlargest(k, best.values(), key=operator.itemgetter(0))
 
-    # Create and return the output dictionary
     return {
-        "distances": [list(sorted_distances)],
-        "documents": [list(sorted_documents)],
-        "metadatas": [list(sorted_metadatas)],
+        "distances": [[distance for distance, _, _ in top]],
+        "documents": [[columns[i][1][j] for _, i, j in top]],
+        "metadatas": [[columns[i][2][j] for _, i, j in top]],
     }
 
 
@@ -267,7 +495,7 @@ def get_all_items_from_collections(collection_names: list[str]) -> dict:
             try:
                 result = get_doc(collection_name=collection_name)
                 if result is not None:
-                    results.append(result.model_dump())
+                    results.append(result)
             except Exception as e:
                 log.exception(f"Error when querying the collection: {e}")
         else:
@@ -294,7 +522,7 @@ def query_collection(
                     query_embedding=query_embedding,
                 )
                 if result is not None:
-                    return result.model_dump(), None
+                    return result, None
             return None, None
         except Exception as e:
             log.exception(f"Error when querying the collection: {e}")
@@ -359,23 +587,28 @@ def query_collection_with_hybrid_search(
         f"Starting hybrid search for {len(queries)} queries in {len(collection_names)} collections..."
     )
 
+    # Embed all queries in one call, for the vector searches and the scoring
+    query_embeddings = {}
+    if hybrid_bm25_weight < 1 or reranking_function is None:
+        query_embeddings = dict(
+            zip(queries, embedding_function(queries, RAG_EMBEDDING_QUERY_PREFIX))
+        )
+
     def process_query(collection_name, query):
         try:
-            result = query_doc_with_hybrid_search(
+            candidates = get_hybrid_search_candidates(
                 collection_name=collection_name,
                 collection_result=collection_results[collection_name],
                 query=query,
                 embedding_function=embedding_function,
                 k=k,
-                reranking_function=reranking_function,
-                k_reranker=k_reranker,
-                r=r,
                 hybrid_bm25_weight=hybrid_bm25_weight,
+                query_embedding=query_embeddings.get(query),
             )
-            return result, None
+            return collection_name, query, candidates, None
         except Exception as e:
             log.exception(f"Error when querying the collection with hybrid_search: {e}")
-            return None, e
+            return collection_name, query, None, e
 
     # Prepare tasks for all collections and queries
     # Avoid running any tasks for collections that failed to fetch data (have assigned None)
@@ -390,15 +623,51 @@ def query_collection_with_hybrid_search(
         future_results = [executor.submit(process_query, cn, q) for cn, q in tasks]
         task_results = [future.result() for future in future_results]
 
-    for result, err in task_results:
+    # Gather the candidates of all collections per query, so that every chunk is
+    # reranked once per query in a single batch
+    query_documents = {}
+    collection_documents = {}
+    for collection_name, query, candidates, err in task_results:
         if err is not None:
             error = True
-        elif result is not None:
-            results.append(result)
+        elif candidates is not None:
+            query_documents.setdefault(query, []).extend(candidates)
+            collection_documents.setdefault(collection_name, []).extend(candidates)
 
-    if error and not results:
+    if error and not query_documents:
+        raise Exception(
+            "Hybrid search failed for all collections. Using Non-hybrid search as fallback."
+        )
+
+    # The candidates of all collections are reranked in one batch, so a failure
+    # here fails every collection, and the caller falls back to vector search
+    try:
+        reranked = rerank_documents(
+            query_documents,
+            embedding_function=embedding_function,
+            reranking_function=reranking_function,
+            top_n=min(k, k_reranker),
+            r=r,
+            query_embeddings=query_embeddings,
+            document_vectors=(
+                get_stored_vectors(collection_documents)
+                if reranking_function is None
+                else None
+            ),
+        )
+    except Exception as e:
+        log.exception(f"Error when reranking the hybrid search results: {e}")
         raise Exception(
             "Hybrid search failed for all collections. Using Non-hybrid search as fallback."
+        ) from e
+
+    for documents in reranked.values():
+        results.append(
+            {
+                "distances": [[d.metadata.get("score") for d in documents]],
+                "documents": [[d.page_content for d in documents]],
+                "metadatas": [[d.metadata for d in documents]],
+            }
         )
 
     return merge_and_sort_query_results(results, k=k)
@@ -451,15 +720,102 @@ def get_embedding_function(
         raise ValueError(f"Unknown embedding engine: {embedding_engine}")
 
 
+class RerankingFunction:
+    """
+    Scores (query, document) pairs with a reranking model.
+
+    Recent scores are kept in a small LRU keyed by query and document hash, so
+    chunks that come back for repeated or overlapping queries are not re-scored.
+    All cache misses are sent to the model in a single predict() call, or one
+    call per query for rerankers that only accept a single query (ColBERT and
+    external rerankers).
+    """
+
+    def __init__(
+        self,
+        reranking_engine: str,
+        reranking_model: str,
+        reranker,
+        cache_size: int = RAG_RERANKING_CACHE_SIZE,
+    ):
+        self.reranking_engine = reranking_engine
+        self.reranking_model = reranking_model
+        self.reranker = reranker
+        self.single_query = isinstance(reranker, BaseReranker)
+
+        self.cache_size = max(0, cache_size)
+        self.hits = 0
+        self.misses = 0
+
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __call__(
+        self, sentences: list[tuple[str, str]], user: Optional[UserModel] = None
+    ) -> Optional[list[float]]:
+        keys = [
+            (query, hashlib.sha256(document.encode()).hexdigest())
+            for query, document in sentences
+        ]
+        scores = [None] * len(sentences)
+
+        missing = {}
+        with self._lock:
+            for idx, key in enumerate(keys):
+                score = self._cache.get(key)
+                if score is None:
+                    missing.setdefault(key, sentences[idx])
+                else:
+                    self._cache.move_to_end(key)
+                    scores[idx] = score
+
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+
+        if missing:
+            if self.single_query:
+                groups = {}
+                for key, pair in missing.items():
+                    groups.setdefault(pair[0], []).append(key)
+                batches = list(groups.values())
+            else:
+                batches = [list(missing.keys())]
+
+            computed = {}
+            for batch in batches:
+                batch_scores = self._predict([missing[key] for key in batch], user)
+                if batch_scores is None:
+                    return None
+                if not isinstance(batch_scores, list):
+                    batch_scores = batch_scores.tolist()
+                computed.update(zip(batch, map(float, batch_scores)))
+
+            with self._lock:
+                for key, score in computed.items():
+                    self._cache[key] = score
+                    self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+            for idx, key in enumerate(keys):
+                if scores[idx] is None:
+                    scores[idx] = computed[key]
+
+        return scores
+
+    def _predict(self, sentences, user=None):
+        log.debug(
+            f"RerankingFunction: scoring {len(sentences)} pairs with {self.reranking_model}"
+        )
+        if self.reranking_engine == "external":
+            return self.reranker.predict(sentences, user=user)
+        return self.reranker.predict(sentences)
+
+
 def get_reranking_function(reranking_engine, reranking_model, reranking_function):
     if reranking_function is None:
         return None
-    if reranking_engine == "external":
-        return lambda sentences, user=None: reranking_function.predict(
-            sentences, user=user
-        )
-    else:
-        return lambda sentences, user=None: reranking_function.predict(sentences)
+    return RerankingFunction(reranking_engine, reranking_model, reranking_function)
 
 
 def get_sources_from_items(
@@ -758,6 +1114,8 @@ def get_model_path(model: str, update_model: bool = False):
 
     # Attempt to query the huggingface_hub library to determine the local path and/or to update
     try:
+        from huggingface_hub import snapshot_download
+
         model_repo_path = snapshot_download(**snapshot_kwargs)
         log.debug(f"model_repo_path: {model_repo_path}")
         return model_repo_path
@@ -959,7 +1317,6 @@ def generate_embeddings(
         return embeddings[0] if isinstance(text, str) else embeddings
 
 
-import operator
 from typing import Optional, Sequence
 
 from langchain_core.callbacks import Callbacks
@@ -982,47 +1339,10 @@ class RerankCompressor(BaseDocumentCompressor):
         query: str,
         callbacks: Optional[Callbacks] = None,
     ) -> Sequence[Document]:
-        reranking = self.reranking_function is not None
-
-        scores = None
-        if reranking:
-            scores = self.reranking_function(
-                [(query, doc.page_content) for doc in documents]
-            )
-        else:
-            from sentence_transformers import util
-
-            query_embedding = self.embedding_function(query, RAG_EMBEDDING_QUERY_PREFIX)
-            document_embedding = self.embedding_function(
-                [doc.page_content for doc in documents], RAG_EMBEDDING_CONTENT_PREFIX
-            )
-            scores = util.cos_sim(query_embedding, document_embedding)[0]
-
-        if scores is not None:
-            docs_with_scores = list(
-                zip(
-                    documents,
-                    scores.tolist() if not isinstance(scores, list) else scores,
-                )
-            )
-            if self.r_score:
-                docs_with_scores = [
-                    (d, s) for d, s in docs_with_scores if s >= self.r_score
-                ]
-
-            result = sorted(docs_with_scores, key=operator.itemgetter(1), reverse=True)
-            final_results = []
-            for doc, doc_score in result[: self.top_n]:
-                metadata = doc.metadata
-                metadata["score"] = doc_score
-                doc = Document(
-                    page_content=doc.page_content,
-                    metadata=metadata,
-                )
-                final_results.append(doc)
-            return final_results
-        else:
-            log.warning(
-                "No valid scores found, check your reranking function. Returning original documents."
-            )
-            return documents
+        return rerank_documents(
+            {query: list(documents)},
+            embedding_function=self.embedding_function,
+            reranking_function=self.reranking_function,
+            top_n=self.top_n,
+            r=self.r_score,
+        )[query]
@@ -70,6 +70,24 @@ class ChromaClient(VectorDBBase):
         # Delete the collection based on the collection name.
         return self.client.delete_collection(name=collection_name)
 
+    def list_collections(self) -> list[str]:
+        # Older chromadb versions return Collection objects instead of names.
+        return [
+            collection if isinstance(collection, str) else collection.name
+            for collection in self.client.list_collections()
+        ]
+
+    def get_vectors(self, collection_name: str, ids: list[str]) -> dict:
+        collection = self.client.get_collection(name=collection_name)
+        result = collection.get(ids=ids, include=["embeddings"])
+        return dict(zip(result["ids"], result["embeddings"]))
+
+    def count(self, collection_name: str) -> Optional[int]:
+        try:
+            return self.client.get_collection(name=collection_name).count()
+        except Exception:
+            return None
+
     def search(
         self, collection_name: str, vectors: list[list[float | int]], limit: int
     ) -> Optional[SearchResult]:
@@ -108,7 +126,8 @@ class ChromaClient(VectorDBBase):
             collection = self.client.get_collection(name=collection_name)
             if collection:
                 result = collection.get(
-                    where=filter,
+                    # Chroma rejects an empty where, which matches everything
+                    where=filter or None,
                     limit=limit,
                 )
 
@@ -151,6 +151,40 @@ class ElasticsearchClient(VectorDBBase):
         query = {"query": {"term": {"collection": collection_name}}}
         self.client.delete_by_query(index=f"{self.index_prefix}*", body=query)
 
+    def list_collections(self) -> list[str]:
+        # All collections share the per-dimension indices, so page through the
+        # distinct values of the "collection" keyword field.
+        collection_names = []
+        after = None
+        while True:
+            composite = {
+                "size": 1000,
+                "sources": [{"collection": {"terms": {"field": "collection"}}}],
+            }
+            if after:
+                composite["after"] = after
+            result = self.client.search(
+                index=f"{self.index_prefix}*",
+                body={"size": 0, "aggs": {"collections": {"composite": composite}}},
+            )
+            if "aggregations" not in result.body:
+                # No index has been created yet
+                return collection_names
+            aggregation = result["aggregations"]["collections"]
+            collection_names.extend(
+                bucket["key"]["collection"] for bucket in aggregation["buckets"]
+            )
+            after = aggregation.get("after_key")
+            if not after or not aggregation["buckets"]:
+                return collection_names
+
+    def count(self, collection_name: str) -> Optional[int]:
+        query = {"query": {"term": {"collection": collection_name}}}
+        try:
+            return self.client.count(index=f"{self.index_prefix}*", body=query)["count"]
+        except Exception:
+            return None
+
     # Status: works
     def search(
         self, collection_name: str, vectors: list[list[float]], limit: int
@@ -172,6 +172,36 @@ class MilvusClient(VectorDBBase):
             collection_name=f"{self.collection_prefix}_{collection_name}"
         )
 
+    def list_collections(self) -> list[str]:
+        # Collection names are stored with "-" replaced by "_". The names used by
+        # Open WebUI (file-{id}, web-search-{hash}, uuids) contain no "_", so this
+        # restores them, and the other methods map any name back the same way.
+        prefix = f"{self.collection_prefix}_"
+        return [
+            collection_name[len(prefix) :].replace("_", "-")
+            for collection_name in self.client.list_collections()
+            if collection_name.startswith(prefix)
+        ]
+
+    def get_vectors(self, collection_name: str, ids: list[str]) -> dict:
+        collection_name = collection_name.replace("-", "_")
+        rows = self.client.get(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            ids=ids,
+            output_fields=["id", "vector"],
+        )
+        return {row["id"]: row["vector"] for row in rows}
+
+    def count(self, collection_name: str) -> Optional[int]:
+        collection_name = collection_name.replace("-", "_")
+        try:
+            stats = self.client.get_collection_stats(
+                collection_name=f"{self.collection_prefix}_{collection_name}"
+            )
+            return int(stats["row_count"])
+        except Exception:
+            return None
+
     def search(
         self, collection_name: str, vectors: list[list[float | int]], limit: int
     ) -> Optional[SearchResult]:
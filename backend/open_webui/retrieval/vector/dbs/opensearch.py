@@ -112,6 +112,34 @@ class OpenSearchClient(VectorDBBase):
         # We are simply adapting to the norms of the other DBs.
         self.client.indices.delete(index=self._get_index_name(collection_name))
 
+    def list_collections(self) -> list[str]:
+        prefix = f"{self.index_prefix}_"
+        return [
+            index[len(prefix) :]
+            for index in self.client.indices.get(index=f"{prefix}*")
+            if index.startswith(prefix)
+        ]
+
+    def get_vectors(self, collection_name: str, ids: list[str]) -> dict:
+        result = self.client.mget(
+            index=self._get_index_name(collection_name),
+            body={"ids": ids},
+            _source=["vector"],
+        )
+        return {
+            doc["_id"]: doc["_source"]["vector"]
+            for doc in result["docs"]
+            if doc.get("found")
+        }
+
+    def count(self, collection_name: str) -> Optional[int]:
+        try:
+            return self.client.count(index=self._get_index_name(collection_name))[
+                "count"
+            ]
+        except Exception:
+            return None
+
     def search(
         self, collection_name: str, vectors: list[list[float | int]], limit: int
     ) -> Optional[SearchResult]:
@@ -941,3 +941,46 @@ class Oracle23aiClient(VectorDBBase):
         except Exception as e:
             log.exception(f"Error deleting collection '{collection_name}': {e}")
             raise
+
+    def list_collections(self) -> List[str]:
+        """
+        List the names of all collections.
+
+        Returns:
+            List[str]: Distinct collection names in the document_chunk table
+        """
+        with self.get_connection() as connection:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT DISTINCT collection_name
+                    FROM document_chunk
+                """
+                )
+                return [row[0] for row in cursor.fetchall()]
+
+    def count(self, collection_name: str) -> Optional[int]:
+        """
+        Count the items of a collection.
+
+        Args:
+            collection_name (str): Name of the collection to count
+
+        Returns:
+            Optional[int]: Number of items, or None if the count failed
+        """
+        try:
+            with self.get_connection() as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        """
+                        SELECT COUNT(*)
+                        FROM document_chunk
+                        WHERE collection_name = :collection_name
+                    """,
+                        {"collection_name": collection_name},
+                    )
+                    return cursor.fetchone()[0]
+        except Exception as e:
+            log.exception(f"Error counting collection '{collection_name}': {e}")
+            return None
@@ -1,6 +1,12 @@
 from typing import Optional, List, Dict, Any
+import hashlib
+import io
 import logging
 import json
+import struct
+import threading
+
+import numpy as np
 from sqlalchemy import (
     func,
     literal,
@@ -21,13 +27,14 @@ from sqlalchemy.sql import true
 from sqlalchemy.pool import NullPool, QueuePool
 
 from sqlalchemy.orm import declarative_base, scoped_session, sessionmaker
-from sqlalchemy.dialects.postgresql import JSONB, array
+from sqlalchemy.dialects.postgresql import JSONB, array, insert as pg_insert
 from pgvector.sqlalchemy import Vector
 from sqlalchemy.ext.mutable import MutableDict
 from sqlalchemy.exc import NoSuchTableError
 
 
 from open_webui.retrieval.vector.utils import stringify_metadata
+from open_webui.utils.serialization import json_dumps_bytes
 from open_webui.retrieval.vector.main import (
     VectorDBBase,
     VectorItem,
@@ -44,6 +51,14 @@ from open_webui.config import (
     PGVECTOR_POOL_MAX_OVERFLOW,
     PGVECTOR_POOL_TIMEOUT,
     PGVECTOR_POOL_RECYCLE,
+    PGVECTOR_BULK_BATCH_SIZE,
+    PGVECTOR_INDEX_METHOD,
+    PGVECTOR_HNSW_M,
+    PGVECTOR_HNSW_EF_CONSTRUCTION,
+    PGVECTOR_HNSW_EF_SEARCH,
+    PGVECTOR_IVFFLAT_LISTS,
+    PGVECTOR_IVFFLAT_PROBES,
+    PGVECTOR_PARTIAL_INDEX_MIN_ROWS,
 )
 
 from open_webui.env import SRC_LOG_LEVELS
@@ -63,6 +78,105 @@ def pgcrypto_decrypt(col, key, outtype="text"):
     return func.cast(func.pgp_sym_decrypt(col, literal(key)), outtype)
 
 
+# COPY ... WITH (FORMAT binary) framing
+COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+COPY_TRAILER = struct.pack("!h", -1)
+COPY_FIELD_COUNT = struct.pack("!h", 5)
+COPY_NULL = struct.pack("!i", -1)
+
+# Rows per INSERT ... VALUES when pgcrypto is enabled, 6 parameters each
+ENCRYPTED_BATCH_SIZE = 500
+
+
+def to_vector_matrix(vectors: List[List[float]]) -> np.ndarray:
+    """Stacks vectors into a float32 matrix, padded or truncated to VECTOR_LENGTH"""
+    matrix = np.zeros((len(vectors), VECTOR_LENGTH), dtype=np.float32)
+    for row, vector in zip(matrix, vectors):
+        vector = vector[:VECTOR_LENGTH]
+        row[: len(vector)] = vector
+    return matrix
+
+
+def _copy_field(value: Optional[bytes]) -> bytes:
+    if value is None:
+        return COPY_NULL
+    return struct.pack("!i", len(value)) + value
+
+
+def format_copy_data(collection_name: str, items: List[VectorItem]) -> bytes:
+    """
+    Encodes items as binary COPY rows of (id, vector, collection_name, text,
+    vmetadata). Vectors are sent in pgvector's binary format, so no floats are
+    formatted or parsed as text on either side. Only used without pgcrypto, the
+    rows are plaintext.
+    """
+    vectors = to_vector_matrix([item["vector"] for item in items]).astype(">f4")
+    vector_header = struct.pack("!ihh", 4 + 4 * VECTOR_LENGTH, VECTOR_LENGTH, 0)
+    collection = _copy_field(collection_name.encode())
+
+    parts = [COPY_HEADER]
+    for item, vector in zip(items, vectors):
+        metadata = stringify_metadata(item["metadata"])
+        text = item["text"]
+        parts += [
+            COPY_FIELD_COUNT,
+            _copy_field(str(item["id"]).encode()),
+            vector_header + vector.tobytes(),
+            collection,
+            _copy_field(None if text is None else text.encode()),
+            _copy_field(json_dumps_bytes(metadata)),
+        ]
+    parts.append(COPY_TRAILER)
+    return b"".join(parts)
+
+
+VECTOR_INDEX = "idx_document_chunk_vector"
+# pgvector's HNSW and IVFFlat indexes support up to 2000 dimensions
+MAX_INDEX_DIMENSIONS = 2000
+# hnsw.ef_search accepts values up to 1000
+MAX_EF_SEARCH = 1000
+
+
+def quote_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def get_partial_index_name(collection_name: str) -> str:
+    digest = hashlib.sha1(collection_name.encode()).hexdigest()[:16]
+    return f"{VECTOR_INDEX}_{digest}"
+
+
+def get_index_options() -> Dict[str, int]:
+    if PGVECTOR_INDEX_METHOD == "hnsw":
+        return {"m": PGVECTOR_HNSW_M, "ef_construction": PGVECTOR_HNSW_EF_CONSTRUCTION}
+    elif PGVECTOR_INDEX_METHOD == "ivfflat":
+        return {"lists": PGVECTOR_IVFFLAT_LISTS}
+    return {}
+
+
+def get_vector_index_sql(
+    name: str, collection_name: Optional[str] = None, concurrently: bool = False
+) -> str:
+    """CREATE INDEX statement for the configured ANN index, partial if collection_name is given"""
+    options = ", ".join(
+        f"{key} = {value}" for key, value in get_index_options().items()
+    )
+    sql = (
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {name} "
+        f"ON document_chunk USING {PGVECTOR_INDEX_METHOD} (vector vector_cosine_ops) "
+        f"WITH ({options})"
+    )
+    if collection_name is not None:
+        sql += f" WHERE collection_name = {quote_literal(collection_name)}"
+    return sql
+
+
+def index_matches_config(definition: str) -> bool:
+    return f"USING {PGVECTOR_INDEX_METHOD} " in definition and all(
+        f"{key}='{value}'" in definition for key, value in get_index_options().items()
+    )
+
+
 class DocumentChunk(Base):
     __tablename__ = "document_chunk"
 
@@ -80,6 +194,16 @@ class DocumentChunk(Base):
 
 class PgvectorClient(VectorDBBase):
     def __init__(self) -> None:
+        if PGVECTOR_INDEX_METHOD not in ["hnsw", "ivfflat", "none"]:
+            raise ValueError(
+                f"Unsupported PGVECTOR_INDEX_METHOD '{PGVECTOR_INDEX_METHOD}', use hnsw, ivfflat or none."
+            )
+
+        # Collections with their own partial ANN index, and index builds in progress
+        # (None stands for the table-wide index)
+        self._partial_indexes: Dict[str, str] = {}
+        self._index_builds = set()
+        self._index_lock = threading.Lock()
 
         # if no pgvector uri, use the existing database connection
         if not PGVECTOR_DB_URL:
@@ -157,13 +281,13 @@ class PgvectorClient(VectorDBBase):
             connection = self.session.connection()
             Base.metadata.create_all(bind=connection)
 
-            # Create an index on the vector column if it doesn't exist
-            self.session.execute(
-                text(
-                    "CREATE INDEX IF NOT EXISTS idx_document_chunk_vector "
-                    "ON document_chunk USING ivfflat (vector vector_cosine_ops) WITH (lists = 100);"
+            # Create the ANN index on the vector column if it doesn't exist
+            self.ensure_vector_index()
+            self._partial_indexes = self.get_partial_indexes()
+            if PGVECTOR_INDEX_METHOD != "none" and not self.has_ann_index():
+                log.warning(
+                    f"Not creating a {PGVECTOR_INDEX_METHOD} index, pgvector indexes support at most {MAX_INDEX_DIMENSIONS} dimensions."
                 )
-            )
             self.session.execute(
                 text(
                     "CREATE INDEX IF NOT EXISTS idx_document_chunk_collection_name "
@@ -177,6 +301,351 @@ class PgvectorClient(VectorDBBase):
             log.exception(f"Error during initialization: {e}")
             raise
 
+    def has_ann_index(self) -> bool:
+        return PGVECTOR_INDEX_METHOD != "none" and VECTOR_LENGTH <= MAX_INDEX_DIMENSIONS
+
+    def has_table_index(self) -> bool:
+        # A table-wide index would compete with the partial indexes in the
+        # planner and filters by collection only after the ANN scan, so with
+        # partial indexes small collections are searched exactly instead
+        return self.has_ann_index() and PGVECTOR_PARTIAL_INDEX_MIN_ROWS <= 0
+
+    def ensure_vector_index(self) -> None:
+        definition = self.session.execute(
+            text(
+                "SELECT indexdef FROM pg_indexes "
+                "WHERE tablename = 'document_chunk' AND indexname = :name"
+            ),
+            {"name": VECTOR_INDEX},
+        ).scalar()
+
+        if not self.has_table_index():
+            if definition is not None:
+                log.warning(
+                    f"{VECTOR_INDEX} is not used with PGVECTOR_PARTIAL_INDEX_MIN_ROWS set. "
+                    "Drop it with POST /api/v1/retrieval/vector/indexes/rebuild."
+                )
+        elif definition is None:
+            self.session.execute(text(get_vector_index_sql(VECTOR_INDEX)))
+        elif not index_matches_config(definition):
+            log.warning(
+                f"{VECTOR_INDEX} does not match the PGVECTOR_INDEX_METHOD settings ({definition}). "
+                "Rebuild it with POST /api/v1/retrieval/vector/indexes/rebuild."
+            )
+
+    def get_partial_indexes(self) -> Dict[str, str]:
+        # Partial indexes carry their collection name as comment
+        rows = self.session.execute(
+            text(
+                "SELECT c.relname AS name, obj_description(c.oid, 'pg_class') AS collection_name "
+                "FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE i.indrelid = 'document_chunk'::regclass AND i.indpred IS NOT NULL "
+                "AND obj_description(c.oid, 'pg_class') IS NOT NULL"
+            )
+        ).all()
+        return {row.collection_name: row.name for row in rows}
+
+    def _maybe_index_collection(self, collection_name: str) -> None:
+        """Starts building a partial ANN index once a collection is large enough"""
+        if PGVECTOR_PARTIAL_INDEX_MIN_ROWS <= 0 or not self.has_ann_index():
+            return
+        with self._index_lock:
+            if (
+                collection_name in self._partial_indexes
+                or collection_name in self._index_builds
+            ):
+                return
+
+        try:
+            rows = self.session.execute(
+                select(func.count())
+                .select_from(DocumentChunk)
+                .where(DocumentChunk.collection_name == collection_name)
+            ).scalar()
+            self.session.rollback()  # read-only transaction
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error counting collection rows: {e}")
+            return
+
+        if rows >= PGVECTOR_PARTIAL_INDEX_MIN_ROWS:
+            self._start_index_builds([collection_name])
+
+    def _start_index_builds(
+        self, collection_names: List[Optional[str]], replace: bool = False
+    ) -> bool:
+        with self._index_lock:
+            collection_names = [
+                name for name in collection_names if name not in self._index_builds
+            ]
+            if not collection_names:
+                return False
+            self._index_builds.update(collection_names)
+
+        threading.Thread(
+            target=self._build_indexes,
+            args=(collection_names, replace),
+            name="pgvector-index",
+            daemon=True,
+        ).start()
+        return True
+
+    def _build_indexes(
+        self, collection_names: List[Optional[str]], replace: bool
+    ) -> None:
+        """
+        Builds the ANN indexes of the given collections (None for the table-wide
+        index) with CREATE INDEX CONCURRENTLY, so searches and writes continue
+        meanwhile. With replace, a new index is built next to the existing one
+        and swapped in afterwards.
+        """
+        engine = self.session.get_bind()
+        for collection_name in collection_names:
+            if collection_name is None:
+                name = VECTOR_INDEX
+                create = self.has_table_index()
+            else:
+                name = get_partial_index_name(collection_name)
+                create = self.has_ann_index()
+            target = f"{name}_rebuild" if replace else name
+
+            try:
+                with engine.connect().execution_options(
+                    isolation_level="AUTOCOMMIT"
+                ) as connection:
+                    if replace:
+                        connection.execute(
+                            text(f"DROP INDEX CONCURRENTLY IF EXISTS {target}")
+                        )
+                    if create:
+                        log.info(f"Building vector index {name}")
+                        connection.execute(
+                            text(
+                                get_vector_index_sql(
+                                    target, collection_name, concurrently=True
+                                )
+                            )
+                        )
+                    if replace:
+                        connection.execute(
+                            text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+                        )
+                        if create:
+                            connection.execute(
+                                text(f"ALTER INDEX {target} RENAME TO {name}")
+                            )
+
+                    if collection_name is not None:
+                        if create:
+                            connection.execute(
+                                text(
+                                    f"COMMENT ON INDEX {name} IS {quote_literal(collection_name)}"
+                                )
+                            )
+                        with self._index_lock:
+                            if create:
+                                self._partial_indexes[collection_name] = name
+                            else:
+                                self._partial_indexes.pop(collection_name, None)
+                log.info(f"Vector index {name} is ready")
+            except Exception as e:
+                log.exception(f"Error building vector index {name}: {e}")
+                # A failed concurrent build leaves an invalid index behind. The
+                # name may also be a valid index, or one still being built, of
+                # another worker that won the race to build it, so only an
+                # invalid index nobody is building is dropped.
+                try:
+                    with engine.connect().execution_options(
+                        isolation_level="AUTOCOMMIT"
+                    ) as connection:
+                        if connection.execute(
+                            text(
+                                "SELECT NOT i.indisvalid AND NOT EXISTS ("
+                                " SELECT 1 FROM pg_stat_progress_create_index p"
+                                " WHERE p.index_relid = i.indexrelid) "
+                                "FROM pg_index i "
+                                "JOIN pg_class c ON c.oid = i.indexrelid "
+                                "WHERE i.indrelid = 'document_chunk'::regclass "
+                                "AND c.relname = :name"
+                            ),
+                            {"name": target},
+                        ).scalar():
+                            connection.execute(
+                                text(f"DROP INDEX CONCURRENTLY IF EXISTS {target}")
+                            )
+                except Exception:
+                    pass
+            finally:
+                with self._index_lock:
+                    self._index_builds.discard(collection_name)
+
+    def _drop_partial_indexes(self, collection_name: Optional[str] = None) -> None:
+        """
+        Drops the partial ANN indexes of a collection, or all of them. They are
+        looked up in pg_index, as another worker may have built them.
+        """
+        with self._index_lock:
+            if collection_name is None:
+                self._partial_indexes.clear()
+            else:
+                self._partial_indexes.pop(collection_name, None)
+
+        if collection_name is None:
+            condition = "c.relname LIKE :prefix"
+            params = {"prefix": f"{VECTOR_INDEX}\\_%"}
+        else:
+            name = get_partial_index_name(collection_name)
+            # Also an unfinished rebuild of the index
+            condition = "c.relname IN (:name, :rebuild)"
+            params = {"name": name, "rebuild": f"{name}_rebuild"}
+
+        try:
+            with (
+                self.session.get_bind()
+                .connect()
+                .execution_options(isolation_level="AUTOCOMMIT") as connection
+            ):
+                names = connection.execute(
+                    text(
+                        "SELECT c.relname FROM pg_index i "
+                        "JOIN pg_class c ON c.oid = i.indexrelid "
+                        "WHERE i.indrelid = 'document_chunk'::regclass "
+                        f"AND i.indpred IS NOT NULL AND {condition}"
+                    ),
+                    params,
+                ).scalars()
+                for name in list(names):
+                    connection.execute(
+                        text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+                    )
+        except Exception as e:
+            log.exception(f"Error dropping partial vector indexes: {e}")
+
+    def rebuild_vector_indexes(self) -> bool:
+        """
+        Rebuilds the table-wide and all partial ANN indexes in the background
+        with the current settings. Returns False if a build is already running.
+        """
+        # Other workers may have built partial indexes this one doesn't know of
+        try:
+            partial_indexes = self.get_partial_indexes()
+            self.session.rollback()  # read-only transaction
+        except Exception:
+            self.session.rollback()
+            raise
+        with self._index_lock:
+            self._partial_indexes = partial_indexes
+        return self._start_index_builds([None, *partial_indexes], replace=True)
+
+    def _set_search_params(self, limit: Optional[int]) -> None:
+        # SET LOCAL only lasts until the end of the search's transaction
+        if PGVECTOR_INDEX_METHOD == "hnsw":
+            # HNSW returns at most ef_search rows per scan
+            ef_search = min(max(PGVECTOR_HNSW_EF_SEARCH, limit or 0), MAX_EF_SEARCH)
+            self.session.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+        elif PGVECTOR_INDEX_METHOD == "ivfflat":
+            self.session.execute(
+                text(f"SET LOCAL ivfflat.probes = {int(PGVECTOR_IVFFLAT_PROBES)}")
+            )
+
+    def get_index_health(self, limit: int = 50) -> Dict[str, Any]:
+        """
+        Reports the ANN index settings, the size and usage of every index on
+        document_chunk, running index builds and the largest collections.
+        """
+        try:
+            table = (
+                self.session.execute(
+                    text(
+                        "SELECT reltuples::bigint AS estimated_rows, "
+                        "pg_total_relation_size(oid) AS total_size, "
+                        "pg_indexes_size(oid) AS index_size "
+                        "FROM pg_class WHERE oid = 'document_chunk'::regclass"
+                    )
+                )
+                .one()
+                ._asdict()
+            )
+
+            indexes = []
+            for row in self.session.execute(
+                text(
+                    "SELECT c.relname AS name, am.amname AS method, "
+                    "pg_relation_size(c.oid) AS size, i.indisvalid AS valid, "
+                    "coalesce(s.idx_scan, 0) AS scans, "
+                    "pg_get_indexdef(c.oid) AS definition, "
+                    "obj_description(c.oid, 'pg_class') AS collection_name "
+                    "FROM pg_index i "
+                    "JOIN pg_class c ON c.oid = i.indexrelid "
+                    "JOIN pg_am am ON am.oid = c.relam "
+                    "LEFT JOIN pg_stat_user_indexes s ON s.indexrelid = c.oid "
+                    "WHERE i.indrelid = 'document_chunk'::regclass "
+                    "ORDER BY c.relname"
+                )
+            ).all():
+                index = row._asdict()
+                if index["name"] == VECTOR_INDEX:
+                    index["matches_config"] = self.has_table_index() and (
+                        index_matches_config(index["definition"])
+                    )
+                elif index["method"] in ["hnsw", "ivfflat"]:
+                    index["matches_config"] = index_matches_config(index["definition"])
+                indexes.append(index)
+
+            builds = [
+                row._asdict()
+                for row in self.session.execute(
+                    text(
+                        "SELECT index_relid::regclass::text AS name, phase, "
+                        "blocks_done, blocks_total, tuples_done, tuples_total "
+                        "FROM pg_stat_progress_create_index "
+                        "WHERE relid = 'document_chunk'::regclass"
+                    )
+                ).all()
+            ]
+
+            with self._index_lock:
+                partial_indexes = dict(self._partial_indexes)
+            collections = [
+                {
+                    "collection_name": row.collection_name,
+                    "rows": row.rows,
+                    "partial_index": partial_indexes.get(row.collection_name),
+                }
+                for row in self.session.execute(
+                    select(
+                        DocumentChunk.collection_name,
+                        func.count().label("rows"),
+                    )
+                    .group_by(DocumentChunk.collection_name)
+                    .order_by(func.count().desc())
+                    .limit(limit)
+                ).all()
+            ]
+
+            extension_version = self.session.execute(
+                text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+            ).scalar()
+
+            self.session.rollback()  # read-only transaction
+            return {
+                "index_method": PGVECTOR_INDEX_METHOD,
+                "index_options": get_index_options(),
+                "ef_search": PGVECTOR_HNSW_EF_SEARCH,
+                "probes": PGVECTOR_IVFFLAT_PROBES,
+                "partial_index_min_rows": PGVECTOR_PARTIAL_INDEX_MIN_ROWS,
+                "vector_length": VECTOR_LENGTH,
+                "extension_version": extension_version,
+                "table": table,
+                "indexes": indexes,
+                "builds": builds,
+                "collections": collections,
+            }
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error getting index health: {e}")
+            raise
+
     def check_vector_length(self) -> None:
         """
         Check if the VECTOR_LENGTH matches the existing vector column dimension in the database.
@@ -216,134 +685,150 @@ class PgvectorClient(VectorDBBase):
         # Adjust vector to have length VECTOR_LENGTH
         current_length = len(vector)
         if current_length < VECTOR_LENGTH:
-            # Pad the vector with zeros
-            vector += [0.0] * (VECTOR_LENGTH - current_length)
+            # Pad the vector with zeros, without modifying the caller's list
+            vector = list(vector) + [0.0] * (VECTOR_LENGTH - current_length)
         elif current_length > VECTOR_LENGTH:
             # Truncate the vector to VECTOR_LENGTH
             vector = vector[:VECTOR_LENGTH]
         return vector
 
-    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+    def _copy(self, data: bytes) -> None:
+        cursor = self.session.connection().connection.cursor()
         try:
-            if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    # Use raw SQL for BYTEA/pgcrypto
-                    # Ensure metadata is converted to its JSON text representation
-                    json_metadata = json.dumps(item["metadata"])
-                    self.session.execute(
-                        text(
-                            """
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO NOTHING
-                        """
-                        ),
-                        {
-                            "id": item["id"],
-                            "vector": vector,
-                            "collection_name": collection_name,
-                            "text": item["text"],
-                            "metadata_text": json_metadata,
-                            "key": PGVECTOR_PGCRYPTO_KEY,
-                        },
-                    )
-                self.session.commit()
-                log.info(f"Encrypted & inserted {len(items)} into '{collection_name}'")
-
+            sql = (
+                "COPY document_chunk_staging "
+                "(id, vector, collection_name, text, vmetadata) "
+                "FROM STDIN WITH (FORMAT binary)"
+            )
+            if hasattr(cursor, "copy_expert"):
+                # psycopg2
+                cursor.copy_expert(sql, io.BytesIO(data))
             else:
-                new_items = []
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    new_chunk = DocumentChunk(
-                        id=item["id"],
-                        vector=vector,
-                        collection_name=collection_name,
-                        text=item["text"],
-                        vmetadata=stringify_metadata(item["metadata"]),
-                    )
-                    new_items.append(new_chunk)
-                self.session.bulk_save_objects(new_items)
-                self.session.commit()
-                log.info(
-                    f"Inserted {len(new_items)} items into collection '{collection_name}'."
+                # psycopg 3
+                with cursor.copy(sql) as copy:
+                    copy.write(data)
+        finally:
+            cursor.close()
+
+    def _bulk_write(
+        self, collection_name: str, items: List[VectorItem], update: bool
+    ) -> int:
+        """
+        Writes items with COPY into a transaction-local staging table and moves
+        them into document_chunk with a single INSERT ... SELECT. With update,
+        existing ids are updated, otherwise a duplicate id fails the insert.
+
+        With pgcrypto, plaintext must not reach a table (a temp table may spill
+        to disk), so rows are encrypted within multi-row INSERT ... VALUES
+        statements instead.
+        """
+        if PGVECTOR_PGCRYPTO:
+            return self._encrypted_write(collection_name, items, update)
+
+        if update:
+            # The same id twice in one statement would fail ON CONFLICT DO UPDATE
+            items = list({item["id"]: item for item in items}.values())
+
+        self.session.execute(
+            text(
+                "CREATE TEMP TABLE IF NOT EXISTS document_chunk_staging ("
+                "id text, vector vector, collection_name text, text text, vmetadata text"
+                ") ON COMMIT DROP"
+            )
+        )
+        for i in range(0, len(items), PGVECTOR_BULK_BATCH_SIZE):
+            self._copy(
+                format_copy_data(
+                    collection_name, items[i : i + PGVECTOR_BULK_BATCH_SIZE]
                 )
+            )
+
+        conflict = ""
+        if update:
+            conflict = (
+                " ON CONFLICT (id) DO UPDATE SET "
+                "vector = EXCLUDED.vector, "
+                "collection_name = EXCLUDED.collection_name, "
+                "text = EXCLUDED.text, "
+                "vmetadata = EXCLUDED.vmetadata"
+            )
+
+        result = self.session.execute(
+            text(
+                "INSERT INTO document_chunk (id, vector, collection_name, text, vmetadata) "
+                "SELECT id, vector, collection_name, text, vmetadata::jsonb "
+                f"FROM document_chunk_staging{conflict}"
+            )
+        )
+        return result.rowcount
+
+    def _encrypted_write(
+        self, collection_name: str, items: List[VectorItem], update: bool
+    ) -> int:
+        """
+        Inserts items with pgp_sym_encrypt applied to text and metadata in the
+        statement. Existing ids are skipped (the first of duplicate ids wins),
+        or updated (the last wins) when update is set.
+        """
+        if update:
+            items = list({item["id"]: item for item in items}.values())
+
+        written = 0
+        for i in range(0, len(items), ENCRYPTED_BATCH_SIZE):
+            batch = items[i : i + ENCRYPTED_BATCH_SIZE]
+            vectors = to_vector_matrix([item["vector"] for item in batch])
+            stmt = pg_insert(DocumentChunk.__table__).values(
+                [
+                    {
+                        "id": item["id"],
+                        "vector": vector,
+                        "collection_name": collection_name,
+                        "text": pgcrypto_encrypt(item["text"], PGVECTOR_PGCRYPTO_KEY),
+                        "vmetadata": pgcrypto_encrypt(
+                            json.dumps(item["metadata"]), PGVECTOR_PGCRYPTO_KEY
+                        ),
+                    }
+                    for item, vector in zip(batch, vectors)
+                ]
+            )
+            if update:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=["id"],
+                    set_={
+                        name: stmt.excluded[name]
+                        for name in ("vector", "collection_name", "text", "vmetadata")
+                    },
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=["id"])
+            written += self.session.execute(stmt).rowcount
+        return written
+
+    def insert(self, collection_name: str, items: List[VectorItem]) -> None:
+        if not items:
+            return
+        try:
+            inserted = self._bulk_write(collection_name, items, update=False)
+            self.session.commit()
+            log.info(f"Inserted {inserted} items into collection '{collection_name}'.")
         except Exception as e:
             self.session.rollback()
             log.exception(f"Error during insert: {e}")
             raise
+        self._maybe_index_collection(collection_name)
 
     def upsert(self, collection_name: str, items: List[VectorItem]) -> None:
+        if not items:
+            return
         try:
-            if PGVECTOR_PGCRYPTO:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    json_metadata = json.dumps(item["metadata"])
-                    self.session.execute(
-                        text(
-                            """
-                            INSERT INTO document_chunk
-                            (id, vector, collection_name, text, vmetadata)
-                            VALUES (
-                                :id, :vector, :collection_name,
-                                pgp_sym_encrypt(:text, :key),
-                                pgp_sym_encrypt(:metadata_text, :key)
-                            )
-                            ON CONFLICT (id) DO UPDATE SET
-                              vector = EXCLUDED.vector,
-                              collection_name = EXCLUDED.collection_name,
-                              text = EXCLUDED.text,
-                              vmetadata = EXCLUDED.vmetadata
-                        """
-                        ),
-                        {
-                            "id": item["id"],
-                            "vector": vector,
-                            "collection_name": collection_name,
-                            "text": item["text"],
-                            "metadata_text": json_metadata,
-                            "key": PGVECTOR_PGCRYPTO_KEY,
-                        },
-                    )
-                self.session.commit()
-                log.info(f"Encrypted & upserted {len(items)} into '{collection_name}'")
-            else:
-                for item in items:
-                    vector = self.adjust_vector_length(item["vector"])
-                    existing = (
-                        self.session.query(DocumentChunk)
-                        .filter(DocumentChunk.id == item["id"])
-                        .first()
-                    )
-                    if existing:
-                        existing.vector = vector
-                        existing.text = item["text"]
-                        existing.vmetadata = stringify_metadata(item["metadata"])
-                        existing.collection_name = (
-                            collection_name  # Update collection_name if necessary
-                        )
-                    else:
-                        new_chunk = DocumentChunk(
-                            id=item["id"],
-                            vector=vector,
-                            collection_name=collection_name,
-                            text=item["text"],
-                            vmetadata=stringify_metadata(item["metadata"]),
-                        )
-                        self.session.add(new_chunk)
-                self.session.commit()
-                log.info(
-                    f"Upserted {len(items)} items into collection '{collection_name}'."
-                )
+            upserted = self._bulk_write(collection_name, items, update=True)
+            self.session.commit()
+            log.info(f"Upserted {upserted} items into collection '{collection_name}'.")
         except Exception as e:
             self.session.rollback()
             log.exception(f"Error during upsert: {e}")
             raise
+        self._maybe_index_collection(collection_name)
 
     def search(
         self,
@@ -422,6 +907,7 @@ class PgvectorClient(VectorDBBase):
                 .order_by(query_vectors.c.qid, subq.c.distance)
             )
 
+            self._set_search_params(limit)
             result_proxy = self.session.execute(stmt)
             results = result_proxy.all()
 
@@ -612,6 +1098,7 @@ class PgvectorClient(VectorDBBase):
             self.session.rollback()
             log.exception(f"Error during reset: {e}")
             raise
+        self._drop_partial_indexes()
 
     def close(self) -> None:
         pass
@@ -633,4 +1120,60 @@ class PgvectorClient(VectorDBBase):
 
     def delete_collection(self, collection_name: str) -> None:
         self.delete(collection_name)
+        self._drop_partial_indexes(collection_name)
         log.info(f"Collection '{collection_name}' deleted.")
+
+    def list_collections(self) -> List[str]:
+        # Loose index scan: jump from one collection name to the next through
+        # idx_document_chunk_collection_name instead of reading every row.
+        try:
+            rows = self.session.execute(
+                text(
+                    "WITH RECURSIVE names AS ("
+                    " SELECT min(collection_name) AS name FROM document_chunk"
+                    " UNION ALL"
+                    " SELECT (SELECT min(collection_name) FROM document_chunk"
+                    " WHERE collection_name > names.name)"
+                    " FROM names WHERE names.name IS NOT NULL"
+                    ") SELECT name FROM names WHERE name IS NOT NULL"
+                )
+            ).fetchall()
+            self.session.rollback()  # read-only transaction
+            return [row[0] for row in rows]
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error listing collections: {e}")
+            raise
+
+    def get_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Dict[str, List[float]]:
+        try:
+            rows = (
+                self.session.query(DocumentChunk.id, DocumentChunk.vector)
+                .filter(
+                    DocumentChunk.collection_name == collection_name,
+                    DocumentChunk.id.in_(ids),
+                )
+                .all()
+            )
+            self.session.rollback()  # read-only transaction
+            return {id: vector for id, vector in rows}
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error fetching vectors from '{collection_name}': {e}")
+            return {}
+
+    def count(self, collection_name: str) -> Optional[int]:
+        try:
+            count = (
+                self.session.query(func.count(DocumentChunk.id))
+                .filter(DocumentChunk.collection_name == collection_name)
+                .scalar()
+            )
+            self.session.rollback()  # read-only transaction
+            return count
+        except Exception as e:
+            self.session.rollback()
+            log.exception(f"Error counting collection '{collection_name}': {e}")
+            return None
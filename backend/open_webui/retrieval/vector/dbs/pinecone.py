@@ -264,6 +264,19 @@ class PineconeClient(VectorDBBase):
             )
             raise
 
+    def get_vectors(self, collection_name: str, ids: List[str]) -> Dict[str, Any]:
+        """Fetch the stored vectors of a collection by ID."""
+        collection_name_with_prefix = self._get_collection_name_with_prefix(
+            collection_name
+        )
+        response = self.index.fetch(ids=ids)
+        return {
+            id: vector.values
+            for id, vector in response.vectors.items()
+            if (vector.metadata or {}).get("collection_name")
+            == collection_name_with_prefix
+        }
+
     def insert(self, collection_name: str, items: List[VectorItem]) -> None:
         """Insert vectors into a collection."""
         if not items:
@@ -146,6 +146,31 @@ class QdrantClient(VectorDBBase):
             collection_name=f"{self.collection_prefix}_{collection_name}"
         )
 
+    def list_collections(self) -> list[str]:
+        prefix = f"{self.collection_prefix}_"
+        return [
+            collection.name[len(prefix) :]
+            for collection in self.client.get_collections().collections
+            if collection.name.startswith(prefix)
+        ]
+
+    def get_vectors(self, collection_name: str, ids: list[str]) -> dict:
+        points = self.client.retrieve(
+            collection_name=f"{self.collection_prefix}_{collection_name}",
+            ids=ids,
+            with_payload=False,
+            with_vectors=True,
+        )
+        return {str(point.id): point.vector for point in points}
+
+    def count(self, collection_name: str) -> Optional[int]:
+        try:
+            return self.client.count(
+                collection_name=f"{self.collection_prefix}_{collection_name}"
+            ).count
+        except Exception:
+            return None
+
     def search(
         self, collection_name: str, vectors: list[list[float | int]], limit: int
     ) -> Optional[SearchResult]:
@@ -347,6 +347,66 @@ class QdrantClient(VectorDBBase):
             if collection.name.startswith(self.collection_prefix):
                 self.client.delete_collection(collection_name=collection.name)
 
+    def list_collections(self) -> List[str]:
+        """
+        List logical collections as the distinct tenant IDs of the shared collections.
+        """
+        if not self.client:
+            return []
+        collection_names = []
+        for mt_collection in (
+            self.MEMORY_COLLECTION,
+            self.KNOWLEDGE_COLLECTION,
+            self.FILE_COLLECTION,
+            self.WEB_SEARCH_COLLECTION,
+            self.HASH_BASED_COLLECTION,
+        ):
+            if not self.client.collection_exists(collection_name=mt_collection):
+                continue
+            # tenant_id carries a keyword index, so faceting doesn't scan payloads
+            facets = self.client.facet(
+                collection_name=mt_collection,
+                key=TENANT_ID_FIELD,
+                limit=NO_LIMIT,
+            )
+            collection_names.extend(str(hit.value) for hit in facets.hits)
+        return collection_names
+
+    def get_vectors(self, collection_name: str, ids: List[str]) -> Dict[str, Any]:
+        """
+        Retrieve the stored vectors of points of a logical collection by ID.
+        """
+        if not self.client:
+            return {}
+        mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
+        if not self.client.collection_exists(collection_name=mt_collection):
+            return {}
+        points = self.client.retrieve(
+            collection_name=mt_collection,
+            ids=ids,
+            with_payload=[TENANT_ID_FIELD],
+            with_vectors=True,
+        )
+        return {
+            str(point.id): point.vector
+            for point in points
+            if point.payload.get(TENANT_ID_FIELD) == tenant_id
+        }
+
+    def count(self, collection_name: str) -> Optional[int]:
+        """
+        Count the points of a logical collection.
+        """
+        if not self.client:
+            return None
+        mt_collection, tenant_id = self._get_collection_and_tenant_id(collection_name)
+        if not self.client.collection_exists(collection_name=mt_collection):
+            return 0
+        return self.client.count(
+            collection_name=mt_collection,
+            count_filter=models.Filter(must=[_tenant_filter(tenant_id)]),
+        ).count
+
     def delete_collection(self, collection_name: str):
         """
         Delete a collection.
@@ -149,6 +149,21 @@ class S3VectorClient(VectorDBBase):
             log.error(f"Error deleting collection '{collection_name}': {e}")
             raise
 
+    def list_collections(self) -> List[str]:
+        """
+        List all vector indexes (collections) in the S3 vector bucket.
+        """
+        collection_names = []
+        kwargs = {"vectorBucketName": self.bucket_name}
+        while True:
+            response = self.client.list_indexes(**kwargs)
+            collection_names.extend(
+                idx["indexName"] for idx in response.get("indexes", [])
+            )
+            if not response.get("nextToken"):
+                return collection_names
+            kwargs["nextToken"] = response["nextToken"]
+
     def insert(self, collection_name: str, items: List[VectorItem]) -> None:
         """
         Insert vector items into the S3 Vector index. Create index if it does not exist.
@@ -0,0 +1,204 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from typing import Optional
+
+from pydantic import BaseModel
+
+from open_webui.config import CACHE_DIR
+from open_webui.env import (
+    SRC_LOG_LEVELS,
+    VECTOR_DB_GC_INTERVAL,
+    VECTOR_DB_GC_ORPHAN_GRACE_PERIOD,
+    WEB_SEARCH_COLLECTION_TTL,
+)
+from open_webui.models.files import Files
+from open_webui.models.knowledge import Knowledges
+from open_webui.retrieval.vector.main import VectorDBBase
+from open_webui.utils.redis import run_periodically
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+FILE_COLLECTION_PREFIX = "file-"
+WEB_SEARCH_COLLECTION_PREFIX = "web-search-"
+# Knowledge bases use their id, a lowercase uuid4, as collection name
+KNOWLEDGE_COLLECTION_PATTERN = re.compile(
+    r"^[0-9a-f]{8}-[0-9a-f]{4}-4[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$"
+)
+
+# When web search collections without a created_at timestamp (written before
+# they carried one) and knowledge-like collections without a knowledge base were
+# first seen, kept across restarts so that they still get a full TTL and grace
+# period
+GC_STATE_PATH = CACHE_DIR / "vector_db_gc.json"
+
+
+class CollectionGarbage(BaseModel):
+    collection_name: str
+    reason: str
+    vectors: Optional[int] = None
+
+
+class VectorDBGarbageReport(BaseModel):
+    dry_run: bool
+    collections: int
+    removed: list[CollectionGarbage] = []
+    failed: list[str] = []
+    reclaimed_vectors: int = 0
+    duration: float = 0.0
+
+
+def load_first_seen() -> dict[str, float]:
+    try:
+        first_seen = json.loads(GC_STATE_PATH.read_text())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        log.warning(f"Unreadable vector DB garbage collection state: {e}")
+        return {}
+    return {
+        collection_name: float(seen_at)
+        for collection_name, seen_at in first_seen.items()
+        if isinstance(seen_at, (int, float))
+    }
+
+
+def save_first_seen(first_seen: dict[str, float]) -> None:
+    tmp_path = GC_STATE_PATH.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(first_seen))
+    os.replace(tmp_path, GC_STATE_PATH)
+
+
+def get_web_search_created_at(
+    client: VectorDBBase, collection_name: str
+) -> Optional[float]:
+    # All chunks of a web search collection carry the same timestamp
+    result = client.query(collection_name=collection_name, filter={}, limit=1)
+    if result is None or not result.metadatas:
+        return None
+
+    for metadata in result.metadatas[0]:
+        try:
+            return float(metadata["created_at"])
+        except (KeyError, TypeError, ValueError):
+            continue
+    return None
+
+
+def find_vector_db_garbage(
+    client: VectorDBBase,
+    web_search_ttl: int = WEB_SEARCH_COLLECTION_TTL,
+    orphan_grace_period: int = VECTOR_DB_GC_ORPHAN_GRACE_PERIOD,
+    now: Optional[float] = None,
+) -> tuple[list[str], list[CollectionGarbage]]:
+    """
+    Returns all collections and those among them that are orphaned (their file
+    is gone, or their knowledge base for longer than the grace period) or are
+    web search results older than the TTL. Collections of any other kind are
+    never touched.
+    """
+    now = now if now is not None else time.time()
+    first_seen = load_first_seen()
+    seen = {}
+
+    # List collections before reading the tables: rows are written before their
+    # collections, so a collection created meanwhile can't look orphaned.
+    collection_names = client.list_collections()
+    file_ids = set(Files.get_file_ids())
+    knowledge_ids = set(Knowledges.get_knowledge_ids())
+
+    garbage = []
+    for collection_name in collection_names:
+        if collection_name.startswith(FILE_COLLECTION_PREFIX):
+            if collection_name[len(FILE_COLLECTION_PREFIX) :] not in file_ids:
+                garbage.append(
+                    CollectionGarbage(
+                        collection_name=collection_name, reason="orphaned_file"
+                    )
+                )
+        elif collection_name.startswith(WEB_SEARCH_COLLECTION_PREFIX):
+            if not web_search_ttl:
+                continue
+            created_at = get_web_search_created_at(client, collection_name)
+            if created_at is None:
+                created_at = seen[collection_name] = first_seen.get(
+                    collection_name, now
+                )
+            if now - created_at >= web_search_ttl:
+                garbage.append(
+                    CollectionGarbage(
+                        collection_name=collection_name, reason="expired_web_search"
+                    )
+                )
+        elif KNOWLEDGE_COLLECTION_PATTERN.match(collection_name):
+            if collection_name in knowledge_ids:
+                continue
+            orphaned_at = seen[collection_name] = first_seen.get(collection_name, now)
+            if now - orphaned_at >= orphan_grace_period:
+                garbage.append(
+                    CollectionGarbage(
+                        collection_name=collection_name, reason="orphaned_knowledge"
+                    )
+                )
+
+    # Only keeps the collections still waiting, so the state does not grow
+    if seen != first_seen:
+        save_first_seen(seen)
+    return collection_names, garbage
+
+
+def collect_vector_db_garbage(
+    client: VectorDBBase,
+    dry_run: bool = False,
+    web_search_ttl: int = WEB_SEARCH_COLLECTION_TTL,
+    orphan_grace_period: int = VECTOR_DB_GC_ORPHAN_GRACE_PERIOD,
+) -> VectorDBGarbageReport:
+    start = time.perf_counter()
+    collection_names, garbage = find_vector_db_garbage(
+        client, web_search_ttl, orphan_grace_period
+    )
+
+    report = VectorDBGarbageReport(dry_run=dry_run, collections=len(collection_names))
+    for item in garbage:
+        item.vectors = client.count(item.collection_name)
+        if not dry_run:
+            try:
+                client.delete_collection(collection_name=item.collection_name)
+            except Exception as e:
+                log.warning(f"Failed to delete collection {item.collection_name}: {e}")
+                report.failed.append(item.collection_name)
+                continue
+        report.removed.append(item)
+        report.reclaimed_vectors += item.vectors or 0
+
+    report.duration = time.perf_counter() - start
+    log.info(
+        f"Vector DB garbage collection{' (dry run)' if dry_run else ''}: "
+        f"{len(report.removed)} of {report.collections} collections removed, "
+        f"{report.reclaimed_vectors} vectors reclaimed, {len(report.failed)} failed "
+        f"in {report.duration:.1f}s"
+    )
+    return report
+
+
+async def periodic_vector_db_gc(client: VectorDBBase, redis=None):
+    """
+    Collects vector DB garbage every VECTOR_DB_GC_INTERVAL seconds. With Redis,
+    only the first worker to claim a run performs it.
+    """
+
+    async def collect():
+        await asyncio.to_thread(collect_vector_db_garbage, client)
+
+    await run_periodically(
+        "vector_db_gc",
+        collect,
+        VECTOR_DB_GC_INTERVAL,
+        initial_delay=min(VECTOR_DB_GC_INTERVAL, 600),
+        redis=redis,
+    )
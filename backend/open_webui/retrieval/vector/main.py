@@ -41,6 +41,22 @@ class VectorDBBase(ABC):
         """Delete a collection from the vector DB."""
         pass
 
+    def list_collections(self) -> List[str]:
+        """List the names of all collections in the vector DB."""
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support listing collections"
+        )
+
+    def count(self, collection_name: str) -> Optional[int]:
+        """Count the vectors in a collection, or None if the backend can't tell."""
+        return None
+
+    def get_vectors(
+        self, collection_name: str, ids: List[str]
+    ) -> Dict[str, List[float]]:
+        """Return the stored vectors by ID; backends that can't return vectors return none."""
+        return {}
+
     @abstractmethod
     def insert(self, collection_name: str, items: List[VectorItem]) -> None:
         """Insert a list of vector items into a collection."""
@@ -4,8 +4,6 @@ import logging
 import os
 import uuid
 from functools import lru_cache
-from pydub import AudioSegment
-from pydub.silence import split_on_silence
 from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
@@ -72,9 +70,6 @@ SPEECH_CACHE_DIR.mkdir(parents=True, exist_ok=True)
 #
 ##########################################
 
-from pydub import AudioSegment
-from pydub.utils import mediainfo
-
 
 def is_audio_conversion_required(file_path):
     """
@@ -87,6 +82,8 @@ def is_audio_conversion_required(file_path):
         return False
 
     try:
+        from pydub.utils import mediainfo
+
         info = mediainfo(file_path)
         codec_name = info.get("codec_name", "").lower()
         codec_type = info.get("codec_type", "").lower()
@@ -109,6 +106,8 @@ def is_audio_conversion_required(file_path):
 def convert_audio_to_mp3(file_path):
     """Convert audio file to mp3 format."""
     try:
+        from pydub import AudioSegment
+
         output_path = os.path.splitext(file_path)[0] + ".mp3"
         audio = AudioSegment.from_file(file_path)
         audio.export(output_path, format="mp3")
@@ -882,6 +881,8 @@ def compress_audio(file_path):
         ]  # Handles names with multiple dots
         file_dir = os.path.dirname(file_path)
 
+        from pydub import AudioSegment
+
         audio = AudioSegment.from_file(file_path)
         audio = audio.set_frame_rate(16000).set_channels(1)  # Compress audio
 
@@ -903,6 +904,8 @@ def split_audio(file_path, max_bytes, format="mp3", bitrate="32k"):
     if file_size <= max_bytes:
         return [file_path]  # Nothing to split
 
+    from pydub import AudioSegment
+
     audio = AudioSegment.from_file(file_path)
     duration_ms = len(audio)
     orig_size = file_size
@@ -1,12 +1,15 @@
+import asyncio
 import json
 import logging
-from typing import Optional
+import zlib
+from typing import Iterator, Literal, Optional
 
 
 from open_webui.socket.main import get_event_emitter
 from open_webui.models.chats import (
     ChatForm,
     ChatImportForm,
+    ChatModel,
     ChatResponse,
     Chats,
     ChatTitleIdResponse,
@@ -16,13 +19,20 @@ from open_webui.models.folders import Folders
 
 from open_webui.config import ENABLE_ADMIN_CHAT_ACCESS, ENABLE_ADMIN_EXPORT
 from open_webui.constants import ERROR_MESSAGES
-from open_webui.env import SRC_LOG_LEVELS
+from open_webui.env import CHAT_STREAM_BATCH_SIZE, SRC_LOG_LEVELS
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 
 from open_webui.utils.auth import get_admin_user, get_verified_user
 from open_webui.utils.access_control import has_permission
+from open_webui.utils.serialization import (
+    JSON_STREAM_MEDIA_TYPES,
+    aiter_json_lines,
+    iter_gzip,
+    iter_json_stream,
+)
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -137,20 +147,30 @@ async def create_new_chat(form_data: ChatForm, user=Depends(get_verified_user)):
 ############################
 
 
+def insert_missing_tags(user_id: str, chats: list[ChatModel]):
+    tag_ids = {
+        tag_id.replace(" ", "_").lower()
+        for chat in chats
+        for tag_id in chat.meta.get("tags", [])
+    }
+    tag_ids.discard("none")
+    if not tag_ids:
+        return
+
+    existing_tag_ids = {
+        tag.id for tag in Tags.get_tags_by_ids_and_user_id(list(tag_ids), user_id)
+    }
+    for tag_id in tag_ids - existing_tag_ids:
+        tag_name = " ".join([word.capitalize() for word in tag_id.split("_")])
+        Tags.insert_new_tag(tag_name, user_id)
+
+
 @router.post("/import", response_model=Optional[ChatResponse])
 async def import_chat(form_data: ChatImportForm, user=Depends(get_verified_user)):
     try:
         chat = Chats.import_chat(user.id, form_data)
         if chat:
-            tags = chat.meta.get("tags", [])
-            for tag_id in tags:
-                tag_id = tag_id.replace(" ", "_").lower()
-                tag_name = " ".join([word.capitalize() for word in tag_id.split("_")])
-                if (
-                    tag_id != "none"
-                    and Tags.get_tag_by_name_and_user_id(tag_name, user.id) is None
-                ):
-                    Tags.insert_new_tag(tag_name, user.id)
+            insert_missing_tags(user.id, [chat])
 
         return ChatResponse(**chat.model_dump())
     except Exception as e:
@@ -160,6 +180,59 @@ async def import_chat(form_data: ChatImportForm, user=Depends(get_verified_user)
         )
 
 
+class ChatImportResult(BaseModel):
+    imported: int
+    failed: int
+
+
+@router.post("/import/bulk", response_model=ChatImportResult)
+async def import_chats(request: Request, user=Depends(get_verified_user)):
+    """
+    Imports chats from a newline delimited JSON or JSON text sequence body, such
+    as an export of /all?format=ndjson, optionally sent with
+    `Content-Encoding: gzip`. The body is read as a stream and the chats are
+    inserted in batches of CHAT_STREAM_BATCH_SIZE, one transaction per batch.
+    """
+    imported, failed = 0, 0
+    batch: list[ChatImportForm] = []
+
+    async def insert_batch():
+        nonlocal imported, failed
+        try:
+            chats = await asyncio.to_thread(Chats.import_chats, user.id, batch)
+            imported += len(chats)
+        except Exception as e:
+            log.exception(e)
+            failed += len(batch)
+            chats = []
+        batch.clear()
+
+        if chats:
+            await asyncio.to_thread(insert_missing_tags, user.id, chats)
+
+    gzip = request.headers.get("content-encoding", "").lower() == "gzip"
+    try:
+        async for line in aiter_json_lines(request.stream(), gzip=gzip):
+            try:
+                batch.append(ChatImportForm.model_validate_json(line))
+            except ValueError:
+                failed += 1
+                continue
+
+            if len(batch) >= CHAT_STREAM_BATCH_SIZE:
+                await insert_batch()
+    except zlib.error as e:
+        log.warning(f"Invalid gzip body after importing {imported} chats: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT("Invalid gzip body"),
+        )
+
+    if batch:
+        await insert_batch()
+    return ChatImportResult(imported=imported, failed=failed)
+
+
 ############################
 # GetChats
 ############################
@@ -232,12 +305,33 @@ async def get_user_pinned_chats(user=Depends(get_verified_user)):
 ############################
 
 
+ChatExportFormat = Literal["json", "ndjson", "json-seq"]
+
+
+def stream_chats(
+    chats: Iterator[ChatModel], format: ChatExportFormat, gzip: bool
+) -> StreamingResponse:
+    content = iter_json_stream((chat.model_dump() for chat in chats), format)
+    if gzip:
+        return StreamingResponse(
+            iter_gzip(content),
+            media_type="application/gzip",
+            headers={
+                "Content-Disposition": f'attachment; filename="chats.{format}.gz"'
+            },
+        )
+    return StreamingResponse(content, media_type=JSON_STREAM_MEDIA_TYPES[format])
+
+
 @router.get("/all", response_model=list[ChatResponse])
-async def get_user_chats(user=Depends(get_verified_user)):
-    return [
-        ChatResponse(**chat.model_dump())
-        for chat in Chats.get_chats_by_user_id(user.id)
-    ]
+async def get_user_chats(
+    format: ChatExportFormat = "json",
+    gzip: bool = False,
+    user=Depends(get_verified_user),
+):
+    return stream_chats(
+        Chats.iter_chats(user.id, batch_size=CHAT_STREAM_BATCH_SIZE), format, gzip
+    )
 
 
 ############################
@@ -276,13 +370,19 @@ async def get_all_user_tags(user=Depends(get_verified_user)):
 
 
 @router.get("/all/db", response_model=list[ChatResponse])
-async def get_all_user_chats_in_db(user=Depends(get_admin_user)):
+async def get_all_user_chats_in_db(
+    format: ChatExportFormat = "json",
+    gzip: bool = False,
+    user=Depends(get_admin_user),
+):
     if not ENABLE_ADMIN_EXPORT:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
-    return [ChatResponse(**chat.model_dump()) for chat in Chats.get_chats()]
+    return stream_chats(
+        Chats.iter_chats(batch_size=CHAT_STREAM_BATCH_SIZE), format, gzip
+    )
 
 
 ############################
@@ -350,7 +450,7 @@ async def get_shared_chat_by_id(share_id: str, user=Depends(get_verified_user)):
     if user.role == "user" or (user.role == "admin" and not ENABLE_ADMIN_CHAT_ACCESS):
         chat = Chats.get_chat_by_share_id(share_id)
     elif user.role == "admin" and ENABLE_ADMIN_CHAT_ACCESS:
-        chat = Chats.get_chat_by_id(share_id)
+        chat = await Chats.get_chat_by_id_async(share_id)
 
     if chat:
         return ChatResponse(**chat.model_dump())
@@ -395,7 +495,7 @@ async def get_user_chat_list_by_tag_name(
 
 @router.get("/{id}", response_model=Optional[ChatResponse])
 async def get_chat_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
 
     if chat:
         return ChatResponse(**chat.model_dump())
@@ -415,10 +515,10 @@ async def get_chat_by_id(id: str, user=Depends(get_verified_user)):
 async def update_chat_by_id(
     id: str, form_data: ChatForm, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         updated_chat = {**chat.chat, **form_data.chat}
-        chat = Chats.update_chat_by_id(id, updated_chat)
+        chat = await Chats.update_chat_by_id_async(id, updated_chat)
         return ChatResponse(**chat.model_dump())
     else:
         raise HTTPException(
@@ -438,7 +538,7 @@ class MessageForm(BaseModel):
 async def update_chat_message_by_id(
     id: str, message_id: str, form_data: MessageForm, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id(id)
+    chat = await Chats.get_chat_by_id_async(id)
 
     if not chat:
         raise HTTPException(
@@ -452,7 +552,7 @@ async def update_chat_message_by_id(
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    chat = Chats.upsert_message_to_chat_by_id_and_message_id(
+    chat = await Chats.upsert_message_to_chat_by_id_and_message_id_async(
         id,
         message_id,
         {
@@ -496,7 +596,7 @@ class EventForm(BaseModel):
 async def send_chat_message_event_by_id(
     id: str, message_id: str, form_data: EventForm, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id(id)
+    chat = await Chats.get_chat_by_id_async(id)
 
     if not chat:
         raise HTTPException(
@@ -536,7 +636,7 @@ async def send_chat_message_event_by_id(
 @router.delete("/{id}", response_model=bool)
 async def delete_chat_by_id(request: Request, id: str, user=Depends(get_verified_user)):
     if user.role == "admin":
-        chat = Chats.get_chat_by_id(id)
+        chat = await Chats.get_chat_by_id_async(id)
         for tag in chat.meta.get("tags", []):
             if Chats.count_chats_by_tag_name_and_user_id(tag, user.id) == 1:
                 Tags.delete_tag_by_name_and_user_id(tag, user.id)
@@ -553,7 +653,7 @@ async def delete_chat_by_id(request: Request, id: str, user=Depends(get_verified
                 detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
             )
 
-        chat = Chats.get_chat_by_id(id)
+        chat = await Chats.get_chat_by_id_async(id)
         for tag in chat.meta.get("tags", []):
             if Chats.count_chats_by_tag_name_and_user_id(tag, user.id) == 1:
                 Tags.delete_tag_by_name_and_user_id(tag, user.id)
@@ -569,7 +669,7 @@ async def delete_chat_by_id(request: Request, id: str, user=Depends(get_verified
 
 @router.get("/{id}/pinned", response_model=Optional[bool])
 async def get_pinned_status_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         return chat.pinned
     else:
@@ -585,7 +685,7 @@ async def get_pinned_status_by_id(id: str, user=Depends(get_verified_user)):
 
 @router.post("/{id}/pin", response_model=Optional[ChatResponse])
 async def pin_chat_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         chat = Chats.toggle_chat_pinned_by_id(id)
         return chat
@@ -608,7 +708,7 @@ class CloneForm(BaseModel):
 async def clone_chat_by_id(
     form_data: CloneForm, id: str, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         updated_chat = {
             **chat.chat,
@@ -645,7 +745,7 @@ async def clone_chat_by_id(
 async def clone_shared_chat_by_id(id: str, user=Depends(get_verified_user)):
 
     if user.role == "admin":
-        chat = Chats.get_chat_by_id(id)
+        chat = await Chats.get_chat_by_id_async(id)
     else:
         chat = Chats.get_chat_by_share_id(id)
 
@@ -682,7 +782,7 @@ async def clone_shared_chat_by_id(id: str, user=Depends(get_verified_user)):
 
 @router.post("/{id}/archive", response_model=Optional[ChatResponse])
 async def archive_chat_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         chat = Chats.toggle_chat_archive_by_id(id)
 
@@ -723,7 +823,7 @@ async def share_chat_by_id(request: Request, id: str, user=Depends(get_verified_
             detail=ERROR_MESSAGES.ACCESS_PROHIBITED,
         )
 
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
 
     if chat:
         if chat.share_id:
@@ -752,7 +852,7 @@ async def share_chat_by_id(request: Request, id: str, user=Depends(get_verified_
 
 @router.delete("/{id}/share", response_model=Optional[bool])
 async def delete_shared_chat_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         if not chat.share_id:
             return False
@@ -781,7 +881,7 @@ class ChatFolderIdForm(BaseModel):
 async def update_chat_folder_id_by_id(
     id: str, form_data: ChatFolderIdForm, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         chat = Chats.update_chat_folder_id_by_id_and_user_id(
             id, user.id, form_data.folder_id
@@ -800,7 +900,7 @@ async def update_chat_folder_id_by_id(
 
 @router.get("/{id}/tags", response_model=list[TagModel])
 async def get_chat_tags_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         tags = chat.meta.get("tags", [])
         return Tags.get_tags_by_ids_and_user_id(tags, user.id)
@@ -819,7 +919,7 @@ async def get_chat_tags_by_id(id: str, user=Depends(get_verified_user)):
 async def add_tag_by_id_and_tag_name(
     id: str, form_data: TagForm, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         tags = chat.meta.get("tags", [])
         tag_id = form_data.name.replace(" ", "_").lower()
@@ -835,7 +935,7 @@ async def add_tag_by_id_and_tag_name(
                 id, user.id, form_data.name
             )
 
-        chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+        chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
         tags = chat.meta.get("tags", [])
         return Tags.get_tags_by_ids_and_user_id(tags, user.id)
     else:
@@ -853,14 +953,14 @@ async def add_tag_by_id_and_tag_name(
 async def delete_tag_by_id_and_tag_name(
     id: str, form_data: TagForm, user=Depends(get_verified_user)
 ):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         Chats.delete_tag_by_id_and_user_id_and_tag_name(id, user.id, form_data.name)
 
         if Chats.count_chats_by_tag_name_and_user_id(form_data.name, user.id) == 0:
             Tags.delete_tag_by_name_and_user_id(form_data.name, user.id)
 
-        chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+        chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
         tags = chat.meta.get("tags", [])
         return Tags.get_tags_by_ids_and_user_id(tags, user.id)
     else:
@@ -876,7 +976,7 @@ async def delete_tag_by_id_and_tag_name(
 
 @router.delete("/{id}/tags/all", response_model=Optional[bool])
 async def delete_all_tags_by_id(id: str, user=Depends(get_verified_user)):
-    chat = Chats.get_chat_by_id_and_user_id(id, user.id)
+    chat = await Chats.get_chat_by_id_and_user_id_async(id, user.id)
     if chat:
         Chats.delete_all_tags_by_id_and_user_id(id, user.id)
 
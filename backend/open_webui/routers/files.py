@@ -16,6 +16,7 @@ from fastapi import (
     Form,
     HTTPException,
     Request,
+    Response,
     UploadFile,
     status,
     Query,
@@ -37,10 +38,16 @@ from open_webui.models.files import (
 from open_webui.models.knowledge import Knowledges
 
 from open_webui.routers.knowledge import get_knowledge, get_knowledge_list
-from open_webui.routers.retrieval import ProcessFileForm, process_file
+from open_webui.retrieval.loaders.cache import EXTRACTION_CACHE
+from open_webui.routers.retrieval import (
+    ProcessFileForm,
+    delete_extraction_cache_entries,
+    process_file,
+)
 from open_webui.routers.audio import transcribe
 from open_webui.storage.provider import Storage
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.event_loop import run_blocking
 from pydantic import BaseModel
 
 log = logging.getLogger(__name__)
@@ -57,7 +64,7 @@ router = APIRouter()
 def has_access_to_file(
     file_id: Optional[str], access_type: str, user=Depends(get_verified_user)
 ) -> bool:
-    file = Files.get_file_by_id(file_id)
+    file = Files.get_file_by_id(file_id, include_content=False)
     log.debug(f"Checking if user has {access_type} access to file")
 
     if not file:
@@ -86,59 +93,79 @@ def has_access_to_file(
 ############################
 
 
-def process_uploaded_file(request, file, file_path, file_item, file_metadata, user):
+async def process_uploaded_file(
+    request: Request,
+    file_item: FileModel,
+    content_type: Optional[str],
+    file_metadata: dict,
+    enable_pii_detection: bool,
+    user,
+) -> Optional[FileModel | FileModelResponse]:
     try:
-        if file.content_type:
+        if content_type:
             stt_supported_content_types = getattr(
                 request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
             )
 
             if any(
-                fnmatch(file.content_type, content_type)
-                for content_type in (
+                fnmatch(content_type, stt_content_type)
+                for stt_content_type in (
                     stt_supported_content_types
                     if stt_supported_content_types
                     and any(t.strip() for t in stt_supported_content_types)
                     else ["audio/*", "video/webm"]
                 )
             ):
-                file_path = Storage.get_file(file_path)
-                result = transcribe(request, file_path, file_metadata)
+                file_path = await run_blocking(Storage.get_file, file_item.path)
+                result = await run_blocking(
+                    transcribe, request, file_path, file_metadata
+                )
 
-                process_file(
+                await process_file(
                     request,
                     ProcessFileForm(
-                        file_id=file_item.id, content=result.get("text", "")
+                        file_id=file_item.id,
+                        content=result.get("text", ""),
+                        enable_pii_detection=enable_pii_detection,
                     ),
                     user=user,
                 )
-            elif (not file.content_type.startswith(("image/", "video/"))) or (
+            elif (not content_type.startswith(("image/", "video/"))) or (
                 request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
             ):
-                process_file(request, ProcessFileForm(file_id=file_item.id), user=user)
+                await process_file(
+                    request,
+                    ProcessFileForm(
+                        file_id=file_item.id, enable_pii_detection=enable_pii_detection
+                    ),
+                    user=user,
+                )
         else:
             log.info(
-                f"File type {file.content_type} is not provided, but trying to process anyway"
+                f"File type {content_type} is not provided, but trying to process anyway"
+            )
+            await process_file(
+                request,
+                ProcessFileForm(
+                    file_id=file_item.id, enable_pii_detection=enable_pii_detection
+                ),
+                user=user,
             )
-            process_file(request, ProcessFileForm(file_id=file_item.id), user=user)
 
-        Files.update_file_data_by_id(
-            file_item.id,
-            {"status": "completed"},
-        )
+        return await run_blocking(Files.get_file_by_id, file_item.id)
     except Exception as e:
+        log.exception(e)
         log.error(f"Error processing file: {file_item.id}")
-        Files.update_file_data_by_id(
-            file_item.id,
-            {
-                "status": "failed",
+        return FileModelResponse(
+            **{
+                **file_item.model_dump(),
                 "error": str(e.detail) if hasattr(e, "detail") else str(e),
-            },
+            }
         )
 
 
 @router.post("/", response_model=FileModelResponse)
-def upload_file(
+async def upload_file(
     request: Request,
     background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
@@ -148,28 +175,50 @@ def upload_file(
     process_in_background: bool = Query(True),
     user=Depends(get_verified_user),
 ):
-    return upload_file_handler(
+    file_item = await run_blocking(
+        upload_file_handler,
         request,
         file=file,
         metadata=metadata,
         process=process,
-        enable_pii_detection=enable_pii_detection,
         process_in_background=process_in_background,
         user=user,
         background_tasks=background_tasks,
     )
 
+    if process:
+        # Extraction awaits the document loaders instead of holding a worker
+        # thread for as long as an external engine takes
+        file_item = await process_uploaded_file(
+            request,
+            file_item,
+            file.content_type,
+            file_item.meta.get("data", {}),
+            enable_pii_detection,
+            user,
+        )
+        if not file_item:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=ERROR_MESSAGES.DEFAULT("Error uploading file"),
+            )
+
+    return file_item
+
 
 def upload_file_handler(
     request: Request,
     file: UploadFile = File(...),
     metadata: Optional[dict | str] = Form(None),
     process: bool = Query(True),
-    enable_pii_detection: bool = Query(True),
     process_in_background: bool = Query(True),
     user=Depends(get_verified_user),
     background_tasks: Optional[BackgroundTasks] = None,
 ):
+    """
+    Validates and stores an uploaded file. Processing it is left to the caller,
+    see process_uploaded_file.
+    """
     log.info(f"file.content_type: {file.content_type}")
 
     if isinstance(metadata, str):
@@ -238,67 +287,6 @@ def upload_file_handler(
             ),
         )
 
-        if process:
-            try:
-                if file.content_type:
-                    stt_supported_content_types = getattr(
-                        request.app.state.config, "STT_SUPPORTED_CONTENT_TYPES", []
-                    )
-
-                    if any(
-                        fnmatch(file.content_type, content_type)
-                        for content_type in (
-                            stt_supported_content_types
-                            if stt_supported_content_types
-                            and any(t.strip() for t in stt_supported_content_types)
-                            else ["audio/*", "video/webm"]
-                        )
-                    ):
-                        file_path = Storage.get_file(file_path)
-                        result = transcribe(request, file_path, file_metadata)
-
-                        process_file(
-                            request,
-                            ProcessFileForm(
-                                file_id=id,
-                                content=result.get("text", ""),
-                                enable_pii_detection=enable_pii_detection,
-                            ),
-                            user=user,
-                        )
-                    elif (not file.content_type.startswith(("image/", "video/"))) or (
-                        request.app.state.config.CONTENT_EXTRACTION_ENGINE == "external"
-                    ):
-                        process_file(
-                            request,
-                            ProcessFileForm(
-                                file_id=id, enable_pii_detection=enable_pii_detection
-                            ),
-                            user=user,
-                        )
-                else:
-                    log.info(
-                        f"File type {file.content_type} is not provided, but trying to process anyway"
-                    )
-                    process_file(
-                        request,
-                        ProcessFileForm(
-                            file_id=id, enable_pii_detection=enable_pii_detection
-                        ),
-                        user=user,
-                    )
-
-                file_item = Files.get_file_by_id(id=id)
-            except Exception as e:
-                log.exception(e)
-                log.error(f"Error processing file: {file_item.id}")
-                file_item = FileModelResponse(
-                    **{
-                        **file_item.model_dump(),
-                        "error": str(e.detail) if hasattr(e, "detail") else str(e),
-                    }
-                )
-
         if file_item:
             return file_item
         else:
@@ -320,18 +308,37 @@ def upload_file_handler(
 ############################
 
 
-@router.get("/", response_model=list[FileModelResponse])
-async def list_files(user=Depends(get_verified_user), content: bool = Query(True)):
-    if user.role == "admin":
-        files = Files.get_files()
-    else:
-        files = Files.get_files_by_user_id(user.id)
+def invalid_cursor_error() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail=ERROR_MESSAGES.DEFAULT("Invalid cursor"),
+    )
 
-    if not content:
-        for file in files:
-            if "content" in file.data:
-                del file.data["content"]
 
+@router.get("/", response_model=list[FileModelResponse])
+async def list_files(
+    response: Response,
+    user=Depends(get_verified_user),
+    content: bool = Query(True),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+):
+    """
+    Lists the files newest first. With a limit, the cursor of the next page is
+    returned in the X-Next-Cursor header.
+    """
+    try:
+        files, next_cursor = Files.get_files_page(
+            user_id=None if user.role == "admin" else user.id,
+            include_content=content,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError:
+        raise invalid_cursor_error()
+
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return files
 
 
@@ -342,26 +349,32 @@ async def list_files(user=Depends(get_verified_user), content: bool = Query(True
 
 @router.get("/search", response_model=list[FileModelResponse])
 async def search_files(
+    response: Response,
     filename: str = Query(
         ...,
         description="Filename pattern to search for. Supports wildcards such as '*.txt'",
     ),
     content: bool = Query(True),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
     user=Depends(get_verified_user),
 ):
     """
     Search for files by filename with support for wildcard patterns.
+    With a limit, the cursor of the next page is returned in the X-Next-Cursor
+    header.
     """
     # Get files according to user role
-    if user.role == "admin":
-        files = Files.get_files()
-    else:
-        files = Files.get_files_by_user_id(user.id)
-
-    # Get matching files
-    matching_files = [
-        file for file in files if fnmatch(file.filename.lower(), filename.lower())
-    ]
+    try:
+        matching_files, next_cursor = Files.search_files_by_filename(
+            filename,
+            user_id=None if user.role == "admin" else user.id,
+            include_content=content,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError:
+        raise invalid_cursor_error()
 
     if not matching_files:
         raise HTTPException(
@@ -369,11 +382,8 @@ async def search_files(
             detail="No files found matching the pattern.",
         )
 
-    if not content:
-        for file in matching_files:
-            if "content" in file.data:
-                del file.data["content"]
-
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return matching_files
 
 
@@ -389,6 +399,8 @@ async def delete_all_files(user=Depends(get_admin_user)):
         try:
             Storage.delete_all_files()
             VECTOR_DB_CLIENT.reset()
+            if EXTRACTION_CACHE is not None:
+                await run_blocking(EXTRACTION_CACHE.clear)
         except Exception as e:
             log.exception(e)
             log.error("Error deleting files")
@@ -411,7 +423,7 @@ async def delete_all_files(user=Depends(get_admin_user)):
 
 @router.get("/{id}", response_model=Optional[FileModel])
 async def get_file_by_id(id: str, user=Depends(get_verified_user)):
-    file = Files.get_file_by_id(id)
+    file = await Files.get_file_by_id_async(id)
 
     if not file:
         raise HTTPException(
@@ -449,7 +461,7 @@ async def get_file_by_id(id: str, user=Depends(get_verified_user)):
                                     "page_content": pages,
                                 },
                             )
-                            file = Files.get_file_by_id(file.id)
+                            file = await Files.get_file_by_id_async(file.id)
                 except Exception:
                     # Ignore augmentation errors; return original file
                     pass
@@ -468,7 +480,7 @@ async def get_file_by_id(id: str, user=Depends(get_verified_user)):
 async def get_file_process_status(
     id: str, stream: bool = Query(False), user=Depends(get_verified_user)
 ):
-    file = Files.get_file_by_id(id)
+    file = await Files.get_file_by_id_async(id, include_content=False)
 
     if not file:
         raise HTTPException(
@@ -487,7 +499,9 @@ async def get_file_process_status(
             async def event_stream(file_item):
                 if file_item:
                     for _ in range(MAX_FILE_PROCESSING_DURATION):
-                        file_item = Files.get_file_by_id(file_item.id)
+                        file_item = await Files.get_file_by_id_async(
+                            file_item.id, include_content=False
+                        )
                         if file_item:
                             data = file_item.model_dump().get("data", {})
                             status = data.get("status")
@@ -528,7 +542,7 @@ async def get_file_process_status(
 
 @router.get("/{id}/data/content")
 async def get_file_data_content_by_id(id: str, user=Depends(get_verified_user)):
-    file = Files.get_file_by_id(id)
+    file = await Files.get_file_by_id_async(id, include_content=False)
 
     if not file:
         raise HTTPException(
@@ -541,7 +555,7 @@ async def get_file_data_content_by_id(id: str, user=Depends(get_verified_user)):
         or user.role == "admin"
         or has_access_to_file(id, "read", user)
     ):
-        return {"content": file.data.get("content", "")}
+        return {"content": await Files.get_file_content_by_id_async(id) or ""}
     else:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -581,7 +595,7 @@ class ContentForm(BaseModel):
 async def update_file_data_content_by_id(
     request: Request, id: str, form_data: ContentForm, user=Depends(get_verified_user)
 ):
-    file = Files.get_file_by_id(id)
+    file = await Files.get_file_by_id_async(id, include_content=False)
 
     if not file:
         raise HTTPException(
@@ -638,7 +652,7 @@ async def update_file_data_content_by_id(
                     pass
 
             # Pass the preserved PII data to process_file to maintain data structure consistency
-            process_file(
+            await process_file(
                 request,
                 ProcessFileForm(
                     file_id=id,
@@ -648,12 +662,11 @@ async def update_file_data_content_by_id(
                 ),
                 user=user,
             )
-            file = Files.get_file_by_id(id=id)
         except Exception as e:
             log.exception(e)
             log.error(f"Error processing file: {file.id}")
 
-        return {"content": file.data.get("content", "")}
+        return {"content": await Files.get_file_content_by_id_async(id) or ""}
     else:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -674,7 +687,7 @@ class PiiStateForm(BaseModel):
 async def update_file_pii_state_by_id(
     id: str, form_data: PiiStateForm, user=Depends(get_verified_user)
 ):
-    file = Files.get_file_by_id(id)
+    file = await Files.get_file_by_id_async(id, include_content=False)
 
     if not file:
         raise HTTPException(
@@ -715,7 +728,7 @@ async def update_file_pii_state_by_id(
 async def get_file_content_by_id(
     id: str, user=Depends(get_verified_user), attachment: bool = Query(False)
 ):
-    file = Files.get_file_by_id(id)
+    file = await Files.get_file_by_id_async(id, include_content=False)
 
     if not file:
         raise HTTPException(
@@ -783,7 +796,7 @@ async def get_file_content_by_id(
 
 @router.get("/{id}/content/html")
 async def get_html_file_content_by_id(id: str, user=Depends(get_verified_user)):
-    file = Files.get_file_by_id(id)
+    file = await Files.get_file_by_id_async(id, include_content=False)
 
     if not file:
         raise HTTPException(
@@ -791,7 +804,7 @@ async def get_html_file_content_by_id(id: str, user=Depends(get_verified_user)):
             detail=ERROR_MESSAGES.NOT_FOUND,
         )
 
-    file_user = Users.get_user_by_id(file.user_id)
+    file_user = await Users.get_user_by_id_async(file.user_id)
     if not file_user.role == "admin":
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -832,7 +845,7 @@ async def get_html_file_content_by_id(id: str, user=Depends(get_verified_user)):
 
 @router.get("/{id}/content/{file_name}")
 async def get_file_content_by_id(id: str, user=Depends(get_verified_user)):
-    file = Files.get_file_by_id(id)
+    file = await Files.get_file_by_id_async(id, include_content=False)
 
     if not file:
         raise HTTPException(
@@ -868,7 +881,7 @@ async def get_file_content_by_id(id: str, user=Depends(get_verified_user)):
                 )
         else:
             # File path doesn’t exist, return the content as .txt if possible
-            file_content = file.content.get("content", "")
+            file_content = await Files.get_file_content_by_id_async(id) or ""
             file_name = file.filename
 
             # Create a generator that encodes the file content
@@ -894,7 +907,7 @@ async def get_file_content_by_id(id: str, user=Depends(get_verified_user)):
 
 @router.delete("/{id}")
 async def delete_file_by_id(id: str, user=Depends(get_verified_user)):
-    file = Files.get_file_by_id(id)
+    file = await Files.get_file_by_id_async(id, include_content=False)
 
     if not file:
         raise HTTPException(
@@ -910,6 +923,7 @@ async def delete_file_by_id(id: str, user=Depends(get_verified_user)):
         result = Files.delete_file_by_id(id)
         if result:
             try:
+                await run_blocking(delete_extraction_cache_entries, file)
                 Storage.delete_file(file.path)
                 VECTOR_DB_CLIENT.delete(collection_name=f"file-{id}")
             except Exception as e:
@@ -4,6 +4,7 @@ import mimetypes
 import os
 import shutil
 import asyncio
+import itertools
 import time
 
 
@@ -26,11 +27,8 @@ from fastapi import (
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-import tiktoken
 
 
-from langchain.text_splitter import RecursiveCharacterTextSplitter, TokenTextSplitter
-from langchain_text_splitters import MarkdownHeaderTextSplitter
 from langchain_core.documents import Document
 
 from open_webui.models.files import FileModel, Files
@@ -39,35 +37,17 @@ from open_webui.storage.provider import Storage
 
 
 from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.retrieval.vector.gc import collect_vector_db_garbage
 
 # Document loaders
+from open_webui.retrieval.loaders.cache import EXTRACTION_CACHE
 from open_webui.retrieval.loaders.main import Loader
 from open_webui.retrieval.loaders.youtube import YoutubeLoader
+from open_webui.retrieval.models.embedding_batcher import EmbeddingBatcher
+from open_webui.retrieval.chunking import batched, iter_chunks, split_pages
 
-# Web search engines
+# Web search engines and loaders are imported lazily in search_web / get_web_loader
 from open_webui.retrieval.web.main import SearchResult
-from open_webui.retrieval.web.utils import get_web_loader
-from open_webui.retrieval.web.brave import search_brave
-from open_webui.retrieval.web.kagi import search_kagi
-from open_webui.retrieval.web.mojeek import search_mojeek
-from open_webui.retrieval.web.bocha import search_bocha
-from open_webui.retrieval.web.duckduckgo import search_duckduckgo
-from open_webui.retrieval.web.google_pse import search_google_pse
-from open_webui.retrieval.web.jina_search import search_jina
-from open_webui.retrieval.web.searchapi import search_searchapi
-from open_webui.retrieval.web.serpapi import search_serpapi
-from open_webui.retrieval.web.searxng import search_searxng
-from open_webui.retrieval.web.yacy import search_yacy
-from open_webui.retrieval.web.serper import search_serper
-from open_webui.retrieval.web.serply import search_serply
-from open_webui.retrieval.web.serpstack import search_serpstack
-from open_webui.retrieval.web.tavily import search_tavily
-from open_webui.retrieval.web.bing import search_bing
-from open_webui.retrieval.web.exa import search_exa
-from open_webui.retrieval.web.perplexity import search_perplexity
-from open_webui.retrieval.web.sougou import search_sougou
-from open_webui.retrieval.web.firecrawl import search_firecrawl
-from open_webui.retrieval.web.external import search_external
 
 from open_webui.retrieval.utils import (
     get_embedding_function,
@@ -92,6 +72,8 @@ from open_webui.clients.nenna_pii_client.models.text_mask_request import (
 )
 from open_webui.clients.nenna_pii_client.models.pii_labels import PiiLabels
 from open_webui.utils.auth import get_admin_user, get_verified_user
+from open_webui.utils.event_loop import run_blocking
+from open_webui.utils.telemetry.instruments import record_file_processing_stage
 
 from open_webui.config import (
     ENV,
@@ -112,6 +94,11 @@ from open_webui.env import (
     SENTENCE_TRANSFORMERS_MODEL_KWARGS,
     SENTENCE_TRANSFORMERS_CROSS_ENCODER_BACKEND,
     SENTENCE_TRANSFORMERS_CROSS_ENCODER_MODEL_KWARGS,
+    ENABLE_SENTENCE_TRANSFORMERS_BATCHING,
+    SENTENCE_TRANSFORMERS_BATCH_SIZE,
+    SENTENCE_TRANSFORMERS_BATCH_WAIT_MS,
+    SENTENCE_TRANSFORMERS_NUM_THREADS,
+    RAG_INGEST_BATCH_SIZE,
 )
 
 from open_webui.constants import ERROR_MESSAGES
@@ -201,6 +188,14 @@ def get_ef(
                 backend=SENTENCE_TRANSFORMERS_BACKEND,
                 model_kwargs=SENTENCE_TRANSFORMERS_MODEL_KWARGS,
             )
+
+            if ENABLE_SENTENCE_TRANSFORMERS_BATCHING:
+                ef = EmbeddingBatcher(
+                    ef,
+                    max_batch_size=SENTENCE_TRANSFORMERS_BATCH_SIZE,
+                    max_wait_ms=SENTENCE_TRANSFORMERS_BATCH_WAIT_MS,
+                    num_threads=SENTENCE_TRANSFORMERS_NUM_THREADS,
+                )
         except Exception as e:
             log.debug(f"Error loading SentenceTransformer: {e}")
 
@@ -352,6 +347,9 @@ async def update_embedding_config(
     )
     if request.app.state.config.RAG_EMBEDDING_ENGINE == "":
         # unloads current internal embedding model and clears VRAM cache
+        if isinstance(request.app.state.ef, EmbeddingBatcher):
+            # Joins the worker thread once in-flight batches are done
+            await asyncio.to_thread(request.app.state.ef.close)
         request.app.state.ef = None
         request.app.state.EMBEDDING_FUNCTION = None
         import gc
@@ -1279,6 +1277,7 @@ def _set_processing(
     This is intentionally tolerant to failures and will not raise.
     """
     try:
+        record_file_processing_stage(file_id, status, stage)
         payload = {
             "processing": {
                 "status": status,
@@ -1295,6 +1294,38 @@ def _set_processing(
         pass
 
 
+def delete_extraction_cache_entries(file: FileModel) -> None:
+    """
+    Removes the cached extraction results of a file that is being deleted, so
+    its unmasked text does not outlive it on disk. Call before deleting the
+    stored file.
+    """
+    if EXTRACTION_CACHE is None or not file.path:
+        return
+    try:
+        EXTRACTION_CACHE.delete_file(Storage.get_file(file.path))
+    except Exception as e:
+        log.warning(f"Failed to remove the extraction cache of file {file.id}: {e}")
+
+
+def get_chunk_fingerprint(config) -> dict:
+    """
+    Settings the stored chunks of a document depend on. They are stored with
+    each chunk (as its embedding_config), so a reindex can tell which
+    documents were embedded or split differently.
+    """
+    fingerprint = {
+        "engine": config.RAG_EMBEDDING_ENGINE,
+        "model": config.RAG_EMBEDDING_MODEL,
+        "text_splitter": config.TEXT_SPLITTER,
+        "chunk_size": config.CHUNK_SIZE,
+        "chunk_overlap": config.CHUNK_OVERLAP,
+    }
+    if config.TEXT_SPLITTER == "token":
+        fingerprint["encoding_name"] = config.TIKTOKEN_ENCODING_NAME
+    return fingerprint
+
+
 def save_docs_to_vector_db(
     request: Request,
     docs,
@@ -1338,191 +1369,21 @@ def save_docs_to_vector_db(
                 log.info(f"Document with hash {metadata['hash']} already exists")
                 raise ValueError(ERROR_MESSAGES.DUPLICATE_CONTENT)
 
-    if split:
-        if request.app.state.config.TEXT_SPLITTER in ["", "character"]:
-            text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "token":
-            log.info(
-                f"Using token text splitter: {request.app.state.config.TIKTOKEN_ENCODING_NAME}"
-            )
-
-            tiktoken.get_encoding(str(request.app.state.config.TIKTOKEN_ENCODING_NAME))
-            text_splitter = TokenTextSplitter(
-                encoding_name=str(request.app.state.config.TIKTOKEN_ENCODING_NAME),
-                chunk_size=request.app.state.config.CHUNK_SIZE,
-                chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                add_start_index=True,
-            )
-            docs = text_splitter.split_documents(docs)
-        elif request.app.state.config.TEXT_SPLITTER == "markdown_header":
-            log.info("Using markdown header text splitter")
-
-            # Define headers to split on - covering most common markdown header levels
-            headers_to_split_on = [
-                ("#", "Header 1"),
-                ("##", "Header 2"),
-                ("###", "Header 3"),
-                ("####", "Header 4"),
-                ("#####", "Header 5"),
-                ("######", "Header 6"),
-            ]
-
-            markdown_splitter = MarkdownHeaderTextSplitter(
-                headers_to_split_on=headers_to_split_on,
-                strip_headers=False,  # Keep headers in content for context
-            )
-
-            md_split_docs = []
-            for doc in docs:
-                md_header_splits = markdown_splitter.split_text(doc.page_content)
-                text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=request.app.state.config.CHUNK_SIZE,
-                    chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
-                    add_start_index=True,
-                )
-                md_header_splits = text_splitter.split_documents(md_header_splits)
-
-                # Convert back to Document objects, preserving original metadata
-                for split_chunk in md_header_splits:
-                    headings_list = []
-                    # Extract header values in order based on headers_to_split_on
-                    for _, header_meta_key_name in headers_to_split_on:
-                        if header_meta_key_name in split_chunk.metadata:
-                            headings_list.append(
-                                split_chunk.metadata[header_meta_key_name]
-                            )
-
-                    md_split_docs.append(
-                        Document(
-                            page_content=split_chunk.page_content,
-                            metadata={**doc.metadata, "headings": headings_list},
-                        )
-                    )
-
-            docs = md_split_docs
-        else:
-            raise ValueError(ERROR_MESSAGES.DEFAULT("Invalid text splitter"))
+    chunks = iter_chunks(
+        docs,
+        text_splitter=request.app.state.config.TEXT_SPLITTER,
+        chunk_size=request.app.state.config.CHUNK_SIZE,
+        chunk_overlap=request.app.state.config.CHUNK_OVERLAP,
+        encoding_name=request.app.state.config.TIKTOKEN_ENCODING_NAME,
+        split=split,
+    )
 
-    if len(docs) == 0:
+    first_chunk = next(chunks, None)
+    if first_chunk is None:
         raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
+    chunks = itertools.chain([first_chunk], chunks)
 
-    # Adjust PII entity positions for chunk
-    for doc in docs:
-        # Normalize/parse PII metadata which may arrive as a JSON string or list
-        try:
-            pii_meta = doc.metadata.get("pii")
-            if isinstance(pii_meta, str):
-                # Attempt to parse JSON string into dict
-                try:
-                    parsed = json.loads(pii_meta)
-                    if isinstance(parsed, dict):
-                        doc.metadata["pii"] = parsed
-                    elif isinstance(parsed, list):
-                        # Convert list of entities to dict keyed by label/text
-                        converted = {}
-                        for entity in parsed:
-                            if not isinstance(entity, dict):
-                                continue
-                            key = (
-                                entity.get("text")
-                                or entity.get("label")
-                                or entity.get("raw_text")
-                            )
-                            if key:
-                                converted[key] = entity
-                        doc.metadata["pii"] = converted
-                    else:
-                        # Unrecognized structure; drop to avoid crashes
-                        doc.metadata["pii"] = {}
-                except Exception:
-                    # If parsing fails, drop PII to avoid breaking ingestion
-                    doc.metadata["pii"] = {}
-            elif isinstance(pii_meta, dict):
-                doc.metadata["pii"] = pii_meta
-            elif isinstance(pii_meta, list):
-                # Convert list of entities to dict keyed by label/text
-                converted = {}
-                for entity in pii_meta:
-                    if not isinstance(entity, dict):
-                        continue
-                    key = (
-                        entity.get("text")
-                        or entity.get("label")
-                        or entity.get("raw_text")
-                    )
-                    if key:
-                        converted[key] = entity
-                doc.metadata["pii"] = converted
-            elif pii_meta is None:
-                doc.metadata["pii"] = {}
-        except Exception:
-            # Never let PII normalization break ingestion
-            doc.metadata["pii"] = {}
-
-        # Guard: skip normalization if already marked as normalized
-        if doc.metadata.get("pii_positions_normalized"):
-            continue
-
-        start_index = doc.metadata.get("start_index", 0)
-        end_index = len(doc.page_content) + start_index
-        pii_to_remove = []
-        for pii_entity in doc.metadata.get("pii") or {}:
-            updated_occurrences = []
-            for occurrence in (
-                doc.metadata["pii"].get(pii_entity, {}).get("occurrences", [])
-            ):
-                s = occurrence.get("start_idx")
-                e = occurrence.get("end_idx")
-                # Case 1: already chunk-local (0..len(content)) -> keep as-is
-                if (
-                    isinstance(s, int)
-                    and isinstance(e, int)
-                    and start_index == 0  # first chunk
-                    and start_index <= s < e <= len(doc.page_content)
-                ):
-                    updated_occurrences.append({"start_idx": s, "end_idx": e})
-                # Case 2: global within start/end -> shift to chunk-local
-                elif (
-                    isinstance(s, int)
-                    and isinstance(e, int)
-                    and s >= start_index
-                    and e <= end_index
-                ):
-                    updated_occurrences.append(
-                        {"start_idx": s - start_index, "end_idx": e - start_index}
-                    )
-                # Else: out of range -> drop this occurrence
-            if updated_occurrences:
-                if pii_entity in doc.metadata["pii"]:
-                    doc.metadata["pii"][pii_entity]["occurrences"] = updated_occurrences
-            else:
-                pii_to_remove.append(pii_entity)
-
-        for pii_entity in pii_to_remove:
-            del doc.metadata["pii"][pii_entity]
-
-        # Mark as normalized to avoid future double-normalization
-        doc.metadata["pii_positions_normalized"] = True
-
-    log.debug(f"docs: {docs}")
-    texts = [doc.page_content for doc in docs]
-    metadatas = [
-        {
-            **doc.metadata,
-            **(metadata if metadata else {}),
-            "embedding_config": {
-                "engine": request.app.state.config.RAG_EMBEDDING_ENGINE,
-                "model": request.app.state.config.RAG_EMBEDDING_MODEL,
-            },
-        }
-        for doc in docs
-    ]
-
+    inserted_ids = []
     try:
         if VECTOR_DB_CLIENT.has_collection(collection_name=collection_name):
             log.info(f"collection {collection_name} already exists")
@@ -1567,30 +1428,53 @@ def save_docs_to_vector_db(
             ),
         )
 
-        embeddings = embedding_function(
-            list(map(lambda x: x.replace("\n", " "), texts)),
-            prefix=RAG_EMBEDDING_CONTENT_PREFIX,
-            user=user,
-        )
+        embedding_config = get_chunk_fingerprint(request.app.state.config)
 
-        items = [
-            {
-                "id": str(uuid.uuid4()),
-                "text": text,
-                "vector": embeddings[idx],
-                "metadata": metadatas[idx],
-            }
-            for idx, text in enumerate(texts)
-        ]
+        # Embed and insert chunks as batches fill up, so only one batch of
+        # chunks and vectors is held in memory regardless of document size
+        for batch in batched(
+            chunks,
+            max(
+                RAG_INGEST_BATCH_SIZE, request.app.state.config.RAG_EMBEDDING_BATCH_SIZE
+            ),
+        ):
+            embeddings = embedding_function(
+                [chunk.text.replace("\n", " ") for chunk in batch],
+                prefix=RAG_EMBEDDING_CONTENT_PREFIX,
+                user=user,
+            )
 
-        VECTOR_DB_CLIENT.insert(
-            collection_name=collection_name,
-            items=items,
-        )
+            items = [
+                {
+                    "id": str(uuid.uuid4()),
+                    "text": chunk.text,
+                    "vector": embeddings[idx],
+                    "metadata": {
+                        **chunk.get_metadata(),
+                        **(metadata if metadata else {}),
+                        "embedding_config": embedding_config,
+                    },
+                }
+                for idx, chunk in enumerate(batch)
+            ]
+
+            VECTOR_DB_CLIENT.insert(
+                collection_name=collection_name,
+                items=items,
+            )
+            inserted_ids.extend(item["id"] for item in items)
 
         return True
     except Exception as e:
         log.exception(e)
+        if inserted_ids:
+            # Don't leave a partially indexed document behind
+            try:
+                VECTOR_DB_CLIENT.delete(
+                    collection_name=collection_name, ids=inserted_ids
+                )
+            except Exception:
+                log.exception(f"Failed to remove partial insert from {collection_name}")
         raise e
 
 
@@ -1630,13 +1514,13 @@ class ProcessFileForm(BaseModel):
 
 
 @router.post("/process/file")
-def process_file(
+async def process_file(
     request: Request,
     form_data: ProcessFileForm,
     user=Depends(get_verified_user),
 ):
     try:
-        file = Files.get_file_by_id(form_data.file_id)
+        file = await run_blocking(Files.get_file_by_id, form_data.file_id)
 
         collection_name = form_data.collection_name
 
@@ -1644,7 +1528,9 @@ def process_file(
             collection_name = f"file-{file.id}"
 
         # Initialize processing metadata so clients can poll
-        _set_processing(file.id, status="processing", stage="starting", progress=5)
+        await run_blocking(
+            _set_processing, file.id, status="processing", stage="starting", progress=5
+        )
 
         # Initialize extraction variables to avoid UnboundLocalError
         extraction_method = request.app.state.config.CONTENT_EXTRACTION_ENGINE
@@ -1657,7 +1543,10 @@ def process_file(
 
             try:
                 # /files/{file_id}/data/content/update
-                VECTOR_DB_CLIENT.delete_collection(collection_name=f"file-{file.id}")
+                await run_blocking(
+                    VECTOR_DB_CLIENT.delete_collection,
+                    collection_name=f"file-{file.id}",
+                )
             except:
                 # Audio file upload pipeline
                 pass
@@ -1676,11 +1565,12 @@ def process_file(
             ]
 
             # Pre-mark extracting so clients see progress immediately
-            _set_processing(file.id, "processing", "extracting", 10)
+            await run_blocking(_set_processing, file.id, "processing", "extracting", 10)
             # Persist content immediately so UI can display it without waiting
             text_content = form_data.content
             try:
-                Files.update_file_data_by_id(
+                await run_blocking(
+                    Files.update_file_data_by_id,
                     file.id,
                     {
                         "content": text_content,
@@ -1690,11 +1580,12 @@ def process_file(
             except Exception:
                 pass
             # Content provided directly; extraction stage completed
-            _set_processing(file.id, "processing", "extracting", 20)
+            await run_blocking(_set_processing, file.id, "processing", "extracting", 20)
 
             # Store extraction information for direct content
             try:
-                Files.update_file_data_by_id(
+                await run_blocking(
+                    Files.update_file_data_by_id,
                     file.id,
                     {
                         "extraction": {
@@ -1716,7 +1607,11 @@ def process_file(
                             # Attach as-is; downstream normalization handles chunk-local mapping
                             docs[0].metadata["pii"] = form_data.pii
                         # Only update if PII data is provided - preserve existing data structure
-                        Files.update_file_data_by_id(file.id, {"pii": form_data.pii})
+                        await run_blocking(
+                            Files.update_file_data_by_id,
+                            file.id,
+                            {"pii": form_data.pii},
+                        )
                         log.debug(f"process_file: Updated PII data for file {file.id}")
                     except Exception as e:
                         log.warning(f"process_file: Failed to update PII data: {e}")
@@ -1733,7 +1628,11 @@ def process_file(
                             if isinstance(form_data.pii_state, ProcessFilePiiState)
                             else form_data.pii_state
                         )
-                        Files.update_file_data_by_id(file.id, {"piiState": state_dict})
+                        await run_blocking(
+                            Files.update_file_data_by_id,
+                            file.id,
+                            {"piiState": state_dict},
+                        )
                         log.debug(f"process_file: Updated PII state for file {file.id}")
                     except Exception as e:
                         log.warning(f"process_file: Failed to update PII state: {e}")
@@ -1748,8 +1647,10 @@ def process_file(
             # Check if the file has already been processed and save the content
             # Usage: /knowledge/{id}/file/add, /knowledge/{id}/file/update
 
-            result = VECTOR_DB_CLIENT.query(
-                collection_name=f"file-{file.id}", filter={"file_id": file.id}
+            result = await run_blocking(
+                VECTOR_DB_CLIENT.query,
+                collection_name=f"file-{file.id}",
+                filter={"file_id": file.id},
             )
 
             if result is not None and len(result.ids[0]) > 0:
@@ -1783,9 +1684,9 @@ def process_file(
                     pass
 
             # Pre-mark extracting so clients see progress immediately
-            _set_processing(file.id, "processing", "extracting", 10)
+            await run_blocking(_set_processing, file.id, "processing", "extracting", 10)
             text_content = file.data.get("content", "")
-            _set_processing(file.id, "processing", "extracting", 20)
+            await run_blocking(_set_processing, file.id, "processing", "extracting", 20)
         else:
             # Process the file and save the content
             # Usage: /files/
@@ -1795,8 +1696,10 @@ def process_file(
             fallback_used = False
 
             if file_path:
-                _set_processing(file.id, "processing", "extracting", 10)
-                file_path = Storage.get_file(file_path)
+                await run_blocking(
+                    _set_processing, file.id, "processing", "extracting", 10
+                )
+                file_path = await run_blocking(Storage.get_file, file_path)
 
                 # Try primary extraction method (e.g., docling)
                 try:
@@ -1836,7 +1739,7 @@ def process_file(
                         DOCUMENT_INTELLIGENCE_KEY=request.app.state.config.DOCUMENT_INTELLIGENCE_KEY,
                         MISTRAL_OCR_API_KEY=request.app.state.config.MISTRAL_OCR_API_KEY,
                     )
-                    docs = loader.load(
+                    docs = await loader.aload(
                         file.filename, file.meta.get("content_type"), file_path
                     )
                     log.info(
@@ -1864,7 +1767,7 @@ def process_file(
                                 engine="langchain",  # Use langchain as fallback
                                 PDF_EXTRACT_IMAGES=request.app.state.config.PDF_EXTRACT_IMAGES,
                             )
-                            docs = fallback_loader.load(
+                            docs = await fallback_loader.aload(
                                 file.filename, file.meta.get("content_type"), file_path
                             )
                             extraction_method = "langchain"
@@ -1909,48 +1812,14 @@ def process_file(
                 except Exception:
                     pass
 
-                # Constants for document chunking
-                CHUNK_SIZE = 5000
-
-                # If there's only one document, chunk it into smaller pieces
-                if len(docs) == 1 and len(docs[0].page_content) > CHUNK_SIZE:
-                    content = docs[0].page_content
-                    base_metadata = docs[0].metadata
-                    chunk_size = CHUNK_SIZE
-                    chunks = []
-
-                    # Split into sentences first
-                    import re
-
-                    sentences = re.split(r"(?<=[.!?])\s+", content)
-
-                    current_chunk = ""
-                    for sentence in sentences:
-                        # If adding this sentence would exceed chunk size
-                        if (
-                            len(current_chunk) + len(sentence) > chunk_size
-                            and current_chunk
-                        ):
-                            chunks.append(
-                                Document(
-                                    page_content=current_chunk,
-                                    metadata=base_metadata.copy(),
-                                )
-                            )
-                            current_chunk = sentence
-                        else:
-                            current_chunk += sentence
-
-                    # Add the last chunk if it has content
-                    if current_chunk.strip():
-                        chunks.append(
-                            Document(
-                                page_content=current_chunk,
-                                metadata=base_metadata.copy(),
-                            )
-                        )
-
-                    docs = chunks
+                # A single large document is paged at sentence boundaries for
+                # PII detection and display, chunking happens once when indexing
+                if len(docs) == 1:
+                    pages = await run_blocking(split_pages, docs[0].page_content)
+                    docs = [
+                        Document(page_content=page, metadata=docs[0].metadata)
+                        for page in pages
+                    ]
 
                 docs = [
                     Document(
@@ -1986,7 +1855,8 @@ def process_file(
 
             # Store extraction information in file data
             try:
-                Files.update_file_data_by_id(
+                await run_blocking(
+                    Files.update_file_data_by_id,
                     file.id,
                     {
                         "extraction": {
@@ -2001,7 +1871,8 @@ def process_file(
 
             total_pages = len(docs) if docs else 1
             try:
-                Files.update_file_data_by_id(
+                await run_blocking(
+                    Files.update_file_data_by_id,
                     file.id,
                     {
                         "content": "".join(text_content),
@@ -2036,16 +1907,21 @@ def process_file(
                             pii_labels=PiiLabels(detect=["ALL"]),
                             known_entities=known_entities,
                         )
-                        response = mask_text_text_mask_post.sync(
-                            client=client,
-                            body=body,
-                            create_session=False,
-                            quiet=False,
+                        response = (
+                            await run_blocking(
+                                mask_text_text_mask_post.sync,
+                                client=client,
+                                body=body,
+                                create_session=False,
+                                quiet=False,
+                            )
                         ).to_dict()
 
                         log.debug(f"response: {response}")
                         # response can be HTTPValidationError or TextMaskResponse
-                        _set_processing(file.id, "processing", "pii_detection", 20)
+                        await run_blocking(
+                            _set_processing, file.id, "processing", "pii_detection", 20
+                        )
                         if "pii" in response:
                             # response.pii is list[list[PiiEntity]] or None/Unset
                             pii = (
@@ -2092,7 +1968,8 @@ def process_file(
                     )
                 # Persist latest PII results incrementally, without blocking content updates
                 try:
-                    Files.update_file_data_by_id(
+                    await run_blocking(
+                        Files.update_file_data_by_id,
                         file.id,
                         {
                             "pii": detections,
@@ -2103,8 +1980,12 @@ def process_file(
                 # Granular PII progress from 20 to 30
                 try:
                     pii_progress = 20 + int(10 * (page_index + 1) / max(total_pages, 1))
-                    _set_processing(
-                        file.id, "processing", "pii_detection", pii_progress
+                    await run_blocking(
+                        _set_processing,
+                        file.id,
+                        "processing",
+                        "pii_detection",
+                        pii_progress,
                     )
                 except Exception:
                     log.exception("Failed to update PII progress")
@@ -2113,17 +1994,20 @@ def process_file(
                 current_page_offset = page_start_offset + len(doc.page_content)
 
             # Extraction completed
-            _set_processing(file.id, "processing", "pii_detection", 70)
+            await run_blocking(
+                _set_processing, file.id, "processing", "pii_detection", 70
+            )
 
         # About to embed/index
-        _set_processing(file.id, "processing", "embedding", 70)
+        await run_blocking(_set_processing, file.id, "processing", "embedding", 70)
 
-        hash = calculate_sha256_string(" ".join(text_content))
-        Files.update_file_hash_by_id(file.id, hash)
+        hash = await run_blocking(calculate_sha256_string, " ".join(text_content))
+        await run_blocking(Files.update_file_hash_by_id, file.id, hash)
 
         if not request.app.state.config.BYPASS_EMBEDDING_AND_RETRIEVAL:
             try:
-                result = save_docs_to_vector_db(
+                result = await run_blocking(
+                    save_docs_to_vector_db,
                     request,
                     docs=docs,
                     collection_name=collection_name,
@@ -2138,8 +2022,11 @@ def process_file(
 
                 if result:
                     # Indexing completed
-                    _set_processing(file.id, "processing", "indexing", 95)
-                    Files.update_file_metadata_by_id(
+                    await run_blocking(
+                        _set_processing, file.id, "processing", "indexing", 95
+                    )
+                    await run_blocking(
+                        Files.update_file_metadata_by_id,
                         file.id,
                         {
                             "collection_name": collection_name,
@@ -2147,7 +2034,7 @@ def process_file(
                     )
 
                     # Done
-                    _set_processing(file.id, "done", "done", 100)
+                    await run_blocking(_set_processing, file.id, "done", "done", 100)
 
                     return {
                         "status": True,
@@ -2166,7 +2053,7 @@ def process_file(
                     log.info(
                         f"Duplicate content detected for file {file.filename}, treating as successful"
                     )
-                    _set_processing(file.id, "done", "done", 100)
+                    await run_blocking(_set_processing, file.id, "done", "done", 100)
 
                     return {
                         "status": True,
@@ -2182,16 +2069,21 @@ def process_file(
                     }
                 else:
                     # Other ValueError exceptions should still be treated as errors
-                    _set_processing(file.id, "error", "error", 100, error=str(e))
+                    await run_blocking(
+                        _set_processing, file.id, "error", "error", 100, error=str(e)
+                    )
                     raise e
             except Exception as e:
                 # Mark error state so clients stop polling
-                _set_processing(file.id, "error", "error", 100, error=str(e))
+                await run_blocking(
+                    _set_processing, file.id, "error", "error", 100, error=str(e)
+                )
                 raise e
         else:
             # Store extraction information in file data for bypass path too
             try:
-                Files.update_file_data_by_id(
+                await run_blocking(
+                    Files.update_file_data_by_id,
                     file.id,
                     {
                         "extraction": {
@@ -2204,7 +2096,7 @@ def process_file(
             except Exception:
                 pass  # Don't let extraction info storage break the main flow
 
-            _set_processing(file.id, "done", "done", 100)
+            await run_blocking(_set_processing, file.id, "done", "done", 100)
             return {
                 "status": True,
                 "collection_name": None,
@@ -2226,7 +2118,9 @@ def process_file(
             )
         else:
             # Ensure error state is written
-            _set_processing(form_data.file_id, "error", "error", 100, error=str(e))
+            await run_blocking(
+                _set_processing, form_data.file_id, "error", "error", 100, error=str(e)
+            )
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=str(e),
@@ -2325,6 +2219,8 @@ def process_web(
         if not collection_name:
             collection_name = calculate_sha256_string(form_data.url)[:63]
 
+        from open_webui.retrieval.web.utils import get_web_loader
+
         loader = get_web_loader(
             form_data.url,
             verify_ssl=request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION,
@@ -2390,6 +2286,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
     # TODO: add playwright to search the web
     if engine == "searxng":
         if request.app.state.config.SEARXNG_QUERY_URL:
+            from open_webui.retrieval.web.searxng import search_searxng
+
             return search_searxng(
                 request.app.state.config.SEARXNG_QUERY_URL,
                 query,
@@ -2400,6 +2298,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
             raise Exception("No SEARXNG_QUERY_URL found in environment variables")
     elif engine == "yacy":
         if request.app.state.config.YACY_QUERY_URL:
+            from open_webui.retrieval.web.yacy import search_yacy
+
             return search_yacy(
                 request.app.state.config.YACY_QUERY_URL,
                 request.app.state.config.YACY_USERNAME,
@@ -2415,6 +2315,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
             request.app.state.config.GOOGLE_PSE_API_KEY
             and request.app.state.config.GOOGLE_PSE_ENGINE_ID
         ):
+            from open_webui.retrieval.web.google_pse import search_google_pse
+
             return search_google_pse(
                 request.app.state.config.GOOGLE_PSE_API_KEY,
                 request.app.state.config.GOOGLE_PSE_ENGINE_ID,
@@ -2428,6 +2330,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
             )
     elif engine == "brave":
         if request.app.state.config.BRAVE_SEARCH_API_KEY:
+            from open_webui.retrieval.web.brave import search_brave
+
             return search_brave(
                 request.app.state.config.BRAVE_SEARCH_API_KEY,
                 query,
@@ -2438,6 +2342,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
             raise Exception("No BRAVE_SEARCH_API_KEY found in environment variables")
     elif engine == "kagi":
         if request.app.state.config.KAGI_SEARCH_API_KEY:
+            from open_webui.retrieval.web.kagi import search_kagi
+
             return search_kagi(
                 request.app.state.config.KAGI_SEARCH_API_KEY,
                 query,
@@ -2448,6 +2354,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
             raise Exception("No KAGI_SEARCH_API_KEY found in environment variables")
     elif engine == "mojeek":
         if request.app.state.config.MOJEEK_SEARCH_API_KEY:
+            from open_webui.retrieval.web.mojeek import search_mojeek
+
             return search_mojeek(
                 request.app.state.config.MOJEEK_SEARCH_API_KEY,
                 query,
@@ -2458,6 +2366,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
             raise Exception("No MOJEEK_SEARCH_API_KEY found in environment variables")
     elif engine == "bocha":
         if request.app.state.config.BOCHA_SEARCH_API_KEY:
+            from open_webui.retrieval.web.bocha import search_bocha
+
             return search_bocha(
                 request.app.state.config.BOCHA_SEARCH_API_KEY,
                 query,
@@ -2468,6 +2378,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
             raise Exception("No BOCHA_SEARCH_API_KEY found in environment variables")
     elif engine == "serpstack":
         if request.app.state.config.SERPSTACK_API_KEY:
+            from open_webui.retrieval.web.serpstack import search_serpstack
+
             return search_serpstack(
                 request.app.state.config.SERPSTACK_API_KEY,
                 query,
@@ -2479,6 +2391,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
             raise Exception("No SERPSTACK_API_KEY found in environment variables")
     elif engine == "serper":
         if request.app.state.config.SERPER_API_KEY:
+            from open_webui.retrieval.web.serper import search_serper
+
             return search_serper(
                 request.app.state.config.SERPER_API_KEY,
                 query,
@@ -2489,6 +2403,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
             raise Exception("No SERPER_API_KEY found in environment variables")
     elif engine == "serply":
         if request.app.state.config.SERPLY_API_KEY:
+            from open_webui.retrieval.web.serply import search_serply
+
             return search_serply(
                 request.app.state.config.SERPLY_API_KEY,
                 query,
@@ -2498,6 +2414,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
         else:
             raise Exception("No SERPLY_API_KEY found in environment variables")
     elif engine == "duckduckgo":
+        from open_webui.retrieval.web.duckduckgo import search_duckduckgo
+
         return search_duckduckgo(
             query,
             request.app.state.config.WEB_SEARCH_RESULT_COUNT,
@@ -2506,6 +2424,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
         )
     elif engine == "tavily":
         if request.app.state.config.TAVILY_API_KEY:
+            from open_webui.retrieval.web.tavily import search_tavily
+
             return search_tavily(
                 request.app.state.config.TAVILY_API_KEY,
                 query,
@@ -2516,6 +2436,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
             raise Exception("No TAVILY_API_KEY found in environment variables")
     elif engine == "exa":
         if request.app.state.config.EXA_API_KEY:
+            from open_webui.retrieval.web.exa import search_exa
+
             return search_exa(
                 request.app.state.config.EXA_API_KEY,
                 query,
@@ -2526,6 +2448,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
             raise Exception("No EXA_API_KEY found in environment variables")
     elif engine == "searchapi":
         if request.app.state.config.SEARCHAPI_API_KEY:
+            from open_webui.retrieval.web.searchapi import search_searchapi
+
             return search_searchapi(
                 request.app.state.config.SEARCHAPI_API_KEY,
                 request.app.state.config.SEARCHAPI_ENGINE,
@@ -2537,6 +2461,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
             raise Exception("No SEARCHAPI_API_KEY found in environment variables")
     elif engine == "serpapi":
         if request.app.state.config.SERPAPI_API_KEY:
+            from open_webui.retrieval.web.serpapi import search_serpapi
+
             return search_serpapi(
                 request.app.state.config.SERPAPI_API_KEY,
                 request.app.state.config.SERPAPI_ENGINE,
@@ -2547,12 +2473,16 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
         else:
             raise Exception("No SERPAPI_API_KEY found in environment variables")
     elif engine == "jina":
+        from open_webui.retrieval.web.jina_search import search_jina
+
         return search_jina(
             request.app.state.config.JINA_API_KEY,
             query,
             request.app.state.config.WEB_SEARCH_RESULT_COUNT,
         )
     elif engine == "bing":
+        from open_webui.retrieval.web.bing import search_bing
+
         return search_bing(
             request.app.state.config.BING_SEARCH_V7_SUBSCRIPTION_KEY,
             request.app.state.config.BING_SEARCH_V7_ENDPOINT,
@@ -2562,6 +2492,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
             request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST,
         )
     elif engine == "exa":
+        from open_webui.retrieval.web.exa import search_exa
+
         return search_exa(
             request.app.state.config.EXA_API_KEY,
             query,
@@ -2569,6 +2501,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
             request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST,
         )
     elif engine == "perplexity":
+        from open_webui.retrieval.web.perplexity import search_perplexity
+
         return search_perplexity(
             request.app.state.config.PERPLEXITY_API_KEY,
             query,
@@ -2582,6 +2516,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
             request.app.state.config.SOUGOU_API_SID
             and request.app.state.config.SOUGOU_API_SK
         ):
+            from open_webui.retrieval.web.sougou import search_sougou
+
             return search_sougou(
                 request.app.state.config.SOUGOU_API_SID,
                 request.app.state.config.SOUGOU_API_SK,
@@ -2594,6 +2530,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
                 "No SOUGOU_API_SID or SOUGOU_API_SK found in environment variables"
             )
     elif engine == "firecrawl":
+        from open_webui.retrieval.web.firecrawl import search_firecrawl
+
         return search_firecrawl(
             request.app.state.config.FIRECRAWL_API_BASE_URL,
             request.app.state.config.FIRECRAWL_API_KEY,
@@ -2602,6 +2540,8 @@ def search_web(request: Request, engine: str, query: str) -> list[SearchResult]:
             request.app.state.config.WEB_SEARCH_DOMAIN_FILTER_LIST,
         )
     elif engine == "external":
+        from open_webui.retrieval.web.external import search_external
+
         return search_external(
             request.app.state.config.EXTERNAL_WEB_SEARCH_URL,
             request.app.state.config.EXTERNAL_WEB_SEARCH_API_KEY,
@@ -2675,6 +2615,8 @@ async def process_web_search(
                 if hasattr(result, "snippet") and result.snippet is not None
             ]
         else:
+            from open_webui.retrieval.web.utils import get_web_loader
+
             loader = get_web_loader(
                 urls,
                 verify_ssl=request.app.state.config.ENABLE_WEB_LOADER_SSL_VERIFICATION,
@@ -2719,6 +2661,8 @@ async def process_web_search(
                     request,
                     docs,
                     collection_name,
+                    # Lets the vector DB garbage collector expire the collection
+                    metadata={"created_at": int(time.time())},
                     overwrite=True,
                     user=user,
                 )
@@ -2935,9 +2879,44 @@ def reset_upload_dir(user=Depends(get_admin_user)) -> bool:
             log.warning(f"The directory {folder} does not exist")
     except Exception as e:
         log.exception(f"Failed to process the directory {folder}. Reason: {e}")
+
+    if EXTRACTION_CACHE is not None:
+        EXTRACTION_CACHE.clear()
     return True
 
 
+def get_index_managed_vector_db():
+    if not hasattr(VECTOR_DB_CLIENT, "get_index_health"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(
+                "Index management is not supported by the configured vector database"
+            ),
+        )
+    return VECTOR_DB_CLIENT
+
+
+@router.get("/vector/indexes")
+def get_vector_index_health(limit: int = 50, user=Depends(get_admin_user)):
+    return get_index_managed_vector_db().get_index_health(limit=limit)
+
+
+@router.post("/vector/indexes/rebuild")
+def rebuild_vector_indexes(user=Depends(get_admin_user)):
+    return {"status": get_index_managed_vector_db().rebuild_vector_indexes()}
+
+
+@router.post("/vector/gc")
+def collect_vector_garbage(dry_run: bool = False, user=Depends(get_admin_user)):
+    try:
+        return collect_vector_db_garbage(VECTOR_DB_CLIENT, dry_run=dry_run)
+    except NotImplementedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=ERROR_MESSAGES.DEFAULT(e),
+        )
+
+
 if ENV == "dev":
 
     @router.get("/ef/{text}")
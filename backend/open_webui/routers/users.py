@@ -211,7 +211,7 @@ async def update_default_user_permissions(
 
 @router.get("/user/settings", response_model=Optional[UserSettings])
 async def get_user_settings_by_session_user(user=Depends(get_verified_user)):
-    user = Users.get_user_by_id(user.id)
+    user = await Users.get_user_by_id_async(user.id)
     if user:
         return user.settings
     else:
@@ -260,7 +260,7 @@ async def update_user_settings_by_session_user(
 
 @router.get("/user/info", response_model=Optional[dict])
 async def get_user_info_by_session_user(user=Depends(get_verified_user)):
-    user = Users.get_user_by_id(user.id)
+    user = await Users.get_user_by_id_async(user.id)
     if user:
         return user.info
     else:
@@ -279,7 +279,7 @@ async def get_user_info_by_session_user(user=Depends(get_verified_user)):
 async def update_user_info_by_session_user(
     form_data: dict, user=Depends(get_verified_user)
 ):
-    user = Users.get_user_by_id(user.id)
+    user = await Users.get_user_by_id_async(user.id)
     if user:
         if user.info is None:
             user.info = {}
@@ -316,7 +316,7 @@ async def get_user_by_id(user_id: str, user=Depends(get_verified_user)):
     # If it is, get the user_id from the chat
     if user_id.startswith("shared-"):
         chat_id = user_id.replace("shared-", "")
-        chat = Chats.get_chat_by_id(chat_id)
+        chat = await Chats.get_chat_by_id_async(chat_id)
         if chat:
             user_id = chat.user_id
         else:
@@ -325,7 +325,7 @@ async def get_user_by_id(user_id: str, user=Depends(get_verified_user)):
                 detail=ERROR_MESSAGES.USER_NOT_FOUND,
             )
 
-    user = Users.get_user_by_id(user_id)
+    user = await Users.get_user_by_id_async(user_id)
 
     if user:
         return UserResponse(
@@ -361,7 +361,7 @@ async def get_user_oauth_sessions_by_id(user_id: str, user=Depends(get_admin_use
 
 @router.get("/{user_id}/profile/image")
 async def get_user_profile_image_by_id(user_id: str, user=Depends(get_verified_user)):
-    user = Users.get_user_by_id(user_id)
+    user = await Users.get_user_by_id_async(user_id)
     if user:
         if user.profile_image_url:
             # check if it's url or base64
@@ -440,7 +440,7 @@ async def update_user_by_id(
             detail="Could not verify primary admin status.",
         )
 
-    user = Users.get_user_by_id(user_id)
+    user = await Users.get_user_by_id_async(user_id)
 
     if user:
         if form_data.email.lower() != user.email:
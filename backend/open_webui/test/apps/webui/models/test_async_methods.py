@@ -0,0 +1,114 @@
+import asyncio
+import json
+import uuid
+
+from sqlalchemy import text
+
+from open_webui.internal.db import (
+    async_engine,
+    get_db,
+    get_async_database_connect_args,
+    get_async_database_url,
+)
+from open_webui.models.chats import ChatForm, Chats
+from open_webui.models.users import Users
+
+
+def run(coro):
+    async def run_and_dispose():
+        try:
+            return await coro
+        finally:
+            # Pooled connections belong to this event loop
+            if async_engine is not None:
+                await async_engine.dispose()
+
+    return asyncio.run(run_and_dispose())
+
+
+def test_async_chat_methods_match_sync():
+    chat = Chats.insert_new_chat(
+        "u", ChatForm(chat={"title": "Chat", "history": {"messages": {}}})
+    )
+    try:
+
+        async def update():
+            await Chats.upsert_message_to_chat_by_id_and_message_id_async(
+                chat.id, "m1", {"role": "assistant", "content": "Hi\x00"}
+            )
+            await Chats.add_message_status_to_chat_by_id_and_message_id_async(
+                chat.id, "m1", {"done": True}
+            )
+            return (
+                await Chats.get_message_by_id_and_message_id_async(chat.id, "m1"),
+                await Chats.get_chat_by_id_and_user_id_async(chat.id, "other"),
+            )
+
+        message, other_users_chat = run(update())
+
+        assert message == {
+            "role": "assistant",
+            "content": "Hi",
+            "statusHistory": [{"done": True}],
+        }
+        assert other_users_chat is None
+        assert Chats.get_chat_by_id(chat.id).chat["history"] == {
+            "messages": {"m1": message},
+            "currentId": "m1",
+        }
+    finally:
+        Chats.delete_chat_by_id(chat.id)
+
+
+def test_chats_stored_with_nan_values_load():
+    chat = Chats.insert_new_chat("u", ChatForm(chat={"title": "Chat"}))
+    try:
+        # Rows written by json.dumps before orjson may contain NaN
+        with get_db() as db:
+            db.execute(
+                text("UPDATE chat SET chat = :chat WHERE id = :id"),
+                {
+                    "chat": json.dumps({"title": "Chat", "score": float("nan")}),
+                    "id": chat.id,
+                },
+            )
+            db.commit()
+
+        for loaded in (
+            Chats.get_chat_by_id(chat.id),
+            run(Chats.get_chat_by_id_and_user_id_async(chat.id, "u")),
+        ):
+            assert loaded.chat["title"] == "Chat"
+            assert loaded.chat["score"] != loaded.chat["score"]
+    finally:
+        Chats.delete_chat_by_id(chat.id)
+
+
+def test_async_user_lookup():
+    user = Users.insert_new_user(
+        str(uuid.uuid4()), "Jane Doe", f"{uuid.uuid4()}@openwebui.com"
+    )
+    try:
+        assert run(Users.get_user_by_id_async(user.id)) == Users.get_user_by_id(user.id)
+        assert run(Users.get_user_by_id_async("missing")) is None
+    finally:
+        Users.delete_user_by_id(user.id)
+
+
+def test_async_database_url_moves_libpq_parameters_to_the_dsn():
+    url = (
+        "postgresql://user:p%40ss@db:5432/webui?sslmode=verify-full"
+        "&sslrootcert=/certs/root.crt&options=-csearch_path%3Dwebui"
+        "&command_timeout=30"
+    )
+
+    assert get_async_database_url(url) == (
+        "postgresql+asyncpg://user:p%40ss@db:5432/webui?command_timeout=30"
+    )
+    assert get_async_database_connect_args(url) == {
+        "dsn": "postgresql://?sslmode=verify-full&sslrootcert=%2Fcerts%2Froot.crt"
+        "&options=-csearch_path%3Dwebui"
+    }
+
+    assert get_async_database_connect_args("postgresql://db/webui") == {}
+    assert get_async_database_connect_args("sqlite:///webui.db") == {}
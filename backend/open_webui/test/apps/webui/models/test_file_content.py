@@ -0,0 +1,60 @@
+import asyncio
+import uuid
+
+from open_webui.internal.db import async_engine, get_db
+from open_webui.models.files import File, FileContent, FileForm, Files
+
+
+def run(coro):
+    async def run_and_dispose():
+        try:
+            return await coro
+        finally:
+            if async_engine is not None:
+                await async_engine.dispose()
+
+    return asyncio.run(run_and_dispose())
+
+
+def test_file_content_is_stored_apart_from_file_data():
+    id = str(uuid.uuid4())
+    file = Files.insert_new_file(
+        "u",
+        FileForm(
+            id=id,
+            filename="a.txt",
+            path="a.txt",
+            data={"status": "pending", "content": "Hello\x00"},
+        ),
+    )
+    assert file.data == {"status": "pending", "content": "Hello"}
+
+    try:
+        Files.update_file_data_by_id(id, {"status": "completed", "pii": {}})
+        Files.update_file_data_by_id(id, {"page_content": ["Hello"]})
+
+        with get_db() as db:
+            assert db.get(File, id).data == {"status": "completed", "pii": {}}
+            assert db.get(FileContent, id).content == "Hello"
+
+        expected = {
+            "status": "completed",
+            "pii": {},
+            "content": "Hello",
+            "page_content": ["Hello"],
+        }
+        assert Files.get_file_by_id(id).data == expected
+        assert run(Files.get_file_by_id_async(id)).data == expected
+        assert Files.get_files_by_ids([id])[0].data == expected
+
+        assert Files.get_file_by_id(id, include_content=False).data == {
+            "status": "completed",
+            "pii": {},
+        }
+        assert "content" not in Files.get_files_by_user_id("u", False)[0].data
+        assert Files.get_file_content_by_id(id) == "Hello"
+        assert run(Files.get_file_content_by_id_async(id)) == "Hello"
+    finally:
+        Files.delete_file_by_id(id)
+
+    assert Files.get_file_content_by_id(id) is None
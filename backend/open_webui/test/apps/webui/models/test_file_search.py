@@ -0,0 +1,120 @@
+import uuid
+
+import pytest
+
+from open_webui.models.files import FileForm, Files, filename_pattern_to_like
+
+FILENAMES = [
+    "Report.PDF",
+    "report_2.pdf",
+    "report%.txt",
+    "notes.txt",
+    "a.pdf",
+    "ÜBERSICHT.pdf",
+]
+
+
+@pytest.fixture
+def user_files():
+    user_id = str(uuid.uuid4())
+    ids = [str(uuid.uuid4()) for _ in FILENAMES]
+    for id, filename in zip(ids, FILENAMES):
+        Files.insert_new_file(
+            user_id,
+            FileForm(id=id, filename=filename, path=filename, data={"content": "x"}),
+        )
+    # Another user's file is never returned
+    Files.insert_new_file(
+        "other", FileForm(id=ids[0][::-1], filename="report.pdf", path="report.pdf")
+    )
+
+    yield user_id
+    for id in ids + [ids[0][::-1]]:
+        Files.delete_file_by_id(id)
+
+
+def search(user_id: str, pattern: str, **kwargs) -> list[str]:
+    files, _ = Files.search_files_by_filename(pattern, user_id=user_id, **kwargs)
+    return [file.filename for file in files]
+
+
+def test_filename_pattern_to_like():
+    assert filename_pattern_to_like("*.pdf") == "%.pdf"
+    assert filename_pattern_to_like("a?_%\\") == "a_\\_\\%\\\\"
+    assert filename_pattern_to_like("[ab]*") is None
+
+
+def test_search_files_by_filename(user_files):
+    assert search(user_files, "report*") == [
+        "report%.txt",
+        "Report.PDF",
+        "report_2.pdf",
+    ]
+    assert search(user_files, "*.PDF") == [
+        "a.pdf",
+        "Report.PDF",
+        "report_2.pdf",
+        "ÜBERSICHT.pdf",
+    ]
+    assert search(user_files, "report?.pdf") == []
+    assert search(user_files, "report_?.pdf") == ["report_2.pdf"]
+    assert search(user_files, "report%*") == ["report%.txt"]
+    assert search(user_files, "[an]*") == ["a.pdf", "notes.txt"]
+    assert search(user_files, "report[_.]*") == ["Report.PDF", "report_2.pdf"]
+    assert search(user_files, "übersicht*") == ["ÜBERSICHT.pdf"]
+    assert search(user_files, "[ü]*") == ["ÜBERSICHT.pdf"]
+
+    files, _ = Files.search_files_by_filename("notes.txt", user_files)
+    assert files[0].data == {"content": "x"}
+    files, _ = Files.search_files_by_filename("notes.txt", user_files, False)
+    assert files[0].data == {}
+
+
+@pytest.mark.parametrize("pattern", ["*", "[!x]*"])
+def test_search_files_pages(user_files, pattern):
+    pages, cursor = [], None
+    while True:
+        files, cursor = Files.search_files_by_filename(
+            pattern, user_id=user_files, limit=2, cursor=cursor
+        )
+        pages.append([file.filename for file in files])
+        if cursor is None:
+            break
+
+    assert pages == [
+        ["a.pdf", "notes.txt"],
+        ["report%.txt", "Report.PDF"],
+        ["report_2.pdf", "ÜBERSICHT.pdf"],
+        [],
+    ]
+
+
+def test_cursors_of_other_queries_are_rejected(user_files):
+    _, list_cursor = Files.get_files_page(user_id=user_files, limit=2)
+    _, search_cursor = Files.search_files_by_filename("*", user_id=user_files, limit=2)
+
+    with pytest.raises(ValueError):
+        Files.get_files_page(user_id=user_files, limit=2, cursor=search_cursor)
+    with pytest.raises(ValueError):
+        Files.search_files_by_filename(
+            "*", user_id=user_files, limit=2, cursor=list_cursor
+        )
+
+
+def test_get_files_page(user_files):
+    files, _ = Files.get_files_page(user_id=user_files, include_content=False)
+    assert len(files) == len(FILENAMES)
+    assert all(file.data == {} for file in files)
+
+    seen, cursor = [], None
+    while True:
+        page, cursor = Files.get_files_page(user_id=user_files, limit=2, cursor=cursor)
+        seen += page
+        if cursor is None:
+            break
+
+    assert [file.id for file in seen] == [file.id for file in files]
+    assert all(file.data == {"content": "x"} for file in seen)
+
+    with pytest.raises(ValueError):
+        Files.get_files_page(user_id=user_files, limit=2, cursor="not a cursor")
@@ -0,0 +1,64 @@
+import uuid
+
+from open_webui.internal.db import get_db
+from open_webui.models.files import File, FileForm, Files
+from open_webui.models.knowledge import KnowledgeForm, Knowledges
+from open_webui.routers.knowledge import get_knowledge_bases_with_files
+
+
+def test_knowledge_files_are_fetched_at_once_and_reconciled():
+    user_id = str(uuid.uuid4())
+    file_ids = [str(uuid.uuid4()) for _ in range(3)]
+    for updated_at, id in enumerate(file_ids):
+        Files.insert_new_file(user_id, FileForm(id=id, filename="a", path="a"))
+        with get_db() as db:
+            db.get(File, id).updated_at = updated_at
+            db.commit()
+
+    deleted_id = str(uuid.uuid4())
+    knowledge_ids = []
+    for ids in (file_ids[:2] + [deleted_id], file_ids[1:], []):
+        knowledge = Knowledges.insert_new_knowledge(
+            user_id, KnowledgeForm(name="k", description="", data={"file_ids": ids})
+        )
+        knowledge_ids.append(knowledge.id)
+
+    try:
+        # Duplicates, deleted files and ids beyond one IN chunk are fine
+        files = Files.get_file_metadatas_by_ids(
+            file_ids * 2 + [str(i) for i in range(1200)]
+        )
+        assert [file.id for file in files] == file_ids[::-1]
+
+        knowledge_bases = [
+            knowledge
+            for knowledge in Knowledges.get_knowledge_bases()
+            if knowledge.id in knowledge_ids
+        ]
+        listed = {
+            knowledge.id: [file.id for file in knowledge.files]
+            for knowledge in get_knowledge_bases_with_files(knowledge_bases)
+        }
+        assert listed == {
+            knowledge_ids[0]: [file_ids[1], file_ids[0]],
+            knowledge_ids[1]: [file_ids[2], file_ids[1]],
+            knowledge_ids[2]: [],
+        }
+        # Listing doesn't write, the reconciliation does
+        assert (
+            deleted_id
+            in Knowledges.get_knowledge_by_id(knowledge_ids[0]).data["file_ids"]
+        )
+
+        assert Knowledges.remove_missing_file_ids() >= 1
+        assert Knowledges.get_knowledge_by_id(knowledge_ids[0]).data == {
+            "file_ids": file_ids[:2]
+        }
+        assert Knowledges.get_knowledge_by_id(knowledge_ids[1]).data == {
+            "file_ids": file_ids[1:]
+        }
+    finally:
+        for id in knowledge_ids:
+            Knowledges.delete_knowledge_by_id(id)
+        for id in file_ids:
+            Files.delete_file_by_id(id)
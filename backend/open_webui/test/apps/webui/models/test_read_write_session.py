@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, create_engine, select
+from sqlalchemy.orm import declarative_base
+
+from open_webui.internal import db
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "item"
+    id = Column(Integer, primary_key=True)
+
+
+def test_read_write_session_routes_reads_until_first_write(tmp_path, monkeypatch):
+    write_engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    read_engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(write_engine)
+    monkeypatch.setattr(db, "engine", write_engine)
+    monkeypatch.setattr(db, "read_engine", read_engine)
+
+    with db.ReadWriteSession() as session:
+        assert session.get_bind(clause=select(Item)) is read_engine
+
+        session.add(Item(id=1))
+        session.flush()
+        # Reads after a write see the uncommitted row on the writer
+        assert session.get_bind(clause=select(Item)) is write_engine
+        assert session.scalars(select(Item.id)).all() == [1]
+        session.commit()
+
+        assert session.get_bind(clause=select(Item)) is read_engine
+        assert session.scalars(select(Item.id)).all() == [1]
@@ -0,0 +1,79 @@
+import time
+import uuid
+
+import pytest
+
+from open_webui.models.users import UserCache, UserModel, Users
+
+
+@pytest.fixture
+def user():
+    user = Users.insert_new_user(
+        str(uuid.uuid4()), "Jane Doe", f"{uuid.uuid4()}@openwebui.com", role="user"
+    )
+    yield user
+    Users.delete_user_by_id(user.id)
+
+
+def make_user(id: str, api_key=None) -> UserModel:
+    return UserModel(
+        id=id,
+        name=id,
+        email=f"{id}@openwebui.com",
+        profile_image_url="/user.png",
+        api_key=api_key,
+        last_active_at=0,
+        updated_at=0,
+        created_at=0,
+    )
+
+
+def test_user_cache_expiry_and_eviction(monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    cache = UserCache(ttl=5, size=2)
+
+    cache.set(make_user("a", api_key="sk-a"))
+    cache.set(make_user("b"))
+    assert cache.get_by_api_key("sk-a").id == "a"
+
+    # "a" was used last, so "b" is evicted
+    cache.set(make_user("c"))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+
+    # A changed API key no longer resolves to the user
+    cache.set(make_user("a", api_key="sk-a2"))
+    assert cache.get_by_api_key("sk-a") is None
+    assert cache.get_by_api_key("sk-a2").id == "a"
+
+    now[0] = 6.0
+    assert cache.get("a") is None
+    assert cache.get_by_api_key("sk-a2") is None
+
+
+def test_cached_user_invalidated_on_update(user):
+    assert Users.get_cached_user_by_id(user.id).role == "user"
+
+    Users.update_user_role_by_id(user.id, "admin")
+    assert Users.get_cached_user_by_id(user.id).role == "admin"
+
+    Users.update_user_api_key_by_id(user.id, "sk-1")
+    assert Users.get_cached_user_by_api_key("sk-1").id == user.id
+    Users.update_user_api_key_by_id(user.id, "sk-2")
+    assert Users.get_cached_user_by_api_key("sk-1") is None
+
+    Users.delete_user_by_id(user.id)
+    assert Users.get_cached_user_by_id(user.id) is None
+
+
+def test_last_active_flushed_in_batches(user):
+    Users.update_user_by_id(user.id, {"last_active_at": 0})
+
+    Users.touch_user_last_active_by_id(user.id)
+    Users.touch_user_last_active_by_id("missing")
+    assert Users.get_user_by_id(user.id).last_active_at == 0
+
+    assert Users.flush_user_last_active() == 2
+    assert Users.get_user_by_id(user.id).last_active_at >= user.last_active_at
+    assert Users.flush_user_last_active() == 0
@@ -0,0 +1 @@
+# Test retrieval package
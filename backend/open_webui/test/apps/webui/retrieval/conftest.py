@@ -0,0 +1,47 @@
+import os
+import threading
+import uuid
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+
+@pytest.fixture
+def client():
+    """
+    PgvectorClient on a live database (PGVECTOR_TEST_DB_URL), in a schema of its
+    own. The tables are left to the tests.
+    """
+    url = os.environ.get("PGVECTOR_TEST_DB_URL")
+    if not url:
+        pytest.skip("PGVECTOR_TEST_DB_URL is not set")
+
+    from open_webui.retrieval.vector.dbs import pgvector
+
+    schema = f"test_{uuid.uuid4().hex}"
+    engine = create_engine(
+        url, connect_args={"options": f"-csearch_path={schema},public"}
+    )
+    with engine.begin() as connection:
+        connection.execute(text(f"CREATE SCHEMA {schema}"))
+
+    client = pgvector.PgvectorClient.__new__(pgvector.PgvectorClient)
+    client.session = scoped_session(sessionmaker(bind=engine))
+    client._partial_indexes = {}
+    client._index_builds = set()
+    client._index_lock = threading.Lock()
+
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    client.statements = statements
+    yield client
+
+    client.session.remove()
+    with engine.begin() as connection:
+        connection.execute(text(f"DROP SCHEMA {schema} CASCADE"))
+    engine.dispose()
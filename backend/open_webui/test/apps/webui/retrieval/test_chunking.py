@@ -0,0 +1,79 @@
+from langchain_core.documents import Document
+
+from open_webui.retrieval.chunking import batched, iter_chunks, split_pages
+
+
+def test_split_pages_keeps_all_text():
+    text = " ".join(f"Sentence number {i}." for i in range(500))
+
+    pages = split_pages(text, page_size=1000)
+
+    assert "".join(pages) == text
+    assert len(pages) > 1
+    assert all(len(page) <= 1000 for page in pages)
+    assert all(page.rstrip().endswith(".") for page in pages)
+
+
+def test_chunks_have_global_offsets_and_shared_metadata():
+    pages = [
+        "First page text. " * 20,
+        "Second page text. " * 20,
+    ]
+    docs = [Document(page_content=page, metadata={"file_id": "f1"}) for page in pages]
+    full_text = "".join(pages)
+
+    chunks = list(iter_chunks(docs, "character", chunk_size=100, chunk_overlap=20))
+
+    assert len(chunks) > 4
+    for chunk in chunks:
+        assert full_text[chunk.start_index :].startswith(chunk.text)
+        page = docs[0] if chunk.start_index < len(pages[0]) else docs[1]
+        assert chunk.metadata is page.metadata
+    assert chunks[-1].start_index > len(pages[0])
+
+
+def test_offsets_restart_for_each_file():
+    docs = [
+        Document(page_content="a" * 50, metadata={"file_id": "f1"}),
+        Document(page_content="b" * 50, metadata={"file_id": "f2"}),
+    ]
+
+    chunks = list(iter_chunks(docs, "character", chunk_size=100, chunk_overlap=0))
+
+    assert [chunk.start_index for chunk in chunks] == [0, 0]
+
+
+def test_pii_occurrences_are_mapped_to_chunks():
+    text = "Alice met Bob. " * 10
+    bob = [{"start_idx": i + 10, "end_idx": i + 13} for i in range(0, len(text), 15)]
+    doc = Document(
+        page_content=text,
+        metadata={"pii": {"Bob": {"label": "PERSON", "occurrences": bob}}},
+    )
+
+    chunks = list(iter_chunks([doc], "character", chunk_size=40, chunk_overlap=0))
+
+    for chunk in chunks:
+        occurrences = chunk.pii["Bob"]["occurrences"]
+        assert occurrences
+        for occurrence in occurrences:
+            assert chunk.text[occurrence["start_idx"] : occurrence["end_idx"]] == "Bob"
+        metadata = chunk.get_metadata()
+        assert metadata["pii_positions_normalized"] is True
+        assert metadata["start_index"] == chunk.start_index
+
+
+def test_markdown_header_chunks():
+    text = "# Title\n\nIntro text.\n\n## Part\n\nPart text."
+    doc = Document(page_content=text, metadata={})
+
+    chunks = list(
+        iter_chunks([doc], "markdown_header", chunk_size=1000, chunk_overlap=0)
+    )
+
+    assert [chunk.headings for chunk in chunks] == [["Title"], ["Title", "Part"]]
+    assert text[chunks[1].start_index :].startswith("## Part")
+
+
+def test_batched():
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
@@ -0,0 +1,87 @@
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from open_webui.retrieval.models.embedding_batcher import EmbeddingBatcher
+
+
+class FakeModel:
+    """Embeds a sentence as [len(sentence), len(prompt)]"""
+
+    max_seq_length = 128
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def encode(self, sentences, prompt=None, batch_size=32, **kwargs):
+        with self.lock:
+            self.calls.append(list(sentences))
+        return np.array(
+            [[len(sentence), len(prompt or "")] for sentence in sentences],
+            dtype=np.float32,
+        )
+
+
+def test_encode_matches_model_output():
+    model = FakeModel()
+    batcher = EmbeddingBatcher(model, max_wait_ms=1)
+
+    assert batcher.encode("abc").tolist() == [3, 0]
+    assert batcher.encode(["a", "abcd"], prompt="q: ").tolist() == [[1, 3], [4, 3]]
+    assert batcher.encode([]).tolist() == []
+    assert batcher.max_seq_length == 128
+    batcher.close()
+
+
+def test_concurrent_requests_are_coalesced():
+    model = FakeModel()
+    batcher = EmbeddingBatcher(model, max_batch_size=64, max_wait_ms=200)
+
+    sentences = ["x" * i for i in range(1, 17)]
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(batcher.encode, sentences))
+
+    assert [result[0] for result in results] == [len(s) for s in sentences]
+    assert len(model.calls) < len(sentences)
+    assert sorted(s for call in model.calls for s in call) == sorted(sentences)
+    batcher.close()
+
+
+def test_errors_are_propagated_and_closed_batcher_rejects():
+    class FailingModel:
+        def encode(self, sentences, **kwargs):
+            raise ValueError("boom")
+
+    batcher = EmbeddingBatcher(FailingModel(), max_wait_ms=1)
+    with pytest.raises(ValueError, match="boom"):
+        batcher.encode("hello")
+
+    batcher.close()
+    with pytest.raises(RuntimeError):
+        batcher.encode("hello")
+
+
+def test_request_racing_close_is_served():
+    class SlowQueue(queue.Queue):
+        # Widens the window between accepting a request and queueing it
+        def put(self, item, *args, **kwargs):
+            if item is not None:
+                time.sleep(0.2)
+            super().put(item, *args, **kwargs)
+
+    batcher = EmbeddingBatcher(FakeModel(), max_wait_ms=1)
+    batcher._queue = SlowQueue()
+    batcher.encode("warm up")
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = executor.submit(batcher.submit, ["racing"])
+        time.sleep(0.05)
+        batcher.close()
+        future = pending.result()
+
+    assert future.result(timeout=2).tolist() == [[6, 0]]
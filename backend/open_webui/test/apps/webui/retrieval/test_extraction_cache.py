@@ -0,0 +1,136 @@
+import os
+import time
+
+from langchain_core.documents import Document
+
+from open_webui.retrieval.loaders import main
+from open_webui.retrieval.loaders.cache import ExtractionCache
+
+
+def write_file(path, content: bytes) -> str:
+    path.write_bytes(content)
+    return str(path)
+
+
+def test_key_depends_on_content_engine_and_params(tmp_path):
+    cache = ExtractionCache(tmp_path / "cache", max_size=1024 * 1024)
+    a = write_file(tmp_path / "a.pdf", b"same content")
+    b = write_file(tmp_path / "b.pdf", b"same content")
+    c = write_file(tmp_path / "c.pdf", b"other content")
+
+    key = cache.get_key(a, "docling", {"DOCLING_PARAMS": {"do_ocr": True}})
+
+    assert cache.get_key(b, "docling", {"DOCLING_PARAMS": {"do_ocr": True}}) == key
+    assert cache.get_key(c, "docling", {"DOCLING_PARAMS": {"do_ocr": True}}) != key
+    assert cache.get_key(a, "tika", {"DOCLING_PARAMS": {"do_ocr": True}}) != key
+    assert cache.get_key(a, "docling", {"DOCLING_PARAMS": {"do_ocr": False}}) != key
+
+
+def test_loader_keys_on_the_active_engine(tmp_path, monkeypatch):
+    cache = ExtractionCache(tmp_path / "cache", max_size=1024 * 1024)
+    monkeypatch.setattr(main, "EXTRACTION_CACHE", cache)
+    path = write_file(tmp_path / "a.pdf", b"content")
+    settings = {
+        "DATALAB_MARKER_API_KEY": "secret",
+        "DATALAB_MARKER_USE_LLM": False,
+        "DOCLING_SERVER_URL": "http://docling",
+    }
+
+    def get_key(**kwargs):
+        loader = main.Loader("datalab_marker", **{**settings, **kwargs})
+        key, _ = loader._get_cached("a.pdf", "application/pdf", path)
+        return key
+
+    key = get_key()
+    # Other engines' settings and the credential's value are not part of the key
+    assert get_key(DOCLING_SERVER_URL="http://other") == key
+    assert get_key(DATALAB_MARKER_API_KEY="rotated") == key
+    assert get_key(DATALAB_MARKER_API_KEY="") != key
+    assert get_key(DATALAB_MARKER_USE_LLM=True) != key
+    # Nor is the cache used when the engine is asked not to
+    assert get_key(DATALAB_MARKER_SKIP_CACHE=True) is None
+
+
+def test_get_and_set_round_trip_with_counters(tmp_path):
+    cache = ExtractionCache(tmp_path, max_size=1024 * 1024)
+    docs = [
+        Document(page_content="Grüße, page 1", metadata={"page": 0}),
+        Document(page_content="page 2", metadata={"page": 1}),
+    ]
+
+    assert cache.get("0" * 64) is None
+    cache.set("0" * 64, docs)
+    cached = cache.get("0" * 64)
+
+    assert [(d.page_content, d.metadata) for d in cached] == [
+        (d.page_content, d.metadata) for d in docs
+    ]
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.stats()["hit_rate"] == 0.5
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    docs = [Document(page_content=os.urandom(2048).hex(), metadata={})]
+    cache = ExtractionCache(tmp_path, max_size=6000)
+
+    cache.set("a" * 64, docs)
+    cache.set("b" * 64, docs)
+    # Make "a" the most recently used entry
+    os.utime(cache._path("b" * 64), (0, 0))
+    cache.get("a" * 64)
+    cache.set("c" * 64, docs)
+
+    assert cache.get("a" * 64) is not None
+    assert cache.get("b" * 64) is None
+    assert cache.evictions == 1
+    assert cache.stats()["size"] <= 6000
+
+
+def test_corrupt_entries_are_discarded(tmp_path):
+    cache = ExtractionCache(tmp_path, max_size=1024 * 1024)
+    path = cache._path("d" * 64)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not gzip")
+
+    assert cache.get("d" * 64) is None
+    assert not path.exists()
+
+
+def test_entries_of_deleted_files_are_removed(tmp_path):
+    cache = ExtractionCache(tmp_path / "cache", max_size=1024 * 1024)
+    docs = [Document(page_content="secret", metadata={})]
+    a = write_file(tmp_path / "a.pdf", b"a")
+    b = write_file(tmp_path / "b.pdf", b"b")
+    for engine in ("tika", "docling"):
+        cache.set(cache.get_key(a, engine, {}), docs)
+    cache.set(cache.get_key(b, "tika", {}), docs)
+
+    assert cache.delete_file(a) == 2
+    assert cache.get(cache.get_key(a, "tika", {})) is None
+    assert cache.get(cache.get_key(b, "tika", {})) is not None
+
+    cache.clear()
+    assert cache.get(cache.get_key(b, "tika", {})) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_entries_expire_after_the_ttl(tmp_path):
+    cache = ExtractionCache(tmp_path, max_size=1024 * 1024, ttl=60)
+    docs = [Document(page_content="secret", metadata={})]
+    cache.set("a" * 64, docs)
+    cache.set("b" * 64, docs)
+    cache.set("c" * 64, docs)
+    stored = time.time() - 120
+    for key in ("a" * 64, "b" * 64):
+        os.utime(cache._path(key), (stored, stored))
+
+    # Using an entry does not extend its lifetime
+    os.utime(cache._path("c" * 64), (time.time(), stored + 90))
+    assert cache.get("c" * 64) is not None
+    assert cache._path("c" * 64).stat().st_mtime == stored + 90
+
+    assert cache.get("a" * 64) is None
+    assert not cache._path("a" * 64).exists()
+    assert cache.expire() == 1
+    assert not cache._path("b" * 64).exists()
+    assert cache.get("c" * 64) is not None
@@ -0,0 +1,136 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from open_webui.models.files import FileModel
+from open_webui.models.knowledge import KnowledgeModel
+from open_webui.retrieval.vector.main import GetResult
+from open_webui.utils import knowledge_reindex
+
+EMBEDDING_CONFIG = {
+    "engine": "",
+    "model": "sentence-transformers/all-MiniLM-L6-v2",
+    "text_splitter": "",
+    "chunk_size": 1000,
+    "chunk_overlap": 100,
+}
+
+
+def make_file(id: str, hash: str) -> FileModel:
+    return FileModel(
+        id=id, user_id="u", hash=hash, filename=f"{id}.txt", created_at=0, updated_at=0
+    )
+
+
+def make_knowledge(id: str, file_ids) -> KnowledgeModel:
+    return KnowledgeModel(
+        id=id,
+        user_id="u",
+        name=id,
+        description="",
+        data={"file_ids": file_ids} if file_ids is not None else None,
+        created_at=0,
+        updated_at=0,
+    )
+
+
+class StoredChunks:
+    def __init__(self, collections: dict[str, dict[str, dict]]):
+        self.collections = collections
+
+    def has_collection(self, collection_name):
+        return collection_name in self.collections
+
+    def query(self, collection_name, filter, limit=None):
+        metadata = self.collections[collection_name].get(filter["file_id"])
+        metadatas = [metadata] if metadata else []
+        return GetResult(
+            ids=[["id"] * len(metadatas)],
+            documents=[[""] * len(metadatas)],
+            metadatas=[metadatas],
+        )
+
+
+def test_embedding_config_comparison():
+    file = make_file("f", "h1")
+    stored = {"hash": "h1", "embedding_config": str(EMBEDDING_CONFIG)}
+
+    assert not knowledge_reindex.is_chunk_stale(file, stored, EMBEDDING_CONFIG)
+    assert knowledge_reindex.is_chunk_stale(
+        file, stored, {**EMBEDDING_CONFIG, "model": "bge-m3"}
+    )
+    assert knowledge_reindex.is_chunk_stale(
+        file, {**stored, "hash": "h0"}, EMBEDDING_CONFIG
+    )
+    # Chunking settings changed, or weren't stored yet
+    assert knowledge_reindex.is_chunk_stale(
+        file, stored, {**EMBEDDING_CONFIG, "chunk_size": 500}
+    )
+    assert knowledge_reindex.is_chunk_stale(
+        file,
+        {**stored, "embedding_config": {"engine": "", "model": "m"}},
+        {**EMBEDDING_CONFIG, "model": "m"},
+    )
+    assert knowledge_reindex.is_chunk_stale(file, {"hash": "h1"}, EMBEDDING_CONFIG)
+    assert knowledge_reindex.is_chunk_stale(file, None, EMBEDDING_CONFIG)
+
+
+def test_plan_only_includes_stale_files(monkeypatch):
+    files = {
+        "fresh": make_file("fresh", "h1"),
+        "changed": make_file("changed", "h2"),
+        "missing": make_file("missing", "h3"),
+    }
+    monkeypatch.setattr(
+        knowledge_reindex.Files,
+        "get_files_by_ids",
+        lambda ids, include_content=True: [files[id] for id in ids if id in files],
+    )
+    monkeypatch.setattr(
+        knowledge_reindex,
+        "VECTOR_DB_CLIENT",
+        StoredChunks(
+            {
+                "kb1": {
+                    "fresh": {"hash": "h1", "embedding_config": EMBEDDING_CONFIG},
+                    "changed": {"hash": "old", "embedding_config": EMBEDDING_CONFIG},
+                }
+            }
+        ),
+    )
+
+    plan = knowledge_reindex.plan_knowledge_reindex(
+        [
+            make_knowledge("kb1", ["fresh", "changed", "missing", "deleted"]),
+            make_knowledge("kb2", ["fresh"]),
+            make_knowledge("broken", None),
+        ],
+        EMBEDDING_CONFIG,
+    )
+
+    assert plan.stale == {"changed": ["kb1"], "missing": ["kb1"], "fresh": ["kb2"]}
+    assert plan.invalid_knowledge_bases == ["broken"]
+    assert (plan.knowledge_bases, plan.files, plan.up_to_date) == (2, 4, 1)
+
+
+def test_only_one_worker_claims_the_lock_file(tmp_path, monkeypatch):
+    lock_path = tmp_path / "knowledge_reindex.lock"
+    monkeypatch.setattr(knowledge_reindex, "REINDEX_LOCK_PATH", lock_path)
+
+    def claim_concurrently():
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            return list(
+                executor.map(knowledge_reindex.claim_reindex_lock_file, "abcdefgh")
+            )
+
+    assert claim_concurrently().count(True) == 1
+
+    # The lock of an interrupted job is taken over by one worker
+    stale = time.time() - 4 * knowledge_reindex.REINDEX_JOB_HEARTBEAT
+    os.utime(lock_path, (stale, stale))
+    assert claim_concurrently().count(True) == 1
+    assert not knowledge_reindex.claim_reindex_lock_file("i")
+
+    knowledge_reindex.release_reindex_lock_file()
+    assert list(tmp_path.iterdir()) == []
+    assert knowledge_reindex.claim_reindex_lock_file("j")
@@ -0,0 +1,164 @@
+import asyncio
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from open_webui.retrieval.loaders import pool
+from open_webui.retrieval.loaders.external_document import ExternalDocumentLoader
+from open_webui.retrieval.loaders.main import TikaLoader
+
+
+class ExtractionServer(BaseHTTPRequestHandler):
+    in_flight = 0
+    max_in_flight = 0
+    lock = threading.Lock()
+
+    def do_PUT(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+
+        with self.lock:
+            ExtractionServer.in_flight += 1
+            ExtractionServer.max_in_flight = max(
+                ExtractionServer.max_in_flight, ExtractionServer.in_flight
+            )
+        time.sleep(0.05)
+        with self.lock:
+            ExtractionServer.in_flight -= 1
+
+        if self.path == "/tika/text":
+            payload = {"X-TIKA:content": f" {body.decode()} ", "Content-Type": "a/b"}
+        else:
+            payload = {"page_content": body.decode(), "metadata": {"p": 1}}
+
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ExtractionServer)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    ExtractionServer.max_in_flight = 0
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+@pytest.fixture
+def client_pool(monkeypatch):
+    client_pool = pool.LoaderClientPool(max_concurrency=2, pool_size=8)
+    monkeypatch.setattr(pool, "LOADER_CLIENT_POOL", client_pool)
+    yield client_pool
+    client_pool.close()
+
+
+def test_tika_loader(tmp_path, server_url, client_pool):
+    file_path = tmp_path / "doc.txt"
+    file_path.write_text("hello tika")
+
+    docs = TikaLoader(server_url, str(file_path), mime_type="text/plain").load()
+
+    assert docs[0].page_content == "hello tika"
+    assert docs[0].metadata == {"Content-Type": "a/b"}
+
+
+def test_concurrency_is_bounded_per_engine(tmp_path, server_url, client_pool):
+    file_path = tmp_path / "doc.txt"
+    file_path.write_text("external")
+    loader = ExternalDocumentLoader(str(file_path), url=server_url, api_key="key")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda _: loader.load(), range(8)))
+
+    assert all(docs[0].page_content == "external" for docs in results)
+    assert ExtractionServer.max_in_flight == 2
+
+
+def test_aload_from_another_event_loop(tmp_path, server_url, client_pool):
+    file_path = tmp_path / "doc.txt"
+    file_path.write_text("async")
+    loader = ExternalDocumentLoader(str(file_path), url=server_url, api_key="key")
+
+    docs = asyncio.run(loader.aload())
+
+    assert [(d.page_content, d.metadata) for d in docs] == [("async", {"p": 1})]
+
+
+class Config:
+    CONTENT_EXTRACTION_ENGINE = "external"
+    BYPASS_EMBEDDING_AND_RETRIEVAL = True
+    ENABLE_PII_DETECTION = False
+    DOCLING_MD_PAGE_BREAK_PLACEHOLDER = "<!-- page break -->"
+
+    def __getattr__(self, name):
+        return None
+
+
+def test_process_file_awaits_the_pool(tmp_path, server_url, client_pool, monkeypatch):
+    from types import SimpleNamespace
+
+    from open_webui.models.files import FileForm, Files
+    from open_webui.retrieval.loaders.main import Loader
+    from open_webui.routers.retrieval import ProcessFileForm, process_file
+
+    def load(*args, **kwargs):
+        raise AssertionError("process_file must not block on Loader.load")
+
+    monkeypatch.setattr(Loader, "load", load)
+
+    # The file rows are written from the blocking executor, not the event loop
+    write_threads = set()
+    for name in ("update_file_data_by_id", "update_file_metadata_by_id"):
+
+        def write(*args, write=getattr(Files, name), **kwargs):
+            write_threads.add(threading.current_thread())
+            return write(*args, **kwargs)
+
+        monkeypatch.setattr(Files, name, write)
+
+    config = Config()
+    config.EXTERNAL_DOCUMENT_LOADER_URL = server_url
+    config.EXTERNAL_DOCUMENT_LOADER_API_KEY = "key"
+    request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace(config=config)))
+
+    file_ids = []
+    for i in range(4):
+        file_path = tmp_path / f"doc{i}.txt"
+        file_path.write_text(f"content {i}")
+        file = Files.insert_new_file(
+            "user",
+            FileForm(
+                id=str(uuid.uuid4()),
+                filename=file_path.name,
+                path=str(file_path),
+                meta={"content_type": "text/plain"},
+            ),
+        )
+        file_ids.append(file.id)
+
+    async def main():
+        return await asyncio.gather(
+            *(
+                process_file(request, ProcessFileForm(file_id=id), user=None)
+                for id in file_ids
+            )
+        )
+
+    results = asyncio.run(main())
+
+    assert [result["content"] for result in results] == [
+        [f"content {i}"] for i in range(4)
+    ]
+    assert ExtractionServer.max_in_flight == 2
+    assert write_threads and threading.main_thread() not in write_threads
@@ -0,0 +1,108 @@
+import pytest
+
+from open_webui.retrieval.loaders.pdf import ParallelPDFLoader, shutdown_pdf_executor
+
+pytest.importorskip("pypdf")
+
+
+def write_pdf(path, pages: int):
+    """Writes a minimal PDF with one line of text per page"""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids ["
+        + b" ".join(f"{4 + 2 * i} 0 R".encode() for i in range(pages))
+        + f"] /Count {pages} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i in range(pages):
+        stream = f"BT /F1 12 Tf 72 720 Td (Page number {i + 1}) Tj ET".encode()
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>".encode()
+        )
+        objects.append(
+            f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream"
+        )
+
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, 1):
+        offsets.append(len(data))
+        data += f"{number} 0 obj\n".encode() + obj + b"\nendobj\n"
+
+    xref = len(data)
+    data += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    data += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    data += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+
+    path.write_bytes(data)
+    return str(path)
+
+
+@pytest.fixture(autouse=True)
+def executor():
+    yield
+    shutdown_pdf_executor()
+
+
+def test_parallel_extraction_matches_pypdf_loader(tmp_path):
+    from langchain_community.document_loaders import PyPDFLoader
+
+    file_path = write_pdf(tmp_path / "doc.pdf", pages=12)
+
+    expected = PyPDFLoader(file_path).load()
+    docs = list(
+        ParallelPDFLoader(
+            file_path, max_workers=2, pages_per_shard=5, min_pages=1
+        ).lazy_load()
+    )
+
+    assert [doc.page_content for doc in docs] == [
+        f"Page number {i}" for i in range(1, 13)
+    ]
+    assert [(d.page_content, d.metadata) for d in docs] == [
+        (d.page_content, d.metadata) for d in expected
+    ]
+
+
+def test_small_documents_are_extracted_in_process(tmp_path, monkeypatch):
+    import open_webui.retrieval.loaders.pdf as pdf
+
+    def fail(*args, **kwargs):
+        raise AssertionError("process pool should not be used")
+
+    monkeypatch.setattr(pdf, "get_pdf_executor", fail)
+    file_path = write_pdf(tmp_path / "doc.pdf", pages=3)
+
+    docs = ParallelPDFLoader(file_path, max_workers=2, min_pages=50).load()
+
+    assert [doc.metadata["page"] for doc in docs] == [0, 1, 2]
+
+
+def test_helpers_match_pypdf_parser():
+    from langchain_community.document_loaders.parsers import pdf as parsers
+
+    if not hasattr(parsers, "_merge_text_and_extras"):
+        pytest.skip("PyPDFParser helpers changed")
+
+    from open_webui.retrieval.loaders.pdf import merge_text_and_extras, purge_metadata
+
+    texts = ["", "one", "a\n\nb", "a\n\nb\n\n\nfooter", "a\n\n\nb\n\nc\n\nfooter"]
+    for text in texts:
+        for extras in [[], [""], ["image"], ["image", "", "other"]]:
+            assert merge_text_and_extras(extras, text) == (
+                parsers._merge_text_and_extras(extras, text)
+            )
+
+    metadata = {
+        "/Producer": " PyPDF ",
+        "/CreationDate": "D:20240101120000+01'00'",
+        "/ModDate": "not a date",
+        "page_count": 3,
+        "file_path": "a.pdf",
+        "/Trapped": ["x"],
+    }
+    assert purge_metadata(metadata) == parsers._purge_metadata(metadata)
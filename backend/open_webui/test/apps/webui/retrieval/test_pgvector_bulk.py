@@ -0,0 +1,136 @@
+import json
+import struct
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+pytest.importorskip("pgvector")
+
+from open_webui.retrieval.vector.dbs import pgvector
+
+
+def read_copy_rows(data: bytes) -> list[list]:
+    """Decodes the binary COPY stream written by format_copy_data"""
+    assert data.startswith(pgvector.COPY_HEADER)
+    position = len(pgvector.COPY_HEADER)
+    rows = []
+    while True:
+        (count,) = struct.unpack_from("!h", data, position)
+        position += 2
+        if count == -1:
+            break
+        row = []
+        for _ in range(count):
+            (length,) = struct.unpack_from("!i", data, position)
+            position += 4
+            if length == -1:
+                row.append(None)
+            else:
+                row.append(data[position : position + length])
+                position += length
+        rows.append(row)
+    assert position == len(data)
+    return rows
+
+
+def test_format_copy_data(monkeypatch):
+    monkeypatch.setattr(pgvector, "VECTOR_LENGTH", 4)
+    items = [
+        {
+            "id": "a",
+            "text": "tab\there\nnewline",
+            "vector": [0.5, 1.0],
+            "metadata": {"page": 1, "headings": ["x"]},
+        },
+        {"id": "b", "text": None, "vector": [1, 2, 3, 4, 5], "metadata": {}},
+    ]
+
+    rows = read_copy_rows(pgvector.format_copy_data("c1", items))
+
+    assert [row[0] for row in rows] == [b"a", b"b"]
+    assert rows[0][2:4] == [b"c1", "tab\there\nnewline".encode()]
+    assert rows[1][3] is None
+
+    dim, unused = struct.unpack_from("!hh", rows[0][1])
+    assert (dim, unused) == (4, 0)
+    assert np.frombuffer(rows[0][1][4:], ">f4").tolist() == [0.5, 1.0, 0.0, 0.0]
+    assert np.frombuffer(rows[1][1][4:], ">f4").tolist() == [1, 2, 3, 4]
+
+    # Lists are stringified for the JSONB column like the ORM path did
+    assert json.loads(rows[0][4]) == {"page": 1, "headings": "['x']"}
+
+
+def test_vectors_are_not_modified(monkeypatch):
+    monkeypatch.setattr(pgvector, "VECTOR_LENGTH", 4)
+    vector = [0.1, 0.2]
+
+    pgvector.to_vector_matrix([vector])
+    pgvector.PgvectorClient.adjust_vector_length(None, vector)
+
+    assert vector == [0.1, 0.2]
+
+
+def item(id, text="text", metadata=None):
+    return {"id": id, "text": text, "vector": [1.0, 0.0], "metadata": metadata or {}}
+
+
+def test_insert_fails_on_duplicate_ids(client):
+    client.session.execute(
+        text(
+            "CREATE TABLE document_chunk (id text PRIMARY KEY, "
+            f"vector vector({pgvector.VECTOR_LENGTH}), "
+            "collection_name text NOT NULL, text text, vmetadata jsonb)"
+        )
+    )
+    client._bulk_write("c1", [item("a"), item("b")], update=False)
+    client.session.commit()
+
+    with pytest.raises(IntegrityError):
+        client._bulk_write("c1", [item("a", "other")], update=False)
+    client.session.rollback()
+
+    client._bulk_write("c1", [item("a", "old"), item("a", "new")], update=True)
+    client.session.commit()
+    rows = client.session.execute(
+        text("SELECT id, text FROM document_chunk ORDER BY id")
+    ).all()
+    assert [tuple(row) for row in rows] == [("a", "new"), ("b", "text")]
+
+
+def test_pgcrypto_write_does_not_stage_plaintext(client, monkeypatch):
+    monkeypatch.setattr(pgvector, "PGVECTOR_PGCRYPTO", True)
+    monkeypatch.setattr(pgvector, "PGVECTOR_PGCRYPTO_KEY", "secret")
+    monkeypatch.setattr(pgvector, "ENCRYPTED_BATCH_SIZE", 2)
+    client.session.execute(
+        text(
+            "CREATE TABLE document_chunk (id text PRIMARY KEY, "
+            f"vector vector({pgvector.VECTOR_LENGTH}), "
+            "collection_name text NOT NULL, text bytea, vmetadata bytea)"
+        )
+    )
+
+    items = [item(id, f"plain {id}", {"page": 1}) for id in "abc"]
+    assert client._bulk_write("c1", items, update=False) == 3
+    client.session.commit()
+    # Existing ids are skipped like before, and updated by upserts
+    assert client._bulk_write("c1", [item("a", "skipped")], update=False) == 0
+    client._bulk_write("c1", [item("b", "old"), item("b", "new")], update=True)
+    client.session.commit()
+
+    assert not any(
+        "COPY" in statement or "staging" in statement for statement in client.statements
+    )
+    assert not any("plain" in statement for statement in client.statements)
+    rows = client.session.execute(
+        text(
+            "SELECT id, pgp_sym_decrypt(text, 'secret'), "
+            "pgp_sym_decrypt(vmetadata, 'secret') FROM document_chunk ORDER BY id"
+        )
+    ).all()
+    assert [tuple(row) for row in rows] == [
+        ("a", "plain a", '{"page": 1}'),
+        ("b", "new", "{}"),
+        ("c", "plain c", '{"page": 1}'),
+    ]
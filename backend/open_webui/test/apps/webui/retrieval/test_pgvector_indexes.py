@@ -0,0 +1,103 @@
+import pytest
+from sqlalchemy import text
+
+pytest.importorskip("pgvector")
+
+from open_webui.retrieval.vector.dbs import pgvector
+
+
+@pytest.fixture
+def hnsw(monkeypatch):
+    monkeypatch.setattr(pgvector, "PGVECTOR_INDEX_METHOD", "hnsw")
+    monkeypatch.setattr(pgvector, "PGVECTOR_HNSW_M", 24)
+    monkeypatch.setattr(pgvector, "PGVECTOR_HNSW_EF_CONSTRUCTION", 100)
+
+
+def test_partial_index_sql(hnsw):
+    sql = pgvector.get_vector_index_sql(
+        "idx_test", collection_name="it's mine", concurrently=True
+    )
+
+    assert sql == (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_test ON document_chunk "
+        "USING hnsw (vector vector_cosine_ops) WITH (m = 24, ef_construction = 100) "
+        "WHERE collection_name = 'it''s mine'"
+    )
+
+
+def test_index_matches_config(hnsw, monkeypatch):
+    # As reported by pg_indexes.indexdef
+    definition = (
+        "CREATE INDEX idx_document_chunk_vector ON public.document_chunk "
+        "USING hnsw (vector vector_cosine_ops) WITH (m='24', ef_construction='100')"
+    )
+
+    assert pgvector.index_matches_config(definition)
+
+    monkeypatch.setattr(pgvector, "PGVECTOR_HNSW_M", 16)
+    assert not pgvector.index_matches_config(definition)
+
+    monkeypatch.setattr(pgvector, "PGVECTOR_INDEX_METHOD", "ivfflat")
+    assert not pgvector.index_matches_config(definition)
+
+
+def test_partial_index_names_are_stable():
+    name = pgvector.get_partial_index_name("file-1")
+
+    assert name == pgvector.get_partial_index_name("file-1")
+    assert name != pgvector.get_partial_index_name("file-2")
+    # Postgres truncates identifiers after 63 bytes
+    assert len(name) <= 63
+
+
+def get_index_names(client) -> set[str]:
+    names = client.session.execute(
+        text("SELECT indexname FROM pg_indexes WHERE tablename = 'document_chunk'")
+    ).scalars()
+    client.session.rollback()
+    return set(names)
+
+
+@pytest.fixture
+def indexed_client(client, hnsw):
+    client.session.execute(
+        text(
+            "CREATE TABLE document_chunk (id text PRIMARY KEY, "
+            f"vector vector({pgvector.VECTOR_LENGTH}), "
+            "collection_name text NOT NULL, text text, vmetadata jsonb)"
+        )
+    )
+    for collection_name in ("c1", "c2"):
+        # As built by another worker, which this client doesn't know about
+        name = pgvector.get_partial_index_name(collection_name)
+        client.session.execute(
+            text(pgvector.get_vector_index_sql(name, collection_name))
+        )
+        client.session.execute(text(f"COMMENT ON INDEX {name} IS '{collection_name}'"))
+    client.session.commit()
+    return client
+
+
+def test_partial_indexes_of_other_workers_are_dropped(indexed_client):
+    client = indexed_client
+    c1, c2 = (pgvector.get_partial_index_name(c) for c in ("c1", "c2"))
+
+    client.delete_collection("c1")
+    assert c1 not in get_index_names(client)
+    assert c2 in get_index_names(client)
+
+    client.reset()
+    assert c2 not in get_index_names(client)
+
+
+def test_failed_build_keeps_the_index_of_another_worker(indexed_client, monkeypatch):
+    client = indexed_client
+    name = pgvector.get_partial_index_name("c1")
+    monkeypatch.setattr(
+        pgvector, "get_vector_index_sql", lambda *args, **kwargs: "SELECT 1 / 0"
+    )
+
+    client._build_indexes(["c1"], replace=False)
+
+    assert name in get_index_names(client)
+    assert "c1" not in client._index_builds
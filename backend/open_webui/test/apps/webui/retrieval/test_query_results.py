@@ -0,0 +1,60 @@
+from open_webui.retrieval.utils import (
+    merge_and_sort_query_results,
+    merge_get_results,
+)
+from open_webui.retrieval.vector.main import GetResult, SearchResult
+
+
+def search_result(rows) -> SearchResult:
+    return SearchResult(
+        ids=[[str(i) for i in range(len(rows))]],
+        distances=[[distance for distance, _, _ in rows]],
+        documents=[[document for _, document, _ in rows]],
+        metadatas=[[metadata for _, _, metadata in rows]],
+    )
+
+
+def test_merge_dedupes_chunks_and_keeps_best_distance():
+    chunk = {"file_id": "f", "start_index": 0}
+    results = [
+        search_result(
+            [
+                (0.5, "chunk of f", chunk),
+                (0.4, "web page", {"source": "a"}),
+                (0.3, "other", {"file_id": "f", "start_index": 10}),
+            ]
+        ),
+        # Same chunk in a knowledge collection, same text from another source
+        {
+            "distances": [[0.9, 0.6, 0.1]],
+            "documents": [["chunk of f", "web page", None]],
+            "metadatas": [[dict(chunk, collection="kb"), {"source": "b"}, {}]],
+        },
+    ]
+
+    merged = merge_and_sort_query_results(results, k=2)
+
+    assert merged == {
+        "distances": [[0.9, 0.6]],
+        "documents": [["chunk of f", "web page"]],
+        "metadatas": [[dict(chunk, collection="kb"), {"source": "b"}]],
+    }
+    assert merge_and_sort_query_results(results, k=10)["distances"] == [[0.9, 0.6, 0.3]]
+    assert merge_and_sort_query_results([], k=3) == {
+        "distances": [[]],
+        "documents": [[]],
+        "metadatas": [[]],
+    }
+
+
+def test_merge_get_results():
+    results = [
+        GetResult(ids=[["1", "2"]], documents=[["a", "b"]], metadatas=[[{}, {}]]),
+        {"ids": [["3"]], "documents": [["c"]], "metadatas": [[{"x": 1}]]},
+    ]
+
+    assert merge_get_results(results) == {
+        "documents": [["a", "b", "c"]],
+        "metadatas": [[{}, {}, {"x": 1}]],
+        "ids": [["1", "2", "3"]],
+    }
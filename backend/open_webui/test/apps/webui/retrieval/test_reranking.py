@@ -0,0 +1,173 @@
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.documents import Document
+
+from open_webui.retrieval import utils
+from open_webui.retrieval.models.base_reranker import BaseReranker
+from open_webui.retrieval.utils import RerankingFunction, rerank_documents
+
+
+class FakeCrossEncoder:
+    """Scores a pair by the number of query words contained in the document"""
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, sentences):
+        self.calls.append(list(sentences))
+        return [
+            float(sum(word in document for word in query.split()))
+            for query, document in sentences
+        ]
+
+
+class FakeSingleQueryReranker(FakeCrossEncoder, BaseReranker):
+    def predict(self, sentences):
+        assert len({query for query, _ in sentences}) == 1
+        return super().predict(sentences)
+
+
+def test_reranking_function_caches_scores():
+    model = FakeCrossEncoder()
+    reranking_function = RerankingFunction("", "fake", model, cache_size=8)
+
+    pairs = [("red fox", "a red fox"), ("red fox", "a dog"), ("dog", "a dog")]
+    assert reranking_function(pairs) == [2.0, 0.0, 1.0]
+    assert reranking_function(pairs + [("dog", "a red dog")]) == [2.0, 0.0, 1.0, 1.0]
+
+    # One batch for all queries, the second call only scores the new pair
+    assert model.calls == [pairs, [("dog", "a red dog")]]
+    assert (reranking_function.hits, reranking_function.misses) == (3, 4)
+
+
+def test_reranking_function_cache_is_bounded():
+    model = FakeCrossEncoder()
+    reranking_function = RerankingFunction("", "fake", model, cache_size=2)
+
+    reranking_function([("a", "a"), ("b", "b"), ("c", "c")])
+    reranking_function([("a", "a")])
+    assert len(model.calls) == 2
+
+    disabled = RerankingFunction("", "fake", model, cache_size=0)
+    disabled([("a", "a")])
+    disabled([("a", "a")])
+    assert len(model.calls) == 4
+
+
+def test_single_query_rerankers_are_called_per_query():
+    model = FakeSingleQueryReranker()
+    reranking_function = RerankingFunction("", "fake", model)
+
+    scores = reranking_function([("x", "x y"), ("y", "x y"), ("x", "z")])
+    assert scores == [1.0, 1.0, 0.0]
+    assert len(model.calls) == 2
+
+
+def test_rerank_documents_dedupes_and_prunes():
+    model = FakeCrossEncoder()
+    documents = [
+        Document(page_content="red fox", metadata={"source": "a"}),
+        Document(page_content="red fox", metadata={"source": "b"}),
+        Document(page_content="red", metadata={"source": "c"}),
+        Document(page_content="blue", metadata={"source": "d"}),
+    ]
+
+    result = rerank_documents(
+        {"red fox": documents, "blue": documents[2:]},
+        embedding_function=None,
+        reranking_function=RerankingFunction("", "fake", model),
+        top_n=2,
+        r=0.5,
+    )
+
+    assert len(model.calls) == 1
+    assert len(model.calls[0]) == 5
+    assert [(d.page_content, d.metadata) for d in result["red fox"]] == [
+        ("red fox", {"source": "a", "score": 2.0}),
+        ("red", {"source": "c", "score": 1.0}),
+    ]
+    assert [d.page_content for d in result["blue"]] == ["blue"]
+    # The candidates' metadata is left untouched
+    assert "score" not in documents[0].metadata
+
+
+def test_rerank_documents_without_reranker_uses_embeddings():
+    vectors = {"q": [1.0, 0.0], "same": [2.0, 0.0], "orthogonal": [0.0, 1.0]}
+
+    result = rerank_documents(
+        {
+            "q": [
+                Document(page_content="orthogonal", metadata={}),
+                Document(page_content="same", metadata={}),
+            ]
+        },
+        embedding_function=lambda texts, prefix: [vectors[t] for t in texts],
+        reranking_function=None,
+        top_n=5,
+        r=0.0,
+    )
+
+    assert [(d.page_content, d.metadata["score"]) for d in result["q"]] == [
+        ("same", 1.0),
+        ("orthogonal", 0.0),
+    ]
+
+
+def test_rerank_documents_scores_with_stored_vectors():
+    calls = []
+
+    def embedding_function(texts, prefix):
+        calls.append(list(texts))
+        return [{"q": [1.0, 0.0], "unstored": [1.0, 1.0]}[t] for t in texts]
+
+    result = rerank_documents(
+        {
+            "q": [
+                Document(id="1", page_content="same", metadata={}),
+                # Zero padded like pgvector stores shorter embeddings
+                Document(id="2", page_content="orthogonal", metadata={}),
+                Document(page_content="unstored", metadata={}),
+            ]
+        },
+        embedding_function=embedding_function,
+        reranking_function=None,
+        top_n=5,
+        r=0.0,
+        query_embeddings={"q": [1.0, 0.0]},
+        document_vectors={"1": [3.0, 0.0], "2": [0.0, 2.0, 0.0, 0.0]},
+    )
+
+    assert [(d.page_content, round(d.metadata["score"], 3)) for d in result["q"]] == [
+        ("same", 1.0),
+        ("unstored", 0.707),
+        ("orthogonal", 0.0),
+    ]
+    # Only the document without a stored vector is embedded
+    assert calls == [["unstored"]]
+
+
+def test_hybrid_search_reranking_failure_falls_back(monkeypatch):
+    monkeypatch.setattr(
+        utils, "VECTOR_DB_CLIENT", SimpleNamespace(get=lambda collection_name: [])
+    )
+    monkeypatch.setattr(
+        utils,
+        "get_hybrid_search_candidates",
+        lambda **kwargs: [Document(page_content="a", metadata={})],
+    )
+
+    def reranking_function(sentences):
+        raise RuntimeError("reranker is down")
+
+    with pytest.raises(Exception, match="Non-hybrid search as fallback"):
+        utils.query_collection_with_hybrid_search(
+            collection_names=["a", "b"],
+            queries=["q"],
+            embedding_function=None,
+            k=5,
+            reranking_function=reranking_function,
+            k_reranker=5,
+            r=0.0,
+            hybrid_bm25_weight=1,
+        )
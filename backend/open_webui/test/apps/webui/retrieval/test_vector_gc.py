@@ -0,0 +1,181 @@
+import asyncio
+from typing import Optional
+
+import pytest
+
+from open_webui.env import REDIS_KEY_PREFIX
+from open_webui.retrieval.vector import gc
+from open_webui.retrieval.vector.main import GetResult, VectorDBBase
+from open_webui.utils.redis import run_periodically
+
+FILE_ID = "0b1c4ab6-3c4f-4c47-9d1e-6f1b0e2f7a10"
+KNOWLEDGE_ID = "5f0e9c7a-1d2b-4e3f-8a9b-0c1d2e3f4a5b"
+DELETED_ID = "9a8b7c6d-5e4f-4a3b-8c1d-0e9f8a7b6c5d"
+
+
+class MemoryVectorDB(VectorDBBase):
+    def __init__(self, collections: dict[str, list[dict]]):
+        self.collections = collections
+
+    def list_collections(self):
+        return list(self.collections)
+
+    def count(self, collection_name):
+        return len(self.collections[collection_name])
+
+    def has_collection(self, collection_name):
+        return collection_name in self.collections
+
+    def delete_collection(self, collection_name):
+        del self.collections[collection_name]
+
+    def get(self, collection_name) -> Optional[GetResult]:
+        metadatas = self.collections[collection_name]
+        return GetResult(
+            ids=[[str(i) for i in range(len(metadatas))]],
+            documents=[["" for _ in metadatas]],
+            metadatas=[metadatas],
+        )
+
+    def insert(self, collection_name, items):
+        pass
+
+    def upsert(self, collection_name, items):
+        pass
+
+    def search(self, collection_name, vectors, limit):
+        pass
+
+    def query(self, collection_name, filter, limit=None):
+        assert filter == {}
+        metadatas = self.collections[collection_name][:limit]
+        return GetResult(
+            ids=[[str(i) for i in range(len(metadatas))]],
+            documents=[["" for _ in metadatas]],
+            metadatas=[metadatas],
+        )
+
+    def delete(self, collection_name, ids=None, filter=None):
+        pass
+
+    def reset(self):
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(gc.Files, "get_file_ids", lambda: [FILE_ID])
+    monkeypatch.setattr(gc.Knowledges, "get_knowledge_ids", lambda: [KNOWLEDGE_ID])
+    monkeypatch.setattr(gc, "GC_STATE_PATH", tmp_path / "vector_db_gc.json")
+    monkeypatch.setattr(gc.time, "time", lambda: 10_000)
+
+    return MemoryVectorDB(
+        {
+            f"file-{FILE_ID}": [{}],
+            f"file-{DELETED_ID}": [{}, {}],
+            KNOWLEDGE_ID: [{}],
+            DELETED_ID: [{}, {}, {}],
+            "web-search-fresh": [{"created_at": 9_000}],
+            "web-search-stale": [{"created_at": "1000"}, {"created_at": 1_000}],
+            "web-search-legacy": [{}],
+            "user-memory-1": [{}],
+            # Not a uuid4, so not a knowledge base id
+            "0b1c4ab6-3c4f-1c47-9d1e-6f1b0e2f7a10": [{}],
+            "c4ca4238a0b923820dcc509a6f75849b": [{}],
+        }
+    )
+
+
+def test_collect_vector_db_garbage(client):
+    report = gc.collect_vector_db_garbage(
+        client, web_search_ttl=5_000, orphan_grace_period=0
+    )
+
+    assert {(item.collection_name, item.reason) for item in report.removed} == {
+        (f"file-{DELETED_ID}", "orphaned_file"),
+        (DELETED_ID, "orphaned_knowledge"),
+        ("web-search-stale", "expired_web_search"),
+    }
+    assert report.collections == 10
+    assert report.reclaimed_vectors == 7
+    assert set(client.collections) == {
+        f"file-{FILE_ID}",
+        KNOWLEDGE_ID,
+        "web-search-fresh",
+        "web-search-legacy",
+        "user-memory-1",
+        "0b1c4ab6-3c4f-1c47-9d1e-6f1b0e2f7a10",
+        "c4ca4238a0b923820dcc509a6f75849b",
+    }
+
+
+def test_dry_run_keeps_collections(client):
+    report = gc.collect_vector_db_garbage(
+        client, dry_run=True, web_search_ttl=5_000, orphan_grace_period=0
+    )
+
+    assert len(report.removed) == 3
+    assert len(client.collections) == 10
+
+
+def test_first_seen_survives_restarts(client, monkeypatch):
+    gc.collect_vector_db_garbage(
+        client, web_search_ttl=5_000, orphan_grace_period=3_000
+    )
+    assert "web-search-legacy" in client.collections
+    assert DELETED_ID in client.collections
+    assert set(gc.load_first_seen()) == {"web-search-legacy", DELETED_ID}
+
+    monkeypatch.setattr(gc.time, "time", lambda: 13_000)
+    gc.collect_vector_db_garbage(
+        client, web_search_ttl=5_000, orphan_grace_period=3_000
+    )
+    assert "web-search-legacy" in client.collections
+    assert DELETED_ID not in client.collections
+
+    monkeypatch.setattr(gc.time, "time", lambda: 15_000)
+    gc.collect_vector_db_garbage(
+        client, web_search_ttl=5_000, orphan_grace_period=3_000
+    )
+    assert "web-search-legacy" not in client.collections
+
+
+class FakeRedis:
+    def __init__(self):
+        self.keys = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = value
+        return True
+
+
+def test_only_one_worker_claims_a_periodic_run():
+    runs = []
+
+    async def collect():
+        runs.append(len(runs))
+        if len(runs) > 1:
+            raise NotImplementedError("no listing")
+
+    async def main():
+        redis = FakeRedis()
+        workers = [
+            asyncio.create_task(
+                run_periodically("vector_db_gc", collect, 3600, 0, redis=redis)
+            )
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.05)
+        assert not any(worker.done() for worker in workers)
+
+        # Without Redis every worker runs it, and a NotImplementedError stops it
+        await run_periodically("vector_db_gc", collect, 3600, 0)
+        for worker in workers:
+            worker.cancel()
+        return redis
+
+    redis = asyncio.run(main())
+    assert runs == [0, 1]
+    assert list(redis.keys) == [f"{REDIS_KEY_PREFIX}:vector_db_gc"]
@@ -0,0 +1,72 @@
+import gzip
+import json
+import uuid
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from open_webui.models.chats import Chats
+from open_webui.models.tags import Tags
+from open_webui.routers import chats
+from open_webui.test.util.mock_user import mock_user
+
+
+def export_line(title: str, updated_at: int, tags: list[str]) -> dict:
+    return {
+        "id": "from-another-instance",
+        "title": title,
+        "chat": {"title": title, "history": {"messages": {}}},
+        "meta": {"tags": tags},
+        "created_at": updated_at,
+        "updated_at": updated_at,
+    }
+
+
+def test_bulk_import_and_streaming_export(monkeypatch):
+    monkeypatch.setattr(chats, "CHAT_STREAM_BATCH_SIZE", 2)
+    user_id = str(uuid.uuid4())
+    app = FastAPI()
+    app.include_router(chats.router, prefix="/api/v1/chats")
+    client = TestClient(app)
+
+    body = "".join(
+        [
+            json.dumps(export_line("A", 1, ["work"])) + "\n",
+            "\x1e" + json.dumps(export_line("B", 2, ["Work", "home"])) + "\n",
+            "not json\n",
+            "\n",
+            json.dumps({"title": "no chat"}) + "\n",
+            json.dumps(export_line("C", 3, [])),
+        ]
+    ).encode()
+
+    with mock_user(app, id=user_id):
+        response = client.post(
+            "/api/v1/chats/import/bulk",
+            content=gzip.compress(body),
+            headers={"Content-Encoding": "gzip"},
+        )
+        assert response.json() == {"imported": 3, "failed": 2}
+        assert sorted(tag.id for tag in Tags.get_tags_by_user_id(user_id)) == [
+            "home",
+            "work",
+        ]
+
+        exported = client.get("/api/v1/chats/all").json()
+        assert [chat["title"] for chat in exported] == ["C", "B", "A"]
+        assert all(chat["user_id"] == user_id for chat in exported)
+        assert "from-another-instance" not in {chat["id"] for chat in exported}
+
+        response = client.get("/api/v1/chats/all?format=ndjson&gzip=true")
+        assert response.headers["content-type"] == "application/gzip"
+        lines = gzip.decompress(response.content).decode().splitlines()
+        assert [json.loads(line) for line in lines] == exported
+
+        response = client.get("/api/v1/chats/all?format=json-seq")
+        assert response.text == "".join(
+            f"\x1e{json.dumps(chat, separators=(',', ':'))}\n" for chat in exported
+        )
+
+    Chats.delete_chats_by_user_id(user_id)
+    for tag in Tags.get_tags_by_user_id(user_id):
+        Tags.delete_tag_by_name_and_user_id(tag.name, user_id)
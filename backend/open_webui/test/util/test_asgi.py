@@ -0,0 +1,64 @@
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from open_webui.utils.asgi import RequestPipelineMiddleware
+
+
+def make_client(events: list) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/state")
+    def get_state(request: Request):
+        return {"user": request.state.user}
+
+    @app.get("/stream")
+    def stream():
+        def body():
+            events.append("body")
+            yield b"data: 1\n\n"
+            yield b"data: 2\n\n"
+
+        return StreamingResponse(body(), media_type="text/event-stream")
+
+    def block(request: Request):
+        if request.query_params.get("block"):
+            return PlainTextResponse("blocked", status_code=403)
+
+    def set_user(request: Request):
+        request.state.user = request.headers.get("X-User")
+
+    app.add_middleware(
+        RequestPipelineMiddleware,
+        request_hooks=[block, set_user],
+        response_hooks=[lambda request, headers: headers.update({"X-Frame": "DENY"})],
+        finish_hooks=[lambda request: events.append("finish")],
+    )
+    return TestClient(app)
+
+
+def test_pipeline_hooks():
+    events = []
+    client = make_client(events)
+
+    response = client.get("/state", headers={"X-User": "alice"})
+    assert response.json() == {"user": "alice"}
+    assert response.headers["X-Frame"] == "DENY"
+    assert response.headers["X-Process-Time"] == "0"
+    assert events == ["finish"]
+
+    # A request hook's response skips the app and later hooks, not the headers
+    response = client.get("/state?block=1")
+    assert (response.status_code, response.text) == (403, "blocked")
+    assert response.headers["X-Frame"] == "DENY"
+    assert events == ["finish"]
+
+
+def test_pipeline_streams_body_before_finish():
+    events = []
+    client = make_client(events)
+
+    response = client.get("/stream")
+    assert response.text == "data: 1\n\ndata: 2\n\n"
+    assert response.headers["X-Frame"] == "DENY"
+    assert events == ["body", "finish"]
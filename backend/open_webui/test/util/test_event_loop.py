@@ -0,0 +1,63 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+
+from open_webui.utils import event_loop
+from open_webui.utils.event_loop import (
+    get_event_loop_lag,
+    monitor_event_loop,
+    offload,
+    run_blocking,
+)
+
+request_id = contextvars.ContextVar("request_id", default=None)
+
+
+def test_run_blocking_uses_executor_threads():
+    @offload
+    def blocking(value):
+        time.sleep(0.01)
+        return value, request_id.get(), threading.current_thread().name
+
+    async def main():
+        request_id.set("abc")
+        return await asyncio.gather(
+            run_blocking(blocking.__wrapped__, 1), blocking(value=2)
+        )
+
+    try:
+        results = asyncio.run(main())
+    finally:
+        event_loop.shutdown_blocking_executor()
+
+    assert [value for value, _, _ in results] == [1, 2]
+    assert all(context == "abc" for _, context, _ in results)
+    assert all(thread.startswith("blocking") for _, _, thread in results)
+
+
+def test_monitor_samples_lag_and_logs_blocking_calls(caplog):
+    def block_the_loop():
+        time.sleep(0.3)
+
+    async def main():
+        monitor = asyncio.create_task(
+            monitor_event_loop(interval=0.05, blocking_threshold_ms=100)
+        )
+        await asyncio.sleep(0.2)
+        block_the_loop()
+        await asyncio.sleep(0.2)
+        monitor.cancel()
+
+    blocked_calls = event_loop.get_blocked_call_count()
+    with caplog.at_level(logging.WARNING, logger=event_loop.__name__):
+        asyncio.run(main())
+
+    last, largest = get_event_loop_lag()
+    assert largest >= 200
+    assert last < largest
+    # Every reader sees the largest lag of the window
+    assert get_event_loop_lag() == (last, largest)
+    assert event_loop.get_blocked_call_count() == blocked_calls + 1
+    assert "block_the_loop" in caplog.text
@@ -0,0 +1,40 @@
+import json
+
+from open_webui.utils.response import parse_passthrough_stream_chunk
+
+
+def chunk(delta, **kwargs):
+    return json.dumps({"choices": [{"index": 0, "delta": delta}], **kwargs})
+
+
+def test_parse_passthrough_stream_chunk_content():
+    """Plain content deltas are returned with their text"""
+    data, value = parse_passthrough_stream_chunk(chunk({"content": "Hello"}))
+    assert value == "Hello"
+    assert data["choices"][0]["delta"]["content"] == "Hello"
+
+    # Null companion fields sent by some providers do not disable the fast path
+    _, value = parse_passthrough_stream_chunk(
+        chunk({"content": " world", "reasoning_content": None, "tool_calls": None})
+    )
+    assert value == " world"
+
+
+def test_parse_passthrough_stream_chunk_fallback():
+    """Anything but a plain content delta falls back to the generic handling"""
+    assert parse_passthrough_stream_chunk("[DONE]") is None
+    assert parse_passthrough_stream_chunk(chunk({"role": "assistant"})) is None
+    assert parse_passthrough_stream_chunk(chunk({"reasoning_content": "Hm"})) is None
+    assert (
+        parse_passthrough_stream_chunk(
+            chunk({"tool_calls": [{"index": 0, "function": {"name": "search"}}]})
+        )
+        is None
+    )
+    assert (
+        parse_passthrough_stream_chunk(chunk({"content": "Hi"}, selected_model_id="m"))
+        is None
+    )
+    assert (
+        parse_passthrough_stream_chunk(json.dumps({"choices": [], "usage": {}})) is None
+    )
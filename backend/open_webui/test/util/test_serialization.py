@@ -0,0 +1,99 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from open_webui.utils import serialization
+from open_webui.utils.serialization import (
+    ORJSONResponse,
+    SocketIOJSON,
+    aiter_json_lines,
+    iter_gzip,
+    iter_json_stream,
+    json_dumps,
+    json_dumps_bytes,
+    json_loads,
+)
+
+
+DOCUMENT = {
+    "title": "Grüße 👋",
+    "history": {"messages": {"1": {"content": "Hi", "timestamp": 1700000000}}},
+    "tags": ["a", "b"],
+    "score": 0.5,
+    "archived": None,
+}
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "stdlib":
+        monkeypatch.setattr(serialization, "orjson", None)
+    return request.param
+
+
+def test_round_trip(backend):
+    """Documents round-trip identically with either backend"""
+    assert json_loads(json_dumps(DOCUMENT)) == DOCUMENT
+    assert json_loads(json_dumps_bytes(DOCUMENT)) == DOCUMENT
+    assert json.loads(json_dumps(DOCUMENT)) == DOCUMENT
+
+
+def test_compact_unicode_output(backend):
+    """Output is compact and keeps non-ASCII characters as UTF-8"""
+    assert json_dumps({"a": [1, 2], "b": "ü"}) == '{"a":[1,2],"b":"ü"}'
+
+
+def test_stdlib_compatibility(backend):
+    """Non-string keys, big integers and formatting options behave like json"""
+    assert json_loads(json_dumps({1: "a"})) == {"1": "a"}
+    assert json_loads(json_dumps({"n": 2**70})) == {"n": 2**70}
+    assert json_dumps({"a": 1}, indent=2) == json.dumps({"a": 1}, indent=2)
+    assert json_dumps({"a": object()}, default=lambda _: "x") == '{"a":"x"}'
+
+
+def test_decode_error(backend):
+    """Decode errors can be caught as json.JSONDecodeError"""
+    with pytest.raises(json.JSONDecodeError):
+        json_loads("{invalid")
+
+
+def test_stdlib_nan_values_load(backend):
+    """Values stored by json.dumps with NaN / Infinity still load"""
+    stored = json.dumps({"score": float("nan"), "limit": float("inf")})
+    for data in (stored, stored.encode(), memoryview(stored.encode())):
+        value = json_loads(data)
+        assert value["score"] != value["score"]
+        assert value["limit"] == float("inf")
+
+
+def test_response_and_socketio_json(backend):
+    assert ORJSONResponse(DOCUMENT).body == json_dumps_bytes(DOCUMENT)
+    assert SocketIOJSON.loads(SocketIOJSON.dumps(DOCUMENT, separators=(",", ":"))) == (
+        DOCUMENT
+    )
+
+
+@pytest.mark.parametrize("format", ["json", "ndjson", "json-seq"])
+def test_json_stream_round_trip(format):
+    """Streamed output parses back, also when records span chunk boundaries"""
+    items = [DOCUMENT] + [{"n": i} for i in range(100)]
+    data = b"".join(iter_json_stream(items, format, chunk_size=64))
+    if format == "json":
+        assert json.loads(data) == items
+        assert b"".join(iter_json_stream([], format)) == b"[]"
+        return
+
+    async def parse(chunk_size: int, compress: bool):
+        body = gzip.compress(data) if compress else data
+
+        async def chunks():
+            for i in range(0, len(body), chunk_size):
+                yield body[i : i + chunk_size]
+
+        return [json_loads(line) async for line in aiter_json_lines(chunks(), compress)]
+
+    assert asyncio.run(parse(7, False)) == items
+    assert asyncio.run(parse(7, True)) == items
+    assert gzip.decompress(b"".join(iter_gzip([data[:10], data[10:]]))) == data
@@ -0,0 +1,136 @@
+import asyncio
+import time
+
+import pytest
+from opentelemetry.sdk.metrics import MeterProvider
+from opentelemetry.sdk.metrics.export import InMemoryMetricReader
+
+from open_webui.utils.telemetry import instruments
+from open_webui.utils.telemetry.prometheus import (
+    get_prometheus_name,
+    render_prometheus,
+)
+
+INSTRUMENTS = {
+    "time_to_first_token": ("gen_ai.server.time_to_first_token", "s"),
+    "time_per_output_token": ("gen_ai.server.time_per_output_token", "s"),
+    "output_tokens_per_second": ("webui.llm.output_tokens_per_second", "{token}/s"),
+    "rag_stage_duration": ("webui.rag.stage.duration", "s"),
+    "file_processing_stage_duration": ("webui.file.processing.stage.duration", "s"),
+    "file_processing_duration": ("webui.file.processing.duration", "s"),
+}
+
+
+@pytest.fixture
+def reader(monkeypatch):
+    # The module's instruments live on the global provider, which can only be
+    # set once per process, so they are swapped for ones on a local provider
+    reader = InMemoryMetricReader()
+    meter = MeterProvider(metric_readers=[reader]).get_meter("test")
+    for attribute, (name, unit) in INSTRUMENTS.items():
+        monkeypatch.setattr(
+            instruments, attribute, meter.create_histogram(name, unit=unit)
+        )
+    return reader
+
+
+def get_points(reader) -> dict[str, list]:
+    return {
+        metric.name: list(metric.data.data_points)
+        for resource_metrics in reader.get_metrics_data().resource_metrics
+        for scope_metrics in resource_metrics.scope_metrics
+        for metric in scope_metrics.metrics
+    }
+
+
+def test_observe_token_stream(reader):
+    chunks = [
+        b'data: {"choices":[{"delta":{"role":"assistant","content":""}}]}\n\n',
+        b'data: {"choices":[{"delta":{"content":"Hel"}}]}\n\n',
+        b'data: {"choices":[{"delta":{"content":"lo \\"content\\": \\"x"}}]}\n\n',
+        b'data: {"choices":[{"delta":{"reasoning_content":"!"}}]}\n\n',
+        b'data: {"choices":[],"usage":{"completion_tokens":5}}\n\n',
+        b"data: [DONE]\n\n",
+    ]
+
+    async def upstream():
+        for chunk in chunks:
+            await asyncio.sleep(0.01)
+            yield chunk
+
+    async def consume():
+        attributes = {"gen_ai.request.model": "m", "gen_ai.provider.name": "openai"}
+        return [
+            chunk
+            async for chunk in instruments.observe_token_stream(
+                upstream(), attributes, time.perf_counter()
+            )
+        ]
+
+    assert asyncio.run(consume()) == chunks
+
+    points = get_points(reader)
+    (ttft,) = points["gen_ai.server.time_to_first_token"]
+    assert ttft.count == 1 and 0.015 < ttft.sum < 1
+    assert dict(ttft.attributes) == {
+        "gen_ai.request.model": "m",
+        "gen_ai.provider.name": "openai",
+    }
+    # 4 tokens (from the usage) after the first one, between its delta and the last
+    (per_token,) = points["gen_ai.server.time_per_output_token"]
+    (tokens_per_second,) = points["webui.llm.output_tokens_per_second"]
+    assert per_token.sum == pytest.approx(1 / tokens_per_second.sum)
+    assert per_token.sum < 0.02
+
+    text = render_prometheus(reader.get_metrics_data())
+    assert "# TYPE gen_ai_server_time_to_first_token_seconds histogram" in text
+    assert (
+        'gen_ai_server_time_to_first_token_seconds_count{gen_ai_request_model="m",'
+        'gen_ai_provider_name="openai"} 1'
+    ) in text
+    assert 'le="+Inf"} 1' in text
+    assert "webui_llm_output_tokens_per_second_count" in text
+
+
+def test_rag_stage_and_file_processing_stages(reader):
+    with instruments.rag_stage("embedding"):
+        pass
+    with pytest.raises(ValueError):
+        with instruments.rag_stage("rerank"):
+            raise ValueError()
+
+    for status, stage in [
+        ("processing", "starting"),
+        ("processing", "extracting"),
+        ("processing", "extracting"),
+        ("processing", "embedding"),
+        ("done", "done"),
+    ]:
+        instruments.record_file_processing_stage("file", status, stage)
+    instruments.record_file_processing_stage("other", "error", "error")
+
+    points = get_points(reader)
+    assert {
+        p.attributes["stage"]: p.count for p in points["webui.rag.stage.duration"]
+    } == {
+        "embedding": 1,
+        "rerank": 1,
+    }
+    assert {
+        p.attributes["stage"]: p.count
+        for p in points["webui.file.processing.stage.duration"]
+    } == {"starting": 1, "extracting": 1, "embedding": 1}
+    assert [
+        (dict(p.attributes), p.count) for p in points["webui.file.processing.duration"]
+    ] == [({"status": "done"}, 1)]
+    assert "file" not in instruments._file_stages
+
+
+def test_get_prometheus_name():
+    assert get_prometheus_name("http.server.duration", "ms") == (
+        "http_server_duration_milliseconds"
+    )
+    assert get_prometheus_name("webui.users.total", "users") == "webui_users_total"
+    assert get_prometheus_name("webui.llm.output_tokens_per_second", "{token}/s") == (
+        "webui_llm_output_tokens_per_second"
+    )
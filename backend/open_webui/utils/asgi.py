@@ -0,0 +1,63 @@
+import time
+from typing import Callable, Optional, Sequence
+
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+RequestHook = Callable[[Request], Optional[Response]]
+ResponseHook = Callable[[Request, MutableHeaders], None]
+FinishHook = Callable[[Request], None]
+
+
+class RequestPipelineMiddleware:
+    """
+    Pure ASGI middleware that runs the app's per-request steps in a single layer.
+
+    - request hooks run in order before the app; the first one returning a
+      response answers the request instead of the app
+    - response hooks edit the headers of the response start message
+    - finish hooks run once the app has sent the complete response
+
+    Unlike BaseHTTPMiddleware, no task or memory stream is created per request,
+    and body messages (e.g. SSE chunks) are passed on to the server untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        request_hooks: Sequence[RequestHook] = (),
+        response_hooks: Sequence[ResponseHook] = (),
+        finish_hooks: Sequence[FinishHook] = (),
+    ) -> None:
+        self.app = app
+        self.request_hooks = list(request_hooks)
+        self.response_hooks = list(response_hooks)
+        self.finish_hooks = list(finish_hooks)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start_time = int(time.time())
+        request = Request(scope, receive)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                for hook in self.response_hooks:
+                    hook(request, headers)
+                headers["X-Process-Time"] = str(int(time.time()) - start_time)
+            await send(message)
+
+        for hook in self.request_hooks:
+            response = hook(request)
+            if response is not None:
+                return await response(scope, receive, send_wrapper)
+
+        await self.app(scope, receive, send_wrapper)
+
+        for hook in self.finish_hooks:
+            hook(request)
@@ -0,0 +1,175 @@
+"""
+Event loop health: a lag sampler, a watchdog logging the stack of callbacks that
+block the loop, and a bounded thread pool to offload known blocking calls to.
+"""
+
+import asyncio
+import collections
+import contextvars
+import functools
+import logging
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from open_webui.env import (
+    BLOCKING_EXECUTOR_WORKERS,
+    EVENT_LOOP_BLOCKING_THRESHOLD_MS,
+    EVENT_LOOP_LAG_SAMPLE_INTERVAL,
+    SRC_LOG_LEVELS,
+)
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+# The largest lag is taken over a fixed window rather than since the last
+# read, so that several readers (OTLP and Prometheus) see the same value
+LAG_WINDOW_SECONDS = 60
+
+# (monotonic time, lag in ms) of the samples in the window
+_lag_samples: collections.deque[tuple[float, float]] = collections.deque()
+_blocked_calls = 0
+
+
+def get_blocking_executor() -> ThreadPoolExecutor:
+    """Thread pool shared by all offloaded blocking calls, created on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=BLOCKING_EXECUTOR_WORKERS,
+                thread_name_prefix="blocking",
+            )
+        return _executor
+
+
+def shutdown_blocking_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+async def run_blocking(func, /, *args, **kwargs):
+    """
+    Runs a blocking function in the blocking executor and waits for its result
+    without stalling the event loop. Context variables are passed along.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        get_blocking_executor(),
+        functools.partial(context.run, func, *args, **kwargs),
+    )
+
+
+def offload(func):
+    """Turns a blocking function into a coroutine function using run_blocking."""
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await run_blocking(func, *args, **kwargs)
+
+    return wrapper
+
+
+def get_event_loop_lag() -> tuple[float, float]:
+    """
+    Returns the lag of the last sample and the largest one of the last
+    LAG_WINDOW_SECONDS, in milliseconds.
+    """
+    samples = list(_lag_samples)
+    if not samples:
+        return 0.0, 0.0
+    since = time.monotonic() - LAG_WINDOW_SECONDS
+    return samples[-1][1], max(
+        (lag for sampled_at, lag in samples if sampled_at >= since),
+        default=samples[-1][1],
+    )
+
+
+def get_blocked_call_count() -> int:
+    return _blocked_calls
+
+
+class BlockingCallWatchdog(threading.Thread):
+    """
+    Pings the event loop from a thread. When a ping isn't answered within the
+    threshold, the loop is blocked: the stack of the loop's thread at that time
+    is logged with how long the block lasted.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, threshold_ms: int):
+        super().__init__(name="event-loop-watchdog", daemon=True)
+        self.loop = loop
+        self.threshold = threshold_ms / 1000
+        # Created from the loop, so this is the loop's thread
+        self.loop_thread_id = threading.get_ident()
+        self.stopped = threading.Event()
+
+    def stop(self):
+        self.stopped.set()
+
+    def run(self):
+        global _blocked_calls
+
+        while not self.stopped.is_set():
+            answered = threading.Event()
+            start = time.monotonic()
+            try:
+                self.loop.call_soon_threadsafe(answered.set)
+            except RuntimeError:
+                return  # the loop is closed
+
+            if answered.wait(self.threshold):
+                self.stopped.wait(self.threshold)
+                continue
+
+            frame = sys._current_frames().get(self.loop_thread_id)
+            stack = "".join(traceback.format_stack(frame)) if frame else ""
+            while not answered.wait(1):
+                if self.stopped.is_set():
+                    return
+            _blocked_calls += 1
+            log.warning(
+                f"Event loop blocked for {(time.monotonic() - start) * 1000:.0f} ms, "
+                f"blocking call:\n{stack}"
+            )
+
+
+async def monitor_event_loop(
+    interval: float = EVENT_LOOP_LAG_SAMPLE_INTERVAL,
+    blocking_threshold_ms: int = EVENT_LOOP_BLOCKING_THRESHOLD_MS,
+):
+    """
+    Samples the event loop lag, how much later than scheduled a sleep resumes,
+    every interval seconds (0 disables sampling). With a blocking threshold, also
+    runs the watchdog.
+    """
+    loop = asyncio.get_running_loop()
+    watchdog = None
+    if blocking_threshold_ms > 0:
+        watchdog = BlockingCallWatchdog(loop, blocking_threshold_ms)
+        watchdog.start()
+
+    try:
+        if not interval:
+            await asyncio.Event().wait()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(interval)
+            lag = max(0.0, loop.time() - start - interval) * 1000
+            now = time.monotonic()
+            _lag_samples.append((now, lag))
+            while _lag_samples[0][0] < now - LAG_WINDOW_SECONDS:
+                _lag_samples.popleft()
+    finally:
+        if watchdog is not None:
+            watchdog.stop()
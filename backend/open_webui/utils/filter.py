@@ -57,6 +57,21 @@ def get_sorted_filter_ids(request, model: dict, enabled_filter_ids: list = None)
     return filter_ids
 
 
+def has_stream_filter_functions(request, filter_functions) -> bool:
+    """
+    Check whether any of the given filter functions implements a "stream" hook.
+    """
+    for function in filter_functions:
+        if not function:
+            continue
+
+        function_module = get_function_module(request, function.id, load_from_db=False)
+        if getattr(function_module, "stream", None):
+            return True
+
+    return False
+
+
 async def process_filter_functions(
     request, filter_functions, filter_type, form_data, extra_params
 ):
@@ -0,0 +1,416 @@
+import ast
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from typing import Optional
+
+from fastapi import Request
+from pydantic import BaseModel
+
+from open_webui.config import CACHE_DIR
+from open_webui.env import (
+    KNOWLEDGE_FILE_RECONCILE_INTERVAL,
+    KNOWLEDGE_REINDEX_CONCURRENCY,
+    REDIS_KEY_PREFIX,
+    SRC_LOG_LEVELS,
+)
+from open_webui.models.files import FileModel, Files
+from open_webui.models.knowledge import KnowledgeModel, Knowledges
+from open_webui.retrieval.vector.factory import VECTOR_DB_CLIENT
+from open_webui.routers.retrieval import (
+    ProcessFileForm,
+    get_chunk_fingerprint,
+    process_file,
+)
+from open_webui.utils.redis import run_periodically
+
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["RAG"])
+
+
+REINDEX_JOB_PATH = CACHE_DIR / "knowledge_reindex.json"
+# Claimed by the worker running a job, when there is no Redis to claim it in
+REINDEX_LOCK_PATH = CACHE_DIR / "knowledge_reindex.lock"
+REINDEX_LOCK_KEY = f"{REDIS_KEY_PREFIX}:knowledge_reindex"
+# A running job saves its state at least this often, so a job whose state is
+# older was interrupted (e.g. by a restart) and can be started again
+REINDEX_JOB_HEARTBEAT = 30
+
+_job_task: Optional[asyncio.Task] = None
+
+
+class ReindexFailure(BaseModel):
+    knowledge_id: str
+    file_id: str
+    error: str
+
+
+class ReindexJob(BaseModel):
+    id: str
+    status: str  # planning, running, completed, failed or interrupted
+    # The chunk fingerprint, see get_chunk_fingerprint
+    embedding_config: dict
+    knowledge_bases: int = 0
+    files: int = 0
+    up_to_date: int = 0
+    stale: int = 0
+    processed: int = 0
+    failed: list[ReindexFailure] = []
+    deleted_knowledge_bases: list[str] = []
+    error: Optional[str] = None
+    created_at: int
+    updated_at: int
+    finished_at: Optional[int] = None
+
+
+class ReindexPlan(BaseModel):
+    knowledge_bases: int = 0
+    files: int = 0
+    # file id -> ids of the knowledge bases whose chunks of it are stale
+    stale: dict[str, list[str]] = {}
+    invalid_knowledge_bases: list[str] = []
+
+    @property
+    def up_to_date(self) -> int:
+        return self.files - sum(len(ids) for ids in self.stale.values())
+
+
+####################
+# Planning
+####################
+
+
+def parse_embedding_config(value) -> Optional[dict]:
+    # Backends that stringify metadata store the dict's repr
+    if isinstance(value, dict):
+        return value
+    if isinstance(value, str):
+        for parse in (json.loads, ast.literal_eval):
+            try:
+                parsed = parse(value)
+            except (ValueError, SyntaxError):
+                continue
+            if isinstance(parsed, dict):
+                return parsed
+    return None
+
+
+def is_chunk_stale(
+    file: FileModel, metadata: Optional[dict], embedding_config: dict
+) -> bool:
+    if not metadata or not file.hash or metadata.get("hash") != file.hash:
+        return True
+
+    stored = parse_embedding_config(metadata.get("embedding_config"))
+    return stored is None or any(
+        stored.get(key) != value for key, value in embedding_config.items()
+    )
+
+
+def get_stored_metadata(collection_name: str, file_id: str) -> Optional[dict]:
+    try:
+        result = VECTOR_DB_CLIENT.query(
+            collection_name=collection_name, filter={"file_id": file_id}, limit=1
+        )
+    except Exception as e:
+        log.debug(f"Error querying {file_id} in collection {collection_name}: {e}")
+        return None
+
+    if result is None or not result.metadatas or not result.metadatas[0]:
+        return None
+    return result.metadatas[0][0]
+
+
+def plan_knowledge_reindex(
+    knowledge_bases: list[KnowledgeModel], embedding_config: dict
+) -> ReindexPlan:
+    """
+    Compares the hash and chunk fingerprint (the embedding and text splitting
+    settings) stored with the first chunk of each knowledge file against the
+    file and the current config. Only files whose chunks differ (or are
+    missing) need to be processed again.
+    """
+    plan = ReindexPlan()
+    for knowledge_base in knowledge_bases:
+        if not knowledge_base.data or not isinstance(knowledge_base.data, dict):
+            plan.invalid_knowledge_bases.append(knowledge_base.id)
+            continue
+
+        plan.knowledge_bases += 1
+        files = Files.get_files_by_ids(
+            knowledge_base.data.get("file_ids", []), include_content=False
+        )
+        plan.files += len(files)
+
+        has_collection = VECTOR_DB_CLIENT.has_collection(
+            collection_name=knowledge_base.id
+        )
+        for file in files:
+            metadata = (
+                get_stored_metadata(knowledge_base.id, file.id)
+                if has_collection
+                else None
+            )
+            if is_chunk_stale(file, metadata, embedding_config):
+                plan.stale.setdefault(file.id, []).append(knowledge_base.id)
+
+    return plan
+
+
+####################
+# Job
+####################
+
+
+def save_reindex_job(job: ReindexJob) -> None:
+    job.updated_at = int(time.time())
+    tmp_path = REINDEX_JOB_PATH.with_suffix(".tmp")
+    tmp_path.write_text(job.model_dump_json())
+    os.replace(tmp_path, REINDEX_JOB_PATH)
+
+
+def get_reindex_job() -> Optional[ReindexJob]:
+    try:
+        job = ReindexJob.model_validate_json(REINDEX_JOB_PATH.read_text())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        log.warning(f"Unreadable knowledge reindex state: {e}")
+        return None
+
+    if (
+        job.status in ("planning", "running")
+        and time.time() - job.updated_at > 3 * REINDEX_JOB_HEARTBEAT
+    ):
+        job.status = "interrupted"
+    return job
+
+
+def claim_reindex_lock_file(job_id: str) -> bool:
+    """
+    Creates the lock file, failing if another worker holds it. A lock whose
+    job stopped refreshing it was interrupted and is taken over: of the workers
+    finding it, only the one creating its takeover marker removes it.
+    """
+    for _ in range(2):
+        try:
+            fd = os.open(REINDEX_LOCK_PATH, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                mtime = REINDEX_LOCK_PATH.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            if time.time_ns() - mtime < 3 * REINDEX_JOB_HEARTBEAT * 10**9:
+                return False
+
+            marker = REINDEX_LOCK_PATH.with_name(f"{REINDEX_LOCK_PATH.name}.{mtime}")
+            try:
+                os.close(os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                return False
+            REINDEX_LOCK_PATH.unlink(missing_ok=True)
+            continue
+
+        with os.fdopen(fd, "w") as f:
+            f.write(job_id)
+        return True
+    return False
+
+
+def release_reindex_lock_file() -> None:
+    REINDEX_LOCK_PATH.unlink(missing_ok=True)
+    for marker in REINDEX_LOCK_PATH.parent.glob(f"{REINDEX_LOCK_PATH.name}.*"):
+        marker.unlink(missing_ok=True)
+
+
+async def claim_reindex_lock(redis, job_id: str) -> bool:
+    if redis is not None:
+        return bool(
+            await redis.set(
+                REINDEX_LOCK_KEY, job_id, nx=True, ex=3 * REINDEX_JOB_HEARTBEAT
+            )
+        )
+    return claim_reindex_lock_file(job_id)
+
+
+async def refresh_reindex_lock(redis) -> None:
+    if redis is not None:
+        await redis.expire(REINDEX_LOCK_KEY, 3 * REINDEX_JOB_HEARTBEAT)
+    else:
+        os.utime(REINDEX_LOCK_PATH)
+
+
+async def release_reindex_lock(redis, job_id: str) -> None:
+    if redis is not None:
+        if await redis.get(REINDEX_LOCK_KEY) == job_id:
+            await redis.delete(REINDEX_LOCK_KEY)
+    else:
+        release_reindex_lock_file()
+
+
+async def reindex_knowledge_file(
+    request: Request, file_id: str, knowledge_id: str, user
+) -> None:
+    # Stale chunks have to go first, otherwise the content hash check would
+    # treat the file as a duplicate and keep them
+    await asyncio.to_thread(
+        VECTOR_DB_CLIENT.delete,
+        collection_name=knowledge_id,
+        filter={"file_id": file_id},
+    )
+    await process_file(
+        request,
+        ProcessFileForm(file_id=file_id, collection_name=knowledge_id),
+        user=user,
+    )
+
+
+async def run_reindex_job(request: Request, user, job: ReindexJob, redis=None) -> None:
+    async def heartbeat():
+        while True:
+            await asyncio.sleep(REINDEX_JOB_HEARTBEAT)
+            save_reindex_job(job)
+            try:
+                await refresh_reindex_lock(redis)
+            except Exception as e:
+                log.warning(f"Failed to refresh the knowledge reindex lock: {e}")
+
+    heartbeat_task = asyncio.create_task(heartbeat())
+    try:
+        knowledge_bases = await asyncio.to_thread(Knowledges.get_knowledge_bases)
+        plan = await asyncio.to_thread(
+            plan_knowledge_reindex, knowledge_bases, job.embedding_config
+        )
+
+        for knowledge_id in plan.invalid_knowledge_bases:
+            log.warning(f"Knowledge base {knowledge_id} has no valid data. Deleting.")
+            try:
+                Knowledges.delete_knowledge_by_id(id=knowledge_id)
+                job.deleted_knowledge_bases.append(knowledge_id)
+            except Exception as e:
+                log.error(
+                    f"Failed to delete invalid knowledge base {knowledge_id}: {e}"
+                )
+
+        job.status = "running"
+        job.knowledge_bases = plan.knowledge_bases
+        job.files = plan.files
+        job.up_to_date = plan.up_to_date
+        job.stale = plan.files - plan.up_to_date
+        save_reindex_job(job)
+        log.info(
+            f"Reindexing {job.stale} of {job.files} files in {job.knowledge_bases} knowledge bases"
+        )
+
+        # Files run in parallel, the knowledge bases of one file one after
+        # another, so processing state of a file is never written concurrently
+        semaphore = asyncio.Semaphore(KNOWLEDGE_REINDEX_CONCURRENCY)
+
+        async def reindex_file(file_id: str, knowledge_ids: list[str]):
+            async with semaphore:
+                for knowledge_id in knowledge_ids:
+                    try:
+                        await reindex_knowledge_file(
+                            request, file_id, knowledge_id, user
+                        )
+                    except Exception as e:
+                        log.error(
+                            f"Error reindexing file {file_id} in knowledge base {knowledge_id}: {e}"
+                        )
+                        job.failed.append(
+                            ReindexFailure(
+                                knowledge_id=knowledge_id,
+                                file_id=file_id,
+                                error=str(getattr(e, "detail", e)),
+                            )
+                        )
+                    job.processed += 1
+                save_reindex_job(job)
+
+        await asyncio.gather(
+            *(
+                reindex_file(file_id, knowledge_ids)
+                for file_id, knowledge_ids in plan.stale.items()
+            )
+        )
+        job.status = "completed"
+    except asyncio.CancelledError:
+        job.status = "interrupted"
+        raise
+    except Exception as e:
+        log.exception(f"Knowledge reindex failed: {e}")
+        job.status = "failed"
+        job.error = str(e)
+    finally:
+        heartbeat_task.cancel()
+        job.finished_at = int(time.time())
+        save_reindex_job(job)
+        try:
+            await release_reindex_lock(redis, job.id)
+        except Exception as e:
+            log.warning(f"Failed to release the knowledge reindex lock: {e}")
+        log.info(
+            f"Knowledge reindex {job.status}: {job.processed - len(job.failed)} files reindexed, "
+            f"{len(job.failed)} failed, {job.up_to_date} up to date"
+        )
+
+
+async def start_reindex_job(request: Request, user) -> Optional[ReindexJob]:
+    """
+    Starts reindexing all knowledge bases in the background, or returns the job
+    that is already running. Files finished by an interrupted job are up to date
+    and skipped, so starting again resumes it.
+
+    Only one worker runs a job at a time, it is claimed in Redis if configured,
+    with a lock file in CACHE_DIR otherwise. Returns None if another worker
+    claimed it but hasn't saved its state yet.
+    """
+    global _job_task
+
+    job = get_reindex_job()
+    if job and job.status in ("planning", "running"):
+        return job
+
+    now = int(time.time())
+    job = ReindexJob(
+        id=str(uuid.uuid4()),
+        status="planning",
+        embedding_config=get_chunk_fingerprint(request.app.state.config),
+        created_at=now,
+        updated_at=now,
+    )
+
+    redis = getattr(request.app.state, "redis", None)
+    if not await claim_reindex_lock(redis, job.id):
+        running_job = get_reindex_job()
+        if running_job and running_job.status in ("planning", "running"):
+            return running_job
+        return None
+
+    save_reindex_job(job)
+    _job_task = asyncio.create_task(run_reindex_job(request, user, job, redis))
+    return job
+
+
+async def reconcile_knowledge_files():
+    updated = await asyncio.to_thread(Knowledges.remove_missing_file_ids)
+    if updated:
+        log.info(f"Removed deleted files from {updated} knowledge bases")
+
+
+async def periodic_knowledge_file_reconcile(redis=None):
+    """
+    Removes deleted files from the knowledge bases every
+    KNOWLEDGE_FILE_RECONCILE_INTERVAL seconds, so listings don't have to. With
+    Redis, only the first worker to claim a run performs it.
+    """
+    await run_periodically(
+        "knowledge_file_reconcile",
+        reconcile_knowledge_files,
+        KNOWLEDGE_FILE_RECONCILE_INTERVAL,
+        initial_delay=min(KNOWLEDGE_FILE_RECONCILE_INTERVAL, 60),
+        redis=redis,
+    )
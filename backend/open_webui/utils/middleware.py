@@ -82,10 +82,14 @@ from open_webui.utils.tools import get_tools
 from open_webui.utils.plugin import load_function_module_by_id
 from open_webui.utils.filter import (
     get_sorted_filter_ids,
+    has_stream_filter_functions,
     process_filter_functions,
 )
 from open_webui.utils.code_interpreter import execute_code_jupyter
 from open_webui.utils.payload import apply_system_prompt_to_body
+from open_webui.utils.response import parse_passthrough_stream_chunk
+from open_webui.utils.serialization import json_dumps, json_loads
+from open_webui.utils.telemetry.instruments import rag_stage, rag_stage_duration
 from open_webui.utils.pii import (
     text_masking,
     consolidate_pii_data,
@@ -108,6 +112,7 @@ from open_webui.env import (
     BYPASS_MODEL_ACCESS_CONTROL,
     ENABLE_REALTIME_CHAT_SAVE,
     ENABLE_QUERIES_CACHE,
+    ENABLE_CHAT_STREAM_PASSTHROUGH,
 )
 from open_webui.constants import TASKS
 
@@ -639,15 +644,16 @@ async def chat_completion_files_handler(
     if files := body.get("metadata", {}).get("files", None):
         queries = []
         try:
-            queries_response = await generate_queries(
-                request,
-                {
-                    "model": body["model"],
-                    "messages": body["messages"],
-                    "type": "retrieval",
-                },
-                user,
-            )
+            with rag_stage("query_generation"):
+                queries_response = await generate_queries(
+                    request,
+                    {
+                        "model": body["model"],
+                        "messages": body["messages"],
+                        "type": "retrieval",
+                    },
+                    user,
+                )
             queries_response = queries_response["choices"][0]["message"]["content"]
 
             try:
@@ -685,6 +691,7 @@ async def chat_completion_files_handler(
         file_entities_dict = {}
 
         # Extract PII entities from files metadata to build initial dictionary
+        pii_start = time.perf_counter()
         for file_item in files:
             # Path 1: file.data.pii (most common for uploaded files)
             # if file_item.get("file", {}).get("data", {}).get("pii"):
@@ -705,7 +712,9 @@ async def chat_completion_files_handler(
                 try:
                     from open_webui.models.files import Files
 
-                    file_object = Files.get_file_by_id(file_item["id"])
+                    file_object = await Files.get_file_by_id_async(
+                        file_item["id"], include_content=False
+                    )
                     if file_object and file_object.data.get("pii"):
                         pii_data = file_object.data.get("pii")
                         if isinstance(pii_data, str):
@@ -724,12 +733,21 @@ async def chat_completion_files_handler(
         # Set consistent entity IDs based on known entities
         if file_entities_dict and known_entities:
             file_entities_dict = set_file_entity_ids(file_entities_dict, known_entities)
+        rag_stage_duration.record(
+            time.perf_counter() - pii_start, {"stage": "pii_entities"}
+        )
 
         # Store file_entities_dict in metadata for PII masking functions to access
         if not body.get("metadata"):
             body["metadata"] = {}
         body["metadata"]["file_entities_dict"] = file_entities_dict
 
+        def embedding_function(query, prefix):
+            with rag_stage("embedding"):
+                return request.app.state.EMBEDDING_FUNCTION(
+                    query, prefix=prefix, user=user
+                )
+
         try:
             # Offload get_sources_from_items to a separate thread
             loop = asyncio.get_running_loop()
@@ -740,9 +758,7 @@ async def chat_completion_files_handler(
                         request=request,
                         items=files,
                         queries=queries,
-                        embedding_function=lambda query, prefix: request.app.state.EMBEDDING_FUNCTION(
-                            query, prefix=prefix, user=user
-                        ),
+                        embedding_function=embedding_function,
                         k=request.app.state.config.TOP_K,
                         reranking_function=(
                             (
@@ -952,7 +968,7 @@ async def process_chat_payload(request, form_data, user, metadata, model):
     # Check if the request has chat_id and is inside of a folder
     chat_id = metadata.get("chat_id", None)
     if chat_id and user:
-        chat = Chats.get_chat_by_id_and_user_id(chat_id, user.id)
+        chat = await Chats.get_chat_by_id_and_user_id_async(chat_id, user.id)
         if chat and chat.folder_id:
             folder = Folders.get_folder_by_id_and_user_id(chat.folder_id, user.id)
 
@@ -1259,11 +1275,12 @@ async def process_chat_payload(request, form_data, user, metadata, model):
                     }
 
                     # Apply PII masking using the shared function
-                    masked_text = apply_pii_masking_to_content(
-                        document_text,
-                        document_metadata_with_entities,
-                        metadata.get("known_entities", []),
-                    )
+                    with rag_stage("pii_masking"):
+                        masked_text = apply_pii_masking_to_content(
+                            document_text,
+                            document_metadata_with_entities,
+                            metadata.get("known_entities", []),
+                        )
 
                     context_string += (
                         f'<source id="{citation_idx_map[source_id]}"'
@@ -1423,7 +1440,7 @@ async def process_chat_response(
     request, response, form_data, user, metadata, model, events, tasks
 ):
     async def background_tasks_handler():
-        message_map = Chats.get_messages_by_chat_id(metadata["chat_id"])
+        message_map = await Chats.get_messages_by_chat_id_async(metadata["chat_id"])
         message = message_map.get(metadata["message_id"]) if message_map else None
 
         if message:
@@ -1496,7 +1513,7 @@ async def process_chat_response(
                                 "follow_ups", []
                             )
 
-                            Chats.upsert_message_to_chat_by_id_and_message_id(
+                            await Chats.upsert_message_to_chat_by_id_and_message_id_async(
                                 metadata["chat_id"],
                                 metadata["message_id"],
                                 {
@@ -1659,7 +1676,7 @@ async def process_chat_response(
                         else:
                             error = str(error)
 
-                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                        await Chats.upsert_message_to_chat_by_id_and_message_id_async(
                             metadata["chat_id"],
                             metadata["message_id"],
                             {
@@ -1675,7 +1692,7 @@ async def process_chat_response(
                             )
 
                     if "selected_model_id" in response_data:
-                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                        await Chats.upsert_message_to_chat_by_id_and_message_id_async(
                             metadata["chat_id"],
                             metadata["message_id"],
                             {
@@ -1709,7 +1726,7 @@ async def process_chat_response(
                             )
 
                             # Save message in the database
-                            Chats.upsert_message_to_chat_by_id_and_message_id(
+                            await Chats.upsert_message_to_chat_by_id_and_message_id_async(
                                 metadata["chat_id"],
                                 metadata["message_id"],
                                 {
@@ -2176,7 +2193,7 @@ async def process_chat_response(
 
                 return content, content_blocks, end_flag
 
-            message = Chats.get_message_by_id_and_message_id(
+            message = await Chats.get_message_by_id_and_message_id_async(
                 metadata["chat_id"], metadata["message_id"]
             )
 
@@ -2232,7 +2249,7 @@ async def process_chat_response(
                     )
 
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    await Chats.upsert_message_to_chat_by_id_and_message_id_async(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
@@ -2256,11 +2273,42 @@ async def process_chat_response(
                     )
                     last_delta_data = None
 
+                    # Plain chats (no stream filters, tools or code interpreter) only
+                    # need delta.content, so those chunks skip the generic handling
+                    # below until a reasoning/solution tag character shows up.
+                    passthrough = (
+                        ENABLE_CHAT_STREAM_PASSTHROUGH
+                        and not form_data.get("tools")
+                        and not DETECT_CODE_INTERPRETER
+                        and not has_stream_filter_functions(request, filter_functions)
+                    )
+                    passthrough_tag_chars = (
+                        {
+                            start_tag[0]
+                            for start_tag, _ in [
+                                *reasoning_tags,
+                                *DEFAULT_SOLUTION_TAGS,
+                            ]
+                        }
+                        if DETECT_REASONING_TAGS
+                        else set()
+                    )
+                    if any(char in content for char in passthrough_tag_chars):
+                        passthrough = False
+
+                    def get_passthrough_delta_data():
+                        return {"content": serialize_content_blocks(content_blocks)}
+
                     async def flush_pending_delta_data(threshold: int = 0):
                         nonlocal delta_count
                         nonlocal last_delta_data
 
                         if delta_count >= threshold and last_delta_data:
+                            # Passthrough chunks defer serializing the content
+                            # until the delta is actually emitted.
+                            if callable(last_delta_data):
+                                last_delta_data = last_delta_data()
+
                             await event_emitter(
                                 {
                                     "type": "chat:completion",
@@ -2285,8 +2333,47 @@ async def process_chat_response(
                         # Remove the prefix
                         data = data[len("data:") :].strip()
 
+                        if (
+                            passthrough
+                            and content_blocks
+                            and content_blocks[-1]["type"] == "text"
+                        ):
+                            chunk = parse_passthrough_stream_chunk(data)
+                            if chunk and any(
+                                char in chunk[1] for char in passthrough_tag_chars
+                            ):
+                                # Possible tag, use the generic handling from now on
+                                passthrough = False
+                            elif chunk:
+                                data, value = chunk
+
+                                content = f"{content}{value}"
+                                content_blocks[-1]["content"] = (
+                                    content_blocks[-1]["content"] + value
+                                )
+
+                                if ENABLE_REALTIME_CHAT_SAVE:
+                                    # Save message in the database
+                                    await Chats.upsert_message_to_chat_by_id_and_message_id_async(
+                                        metadata["chat_id"],
+                                        metadata["message_id"],
+                                        {
+                                            "content": serialize_content_blocks(
+                                                content_blocks
+                                            ),
+                                        },
+                                    )
+                                else:
+                                    data = get_passthrough_delta_data
+
+                                delta_count += 1
+                                last_delta_data = data
+                                if delta_count >= delta_chunk_size:
+                                    await flush_pending_delta_data(delta_chunk_size)
+                                continue
+
                         try:
-                            data = json.loads(data)
+                            data = json_loads(data)
 
                             data, _ = await process_filter_functions(
                                 request=request,
@@ -2302,7 +2389,7 @@ async def process_chat_response(
 
                                 if "selected_model_id" in data:
                                     model_id = data["selected_model_id"]
-                                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                                    await Chats.upsert_message_to_chat_by_id_and_message_id_async(
                                         metadata["chat_id"],
                                         metadata["message_id"],
                                         {
@@ -2510,7 +2597,7 @@ async def process_chat_response(
 
                                         if ENABLE_REALTIME_CHAT_SAVE:
                                             # Save message in the database
-                                            Chats.upsert_message_to_chat_by_id_and_message_id(
+                                            await Chats.upsert_message_to_chat_by_id_and_message_id_async(
                                                 metadata["chat_id"],
                                                 metadata["message_id"],
                                                 {
@@ -2957,7 +3044,7 @@ async def process_chat_response(
 
                 if not ENABLE_REALTIME_CHAT_SAVE:
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    await Chats.upsert_message_to_chat_by_id_and_message_id_async(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
@@ -2995,7 +3082,7 @@ async def process_chat_response(
 
                 if not ENABLE_REALTIME_CHAT_SAVE:
                     # Save message in the database
-                    Chats.upsert_message_to_chat_by_id_and_message_id(
+                    await Chats.upsert_message_to_chat_by_id_and_message_id_async(
                         metadata["chat_id"],
                         metadata["message_id"],
                         {
@@ -3024,7 +3111,7 @@ async def process_chat_response(
                 )
 
                 if event:
-                    yield wrap_item(json.dumps(event))
+                    yield wrap_item(json_dumps(event))
 
             async for data in original_generator:
                 data, _ = await process_filter_functions(
@@ -1,11 +1,13 @@
+import asyncio
 import inspect
+from typing import Awaitable, Callable
 from urllib.parse import urlparse
 
 import logging
 
 import redis
 
-from open_webui.env import REDIS_SENTINEL_MAX_RETRY_COUNT
+from open_webui.env import REDIS_KEY_PREFIX, REDIS_SENTINEL_MAX_RETRY_COUNT
 
 log = logging.getLogger(__name__)
 
@@ -207,3 +209,41 @@ def get_sentinel_url_from_env(redis_url, sentinel_hosts_env, sentinel_port_env):
         f"{host}:{sentinel_port_env}" for host in sentinel_hosts_env.split(",")
     )
     return f"redis+sentinel://{auth_part}{hosts_part}/{redis_config['db']}/{redis_config['service']}"
+
+
+async def claim_periodic_run(redis, name: str, interval: int) -> bool:
+    """
+    Claims the current run of a periodic task for this worker, so that only one
+    worker performs it. Without Redis, every worker does.
+    """
+    if redis is None:
+        return True
+    return bool(
+        await redis.set(
+            f"{REDIS_KEY_PREFIX}:{name}", "1", nx=True, ex=max(1, interval // 2)
+        )
+    )
+
+
+async def run_periodically(
+    name: str,
+    func: Callable[[], Awaitable],
+    interval: int,
+    initial_delay: float,
+    redis=None,
+):
+    """
+    Awaits func every interval seconds on the worker that claims the run. A
+    NotImplementedError stops the task, other errors are logged.
+    """
+    await asyncio.sleep(initial_delay)
+    while True:
+        try:
+            if await claim_periodic_run(redis, name, interval):
+                await func()
+        except NotImplementedError as e:
+            log.info(f"Periodic task {name} disabled: {e}")
+            return
+        except Exception as e:
+            log.exception(f"Periodic task {name} failed: {e}")
+        await asyncio.sleep(interval)
@@ -1,9 +1,12 @@
 import json
+from typing import Optional
 from uuid import uuid4
+
 from open_webui.utils.misc import (
     openai_chat_chunk_message_template,
     openai_chat_completion_message_template,
 )
+from open_webui.utils.serialization import json_dumps, json_loads
 
 
 def convert_ollama_tool_call_to_openai(tool_calls: list) -> list:
@@ -101,7 +104,7 @@ def convert_response_ollama_to_openai(ollama_response: dict) -> dict:
 
 async def convert_streaming_response_ollama_to_openai(ollama_streaming_response):
     async for data in ollama_streaming_response.body_iterator:
-        data = json.loads(data)
+        data = json_loads(data)
 
         model = data.get("model", "ollama")
         message_content = data.get("message", {}).get("content", None)
@@ -122,7 +125,7 @@ async def convert_streaming_response_ollama_to_openai(ollama_streaming_response)
             model, message_content, reasoning_content, openai_tool_calls, usage
         )
 
-        line = f"data: {json.dumps(data)}\n\n"
+        line = f"data: {json_dumps(data)}\n\n"
         yield line
 
     yield "data: [DONE]\n\n"
@@ -187,3 +190,38 @@ def convert_embedding_response_ollama_to_openai(response) -> dict:
 
     # Fallback: return as is if unrecognized
     return response
+
+
+def parse_passthrough_stream_chunk(payload: str) -> Optional[tuple[dict, str]]:
+    """
+    Parse an OpenAI-compatible SSE chunk payload (without the "data:" prefix) and
+    return (data, delta content) if the chunk is a plain content delta.
+
+    Returns None for everything else (tool calls, reasoning, usage, errors, events,
+    [DONE], ...) so the caller can fall back to the generic stream handling.
+    """
+    try:
+        data = json_loads(payload)
+    except ValueError:
+        return None
+
+    if not isinstance(data, dict) or any(
+        key in data for key in ("event", "selected_model_id", "error")
+    ):
+        return None
+
+    choices = data.get("choices")
+    if not choices or len(choices) != 1:
+        return None
+
+    delta = choices[0].get("delta")
+    if not isinstance(delta, dict) or any(
+        value for key, value in delta.items() if key not in ("content", "role")
+    ):
+        return None
+
+    value = delta.get("content")
+    if not value or not isinstance(value, str):
+        return None
+
+    return data, value
@@ -0,0 +1,157 @@
+import json
+import zlib
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Callable,
+    Iterable,
+    Iterator,
+    Optional,
+)
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# orjson only emits compact output, other separators/indent need the stdlib
+COMPACT_SEPARATORS = (",", ":")
+
+
+def _use_orjson(kwargs: dict) -> bool:
+    return orjson is not None and all(
+        key == "separators" and tuple(value) == COMPACT_SEPARATORS
+        for key, value in kwargs.items()
+    )
+
+
+def json_dumps_bytes(
+    obj: Any, default: Optional[Callable[[Any], Any]] = None, **kwargs
+) -> bytes:
+    """
+    Serialize obj to UTF-8 encoded JSON bytes, using orjson when available.
+
+    Falls back to the stdlib json module for values orjson cannot handle
+    (e.g. integers larger than 64 bits) or for non-compact formatting options.
+    """
+    if _use_orjson(kwargs):
+        try:
+            return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+
+    if kwargs.get("indent") is None:
+        kwargs.setdefault("separators", COMPACT_SEPARATORS)
+    return json.dumps(obj, default=default, ensure_ascii=False, **kwargs).encode(
+        "utf-8"
+    )
+
+
+def json_dumps(
+    obj: Any, default: Optional[Callable[[Any], Any]] = None, **kwargs
+) -> str:
+    return json_dumps_bytes(obj, default=default, **kwargs).decode("utf-8")
+
+
+def json_loads(data: str | bytes | bytearray | memoryview, **kwargs) -> Any:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+    # catching the stdlib exception
+    if orjson is not None and not kwargs:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN / Infinity, as written by json.dumps into older rows and
+            # Redis values, are only accepted by the stdlib
+            pass
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data, **kwargs)
+
+
+JSON_STREAM_MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "json-seq": "application/json-seq",
+}
+
+
+def iter_json_stream(
+    items: Iterable[Any], format: str = "json", chunk_size: int = 64 * 1024
+) -> Iterator[bytes]:
+    """
+    Serialize items one by one as a JSON array, newline delimited JSON or a
+    JSON text sequence (RFC 7464), yielding chunks of about chunk_size bytes.
+    """
+    buffer = bytearray(b"[" if format == "json" else b"")
+    for index, item in enumerate(items):
+        if format == "json":
+            if index:
+                buffer += b","
+            buffer += json_dumps_bytes(item)
+        elif format == "json-seq":
+            buffer += b"\x1e" + json_dumps_bytes(item) + b"\n"
+        else:
+            buffer += json_dumps_bytes(item) + b"\n"
+
+        if len(buffer) >= chunk_size:
+            yield bytes(buffer)
+            buffer.clear()
+
+    if format == "json":
+        buffer += b"]"
+    if buffer:
+        yield bytes(buffer)
+
+
+def iter_gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        if data := compressor.compress(chunk):
+            yield data
+    yield compressor.flush()
+
+
+async def aiter_json_lines(
+    chunks: AsyncIterable[bytes], gzip: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Split a newline delimited JSON or JSON text sequence body into its
+    (still encoded) records, decompressing it first if gzip is set.
+    """
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS) if gzip else None
+    buffer = bytearray()
+    async for chunk in chunks:
+        buffer += decompressor.decompress(chunk) if decompressor else chunk
+        start = 0
+        while (end := buffer.find(b"\n", start)) != -1:
+            if line := bytes(buffer[start:end]).strip(b"\x1e \t\r"):
+                yield line
+            start = end + 1
+        del buffer[:start]
+
+    if decompressor is not None:
+        buffer += decompressor.flush()
+    if line := bytes(buffer).strip(b"\x1e \t\r\n"):
+        yield line
+
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson (stdlib json if it is not installed).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps_bytes(content)
+
+
+class SocketIOJSON:
+    """
+    Drop-in for the json module used by python-socketio/engineio packets.
+    """
+
+    dumps = staticmethod(json_dumps)
+    loads = staticmethod(json_loads)
@@ -0,0 +1,176 @@
+"""Instruments for LLM streaming, retrieval and file processing stages.
+
+They are created on the global meter provider, so modules can record into them
+without depending on the exporters. Until setup_metrics installs a provider,
+recording does nothing.
+
+Attributes are kept to a low cardinality:
+
+* gen_ai.request.model, gen_ai.provider.name for the LLM instruments
+* stage for the retrieval and file processing stage durations
+* status for the file processing duration
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from contextlib import contextmanager
+from typing import AsyncIterator, Optional
+
+from opentelemetry import metrics
+
+meter = metrics.get_meter("open_webui")
+
+time_to_first_token = meter.create_histogram(
+    name="gen_ai.server.time_to_first_token",
+    description="Time from the upstream request to the first streamed token",
+    unit="s",
+)
+time_per_output_token = meter.create_histogram(
+    name="gen_ai.server.time_per_output_token",
+    description="Average time between streamed tokens after the first one",
+    unit="s",
+)
+output_tokens_per_second = meter.create_histogram(
+    name="webui.llm.output_tokens_per_second",
+    description="Output tokens per second after the first token",
+    unit="{token}/s",
+)
+rag_stage_duration = meter.create_histogram(
+    name="webui.rag.stage.duration",
+    description="Duration of a retrieval stage of a chat completion",
+    unit="s",
+)
+file_processing_stage_duration = meter.create_histogram(
+    name="webui.file.processing.stage.duration",
+    description="Duration of a stage of the file upload pipeline",
+    unit="s",
+)
+file_processing_duration = meter.create_histogram(
+    name="webui.file.processing.duration",
+    description="Duration of the file upload pipeline",
+    unit="s",
+)
+
+# Histogram bucket boundaries, see the views in setup_metrics
+TIME_TO_FIRST_TOKEN_BUCKETS = [0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120]
+TIME_PER_OUTPUT_TOKEN_BUCKETS = [0.005, 0.01, 0.02, 0.04, 0.08, 0.15, 0.3, 0.6, 1]
+OUTPUT_TOKENS_PER_SECOND_BUCKETS = [1, 5, 10, 20, 40, 60, 80, 120, 200, 400]
+STAGE_DURATION_BUCKETS = [
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1,
+    2.5,
+    5,
+    10,
+    30,
+    60,
+    300,
+]
+
+
+@contextmanager
+def rag_stage(stage: str):
+    """Records the duration of the block as the given retrieval stage."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        rag_stage_duration.record(time.perf_counter() - start, {"stage": stage})
+
+
+def get_llm_attributes(model_id: str, model: dict) -> dict[str, str]:
+    if model.get("direct"):
+        # Direct connections have user defined model ids
+        return {"gen_ai.request.model": "direct", "gen_ai.provider.name": "direct"}
+    return {
+        "gen_ai.request.model": model_id,
+        "gen_ai.provider.name": (
+            "pipe" if model.get("pipe") else model.get("owned_by", "unknown")
+        ),
+    }
+
+
+# A content, reasoning or tool call delta in an OpenAI-compatible stream chunk
+_TOKEN_DELTA = (
+    r'"(?:content|reasoning_content|reasoning)"\s*:\s*"(?!")|"tool_calls"\s*:\s*\['
+)
+_COMPLETION_TOKENS = r'"completion_tokens"\s*:\s*(\d+)'
+_PATTERNS = {
+    str: (re.compile(_TOKEN_DELTA), re.compile(_COMPLETION_TOKENS)),
+    bytes: (
+        re.compile(_TOKEN_DELTA.encode()),
+        re.compile(_COMPLETION_TOKENS.encode()),
+    ),
+}
+
+
+async def observe_token_stream(
+    body_iterator: AsyncIterator, attributes: dict[str, str], start: float
+) -> AsyncIterator:
+    """
+    Passes the chunks of an OpenAI-compatible SSE stream through while recording
+    the time to first token (from `start`, a perf_counter() value), the time per
+    output token and the output tokens per second.
+
+    Chunks are matched without being parsed. Each delta counts as a token, unless
+    the upstream reports the completion tokens in its usage.
+    """
+    first = last = None
+    deltas = 0
+    completion_tokens: Optional[int] = None
+    try:
+        async for chunk in body_iterator:
+            patterns = _PATTERNS.get(type(chunk))
+            if patterns:
+                count = len(patterns[0].findall(chunk))
+                if count:
+                    last = time.perf_counter()
+                    if first is None:
+                        first = last
+                        time_to_first_token.record(first - start, attributes)
+                    deltas += count
+                match = patterns[1].search(chunk)
+                if match:
+                    completion_tokens = int(match.group(1))
+            yield chunk
+    finally:
+        tokens = completion_tokens or deltas
+        if first is not None and tokens > 1 and last > first:
+            time_per_output_token.record((last - first) / (tokens - 1), attributes)
+            output_tokens_per_second.record((tokens - 1) / (last - first), attributes)
+
+
+# Current stage of the files being processed, when it started and when the
+# pipeline started, by file id
+_file_stages: dict[str, tuple[str, float, float]] = {}
+_MAX_TRACKED_FILES = 10000
+
+
+def record_file_processing_stage(file_id: str, status: str, stage: str):
+    """
+    Records the duration of a file's previous processing stage when it moves to
+    another one, and the whole pipeline's once it is done or failed.
+    """
+    now = time.perf_counter()
+    current = _file_stages.get(file_id)
+    if current and current[0] != stage:
+        file_processing_stage_duration.record(now - current[1], {"stage": current[0]})
+
+    if status in ("done", "error"):
+        _file_stages.pop(file_id, None)
+        if current:
+            file_processing_duration.record(now - current[2], {"status": status})
+    elif current is None:
+        if len(_file_stages) >= _MAX_TRACKED_FILES:
+            # Files whose processing never finished, e.g. after a crash
+            _file_stages.clear()
+        _file_stages[file_id] = (stage, now, now)
+    elif current[0] != stage:
+        _file_stages[file_id] = (stage, now, current[2])
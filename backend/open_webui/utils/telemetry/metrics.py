@@ -1,15 +1,25 @@
 """OpenTelemetry metrics bootstrap for Open WebUI.
 
 This module initialises a MeterProvider that sends metrics to an OTLP
-collector. The collector is responsible for exposing a Prometheus
-`/metrics` endpoint – WebUI does **not** expose it directly.
+collector (ENABLE_OTEL_METRICS) and/or serves them in the Prometheus text
+format at `/metrics` (ENABLE_PROMETHEUS_METRICS), which needs no collector.
 
 Metrics collected:
 
 * http.server.requests (counter)
-* http.server.duration (histogram, milliseconds)
+* http.server.duration (histogram, milliseconds, until the response is sent)
+* webui.event_loop.lag (gauge, largest lag of the last minute in milliseconds)
+* webui.event_loop.blocked_calls (counter, calls over EVENT_LOOP_BLOCKING_THRESHOLD_MS)
+* webui.extraction_cache.lookups (counter, by result) and
+  webui.extraction_cache.evictions (counter), with ENABLE_EXTRACTION_CACHE
+* gen_ai.server.time_to_first_token, gen_ai.server.time_per_output_token
+  (histograms, seconds) and webui.llm.output_tokens_per_second (histogram)
+* webui.rag.stage.duration (histogram, seconds)
+* webui.file.processing.stage.duration, webui.file.processing.duration
+  (histograms, seconds)
 
-Attributes used: http.method, http.route, http.status_code
+Attributes used: http.method, http.route, http.status_code for the HTTP
+metrics, see open_webui.utils.telemetry.instruments for the others.
 
 If you wish to add more attributes (e.g. user-agent) you can, but beware of
 high-cardinality label sets.
@@ -17,11 +27,13 @@ high-cardinality label sets.
 
 from __future__ import annotations
 
+import hmac
+import logging
 import time
 from typing import Dict, List, Sequence, Any
 from base64 import b64encode
 
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, HTTPException, Request, Response, status
 from opentelemetry import metrics
 from opentelemetry.exporter.otlp.proto.grpc.metric_exporter import (
     OTLPMetricExporter,
@@ -31,28 +43,43 @@ from opentelemetry.exporter.otlp.proto.http.metric_exporter import (
     OTLPMetricExporter as OTLPHttpMetricExporter,
 )
 from opentelemetry.sdk.metrics import MeterProvider
-from opentelemetry.sdk.metrics.view import View
+from opentelemetry.sdk.metrics.view import ExplicitBucketHistogramAggregation, View
 from opentelemetry.sdk.metrics.export import (
+    InMemoryMetricReader,
+    MetricReader,
     PeriodicExportingMetricReader,
 )
 from opentelemetry.sdk.resources import Resource
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from open_webui.env import (
+    ENABLE_OTEL,
+    ENABLE_OTEL_METRICS,
+    ENABLE_PROMETHEUS_METRICS,
+    PROMETHEUS_METRICS_API_KEY,
+    PROMETHEUS_METRICS_ALLOW_UNAUTHENTICATED,
     OTEL_SERVICE_NAME,
     OTEL_METRICS_EXPORTER_OTLP_ENDPOINT,
     OTEL_METRICS_BASIC_AUTH_USERNAME,
     OTEL_METRICS_BASIC_AUTH_PASSWORD,
     OTEL_METRICS_OTLP_SPAN_EXPORTER,
     OTEL_METRICS_EXPORTER_OTLP_INSECURE,
+    SRC_LOG_LEVELS,
 )
+from open_webui.retrieval.loaders.cache import EXTRACTION_CACHE
 from open_webui.socket.main import get_active_user_ids
+from open_webui.utils.event_loop import get_blocked_call_count, get_event_loop_lag
+from open_webui.utils.telemetry import instruments
+from open_webui.utils.telemetry.prometheus import CONTENT_TYPE, render_prometheus
 from open_webui.models.users import Users
 
+log = logging.getLogger(__name__)
+log.setLevel(SRC_LOG_LEVELS["MAIN"])
+
 _EXPORT_INTERVAL_MILLIS = 10_000  # 10 seconds
 
 
-def _build_meter_provider(resource: Resource) -> MeterProvider:
-    """Return a configured MeterProvider."""
+def _build_otlp_reader() -> PeriodicExportingMetricReader:
     headers = []
     if OTEL_METRICS_BASIC_AUTH_USERNAME and OTEL_METRICS_BASIC_AUTH_PASSWORD:
         auth_string = (
@@ -63,25 +90,26 @@ def _build_meter_provider(resource: Resource) -> MeterProvider:
 
     # Periodic reader pushes metrics over OTLP/gRPC to collector
     if OTEL_METRICS_OTLP_SPAN_EXPORTER == "http":
-        readers: List[PeriodicExportingMetricReader] = [
-            PeriodicExportingMetricReader(
-                OTLPHttpMetricExporter(
-                    endpoint=OTEL_METRICS_EXPORTER_OTLP_ENDPOINT, headers=headers
-                ),
-                export_interval_millis=_EXPORT_INTERVAL_MILLIS,
-            )
-        ]
-    else:
-        readers: List[PeriodicExportingMetricReader] = [
-            PeriodicExportingMetricReader(
-                OTLPMetricExporter(
-                    endpoint=OTEL_METRICS_EXPORTER_OTLP_ENDPOINT,
-                    insecure=OTEL_METRICS_EXPORTER_OTLP_INSECURE,
-                    headers=headers,
-                ),
-                export_interval_millis=_EXPORT_INTERVAL_MILLIS,
-            )
-        ]
+        return PeriodicExportingMetricReader(
+            OTLPHttpMetricExporter(
+                endpoint=OTEL_METRICS_EXPORTER_OTLP_ENDPOINT, headers=headers
+            ),
+            export_interval_millis=_EXPORT_INTERVAL_MILLIS,
+        )
+    return PeriodicExportingMetricReader(
+        OTLPMetricExporter(
+            endpoint=OTEL_METRICS_EXPORTER_OTLP_ENDPOINT,
+            insecure=OTEL_METRICS_EXPORTER_OTLP_INSECURE,
+            headers=headers,
+        ),
+        export_interval_millis=_EXPORT_INTERVAL_MILLIS,
+    )
+
+
+def _build_meter_provider(
+    resource: Resource, readers: List[MetricReader]
+) -> MeterProvider:
+    """Return a configured MeterProvider."""
 
     # Optional view to limit cardinality: drop user-agent etc.
     views: List[View] = [
@@ -99,6 +127,54 @@ def _build_meter_provider(resource: Resource) -> MeterProvider:
         View(
             instrument_name="webui.users.active",
         ),
+        View(
+            instrument_name="webui.event_loop.lag",
+        ),
+        View(
+            instrument_name="webui.event_loop.blocked_calls",
+        ),
+        View(
+            instrument_name="gen_ai.server.time_to_first_token",
+            attribute_keys=["gen_ai.request.model", "gen_ai.provider.name"],
+            aggregation=ExplicitBucketHistogramAggregation(
+                instruments.TIME_TO_FIRST_TOKEN_BUCKETS
+            ),
+        ),
+        View(
+            instrument_name="gen_ai.server.time_per_output_token",
+            attribute_keys=["gen_ai.request.model", "gen_ai.provider.name"],
+            aggregation=ExplicitBucketHistogramAggregation(
+                instruments.TIME_PER_OUTPUT_TOKEN_BUCKETS
+            ),
+        ),
+        View(
+            instrument_name="webui.llm.output_tokens_per_second",
+            attribute_keys=["gen_ai.request.model", "gen_ai.provider.name"],
+            aggregation=ExplicitBucketHistogramAggregation(
+                instruments.OUTPUT_TOKENS_PER_SECOND_BUCKETS
+            ),
+        ),
+        View(
+            instrument_name="webui.rag.stage.duration",
+            attribute_keys=["stage"],
+            aggregation=ExplicitBucketHistogramAggregation(
+                instruments.STAGE_DURATION_BUCKETS
+            ),
+        ),
+        View(
+            instrument_name="webui.file.processing.stage.duration",
+            attribute_keys=["stage"],
+            aggregation=ExplicitBucketHistogramAggregation(
+                instruments.STAGE_DURATION_BUCKETS
+            ),
+        ),
+        View(
+            instrument_name="webui.file.processing.duration",
+            attribute_keys=["status"],
+            aggregation=ExplicitBucketHistogramAggregation(
+                instruments.STAGE_DURATION_BUCKETS
+            ),
+        ),
     ]
 
     provider = MeterProvider(
@@ -109,10 +185,60 @@ def _build_meter_provider(resource: Resource) -> MeterProvider:
     return provider
 
 
+class HTTPMetricsMiddleware:
+    """
+    Pure ASGI middleware counting HTTP requests and recording their duration
+    until the response has been sent, streamed bodies included.
+    """
+
+    def __init__(self, app: ASGIApp, *, request_counter, duration_histogram):
+        self.app = app
+        self.request_counter = request_counter
+        self.duration_histogram = duration_histogram
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed_ms = (time.perf_counter() - start_time) * 1000.0
+
+            # Route template e.g. "/items/{item_id}" instead of real path.
+            route = scope.get("route")
+            route_path = getattr(route, "path", scope["path"])
+
+            attrs: Dict[str, str | int] = {
+                "http.method": scope["method"],
+                "http.route": route_path,
+                "http.status_code": status_code,
+            }
+
+            self.request_counter.add(1, attrs)
+            self.duration_histogram.record(elapsed_ms, attrs)
+
+
 def setup_metrics(app: FastAPI, resource: Resource) -> None:
     """Attach OTel metrics middleware to *app* and initialise provider."""
 
-    metrics.set_meter_provider(_build_meter_provider(resource))
+    readers: List[MetricReader] = []
+    if ENABLE_OTEL and ENABLE_OTEL_METRICS:
+        readers.append(_build_otlp_reader())
+    if ENABLE_PROMETHEUS_METRICS:
+        prometheus_reader = InMemoryMetricReader()
+        readers.append(prometheus_reader)
+
+    metrics.set_meter_provider(_build_meter_provider(resource, readers))
     meter = metrics.get_meter(__name__)
 
     # Instruments
@@ -159,24 +285,90 @@ def setup_metrics(app: FastAPI, resource: Resource) -> None:
         callbacks=[observe_active_users],
     )
 
-    # FastAPI middleware
-    @app.middleware("http")
-    async def _metrics_middleware(request: Request, call_next):
-        start_time = time.perf_counter()
-        response = await call_next(request)
-        elapsed_ms = (time.perf_counter() - start_time) * 1000.0
+    def observe_event_loop_lag(
+        options: metrics.CallbackOptions,
+    ) -> Sequence[metrics.Observation]:
+        _, largest = get_event_loop_lag()
+        return [metrics.Observation(value=largest)]
 
-        # Route template e.g. "/items/{item_id}" instead of real path.
-        route = request.scope.get("route")
-        route_path = getattr(route, "path", request.url.path)
+    def observe_blocked_calls(
+        options: metrics.CallbackOptions,
+    ) -> Sequence[metrics.Observation]:
+        return [metrics.Observation(value=get_blocked_call_count())]
 
-        attrs: Dict[str, str | int] = {
-            "http.method": request.method,
-            "http.route": route_path,
-            "http.status_code": response.status_code,
-        }
+    meter.create_observable_gauge(
+        name="webui.event_loop.lag",
+        description="Largest event loop lag of the last minute",
+        unit="ms",
+        callbacks=[observe_event_loop_lag],
+    )
 
-        request_counter.add(1, attrs)
-        duration_histogram.record(elapsed_ms, attrs)
+    meter.create_observable_counter(
+        name="webui.event_loop.blocked_calls",
+        description="Callbacks that blocked the event loop longer than the threshold",
+        unit="1",
+        callbacks=[observe_blocked_calls],
+    )
+
+    if EXTRACTION_CACHE is not None:
+
+        def observe_extraction_cache(
+            options: metrics.CallbackOptions,
+        ) -> Sequence[metrics.Observation]:
+            stats = EXTRACTION_CACHE.stats()
+            return [
+                metrics.Observation(value=stats[result], attributes={"result": result})
+                for result in ("hits", "misses")
+            ]
 
-        return response
+        def observe_extraction_cache_evictions(
+            options: metrics.CallbackOptions,
+        ) -> Sequence[metrics.Observation]:
+            return [metrics.Observation(value=EXTRACTION_CACHE.stats()["evictions"])]
+
+        meter.create_observable_counter(
+            name="webui.extraction_cache.lookups",
+            description="Extraction cache lookups by result (hits or misses)",
+            unit="1",
+            callbacks=[observe_extraction_cache],
+        )
+
+        meter.create_observable_counter(
+            name="webui.extraction_cache.evictions",
+            description="Extraction cache entries evicted to stay under the size limit",
+            unit="1",
+            callbacks=[observe_extraction_cache_evictions],
+        )
+
+    app.add_middleware(
+        HTTPMetricsMiddleware,
+        request_counter=request_counter,
+        duration_histogram=duration_histogram,
+    )
+
+    if ENABLE_PROMETHEUS_METRICS:
+        if (
+            not PROMETHEUS_METRICS_API_KEY
+            and not PROMETHEUS_METRICS_ALLOW_UNAUTHENTICATED
+        ):
+            log.warning(
+                "/metrics refuses all requests, set PROMETHEUS_METRICS_API_KEY "
+                "or PROMETHEUS_METRICS_ALLOW_UNAUTHENTICATED"
+            )
+
+        @app.get("/metrics", include_in_schema=False)
+        def get_prometheus_metrics(request: Request):
+            if PROMETHEUS_METRICS_API_KEY:
+                authorized = hmac.compare_digest(
+                    request.headers.get("Authorization", ""),
+                    f"Bearer {PROMETHEUS_METRICS_API_KEY}",
+                )
+            else:
+                authorized = PROMETHEUS_METRICS_ALLOW_UNAUTHENTICATED
+            if not authorized:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED)
+
+            return Response(
+                render_prometheus(prometheus_reader.get_metrics_data()),
+                media_type=CONTENT_TYPE,
+            )
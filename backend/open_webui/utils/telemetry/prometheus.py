@@ -0,0 +1,114 @@
+"""Prometheus text exposition of OpenTelemetry metrics.
+
+Renders the data collected by an InMemoryMetricReader, so a Prometheus server
+can scrape WebUI directly, without an OTLP collector or extra dependencies.
+Names follow the OpenTelemetry to Prometheus conventions: dots become
+underscores, the unit is appended (e.g. `_seconds`) and monotonic counters get
+a `_total` suffix.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from typing import Iterable, Optional
+
+from opentelemetry.sdk.metrics.export import (
+    Gauge,
+    Histogram,
+    MetricsData,
+    Sum,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_UNITS = {
+    "s": "seconds",
+    "ms": "milliseconds",
+    "By": "bytes",
+    "1": "",
+}
+_INVALID_NAME_CHARS = re.compile(r"[^a-zA-Z0-9_:]")
+_INVALID_LABEL_CHARS = re.compile(r"[^a-zA-Z0-9_]")
+
+
+def get_prometheus_name(name: str, unit: Optional[str] = None) -> str:
+    name = _INVALID_NAME_CHARS.sub("_", name)
+    # Annotations like "{token}/s" or "users" carry no Prometheus unit
+    suffix = _UNITS.get(unit or "", "")
+    if suffix and not name.endswith(f"_{suffix}"):
+        name = f"{name}_{suffix}"
+    return name
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(attributes: dict, extra: Iterable[tuple[str, str]] = ()) -> str:
+    labels = [
+        (_INVALID_LABEL_CHARS.sub("_", str(key)), str(value))
+        for key, value in (attributes or {}).items()
+    ]
+    labels.extend(extra)
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels) + "}"
+
+
+def render_prometheus(metrics_data: Optional[MetricsData]) -> str:
+    lines = []
+    seen = set()
+    for resource_metrics in metrics_data.resource_metrics if metrics_data else []:
+        for scope_metrics in resource_metrics.scope_metrics:
+            for metric in scope_metrics.metrics:
+                name = get_prometheus_name(metric.name, metric.unit)
+                data = metric.data
+
+                if isinstance(data, Histogram):
+                    kind = "histogram"
+                elif isinstance(data, Sum) and data.is_monotonic:
+                    kind = "counter"
+                    if not name.endswith("_total"):
+                        name = f"{name}_total"
+                elif isinstance(data, (Sum, Gauge)):
+                    kind = "gauge"
+                else:
+                    continue
+
+                if name not in seen:
+                    seen.add(name)
+                    if metric.description:
+                        lines.append(f"# HELP {name} {_escape(metric.description)}")
+                    lines.append(f"# TYPE {name} {kind}")
+
+                for point in data.data_points:
+                    if kind != "histogram":
+                        lines.append(
+                            f"{name}{_format_labels(point.attributes)} "
+                            f"{_format_value(point.value)}"
+                        )
+                        continue
+
+                    count = 0
+                    for bound, bucket_count in zip(
+                        [*point.explicit_bounds, math.inf], point.bucket_counts
+                    ):
+                        count += bucket_count
+                        labels = _format_labels(
+                            point.attributes, [("le", _format_value(float(bound)))]
+                        )
+                        lines.append(f"{name}_bucket{labels} {count}")
+                    labels = _format_labels(point.attributes)
+                    lines.append(f"{name}_sum{labels} {_format_value(point.sum)}")
+                    lines.append(f"{name}_count{labels} {point.count}")
+
+    return "\n".join(lines) + "\n"
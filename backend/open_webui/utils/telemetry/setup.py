@@ -17,8 +17,10 @@ from open_webui.env import (
     OTEL_SERVICE_NAME,
     OTEL_EXPORTER_OTLP_ENDPOINT,
     OTEL_EXPORTER_OTLP_INSECURE,
+    ENABLE_OTEL,
     ENABLE_OTEL_TRACES,
     ENABLE_OTEL_METRICS,
+    ENABLE_PROMETHEUS_METRICS,
     OTEL_BASIC_AUTH_USERNAME,
     OTEL_BASIC_AUTH_PASSWORD,
     OTEL_OTLP_SPAN_EXPORTER,
@@ -28,7 +30,7 @@ from open_webui.env import (
 def setup(app: FastAPI, db_engine: Engine):
     # set up trace
     resource = Resource.create(attributes={SERVICE_NAME: OTEL_SERVICE_NAME})
-    if ENABLE_OTEL_TRACES:
+    if ENABLE_OTEL and ENABLE_OTEL_TRACES:
         trace.set_tracer_provider(TracerProvider(resource=resource))
 
         # Add basic auth header only if both username and password are not empty
@@ -53,6 +55,6 @@ def setup(app: FastAPI, db_engine: Engine):
         trace.get_tracer_provider().add_span_processor(BatchSpanProcessor(exporter))
         Instrumentor(app=app, db_engine=db_engine).instrument()
 
-    # set up metrics only if enabled
-    if ENABLE_OTEL_METRICS:
+    # set up metrics only if enabled, Prometheus works without OTLP export
+    if (ENABLE_OTEL and ENABLE_OTEL_METRICS) or ENABLE_PROMETHEUS_METRICS:
         setup_metrics(app, resource)
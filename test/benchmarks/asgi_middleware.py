@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+HTTP middleware benchmark: the previous stack of BaseHTTPMiddleware layers vs
+the single pure-ASGI RequestPipelineMiddleware doing the same per-request work.
+
+Drives the ASGI apps in-process (no sockets) and reports requests/s for a small
+JSON endpoint and the per-chunk overhead of a streaming (SSE) response.
+
+Usage (from the repository root):
+    PYTHONPATH=backend python test/benchmarks/asgi_middleware.py --requests 2000
+"""
+
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from open_webui.utils.asgi import RequestPipelineMiddleware
+
+SECURITY_HEADERS = {"X-Frame-Options": "DENY", "X-Content-Type-Options": "nosniff"}
+
+
+def make_app(chunks: int) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/config")
+    async def get_config(request: Request):
+        return {"status": True, "token": request.state.token}
+
+    @app.get("/api/chat")
+    async def chat():
+        async def body():
+            for _ in range(chunks):
+                yield b'data: {"choices":[{"delta":{"content":"token"}}]}\n\n'
+
+        return StreamingResponse(body(), media_type="text/event-stream")
+
+    return app
+
+
+def make_legacy_app(chunks: int) -> FastAPI:
+    app = make_app(chunks)
+
+    class RedirectMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            if request.method == "GET" and request.url.path.endswith("/watch"):
+                return JSONResponse({})
+            return await call_next(request)
+
+    class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+        async def dispatch(self, request, call_next):
+            response = await call_next(request)
+            response.headers.update(SECURITY_HEADERS)
+            return response
+
+    app.add_middleware(RedirectMiddleware)
+    app.add_middleware(SecurityHeadersMiddleware)
+
+    @app.middleware("http")
+    async def commit_session_after_request(request, call_next):
+        return await call_next(request)
+
+    @app.middleware("http")
+    async def check_url(request, call_next):
+        start_time = int(time.time())
+        request.state.token = request.headers.get("Authorization")
+        response = await call_next(request)
+        response.headers["X-Process-Time"] = str(int(time.time()) - start_time)
+        return response
+
+    @app.middleware("http")
+    async def inspect_websocket(request, call_next):
+        if "/ws/socket.io" in request.url.path:
+            return JSONResponse({}, status_code=400)
+        return await call_next(request)
+
+    return app
+
+
+def make_pipeline_app(chunks: int) -> FastAPI:
+    app = make_app(chunks)
+
+    def reject_websocket(request):
+        if "/ws/socket.io" in request.url.path:
+            return JSONResponse({}, status_code=400)
+
+    def redirect(request):
+        if request.method == "GET" and request.url.path.endswith("/watch"):
+            return JSONResponse({})
+
+    def set_request_state(request):
+        request.state.token = request.headers.get("Authorization")
+
+    app.add_middleware(
+        RequestPipelineMiddleware,
+        request_hooks=[reject_websocket, set_request_state, redirect],
+        response_hooks=[lambda request, headers: headers.update(SECURITY_HEADERS)],
+        finish_hooks=[lambda request: None],
+    )
+    return app
+
+
+async def call(app, path: str) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost"), (b"authorization", b"Bearer x")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("localhost", 80),
+        "state": {},
+    }
+    received = False
+
+    async def receive():
+        nonlocal received
+        if received:
+            await asyncio.Event().wait()
+        received = True
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    chunks = 0
+
+    async def send(message):
+        nonlocal chunks
+        if message["type"] == "http.response.body" and message.get("body"):
+            chunks += 1
+
+    await app(scope, receive, send)
+    return chunks
+
+
+async def measure(app, path: str, requests: int) -> float:
+    await call(app, path)  # warm up
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, path)
+    return time.perf_counter() - start
+
+
+async def run(args):
+    results = {}
+    for name, make in (
+        ("BaseHTTPMiddleware", make_legacy_app),
+        ("pipeline", make_pipeline_app),
+    ):
+        app = make(args.chunks)
+        assert await call(app, "/api/chat") == args.chunks
+        json_seconds = await measure(app, "/api/config", args.requests)
+        stream_seconds = await measure(app, "/api/chat", args.streams)
+        results[name] = (
+            args.requests / json_seconds,
+            stream_seconds / (args.streams * args.chunks) * 1e6,
+        )
+
+    print(
+        f"{args.requests} JSON requests, {args.streams} streams of {args.chunks} chunks"
+    )
+    for name, (rps, chunk_us) in results.items():
+        print(f"{name:>20}: {rps:10,.0f} requests/s {chunk_us:8.2f} µs/chunk")
+    legacy, pipeline = results["BaseHTTPMiddleware"], results["pipeline"]
+    print(
+        f"{'speedup':>20}: {pipeline[0] / legacy[0]:10.1f}x"
+        f"{legacy[1] / pipeline[1]:20.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--streams", type=int, default=50)
+    parser.add_argument("--chunks", type=int, default=500)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
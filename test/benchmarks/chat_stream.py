@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Chat streaming benchmark: tokens/s per worker core of process_chat_response with
+the generic SSE chunk handling and with the passthrough fast path.
+
+Streams a completion from test/simple-mock-api.py once, then replays its SSE
+lines as the upstream StreamingResponse of process_chat_response, with and
+without ENABLE_CHAT_STREAM_PASSTHROUGH, measuring CPU (process) time only. The
+socket.io event emitter is replaced by one that only collects the events.
+
+Usage (from the repository root):
+    PYTHONPATH=backend python test/benchmarks/chat_stream.py --tokens 2000
+"""
+
+import argparse
+import asyncio
+import contextlib
+import http.client
+import importlib.util
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+from socketserver import TCPServer
+from types import SimpleNamespace
+
+
+def start_mock_api():
+    path = Path(__file__).resolve().parents[1] / "simple-mock-api.py"
+    spec = importlib.util.spec_from_file_location("simple_mock_api", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    server = TCPServer(("127.0.0.1", 0), module.MockHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def fetch_stream_lines(port: int, tokens: int) -> list[bytes]:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    body = json.dumps({"model": "mock", "stream": True, "max_tokens": tokens})
+
+    # The mock API prints every request, keep the benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        conn.request("POST", "/v1/chat/completions", body=body)
+        raw = conn.getresponse().read()
+
+    return [line + b"\n" for line in raw.split(b"\n") if line.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tokens", type=int, default=2000)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--delta-chunk-size", type=int, default=1)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="owui-bench-"))
+
+    import open_webui.config  # noqa: F401 - runs the migrations
+    from starlette.requests import Request
+    from starlette.responses import StreamingResponse
+
+    from open_webui.internal.db import async_engine
+    from open_webui.models.chats import ChatForm, Chats
+    from open_webui.utils import middleware
+
+    server = start_mock_api()
+    try:
+        lines = fetch_stream_lines(server.server_address[1], args.tokens)
+    finally:
+        server.shutdown()
+
+    user = SimpleNamespace(id=f"benchmark-{uuid.uuid4()}")
+    message_id = str(uuid.uuid4())
+    chat = Chats.insert_new_chat(
+        user.id,
+        ChatForm(
+            chat={
+                "title": "Benchmark",
+                "history": {
+                    "messages": {
+                        message_id: {
+                            "id": message_id,
+                            "role": "assistant",
+                            "content": "",
+                        }
+                    },
+                    "currentId": message_id,
+                },
+            }
+        ),
+    )
+
+    app = SimpleNamespace(
+        state=SimpleNamespace(
+            WEBUI_NAME="Open WebUI",
+            config=SimpleNamespace(WEBUI_URL=""),
+            oauth_manager=SimpleNamespace(get_oauth_token=lambda *args: None),
+        )
+    )
+    request = Request({"type": "http", "app": app, "headers": []})
+    metadata = {
+        "chat_id": chat.id,
+        "message_id": message_id,
+        "session_id": "benchmark",
+        "params": {"stream_delta_chunk_size": args.delta_chunk_size},
+        "features": {},
+    }
+    form_data = {"model": "mock", "messages": [{"role": "user", "content": "Hi"}]}
+
+    events = []
+
+    async def event_emitter(event):
+        events.append(event)
+
+    async def event_caller(event):
+        return None
+
+    middleware.get_event_emitter = lambda *args, **kwargs: event_emitter
+    middleware.get_event_call = lambda *args, **kwargs: event_caller
+
+    async def upstream():
+        for line in lines:
+            yield line
+
+    async def stream() -> str:
+        response = StreamingResponse(upstream(), media_type="text/event-stream")
+        await middleware.process_chat_response(
+            request, response, form_data, user, metadata, {"id": "mock"}, [], {}
+        )
+        return events[-1]["data"]["content"]
+
+    async def measure(passthrough: bool) -> tuple[float, str]:
+        middleware.ENABLE_CHAT_STREAM_PASSTHROUGH = passthrough
+        elapsed = 0.0
+        for _ in range(args.rounds):
+            # The handler continues the stored message, start each round afresh
+            await Chats.upsert_message_to_chat_by_id_and_message_id_async(
+                chat.id, message_id, {"content": ""}
+            )
+            events.clear()
+
+            start = time.process_time()
+            content = await stream()
+            elapsed += time.process_time() - start
+        return args.tokens * args.rounds / elapsed, content
+
+    async def run():
+        try:
+            return await measure(passthrough=False), await measure(passthrough=True)
+        finally:
+            # The pooled aiosqlite connections belong to this event loop
+            if async_engine is not None:
+                await async_engine.dispose()
+
+    try:
+        (generic, generic_content), (passthrough, passthrough_content) = asyncio.run(
+            run()
+        )
+    finally:
+        Chats.delete_chat_by_id(chat.id)
+
+    assert generic_content == passthrough_content
+
+    print(
+        f"tokens per stream: {args.tokens}, rounds: {args.rounds}, "
+        f"delta chunk size: {args.delta_chunk_size}"
+    )
+    print(f"generic:     {generic:12,.0f} tokens/s per core")
+    print(f"passthrough: {passthrough:12,.0f} tokens/s per core")
+    print(f"speedup:     {passthrough / generic:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
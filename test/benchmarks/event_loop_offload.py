@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Event loop lag while async handlers make blocking calls (an embedding or a vector
+DB request, simulated by a sleep): called on the loop (as before) vs. offloaded
+with run_blocking.
+
+Usage (from the repository root):
+    PYTHONPATH=backend python test/benchmarks/event_loop_offload.py --requests 20
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20, help="concurrent calls")
+    parser.add_argument("--call-ms", type=float, default=50, help="blocking call")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATA_DIR", tempfile.mkdtemp(prefix="owui-bench-"))
+
+    from open_webui.utils.event_loop import (
+        get_event_loop_lag,
+        monitor_event_loop,
+        run_blocking,
+        shutdown_blocking_executor,
+    )
+
+    def blocking_call():
+        time.sleep(args.call_ms / 1000)
+
+    async def on_loop():
+        blocking_call()
+
+    async def offloaded():
+        await run_blocking(blocking_call)
+
+    async def run(handler):
+        monitor = asyncio.create_task(monitor_event_loop(interval=0.01))
+        await asyncio.sleep(0.05)
+        get_event_loop_lag(reset=True)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(handler() for _ in range(args.requests)))
+        duration = time.perf_counter() - start
+
+        await asyncio.sleep(0.05)
+        monitor.cancel()
+        _, largest = get_event_loop_lag(reset=True)
+        return duration, largest
+
+    print(f"{args.requests} concurrent blocking calls of {args.call_ms:.0f} ms")
+    try:
+        for name, handler in (("on the loop", on_loop), ("run_blocking", offloaded)):
+            duration, largest = asyncio.run(run(handler))
+            print(
+                f"{name:>12}: {duration * 1000:8.1f} ms total, "
+                f"max loop lag {largest:8.1f} ms"
+            )
+    finally:
+        shutdown_blocking_executor()
+
+
+if __name__ == "__main__":
+    main()
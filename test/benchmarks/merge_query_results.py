@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Query result merging microbenchmark: the previous merge (model_dump, SHA-256
+of every document, full sort) vs open_webui.retrieval.utils.merge_and_sort_query_results
+on many generated queries over many collections.
+
+Usage (from the repository root):
+    PYTHONPATH=backend python test/benchmarks/merge_query_results.py --queries 5 --collections 8
+"""
+
+import argparse
+import hashlib
+import random
+import timeit
+import uuid
+
+from open_webui.retrieval.utils import merge_and_sort_query_results
+from open_webui.retrieval.vector.main import SearchResult
+
+
+def make_results(
+    queries: int, collections: int, limit: int, chunk_size: int
+) -> list[SearchResult]:
+    rng = random.Random(0)
+    file_ids = [str(uuid.uuid4()) for _ in range(collections)]
+    results = []
+    for _ in range(queries):
+        for file_id in file_ids:
+            # Different queries mostly hit the same chunks
+            positions = rng.sample(range(limit * 2), limit)
+            results.append(
+                SearchResult(
+                    ids=[[str(uuid.uuid4()) for _ in positions]],
+                    distances=[[rng.random() for _ in positions]],
+                    documents=[
+                        [f"{file_id}:{p} " + "x" * chunk_size for p in positions]
+                    ],
+                    metadatas=[
+                        [
+                            {"file_id": file_id, "start_index": p * chunk_size}
+                            for p in positions
+                        ]
+                    ],
+                )
+            )
+    return results
+
+
+def legacy_merge(results: list[SearchResult], k: int) -> dict:
+    query_results = [result.model_dump() for result in results]
+
+    combined = dict()
+    for data in query_results:
+        for distance, document, metadata in zip(
+            data["distances"][0], data["documents"][0], data["metadatas"][0]
+        ):
+            if isinstance(document, str):
+                doc_hash = hashlib.sha256(document.encode()).hexdigest()
+                if doc_hash not in combined or distance > combined[doc_hash][0]:
+                    combined[doc_hash] = (distance, document, metadata)
+
+    combined = list(combined.values())
+    combined.sort(key=lambda x: x[0], reverse=True)
+    distances, documents, metadatas = zip(*combined[:k]) if combined else ([], [], [])
+    return {
+        "distances": [list(distances)],
+        "documents": [list(documents)],
+        "metadatas": [list(metadatas)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--collections", type=int, default=8)
+    parser.add_argument("--limit", type=int, default=50, help="hits per search")
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--number", type=int, default=50)
+    args = parser.parse_args()
+
+    results = make_results(args.queries, args.collections, args.limit, args.chunk_size)
+    legacy = legacy_merge(results, args.k)
+    merged = merge_and_sort_query_results(results, args.k)
+    assert merged["distances"] == legacy["distances"]
+
+    print(
+        f"{len(results)} searches, {len(results) * args.limit} hits, "
+        f"{args.chunk_size} character chunks, k={args.k}"
+    )
+    timings = {}
+    for name, merge in (
+        ("legacy", legacy_merge),
+        ("merge_and_sort_query_results", merge_and_sort_query_results),
+    ):
+        seconds = timeit.timeit(lambda: merge(results, args.k), number=args.number)
+        timings[name] = seconds / args.number
+        print(f"{name:>30}: {timings[name] * 1000:8.2f} ms")
+    print(
+        f"{'speedup':>30}: "
+        f"{timings['legacy'] / timings['merge_and_sort_query_results']:8.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Serialization microbenchmark: stdlib json vs open_webui.utils.serialization
+(orjson) on representative chat documents and model lists.
+
+Usage (from the repository root):
+    PYTHONPATH=backend python test/benchmarks/serialization.py
+"""
+
+import argparse
+import json
+import timeit
+import uuid
+
+from open_webui.utils.serialization import json_dumps, json_dumps_bytes, json_loads
+
+
+def make_chat(messages: int = 200) -> dict:
+    history = {}
+    parent_id = None
+    for i in range(messages):
+        message_id = str(uuid.uuid4())
+        history[message_id] = {
+            "id": message_id,
+            "parentId": parent_id,
+            "childrenIds": [],
+            "role": "user" if i % 2 == 0 else "assistant",
+            "content": (
+                "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20
+            )
+            + "Grüße 👋",
+            "model": "gpt-4o",
+            "timestamp": 1700000000 + i,
+            "usage": {"prompt_tokens": 1200, "completion_tokens": 350},
+            "sources": [
+                {
+                    "source": {"id": str(uuid.uuid4()), "name": "handbook.pdf"},
+                    "document": ["Excerpt " * 50],
+                    "metadata": [{"page": 3, "start_index": 1024}],
+                }
+            ],
+        }
+        parent_id = message_id
+
+    return {
+        "id": str(uuid.uuid4()),
+        "title": "Benchmark chat",
+        "models": ["gpt-4o"],
+        "history": {"messages": history, "currentId": parent_id},
+        "messages": list(history.values()),
+        "tags": ["benchmark"],
+        "timestamp": 1700000000,
+    }
+
+
+def make_models(count: int = 300) -> dict:
+    return {
+        "data": [
+            {
+                "id": f"model-{i}",
+                "name": f"Model {i}",
+                "object": "model",
+                "created": 1700000000,
+                "owned_by": "openai",
+                "connection_type": "external",
+                "info": {
+                    "meta": {
+                        "description": "A general purpose model " * 5,
+                        "capabilities": {"vision": True, "citations": True},
+                        "toolIds": ["web_search", "calculator"],
+                    },
+                    "params": {"temperature": 0.7, "top_p": 0.9},
+                    "access_control": None,
+                },
+                "tags": [{"name": "general"}],
+            }
+            for i in range(count)
+        ]
+    }
+
+
+def bench(label: str, func, number: int):
+    seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+    print(f"  {label:<28} {seconds * 1_000_000:12,.1f} µs")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=50)
+    args = parser.parse_args()
+
+    payloads = {
+        "chat document (200 messages)": make_chat(),
+        "chat list (50 x 20 messages)": [make_chat(20) for _ in range(50)],
+        "model list (300 models)": make_models(),
+    }
+
+    for name, payload in payloads.items():
+        encoded = json.dumps(payload)
+        print(f"{name}: {len(encoded) / 1024:,.0f} KiB")
+
+        stdlib_dumps = bench("json.dumps", lambda: json.dumps(payload), args.number)
+        fast_dumps = bench(
+            "json_dumps_bytes", lambda: json_dumps_bytes(payload), args.number
+        )
+        bench("json_dumps (str)", lambda: json_dumps(payload), args.number)
+        stdlib_loads = bench("json.loads", lambda: json.loads(encoded), args.number)
+        fast_loads = bench("json_loads", lambda: json_loads(encoded), args.number)
+
+        print(
+            f"  speedup: dumps {stdlib_dumps / fast_dumps:.1f}x, "
+            f"loads {stdlib_loads / fast_loads:.1f}x\n"
+        )
+
+
+if __name__ == "__main__":
+    main()
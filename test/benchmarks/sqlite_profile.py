@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+SQLite under concurrent load: default settings vs. ENABLE_SQLITE_PERFORMANCE_PROFILE.
+
+Writer threads save streamed assistant messages while reader threads load the
+chat sidebar, the mix a busy single node instance sees. Each profile runs in a
+fresh interpreter with its own temporary database, since the engine settings
+are read at import time.
+
+Usage (from the repository root):
+    PYTHONPATH=backend python test/benchmarks/sqlite_profile.py --writers 8 --readers 16
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+PROFILES = {"default": "false", "performance": "true"}
+
+
+def run_child(args) -> dict:
+    import open_webui.config  # noqa: F401 - runs the migrations
+    from open_webui.models.chats import ChatForm, Chats
+
+    history = {
+        str(i): {"id": str(i), "role": "user", "content": "Lorem ipsum " * 50}
+        for i in range(args.history)
+    }
+    chat_ids = [
+        Chats.insert_new_chat(
+            f"user-{i % args.readers}",
+            ChatForm(chat={"title": "Benchmark", "history": {"messages": history}}),
+        ).id
+        for i in range(args.chats)
+    ]
+
+    latencies = {"write": [], "read": []}
+    errors = {"write": 0, "read": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+
+    def work(kind: str, index: int):
+        content = ""
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                if kind == "write":
+                    content += "token " * 20
+                    chat_id = chat_ids[index % len(chat_ids)]
+                    if (
+                        Chats.upsert_message_to_chat_by_id_and_message_id(
+                            chat_id, f"reply-{index}", {"content": content}
+                        )
+                        is None
+                    ):
+                        raise RuntimeError("upsert failed")
+                else:
+                    Chats.get_chat_title_id_list_by_user_id(f"user-{index}", limit=50)
+                failed = False
+            except Exception:
+                failed = True
+            elapsed = time.perf_counter() - start
+            with lock:
+                if failed:
+                    errors[kind] += 1
+                else:
+                    latencies[kind].append(elapsed)
+
+    threads = [
+        threading.Thread(target=work, args=(kind, i))
+        for kind, count in (("write", args.writers), ("read", args.readers))
+        for i in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    results = {}
+    for kind, values in latencies.items():
+        values.sort()
+        results[kind] = {
+            "ops": len(values) / args.seconds,
+            "p95": values[int(len(values) * 0.95) - 1] * 1000 if values else 0.0,
+            "errors": errors[kind],
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--chats", type=int, default=200)
+    parser.add_argument("--history", type=int, default=50, help="messages in each chat")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args)))
+        return
+
+    print(
+        f"{args.writers} writers, {args.readers} readers, {args.seconds:.0f}s, "
+        f"{args.chats} chats of {args.history} messages"
+    )
+    for profile, enabled in PROFILES.items():
+        env = dict(
+            os.environ,
+            DATA_DIR=tempfile.mkdtemp(prefix="owui-bench-"),
+            ENABLE_SQLITE_PERFORMANCE_PROFILE=enabled,
+            GLOBAL_LOG_LEVEL="ERROR",
+        )
+        env.pop("DATABASE_URL", None)
+        output = subprocess.run(
+            [sys.executable, __file__, "--child", *sys.argv[1:]],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        results = json.loads(output.strip().splitlines()[-1])
+        for kind, stats in results.items():
+            print(
+                f"{profile:>11} {kind:>5}: {stats['ops']:8.1f} ops/s, "
+                f"p95 {stats['p95']:8.2f} ms, {stats['errors']} errors"
+            )
+
+
+if __name__ == "__main__":
+    main()
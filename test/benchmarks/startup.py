@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Startup import profile: runs `python -X importtime -c "import open_webui.main"`
+in a fresh interpreter and reports the slowest imports.
+
+Exits non-zero when a provider-specific module that should be loaded lazily is
+imported at startup, or when the total import time exceeds --max-seconds, so it
+can gate regressions in CI.
+
+Usage (from the repository root):
+    PYTHONPATH=backend python test/benchmarks/startup.py --max-seconds 15
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+import time
+
+# Modules only needed by non-default storage providers, web search engines,
+# document loaders and audio backends
+LAZY_MODULES = [
+    "boto3",
+    "google.cloud.storage",
+    "azure.storage.blob",
+    "azure.identity",
+    "ddgs",
+    "pydub",
+    "langchain_community.document_loaders.pdf",
+    "langchain_community.retrievers.bm25",
+    "langchain.retrievers",
+]
+
+IMPORTTIME_PATTERN = re.compile(
+    r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$"
+)
+
+
+def profile_imports(module: str, env: dict) -> tuple[float, list[tuple[int, int, str]]]:
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr[-4000:])
+        raise SystemExit(f"Importing {module} failed")
+
+    imports = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append((int(self_us), int(cumulative_us), name))
+
+    return elapsed, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="open_webui.main")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument(
+        "--max-seconds",
+        type=float,
+        default=None,
+        help="fail if the wall-clock import time exceeds this value",
+    )
+    parser.add_argument(
+        "--allow",
+        action="append",
+        default=[],
+        help="lazy module that may be imported (e.g. when configured as provider)",
+    )
+    args = parser.parse_args()
+
+    env = {
+        **os.environ,
+        "STORAGE_PROVIDER": os.environ.get("STORAGE_PROVIDER", "local"),
+        "PYTHONDONTWRITEBYTECODE": "1",
+    }
+
+    elapsed, imports = profile_imports(args.module, env)
+    imported = {name for _, _, name in imports}
+
+    print(f"import {args.module}: {elapsed:.2f}s wall, {len(imports)} modules")
+    print(f"{'cumulative [ms]':>16} {'self [ms]':>10}  module")
+    for self_us, cumulative_us, name in sorted(
+        imports, key=lambda item: item[1], reverse=True
+    )[: args.top]:
+        print(f"{cumulative_us / 1000:16.1f} {self_us / 1000:10.1f}  {name}")
+
+    failures = [
+        f"{name} is imported at startup"
+        for name in LAZY_MODULES
+        if name in imported and name not in args.allow
+    ]
+    if args.max_seconds is not None and elapsed > args.max_seconds:
+        failures.append(f"startup took {elapsed:.2f}s > {args.max_seconds:.2f}s")
+
+    if failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures))
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -74,6 +74,11 @@ class MockHandler(http.server.BaseHTTPRequestHandler):
         )
         print("=" * 60)
 
+        payload = json.loads(body) if body else {}
+        if payload.get("stream"):
+            self.stream_response(payload)
+            return
+
         # Send response
         self.send_response(200)
         self.send_header("Content-Type", "application/json")
@@ -108,6 +113,31 @@ class MockHandler(http.server.BaseHTTPRequestHandler):
 
         self.wfile.write(json.dumps(response).encode())
 
+    def stream_response(self, payload):
+        # Stream "max_tokens" (default 256) word tokens as OpenAI-compatible SSE chunks
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+
+        def chunk(delta, finish_reason=None):
+            data = {
+                "id": "mock-response",
+                "object": "chat.completion.chunk",
+                "created": 1234567890,
+                "model": payload.get("model", "gpt-3.5-turbo"),
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+            }
+            return f"data: {json.dumps(data)}\n\n".encode()
+
+        self.wfile.write(chunk({"role": "assistant", "content": ""}))
+        for i in range(int(payload.get("max_tokens") or 256)):
+            self.wfile.write(chunk({"content": f"token{i} "}))
+        self.wfile.write(chunk({}, "stop"))
+        self.wfile.write(b"data: [DONE]\n\n")
+
     def do_OPTIONS(self):
         # Handle CORS preflight
         self.send_response(200)